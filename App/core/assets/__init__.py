@@ -0,0 +1,36 @@
+"""
+Indexing of content folders (microstock assets) into the database.
+
+Public names are loaded from their submodule on first access, so importing
+the package (or running one of its modules with python -m) does not import
+the others, e.g. numpy for perceptual hashing.
+"""
+import importlib
+
+_EXPORTS = {
+    'AssetIndexer': '_asset_indexer',
+    'index_folders': '_asset_indexer',
+    'scan_tree': '_asset_indexer',
+    'ThumbnailCache': '_thumbnail_cache',
+    'prerender': '_thumbnail_cache',
+    'MetadataExtractor': '_asset_metadata',
+    'files_with_keyword': '_asset_metadata',
+    'read_metadata': '_asset_metadata',
+    'search_assets': '_asset_metadata',
+    'DuplicateIndex': '_perceptual_hash',
+    'MultiIndexHash': '_perceptual_hash',
+    'PerceptualHasher': '_perceptual_hash',
+    'hamming': '_perceptual_hash',
+    'image_hashes': '_perceptual_hash',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,397 @@
+"""
+Asset Indexer
+
+Keeps the files table in step with the content folders on disk.
+
+A scan walks each folder with os.scandir, which returns file sizes and
+modification times along with the names. Files whose (path, size, mtime)
+match the table are not opened again. New and changed files are hashed
+(BLAKE2b of the whole content) and their real format is identified from
+their leading bytes, in a process pool. Results are upserted in batched
+transactions while the pool keeps hashing. Rows for files that disappeared
+from a scanned folder are removed; rows under folders that could not be
+read are kept, and a missing root folder is not scanned at all.
+
+    python -m App.core.assets._asset_indexer D:/Stock/Photos --user admin
+    python -m App.core.assets._asset_indexer --benchmark 20000
+"""
+import os
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+if __package__ in (None, ''):
+    sys.path.insert(0, str(Path(__file__).parents[3]))
+
+HASH_BLOCK_SIZE = 1 << 20
+DEFAULT_BATCH_SIZE = 500
+# Below this many files, hashing in-process is faster than starting a pool
+POOL_THRESHOLD = 64
+
+# Leading bytes -> file type, for files with a missing or wrong extension
+SIGNATURES = (
+    (b'\xff\xd8\xff', 'jpg'),
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+    (b'II*\x00', 'tiff'),
+    (b'MM\x00*', 'tiff'),
+    (b'8BPS', 'psd'),
+    (b'%PDF', 'pdf'),
+    (b'%!PS-Adobe', 'eps'),
+    (b'\xc5\xd0\xd3\xc6', 'eps'),
+)
+# Extensions that are the sniffed format under another name
+TYPE_ALIASES = {
+    'jpg': ('jpeg', 'jpe'),
+    'tiff': ('tif',),
+    'pdf': ('ai',),  # Illustrator files are PDF inside
+    'eps': ('ps', 'ai'),
+    'mp4': ('m4v',),
+}
+
+
+def _get_config():
+    base_dir = str(Path(__file__).parents[3])  # Go up 3 levels from this file
+    with open(os.path.join(base_dir, 'App', 'config', 'config.json'), 'r', encoding='utf-8') as f:
+        return base_dir, json.load(f)
+
+
+def _get_db_path():
+    """Get database path from config."""
+    base_dir, config = _get_config()
+    db_path = config['database']['path']
+    if not os.path.isabs(db_path):
+        db_path = os.path.join(base_dir, db_path)
+    return db_path
+
+
+def sniff_file_type(head, extension):
+    """
+    Identify a file's format from its first bytes.
+
+    Args:
+        head (bytes): Start of the file (at least 12 bytes for all formats)
+        extension (str): Lowercase extension without the dot
+
+    Returns:
+        str: File type such as 'jpg' or 'eps'; the extension if the format
+             is not recognized or the extension is another name for it
+    """
+    detected = None
+    for signature, file_type in SIGNATURES:
+        if head.startswith(signature):
+            detected = file_type
+            break
+    else:
+        if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+            detected = 'webp'
+        elif head[4:8] == b'ftyp':
+            detected = 'mov' if head[8:12] == b'qt  ' else 'mp4'
+
+    if detected is None or extension == detected or extension in TYPE_ALIASES.get(detected, ()):
+        return extension or detected or ''
+    return detected
+
+
+def fingerprint_file(path):
+    """
+    Hash a file and identify its format (runs in the worker processes).
+
+    Args:
+        path (str): File to read
+
+    Returns:
+        tuple: (path, size, mtime_ns, content_hash, file_type, error); on failure
+               everything but path and error is None
+    """
+    try:
+        stat = os.stat(path)
+        digest = hashlib.blake2b(digest_size=20)
+        with open(path, 'rb') as f:
+            block = f.read(HASH_BLOCK_SIZE)
+            file_type = sniff_file_type(block[:16], os.path.splitext(path)[1][1:].lower())
+            while block:
+                digest.update(block)
+                block = f.read(HASH_BLOCK_SIZE)
+        return path, stat.st_size, stat.st_mtime_ns, digest.hexdigest(), file_type, None
+    except OSError as e:
+        return path, None, None, None, None, str(e)
+
+
+def scan_tree(root, extensions=None, errors=None):
+    """
+    Walk a folder with os.scandir, skipping hidden entries and linked folders.
+
+    Args:
+        root (str): Folder to walk
+        extensions (set, optional): Lowercase extensions (without dot) to include;
+            None includes every file
+        errors (list, optional): Receives (path, reason) for unreadable folders
+
+    Yields:
+        tuple: (path, size, mtime_ns) for each file
+    """
+    pending = [root]
+    while pending:
+        folder = pending.pop()
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_file():
+                            if extensions is not None and \
+                                    os.path.splitext(entry.name)[1][1:].lower() not in extensions:
+                                continue
+                            stat = entry.stat()
+                            yield entry.path, stat.st_size, stat.st_mtime_ns
+                    except OSError as e:
+                        if errors is not None:
+                            errors.append((entry.path, str(e)))
+        except OSError as e:
+            if errors is not None:
+                errors.append((folder, str(e)))
+
+
+class AssetIndexer:
+    """
+    Incremental, parallel indexer for the files table.
+    """
+
+    UPSERT = """
+    INSERT INTO files (user_id, filename, original_path, file_type, file_size, mtime_ns, content_hash)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (original_path) DO UPDATE SET
+        filename = excluded.filename,
+        file_type = excluded.file_type,
+        file_size = excluded.file_size,
+        mtime_ns = excluded.mtime_ns,
+        content_hash = excluded.content_hash,
+        updated_at = CURRENT_TIMESTAMP
+    """
+
+    def __init__(self, db_path=None, workers=None, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Args:
+            db_path (str, optional): Database file; defaults to the configured database
+            workers (int, optional): Hashing processes; defaults to the CPU count
+            batch_size (int, optional): Rows per transaction
+        """
+        self.logger = logging.getLogger('main.database')
+        self.db_path = db_path or _get_db_path()
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+
+    def index(self, root, user_id, extensions=None):
+        """
+        Bring the files table up to date with a folder.
+
+        Args:
+            root (str): Content folder to scan recursively
+            user_id (int): Owner recorded for newly found files
+            extensions (iterable, optional): Only index these extensions (e.g. 'jpg', 'eps')
+
+        Returns:
+            dict: 'scanned', 'added', 'updated', 'unchanged' and 'removed' counts,
+                  'errors' (list of (path, reason)) and 'elapsed' seconds
+        """
+        start = time.perf_counter()
+        root = os.path.abspath(root)
+        if extensions is not None:
+            extensions = {extension.lower().lstrip('.') for extension in extensions}
+        report = {'scanned': 0, 'added': 0, 'updated': 0, 'unchanged': 0, 'removed': 0,
+                  'errors': [], 'elapsed': 0.0}
+        # A missing root (e.g. an unplugged drive) must not read as "every file was deleted"
+        if not os.path.isdir(root):
+            self.logger.warning(f"Not indexing {root}: folder not found")
+            report['errors'].append((root, "Folder not found"))
+            return report
+
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=10000")
+            known = self._load_known(conn, root)
+
+            changed = []
+            for path, size, mtime_ns in scan_tree(root, extensions, report['errors']):
+                report['scanned'] += 1
+                row = known.pop(path, None)
+                if row is not None and row[1] == size and row[2] == mtime_ns and row[3]:
+                    report['unchanged'] += 1
+                    continue
+                changed.append((path, row is None))
+
+            batch = []
+            is_new = dict(changed)
+            for path, size, mtime_ns, content_hash, file_type, error in self._fingerprint(
+                    [path for path, _ in changed]):
+                if error:
+                    report['errors'].append((path, error))
+                    continue
+                batch.append((user_id, os.path.basename(path), path, file_type, size, mtime_ns, content_hash))
+                report['added' if is_new[path] else 'updated'] += 1
+                if len(batch) >= self.batch_size:
+                    self._write(conn, self.UPSERT, batch)
+                    batch = []
+            if batch:
+                self._write(conn, self.UPSERT, batch)
+
+            # Whatever was not seen on disk is gone, unless the extension filter hid it
+            # or it lies in (or is) an entry that could not be read
+            unreadable = {path for path, _ in report['errors']}
+            unreadable_prefixes = tuple(path.rstrip(os.sep) + os.sep for path in unreadable)
+            removed = [(row[0],) for path, row in known.items()
+                       if (extensions is None or os.path.splitext(path)[1][1:].lower() in extensions)
+                       and path not in unreadable and not path.startswith(unreadable_prefixes)]
+            for offset in range(0, len(removed), self.batch_size):
+                self._write(conn, "DELETE FROM files WHERE id = ?", removed[offset:offset + self.batch_size])
+            report['removed'] = len(removed)
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error indexing {root}: {e}")
+            report['errors'].append((root, f"Database error: {e}"))
+        finally:
+            conn.close()
+
+        report['elapsed'] = time.perf_counter() - start
+        self.logger.info("Indexed %s: %d files, %d added, %d updated, %d removed, %d errors in %.2fs",
+                         root, report['scanned'], report['added'], report['updated'], report['removed'],
+                         len(report['errors']), report['elapsed'])
+        return report
+
+    @staticmethod
+    def _load_known(conn, root):
+        """Indexed files under root: path -> (id, size, mtime_ns, content_hash)."""
+        prefix = root.rstrip(os.sep) + os.sep
+        # A range on the unique path index instead of a LIKE scan
+        upper = prefix[:-1] + chr(ord(os.sep) + 1)
+        cursor = conn.execute("""
+        SELECT original_path, id, file_size, mtime_ns, content_hash FROM files
+        WHERE original_path >= ? AND original_path < ?
+        """, (prefix, upper))
+        return {path: (file_id, size, mtime_ns, content_hash)
+                for path, file_id, size, mtime_ns, content_hash in cursor}
+
+    def _fingerprint(self, paths):
+        """Yield fingerprint_file() results, in a process pool when there are enough files."""
+        if len(paths) < POOL_THRESHOLD or self.workers == 1:
+            yield from map(fingerprint_file, paths)
+            return
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            yield from pool.map(fingerprint_file, paths, chunksize=32)
+
+    @staticmethod
+    def _write(conn, sql, rows):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(sql, rows)
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+
+
+def index_folders(folders=None, user_id=1, db_path=None):
+    """
+    Index the configured content folders.
+
+    Args:
+        folders (list, optional): Folders to scan; defaults to assets.folders in config.json
+        user_id (int, optional): Owner recorded for newly found files
+        db_path (str, optional): Database file; defaults to the configured database
+
+    Returns:
+        list: One index() report per folder
+    """
+    base_dir, config = _get_config()
+    settings = config.get('assets', {})
+    if folders is None:
+        folders = [folder if os.path.isabs(folder) else os.path.join(base_dir, folder)
+                   for folder in settings.get('folders', [])]
+    indexer = AssetIndexer(db_path, settings.get('workers') or None,
+                           settings.get('batch_size', DEFAULT_BATCH_SIZE))
+    extensions = settings.get('extensions') or None
+    return [indexer.index(folder, user_id, extensions) for folder in folders]
+
+
+def _benchmark_indexer(assets=20000):
+    """Time a first index, an unchanged re-index and a re-index after a few edits."""
+    import shutil
+    import random
+    import tempfile
+    from App.core.database._db_migration import DatabaseMigration
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        migration = DatabaseMigration()
+        migration.db_path = os.path.join(temp_dir, 'bench.db')
+        migration.run_migrations()
+
+        root = os.path.join(temp_dir, 'assets')
+        rng = random.Random(1)
+        for i in range(assets):
+            folder = os.path.join(root, f"set{i // 500:03d}")
+            if i % 500 == 0:
+                os.makedirs(folder)
+            with open(os.path.join(folder, f"IMG_{i:06d}.jpg"), 'wb') as f:
+                f.write(b'\xff\xd8\xff\xe0' + rng.randbytes(rng.randint(2000, 20000)))
+
+        indexer = AssetIndexer(migration.db_path)
+        first = indexer.index(root, 1)
+        again = indexer.index(root, 1)
+        for i in range(0, assets, 100):
+            path = os.path.join(root, f"set{i // 500:03d}", f"IMG_{i:06d}.jpg")
+            with open(path, 'ab') as f:
+                f.write(b'edit')
+        edited = indexer.index(root, 1)
+
+        print(f"Indexing {assets} assets with {indexer.workers} workers")
+        print(f"  first index : {first['elapsed']:.2f}s ({first['added']} added)")
+        print(f"  re-index    : {again['elapsed']:.2f}s ({again['unchanged']} unchanged)")
+        print(f"  after edits : {edited['elapsed']:.2f}s ({edited['updated']} updated)")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index content folders into the files table")
+    parser.add_argument('folders', nargs='*', help="Folders to scan (defaults to assets.folders in config.json)")
+    parser.add_argument('--user', default='admin', help="Owner of newly found files")
+    parser.add_argument('--benchmark', type=int, metavar='N', help="Benchmark with N generated files")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        _benchmark_indexer(args.benchmark)
+        return 0
+
+    conn = sqlite3.connect(_get_db_path())
+    try:
+        row = conn.execute("SELECT id FROM users WHERE username = ?", (args.user,)).fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        parser.error(f"unknown user {args.user}")
+
+    status = 0
+    for report in index_folders(args.folders or None, row[0]):
+        print(f"{report['scanned']} files in {report['elapsed']:.2f}s: {report['added']} added, "
+              f"{report['updated']} updated, {report['unchanged']} unchanged, {report['removed']} removed")
+        for path, reason in report['errors']:
+            print(f"  error: {path}: {reason}")
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
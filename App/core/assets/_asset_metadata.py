@@ -0,0 +1,469 @@
+"""
+Asset Metadata
+
+Extracts the titles, captions and keywords that microstock agencies read
+from EXIF, IPTC and XMP, and stores them per file so the library can be
+searched without opening files again.
+
+Only headers are read. Image.open() parses the marker segments / IFDs and
+stops before the pixel data, which is never decoded. Files whose XMP
+Pillow does not expose (EPS, PSD) or cannot open at all (AI, PDF, MP4)
+have their XMP packet located in the first few MiB. Files are
+processed in a process pool, and results are written in batched
+transactions. Sources are merged as XMP over IPTC over EXIF, the order
+stock sites use.
+
+Extraction is incremental. Only files without a metadata row, or whose
+content hash changed since, are read. search_assets() matches words as
+prefixes against asset_metadata_fts (titles and keywords rank first), and
+files_with_keyword() is an exact lookup on asset_keywords.
+
+    python -m App.core.assets._asset_metadata                 # extract new and changed files
+    python -m App.core.assets._asset_metadata --search "sunset beach"
+"""
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import logging
+import argparse
+import xml.etree.ElementTree as ElementTree
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image, IptcImagePlugin
+
+if __package__ in (None, ''):
+    sys.path.insert(0, str(Path(__file__).parents[3]))
+
+DEFAULT_BATCH_SIZE = 500
+POOL_THRESHOLD = 64
+# How far into non-image files to look for an XMP packet
+XMP_SCAN_BYTES = 4 << 20
+METADATA_FIELDS = ('title', 'description', 'keywords', 'creator', 'copyright', 'width', 'height',
+                   'camera_make', 'camera_model', 'taken_at')
+# bm25 column weights: title, keywords, description
+RANK_WEIGHTS = (10.0, 5.0, 1.0)
+
+NAMESPACES = {
+    'rdf': 'http://www.w3.org/1999/02/22-rdf-syntax-ns#',
+    'dc': 'http://purl.org/dc/elements/1.1/',
+    'photoshop': 'http://ns.adobe.com/photoshop/1.0/',
+}
+XML_LANG = '{http://www.w3.org/XML/1998/namespace}lang'
+
+# IPTC IIM datasets (record 2)
+IPTC_FIELDS = {
+    (2, 5): 'title',           # Object Name
+    (2, 120): 'description',   # Caption/Abstract
+    (2, 25): 'keywords',
+    (2, 80): 'creator',        # By-line
+    (2, 116): 'copyright',
+}
+# EXIF tags; the XP* tags are what Windows Explorer writes, in UTF-16
+EXIF_FIELDS = {
+    0x010E: 'description',     # ImageDescription
+    0x013B: 'creator',         # Artist
+    0x8298: 'copyright',
+    0x010F: 'camera_make',
+    0x0110: 'camera_model',
+    0x0132: 'taken_at',        # DateTime, overridden by DateTimeOriginal
+    0x9C9B: 'title',           # XPTitle
+    0x9C9E: 'keywords',        # XPKeywords
+    0x9C9D: 'creator',         # XPAuthor
+}
+EXIF_IFD = 0x8769
+DATETIME_ORIGINAL = 0x9003
+
+
+def _get_config():
+    base_dir = str(Path(__file__).parents[3])  # Go up 3 levels from this file
+    with open(os.path.join(base_dir, 'App', 'config', 'config.json'), 'r', encoding='utf-8') as f:
+        return base_dir, json.load(f)
+
+
+def _get_db_path():
+    """Get database path from config."""
+    base_dir, config = _get_config()
+    db_path = config['database']['path']
+    if not os.path.isabs(db_path):
+        db_path = os.path.join(base_dir, db_path)
+    return db_path
+
+
+def _text(value):
+    """Decode and tidy a metadata value; None if empty."""
+    if value is None:
+        return None
+    if isinstance(value, bytes):
+        try:
+            value = value.decode('utf-8')
+        except UnicodeDecodeError:
+            value = value.decode('latin-1')
+    value = re.sub(r'\s+', ' ', str(value).replace('\x00', '')).strip()
+    return value or None
+
+
+def normalize_keywords(values):
+    """
+    Split, trim and de-duplicate keywords (case-insensitively, keeping the first spelling).
+
+    Args:
+        values (list): Keyword strings; single strings may hold several separated by , or ;
+
+    Returns:
+        list: Keywords in their original order
+    """
+    keywords = []
+    seen = set()
+    for value in values:
+        for keyword in re.split(r'[;,]', _text(value) or ''):
+            keyword = keyword.strip()
+            if keyword and keyword.lower() not in seen:
+                seen.add(keyword.lower())
+                keywords.append(keyword)
+    return keywords
+
+
+def parse_xmp(packet):
+    """
+    Read Dublin Core fields from an XMP packet.
+
+    Args:
+        packet (bytes or str): The <x:xmpmeta> document
+
+    Returns:
+        dict: Any of 'title', 'description', 'creator', 'copyright' (str) and 'keywords' (list)
+    """
+    if isinstance(packet, bytes):
+        packet = packet.decode('utf-8', 'ignore')
+    start = packet.find('<x:xmpmeta')
+    end = packet.find('</x:xmpmeta>')
+    if start < 0 or end < 0:
+        return {}
+    try:
+        root = ElementTree.fromstring(packet[start:end + len('</x:xmpmeta>')])
+    except ElementTree.ParseError:
+        return {}
+
+    def items(tag):
+        values = []
+        for element in root.iter(tag):
+            entries = element.findall('.//rdf:li', NAMESPACES)
+            # Language alternatives: prefer the default language
+            default = [entry for entry in entries if entry.get(XML_LANG) == 'x-default']
+            values.extend(_text(entry.text) for entry in (default or entries) if _text(entry.text))
+            if not entries and _text(element.text):
+                values.append(_text(element.text))
+        return values
+
+    fields = {}
+    for name, tag in (('title', 'dc:title'), ('description', 'dc:description'),
+                      ('creator', 'dc:creator'), ('copyright', 'dc:rights')):
+        values = items(f"{{{NAMESPACES['dc']}}}{tag.split(':')[1]}")
+        if values:
+            fields[name] = values[0] if name != 'creator' else ', '.join(values)
+    if 'title' not in fields:
+        headline = items(f"{{{NAMESPACES['photoshop']}}}Headline")
+        if headline:
+            fields['title'] = headline[0]
+    keywords = items(f"{{{NAMESPACES['dc']}}}subject")
+    if keywords:
+        fields['keywords'] = keywords
+    return fields
+
+
+def _parse_iptc(img):
+    info = IptcImagePlugin.getiptcinfo(img) or {}
+    fields = {}
+    for dataset, name in IPTC_FIELDS.items():
+        value = info.get(dataset)
+        if value is None:
+            continue
+        values = value if isinstance(value, list) else [value]
+        if name == 'keywords':
+            fields[name] = [_text(item) for item in values if _text(item)]
+        elif _text(values[0]):
+            fields[name] = _text(values[0])
+    return fields
+
+
+def _parse_exif(img):
+    exif = img.getexif()
+    fields = {}
+    for tag, name in EXIF_FIELDS.items():
+        value = exif.get(tag)
+        if value is None:
+            continue
+        if tag >= 0x9C9B:
+            value = bytes(value).decode('utf-16-le', 'ignore') if not isinstance(value, str) else value
+        if name == 'keywords':
+            fields[name] = [value]
+        elif _text(value) and name not in fields:
+            fields[name] = _text(value)
+    original = exif.get_ifd(EXIF_IFD).get(DATETIME_ORIGINAL)
+    if _text(original):
+        fields['taken_at'] = _text(original)
+    if 'taken_at' in fields:
+        # EXIF writes dates as 2024:05:01 10:30:00
+        fields['taken_at'] = re.sub(r'^(\d{4}):(\d{2}):(\d{2})', r'\1-\2-\3', fields['taken_at'])
+    return fields
+
+
+def _scan_xmp(path):
+    """Find an XMP packet near the start of a file whose reader does not expose it."""
+    with open(path, 'rb') as f:
+        data = f.read(XMP_SCAN_BYTES)
+    start = data.find(b'<x:xmpmeta')
+    if start < 0:
+        return {}
+    end = data.find(b'</x:xmpmeta>', start)
+    return parse_xmp(data[start:end + len(b'</x:xmpmeta>')]) if end > 0 else {}
+
+
+def read_metadata(path):
+    """
+    Read normalized metadata from a file's headers (runs in the worker processes).
+
+    Args:
+        path (str): Asset file
+
+    Returns:
+        tuple: (dict with METADATA_FIELDS, 'keywords' as a list, or None, error or None)
+    """
+    sources = []
+    try:
+        try:
+            with Image.open(path) as img:
+                width, height = img.size
+                xmp = img.info.get('xmp') or img.info.get('XML:com.adobe.xmp')
+                sources = [parse_xmp(xmp) if xmp else {}, _parse_iptc(img), _parse_exif(img)]
+                if not xmp or img.format in ('EPS', 'PSD'):
+                    # Pillow's EPS and PSD plugins never put the packet in info
+                    sources.insert(0, _scan_xmp(path))
+        except Image.UnidentifiedImageError:
+            width = height = None
+            sources = [_scan_xmp(path)]
+    except (OSError, ValueError, SyntaxError, Image.DecompressionBombError) as e:
+        return None, str(e)
+
+    metadata = dict.fromkeys(METADATA_FIELDS)
+    metadata.update(width=width, height=height)
+    # First source wins: XMP, then IPTC, then EXIF
+    for source in sources:
+        for name, value in source.items():
+            if name != 'keywords' and metadata.get(name) is None:
+                metadata[name] = value
+    keywords = next((source['keywords'] for source in sources if source.get('keywords')), [])
+    metadata['keywords'] = normalize_keywords(keywords)
+    return metadata, None
+
+
+class MetadataExtractor:
+    """
+    Incremental, parallel metadata extraction for the files table.
+    """
+
+    UPSERT = """
+    INSERT INTO asset_metadata (file_id, content_hash, title, description, keywords, creator, copyright,
+                                width, height, camera_make, camera_model, taken_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (file_id) DO UPDATE SET
+        content_hash = excluded.content_hash, title = excluded.title,
+        description = excluded.description, keywords = excluded.keywords,
+        creator = excluded.creator, copyright = excluded.copyright,
+        width = excluded.width, height = excluded.height,
+        camera_make = excluded.camera_make, camera_model = excluded.camera_model,
+        taken_at = excluded.taken_at, extracted_at = CURRENT_TIMESTAMP
+    """
+
+    def __init__(self, db_path=None, workers=None, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Args:
+            db_path (str, optional): Database file; defaults to the configured database
+            workers (int, optional): Reading processes; defaults to the CPU count
+            batch_size (int, optional): Files per transaction
+        """
+        self.logger = logging.getLogger('main.database')
+        self.db_path = db_path or _get_db_path()
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+
+    def extract(self):
+        """
+        Extract metadata for files that are new or changed since the last run.
+
+        Returns:
+            dict: 'extracted' and 'failed' counts, 'errors' (list of (path, reason))
+                  and 'elapsed' seconds
+        """
+        start = time.perf_counter()
+        report = {'extracted': 0, 'failed': 0, 'errors': [], 'elapsed': 0.0}
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=10000")
+            pending = conn.execute("""
+            SELECT f.id, f.original_path, f.content_hash FROM files f
+            LEFT JOIN asset_metadata m ON m.file_id = f.id
+            WHERE f.content_hash IS NOT NULL AND m.content_hash IS NOT f.content_hash
+            """).fetchall()
+
+            batch = []
+            paths = [path for _, path, _ in pending]
+            for (file_id, path, content_hash), (metadata, error) in zip(pending, self._read(paths)):
+                if error:
+                    # Still recorded, so unreadable files are not retried until they change
+                    report['failed'] += 1
+                    report['errors'].append((path, error))
+                    metadata = dict.fromkeys(METADATA_FIELDS, None)
+                    metadata['keywords'] = []
+                else:
+                    report['extracted'] += 1
+                batch.append((file_id, content_hash, metadata))
+                if len(batch) >= self.batch_size:
+                    self._write(conn, batch)
+                    batch = []
+            if batch:
+                self._write(conn, batch)
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error extracting asset metadata: {e}")
+            report['errors'].append(('', f"Database error: {e}"))
+        finally:
+            conn.close()
+
+        report['elapsed'] = time.perf_counter() - start
+        self.logger.info("Extracted metadata for %d files (%d failed) in %.2fs",
+                         report['extracted'], report['failed'], report['elapsed'])
+        return report
+
+    def _read(self, paths):
+        if len(paths) < POOL_THRESHOLD or self.workers == 1:
+            yield from map(read_metadata, paths)
+            return
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            yield from pool.map(read_metadata, paths, chunksize=16)
+
+    def _write(self, conn, batch):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(self.UPSERT, [
+                (file_id, content_hash, metadata['title'], metadata['description'],
+                 ', '.join(metadata['keywords']) or None, metadata['creator'], metadata['copyright'],
+                 metadata['width'], metadata['height'], metadata['camera_make'], metadata['camera_model'],
+                 metadata['taken_at'])
+                for file_id, content_hash, metadata in batch
+            ])
+            conn.executemany("DELETE FROM asset_keywords WHERE file_id = ?",
+                             [(file_id,) for file_id, _, _ in batch])
+            conn.executemany("INSERT OR IGNORE INTO asset_keywords (keyword, file_id) VALUES (?, ?)",
+                             [(keyword, file_id) for file_id, _, metadata in batch
+                              for keyword in metadata['keywords']])
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+
+
+def search_assets(text, offset=0, limit=50, db_path=None):
+    """
+    Search the library by title, keyword and description, best matches first.
+
+    Args:
+        text (str): Words to match as prefixes
+        offset (int, optional): Number of results to skip. Defaults to 0.
+        limit (int, optional): Page size. Defaults to 50.
+        db_path (str, optional): Database file; defaults to the configured database
+
+    Returns:
+        dict: 'files' (list of dicts with id, original_path, filename, file_type,
+              content_hash, title, keywords, width and height) and 'total';
+              empty on database error
+    """
+    words = re.findall(r'\w+', text)
+    if not words:
+        return {'files': [], 'total': 0}
+    columns = ("f.id, f.original_path, f.filename, f.file_type, f.content_hash, "
+               "m.title, m.keywords, m.width, m.height")
+    conn = None
+    try:
+        conn = sqlite3.connect(db_path or _get_db_path(), timeout=30)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'asset_metadata_fts'")
+        if cursor.fetchone():
+            source = ("asset_metadata_fts s JOIN asset_metadata m ON m.file_id = s.rowid "
+                      "JOIN files f ON f.id = m.file_id")
+            where, params = "WHERE asset_metadata_fts MATCH ?", [' '.join(f'"{word}"*' for word in words)]
+            order = f"bm25(asset_metadata_fts, {', '.join(str(weight) for weight in RANK_WEIGHTS)})"
+        else:
+            source = "asset_metadata m JOIN files f ON f.id = m.file_id"
+            any_column = "(m.title LIKE ? OR m.keywords LIKE ? OR m.description LIKE ?)"
+            where = f"WHERE {' AND '.join([any_column] * len(words))}"
+            params = [f"%{word}%" for word in words for _ in range(3)]
+            order = "f.filename"
+
+        cursor.execute(f"SELECT COUNT(*) FROM {source} {where}", params)
+        total = cursor.fetchone()[0]
+        cursor.execute(f"SELECT {columns} FROM {source} {where} ORDER BY {order} LIMIT ? OFFSET ?",
+                       params + [limit, offset])
+        return {'files': [dict(row) for row in cursor.fetchall()], 'total': total}
+    except sqlite3.Error as e:
+        logging.getLogger('main.database').error(f"Database error searching assets: {e}")
+        return {'files': [], 'total': 0}
+    finally:
+        if conn:
+            conn.close()
+
+
+def files_with_keyword(keyword, db_path=None):
+    """
+    Return the ids of files tagged with a keyword (exact, case-insensitive).
+
+    Args:
+        keyword (str): Keyword to look up
+        db_path (str, optional): Database file; defaults to the configured database
+
+    Returns:
+        list: File ids; empty on database error
+    """
+    conn = None
+    try:
+        conn = sqlite3.connect(db_path or _get_db_path(), timeout=30)
+        rows = conn.execute("SELECT file_id FROM asset_keywords WHERE keyword = ? ORDER BY file_id",
+                            (keyword.strip(),)).fetchall()
+        return [file_id for (file_id,) in rows]
+    except sqlite3.Error as e:
+        logging.getLogger('main.database').error(f"Database error looking up keyword {keyword}: {e}")
+        return []
+    finally:
+        if conn:
+            conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract and search asset metadata")
+    parser.add_argument('--search', metavar='TEXT', help="Search titles, keywords and descriptions")
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if args.search:
+        result = search_assets(args.search, limit=args.limit)
+        print(f"{result['total']} matches")
+        for asset in result['files']:
+            print(f"  {asset['original_path']}: {asset['title'] or ''} [{asset['keywords'] or ''}]")
+        return 0
+
+    settings = _get_config()[1].get('assets', {})
+    report = MetadataExtractor(workers=settings.get('workers') or None,
+                               batch_size=settings.get('batch_size', DEFAULT_BATCH_SIZE)).extract()
+    print(f"{report['extracted']} extracted, {report['failed']} failed in {report['elapsed']:.2f}s")
+    for path, reason in report['errors']:
+        print(f"  error: {path}: {reason}")
+    return 1 if report['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
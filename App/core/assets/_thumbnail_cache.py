@@ -0,0 +1,395 @@
+"""
+Thumbnail Cache
+
+Thumbnails for indexed assets are rendered in a process pool and kept on
+disk under UserData/cache/thumbnails, addressed by the file's content hash
+(files.content_hash). A renamed, moved or copied file therefore reuses its
+thumbnails, and an edited file gets new ones.
+
+One decode produces every configured size. For JPEGs, Image.draft() makes
+the decoder downscale during decoding (by 1/2 to 1/8), so a 6000 px photo
+is never decoded at full resolution. Each smaller size is reduced from the
+previous one.
+
+The cache is capped by size. The least recently used thumbnails are
+deleted first. Use is tracked in memory and written to the files'
+modification times, so the order survives restarts.
+
+    python -m App.core.assets._thumbnail_cache            # pre-render all indexed images
+    python -m App.core.assets._thumbnail_cache --benchmark 200
+"""
+import os
+import sys
+import json
+import time
+import sqlite3
+import logging
+import argparse
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, Future
+from PIL import Image, ImageOps
+
+if __package__ in (None, ''):
+    sys.path.insert(0, str(Path(__file__).parents[3]))
+
+DEFAULT_SIZES = (128, 256, 512)
+DEFAULT_CACHE_MB = 256
+JPEG_QUALITY = 85
+# Formats Pillow opens without external tools
+IMAGE_TYPES = ('jpg', 'png', 'gif', 'tiff', 'webp', 'bmp', 'psd')
+# Evict down to this share of the cap, so one new thumbnail does not evict every time
+EVICT_TARGET = 0.9
+
+
+def _get_config():
+    base_dir = str(Path(__file__).parents[3])  # Go up 3 levels from this file
+    with open(os.path.join(base_dir, 'App', 'config', 'config.json'), 'r', encoding='utf-8') as f:
+        return base_dir, json.load(f)
+
+
+def thumbnail_path(cache_dir, content_hash, size):
+    """Where the thumbnail of a given size for some content is stored."""
+    return os.path.join(cache_dir, content_hash[:2], f"{content_hash}_{size}.jpg")
+
+
+def render_thumbnails(source_path, content_hash, sizes, cache_dir):
+    """
+    Decode an image once and write a thumbnail for every size (runs in the worker processes).
+
+    Args:
+        source_path (str): Image file
+        content_hash (str): Its content hash, which names the thumbnails
+        sizes (tuple): Longest side of each thumbnail in pixels
+        cache_dir (str): Cache root
+
+    Returns:
+        tuple: ({size: (path, bytes)}, error); error is None on success
+    """
+    written = {}
+    try:
+        with Image.open(source_path) as img:
+            # JPEG only: decode at the smallest 1/n scale still covering the largest size
+            img.draft('RGB', (max(sizes), max(sizes)))
+            img = ImageOps.exif_transpose(img)
+            if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
+                rgba = img.convert('RGBA')
+                img = Image.new('RGB', rgba.size, (255, 255, 255))
+                img.paste(rgba, mask=rgba.getchannel('A'))
+            elif img.mode != 'RGB':
+                img = img.convert('RGB')
+
+            os.makedirs(os.path.dirname(thumbnail_path(cache_dir, content_hash, 0)), exist_ok=True)
+            for size in sorted(sizes, reverse=True):
+                img.thumbnail((size, size), Image.Resampling.LANCZOS, reducing_gap=2.0)
+                path = thumbnail_path(cache_dir, content_hash, size)
+                temp_path = f"{path}.{os.getpid()}.tmp"
+                img.save(temp_path, 'JPEG', quality=JPEG_QUALITY, optimize=True)
+                os.replace(temp_path, path)
+                written[size] = (path, os.path.getsize(path))
+        return written, None
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        return written, str(e)
+
+
+class ThumbnailCache:
+    """
+    Size-capped, content-addressed thumbnail store with a rendering pool.
+
+    Safe to use from several threads.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None, sizes=None, workers=None):
+        """
+        Args:
+            cache_dir (str, optional): Cache root; defaults to UserData/cache/thumbnails
+            max_bytes (int, optional): Size cap; defaults to assets.thumbnail_cache_mb
+            sizes (tuple, optional): Thumbnail sizes; defaults to assets.thumbnail_sizes
+            workers (int, optional): Rendering processes; defaults to assets.workers or the CPU count
+        """
+        self.logger = logging.getLogger('main')
+        base_dir, config = _get_config()
+        settings = config.get('assets', {})
+        self.cache_dir = cache_dir or os.path.join(base_dir, 'UserData', 'cache', 'thumbnails')
+        self.max_bytes = max_bytes or settings.get('thumbnail_cache_mb', DEFAULT_CACHE_MB) * 1024 * 1024
+        self.sizes = tuple(sorted(sizes or settings.get('thumbnail_sizes') or DEFAULT_SIZES))
+        self.workers = workers or settings.get('workers') or os.cpu_count() or 1
+
+        self._lock = threading.Lock()
+        self._entries = None  # (content_hash, size) -> bytes, least recently used first
+        self._total = 0
+        self._touched = set()
+        self._pending = {}  # content_hash -> Future
+        self._failed = {}  # content_hash -> error
+        self._pool = None
+
+    def _load_index(self):
+        """Build the LRU order from the files on disk (oldest modification time first)."""
+        found = []
+        try:
+            with os.scandir(self.cache_dir) as buckets:
+                for bucket in buckets:
+                    if not bucket.is_dir():
+                        continue
+                    with os.scandir(bucket.path) as entries:
+                        for entry in entries:
+                            stem, ext = os.path.splitext(entry.name)
+                            content_hash, _, size = stem.rpartition('_')
+                            if ext != '.jpg' or not size.isdigit():
+                                continue
+                            stat = entry.stat()
+                            found.append((stat.st_mtime_ns, (content_hash, int(size)), stat.st_size))
+        except FileNotFoundError:
+            pass
+        found.sort()
+        self._entries = OrderedDict((key, size) for _, key, size in found)
+        self._total = sum(self._entries.values())
+
+    def target_size(self, size):
+        """The smallest configured size at least as large as the requested one."""
+        for candidate in self.sizes:
+            if candidate >= size:
+                return candidate
+        return self.sizes[-1]
+
+    def get(self, content_hash, size):
+        """
+        Find a cached thumbnail for display at a size.
+
+        Args:
+            content_hash (str): files.content_hash of the image
+            size (int): Longest side the view wants, in pixels
+
+        Returns:
+            str: Path of the thumbnail (possibly a larger size), or None if it needs rendering
+        """
+        with self._lock:
+            if self._entries is None:
+                self._load_index()
+            wanted = self.target_size(size)
+            for candidate in self.sizes:
+                key = (content_hash, candidate)
+                if candidate >= wanted and key in self._entries:
+                    self._entries.move_to_end(key)
+                    path = thumbnail_path(self.cache_dir, content_hash, candidate)
+                    touch = key not in self._touched
+                    self._touched.add(key)
+                    break
+            else:
+                return None
+        if touch:
+            # Persist the use for the next session; once per session is enough
+            try:
+                os.utime(path)
+            except OSError:
+                self.forget(content_hash)
+                return None
+        return path
+
+    def failure(self, content_hash):
+        """Why rendering this content failed in this session, or None."""
+        return self._failed.get(content_hash)
+
+    def render(self, source_path, content_hash):
+        """
+        Render all sizes for an image in the pool.
+
+        Concurrent requests for the same content share one render.
+
+        Args:
+            source_path (str): Image file
+            content_hash (str): Its content hash
+
+        Returns:
+            concurrent.futures.Future: Resolves to the error string, or None on success
+        """
+        with self._lock:
+            future = self._pending.get(content_hash)
+            if future is not None:
+                return future
+            if content_hash in self._failed:
+                future = Future()
+                future.set_result(self._failed[content_hash])
+                return future
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            future = Future()
+            self._pending[content_hash] = future
+
+        work = self._pool.submit(render_thumbnails, source_path, content_hash, self.sizes, self.cache_dir)
+        work.add_done_callback(lambda done: self._rendered(content_hash, future, done))
+        return future
+
+    def _rendered(self, content_hash, future, done):
+        try:
+            written, error = done.result()
+        except Exception as e:  # The worker process died
+            written, error = {}, str(e)
+        with self._lock:
+            if self._entries is None:
+                self._load_index()
+            for size, (_, nbytes) in written.items():
+                key = (content_hash, size)
+                self._total += nbytes - self._entries.get(key, 0)
+                self._entries[key] = nbytes
+                self._entries.move_to_end(key)
+                self._touched.add(key)
+            if error:
+                self._failed[content_hash] = error
+            del self._pending[content_hash]
+            evicted = self._evict()
+        for key in evicted:
+            try:
+                os.remove(thumbnail_path(self.cache_dir, *key))
+            except OSError:
+                pass
+        if error:
+            self.logger.warning(f"Could not render thumbnails for {content_hash}: {error}")
+        future.set_result(error)
+
+    def _evict(self):
+        """Drop least recently used entries until under the cap; call with the lock held."""
+        evicted = []
+        if self._total <= self.max_bytes:
+            return evicted
+        while self._entries and self._total > self.max_bytes * EVICT_TARGET:
+            key, nbytes = self._entries.popitem(last=False)
+            self._total -= nbytes
+            self._touched.discard(key)
+            evicted.append(key)
+        return evicted
+
+    def forget(self, content_hash):
+        """Drop an entry whose files were removed behind the cache's back."""
+        with self._lock:
+            if self._entries is None:
+                return
+            for size in self.sizes:
+                self._total -= self._entries.pop((content_hash, size), 0)
+                self._touched.discard((content_hash, size))
+
+    def usage(self):
+        """Return (bytes used, entry count)."""
+        with self._lock:
+            if self._entries is None:
+                self._load_index()
+            return self._total, len(self._entries)
+
+    def close(self):
+        """Stop the rendering processes."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def prerender(db_path=None, cache=None):
+    """
+    Render thumbnails for every indexed image that has none yet.
+
+    Args:
+        db_path (str, optional): Database file; defaults to the configured database
+        cache (ThumbnailCache, optional): Cache to fill; defaults to the configured one
+
+    Returns:
+        dict: 'rendered', 'cached' and 'failed' counts and 'elapsed' seconds
+    """
+    start = time.perf_counter()
+    if db_path is None:
+        base_dir, config = _get_config()
+        db_path = config['database']['path']
+        if not os.path.isabs(db_path):
+            db_path = os.path.join(base_dir, db_path)
+    cache = cache or ThumbnailCache()
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute(f"""
+        SELECT original_path, MIN(content_hash) FROM files
+        WHERE content_hash IS NOT NULL AND file_type IN ({', '.join('?' * len(IMAGE_TYPES))})
+        GROUP BY content_hash
+        """, IMAGE_TYPES).fetchall()
+    finally:
+        conn.close()
+
+    report = {'rendered': 0, 'cached': 0, 'failed': 0, 'elapsed': 0.0}
+    futures = []
+    for path, content_hash in rows:
+        if cache.get(content_hash, cache.sizes[-1]):
+            report['cached'] += 1
+        else:
+            futures.append(cache.render(path, content_hash))
+    for future in futures:
+        report['failed' if future.result() else 'rendered'] += 1
+    report['elapsed'] = time.perf_counter() - start
+    return report
+
+
+def _benchmark_thumbnails(images=200):
+    """Compare draft-mode pool rendering against a full decode and resize per size."""
+    import shutil
+    import random
+    import tempfile
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        rng = random.Random(1)
+        sources = []
+        base = Image.effect_noise((4000, 3000), 64).convert('RGB')
+        for i in range(images):
+            path = os.path.join(temp_dir, f"IMG_{i:04d}.jpg")
+            base.rotate(rng.randint(0, 359)).save(path, 'JPEG', quality=90)
+            sources.append((path, f"{i:040x}"))
+
+        cache = ThumbnailCache(os.path.join(temp_dir, 'cache'), max_bytes=1 << 30)
+        start = time.perf_counter()
+        for future in [cache.render(path, content_hash) for path, content_hash in sources]:
+            future.result()
+        pooled = time.perf_counter() - start
+        cache.close()
+
+        # What save_profile_image-style resizing costs: full decode, one resize per size
+        naive_dir = os.path.join(temp_dir, 'naive')
+        os.makedirs(naive_dir)
+        start = time.perf_counter()
+        for path, content_hash in sources:
+            for size in cache.sizes:
+                with Image.open(path) as img:
+                    img = img.convert('RGB')
+                    scale = size / max(img.size)
+                    img = img.resize((round(img.width * scale), round(img.height * scale)), Image.LANCZOS)
+                    img.save(os.path.join(naive_dir, f"{content_hash}_{size}.jpg"), 'JPEG', quality=JPEG_QUALITY)
+        naive = time.perf_counter() - start
+
+        used, count = cache.usage()
+        print(f"Thumbnails for {images} 4000x3000 JPEGs, sizes {cache.sizes}, {cache.workers} workers")
+        print(f"  draft + pool : {pooled:.2f}s ({images / pooled:,.1f} images/s)")
+        print(f"  full decode  : {naive:.2f}s ({images / naive:,.1f} images/s)")
+        print(f"  cache        : {count} thumbnails, {used / 1024:,.0f} KiB")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render thumbnails for indexed images")
+    parser.add_argument('--benchmark', type=int, metavar='N', help="Benchmark with N generated photos")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        _benchmark_thumbnails(args.benchmark)
+        return 0
+
+    cache = ThumbnailCache()
+    try:
+        report = prerender(cache=cache)
+    finally:
+        cache.close()
+    used, count = cache.usage()
+    print(f"{report['rendered']} rendered, {report['cached']} already cached, {report['failed']} failed "
+          f"in {report['elapsed']:.2f}s")
+    print(f"Cache: {count} thumbnails, {used / 1024 / 1024:,.1f} MiB of {cache.max_bytes / 1024 / 1024:,.0f} MiB")
+    return 1 if report['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,7 @@ import sqlite3
 import json
 import logging
 import hashlib
+import secrets
 from pathlib import Path
 
 class DatabaseMigration:
@@ -24,7 +25,7 @@ class DatabaseMigration:
             app_instance: The application instance with BASE_DIR attribute
         """
         self.app = app_instance
-        self.logger = logging.getLogger('main')  # Use main logger instead of separate one
+        self.logger = logging.getLogger('main.database')
         
         # Get database path from config
         if self.app and hasattr(self.app, 'BASE_DIR'):
@@ -83,19 +84,13 @@ class DatabaseMigration:
     def _connect_db(self):
         """Connect to the SQLite database."""
         try:
-            # Print database path to console for debugging
-            print(f"Connecting to database: {self.db_path}")
+            self.logger.debug("Connecting to database: %s", self.db_path)
             
             self.conn = sqlite3.connect(self.db_path)
             self.conn.row_factory = sqlite3.Row  # Use dictionary-like rows
-            
-            # Print connection status
-            print(f"Database connection successful: {self.db_path}")
             return True
         except sqlite3.Error as e:
-            self.logger.error(f"Database error: {e}")
-            print(f"Database connection failed: {self.db_path}")
-            print(f"Error: {e}")
+            self.logger.error("Database connection failed: %s (%s)", self.db_path, e)
             return False
     
     def _close_db(self):
@@ -141,6 +136,7 @@ class DatabaseMigration:
                 bank_account_holder TEXT,
                 role TEXT NOT NULL,
                 attendance_pin TEXT,
+                attendance_pin_hash TEXT,
                 profile_image TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 last_login TIMESTAMP
@@ -236,6 +232,25 @@ class DatabaseMigration:
             )
             """)
             
+            # Per-user history, newest first (keyset paging and open-record lookups)
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_user_attendance_user_date
+            ON user_attendance (user_id, full_date DESC, id DESC)
+            """)
+            
+            # Only open check-ins, so "who's in now" never scans closed history
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_user_attendance_open
+            ON user_attendance (user_id, check_in_datetime)
+            WHERE check_in_time IS NOT NULL AND check_out_time IS NULL
+            """)
+            
+            # Change feed for incremental exports (sheet sync watermark)
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_user_attendance_updated
+            ON user_attendance (updated_at, id)
+            """)
+            
             # Create attendance_status table for tracking attendance statuses
             cursor.execute("""
             CREATE TABLE IF NOT EXISTS attendance_status (
@@ -295,6 +310,414 @@ class DatabaseMigration:
             self.logger.error(f"Error creating default admin: {e}")
             return False
     
+    def _migrate_attendance_pins(self):
+        """
+        Move attendance PINs to unique, indexed hashes for kiosk lookups.
+        
+        Adds users.attendance_pin_hash to older databases, creates the PIN key
+        and version settings, hashes legacy plaintext PINs (duplicates are left
+        as-is and logged, since a PIN must identify exactly one employee), then
+        adds the unique index and the triggers that bump attendance_pin_version
+        whenever a PIN or account status changes.
+        """
+        from ._db_user_attendance import hash_attendance_pin
+        
+        try:
+            cursor = self.conn.cursor()
+            
+            cursor.execute("PRAGMA table_info(users)")
+            columns = {row['name'] for row in cursor.fetchall()}
+            if 'attendance_pin_hash' not in columns:
+                cursor.execute("ALTER TABLE users ADD COLUMN attendance_pin_hash TEXT")
+                self.logger.info("Added attendance_pin_hash column to users")
+            
+            cursor.execute(
+                "INSERT OR IGNORE INTO app_settings (key, value) VALUES ('attendance_pin_key', ?)",
+                (secrets.token_hex(32),)
+            )
+            cursor.execute(
+                "INSERT OR IGNORE INTO app_settings (key, value) VALUES ('attendance_pin_version', '0')"
+            )
+            cursor.execute("SELECT value FROM app_settings WHERE key = 'attendance_pin_key'")
+            pin_key = cursor.fetchone()['value']
+            
+            cursor.execute("SELECT attendance_pin_hash FROM users WHERE attendance_pin_hash IS NOT NULL")
+            used_hashes = {row['attendance_pin_hash'] for row in cursor.fetchall()}
+            cursor.execute(
+                "SELECT id, attendance_pin FROM users "
+                "WHERE attendance_pin IS NOT NULL AND attendance_pin != '' AND attendance_pin_hash IS NULL"
+            )
+            for row in cursor.fetchall():
+                pin_hash = hash_attendance_pin(row['attendance_pin'], pin_key)
+                if pin_hash in used_hashes:
+                    self.logger.warning(f"User {row['id']} shares an attendance PIN; reset it to use kiosk mode")
+                    continue
+                used_hashes.add(pin_hash)
+                cursor.execute(
+                    "UPDATE users SET attendance_pin_hash = ?, attendance_pin = NULL WHERE id = ?",
+                    (pin_hash, row['id'])
+                )
+            
+            cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_users_attendance_pin_hash
+            ON users (attendance_pin_hash) WHERE attendance_pin_hash IS NOT NULL
+            """)
+            
+            bump_version = """
+                UPDATE app_settings
+                SET value = CAST(value AS INTEGER) + 1, updated_at = CURRENT_TIMESTAMP
+                WHERE key = 'attendance_pin_version';
+            """
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_users_pin_version_insert
+            AFTER INSERT ON users WHEN NEW.attendance_pin_hash IS NOT NULL
+            BEGIN {bump_version} END
+            """)
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_users_pin_version_update
+            AFTER UPDATE OF attendance_pin_hash, is_active, is_deleted, fullname, department, profile_image ON users
+            BEGIN {bump_version} END
+            """)
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_users_pin_version_delete
+            AFTER DELETE ON users WHEN OLD.attendance_pin_hash IS NOT NULL
+            BEGIN {bump_version} END
+            """)
+            
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error migrating attendance PINs: {e}")
+            return False
+    
+    def _create_user_directory(self):
+        """
+        Create the full-text user directory used by UserDirectoryDB.
+        
+        users_fts is an external-content FTS5 index over users (no second copy
+        of the data) kept in sync by triggers. It is rebuilt once when first
+        created. SQLite builds without FTS5 skip this; the directory then falls
+        back to LIKE searches.
+        """
+        try:
+            cursor = self.conn.cursor()
+            
+            # Plain listing of the directory is ordered by name
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_fullname ON users (fullname COLLATE NOCASE)")
+            
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users_fts'")
+            exists = cursor.fetchone() is not None
+            
+            try:
+                cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5(
+                    fullname, username, email, department, phone_number,
+                    content='users', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                )
+                """)
+            except sqlite3.OperationalError as e:
+                self.logger.warning(f"FTS5 unavailable, user directory will use LIKE search: {e}")
+                self.conn.rollback()
+                return True
+            
+            columns = "fullname, username, email, department, phone_number"
+            new_values = "NEW.fullname, NEW.username, NEW.email, NEW.department, NEW.phone_number"
+            old_values = "OLD.fullname, OLD.username, OLD.email, OLD.department, OLD.phone_number"
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_users_fts_insert AFTER INSERT ON users
+            BEGIN
+                INSERT INTO users_fts (rowid, {columns}) VALUES (NEW.id, {new_values});
+            END
+            """)
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_users_fts_delete AFTER DELETE ON users
+            BEGIN
+                INSERT INTO users_fts (users_fts, rowid, {columns}) VALUES ('delete', OLD.id, {old_values});
+            END
+            """)
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_users_fts_update
+            AFTER UPDATE OF {columns} ON users
+            BEGIN
+                INSERT INTO users_fts (users_fts, rowid, {columns}) VALUES ('delete', OLD.id, {old_values});
+                INSERT INTO users_fts (rowid, {columns}) VALUES (NEW.id, {new_values});
+            END
+            """)
+            
+            if not exists:
+                cursor.execute("INSERT INTO users_fts (users_fts) VALUES ('rebuild')")
+                self.logger.info("Built full-text user directory")
+            
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error creating user directory: {e}")
+            return False
+    
+    def _create_changelog(self):
+        """
+        Capture changes to replicated tables for multi-office merging.
+        
+        changelog keeps one compact row per changed record (table, key,
+        insert/update or delete, a millisecond version timestamp and the
+        branch the change came from), written by triggers. Every change
+        gives the row a new seq, so exports only read rows above the last
+        exported seq. Existing rows are captured once when the changelog is
+        created, so the first export carries the full state. Settings that
+        only make sense locally (PIN key, watermarks, replication state) are
+        not captured. See App.core.database._db_replication.
+        """
+        try:
+            cursor = self.conn.cursor()
+            
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'changelog'")
+            exists = cursor.fetchone() is not None
+            
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS changelog (
+                table_name TEXT NOT NULL,
+                row_key TEXT NOT NULL,
+                op TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                updated_at TEXT NOT NULL,
+                origin TEXT,
+                PRIMARY KEY (table_name, row_key)
+            ) WITHOUT ROWID
+            """)
+            cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_changelog_seq ON changelog (seq)")
+            
+            # Attendance ids differ per office; merged rows remember their global key
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS replication_attendance_keys (
+                global_key TEXT PRIMARY KEY,
+                local_id INTEGER UNIQUE NOT NULL
+            )
+            """)
+            
+            cursor.execute(
+                "INSERT OR IGNORE INTO app_settings (key, value) VALUES ('replication_branch_id', ?)",
+                (secrets.token_hex(6),)
+            )
+            
+            # Upsert the captured key with the next seq. The SELECT needs a WHERE
+            # clause so SQLite can parse the ON CONFLICT that follows it.
+            capture = """
+                INSERT INTO changelog (table_name, row_key, op, seq, updated_at, origin)
+                SELECT '{table}', {key}, '{op}', (SELECT IFNULL(MAX(seq), 0) + 1 FROM changelog),
+                       strftime('%Y-%m-%d %H:%M:%f', 'now'), NULL
+                WHERE {where}
+                ON CONFLICT (table_name, row_key) DO UPDATE SET
+                    op = excluded.op, seq = excluded.seq, updated_at = excluded.updated_at, origin = NULL;
+            """
+            local_setting = ("{row}.key NOT IN ('attendance_pin_key', 'attendance_pin_version') "
+                             "AND substr({row}.key, 1, 12) != 'replication_' "
+                             "AND substr({row}.key, 1, 11) != 'sheet_sync_'")
+            tables = {
+                # table: (row key expression, which rows are replicated)
+                'users': ("{row}.username", "1"),
+                'departments': ("{row}.name", "1"),
+                'app_settings': ("{row}.key", local_setting),
+                'user_attendance': ("CAST({row}.id AS TEXT)", "1"),
+            }
+            for table, (key, replicated) in tables.items():
+                new_key, old_key = key.format(row='NEW'), key.format(row='OLD')
+                new_ok, old_ok = replicated.format(row='NEW'), replicated.format(row='OLD')
+                cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_changelog_insert AFTER INSERT ON {table}
+                BEGIN {capture.format(table=table, key=new_key, op='U', where=new_ok)} END
+                """)
+                # A renamed key is a delete of the old key plus a write of the new one
+                cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_changelog_update AFTER UPDATE ON {table}
+                BEGIN
+                    {capture.format(table=table, key=old_key, op='D', where=f"{old_ok} AND {old_key} IS NOT {new_key}")}
+                    {capture.format(table=table, key=new_key, op='U', where=new_ok)}
+                END
+                """)
+                cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_changelog_delete AFTER DELETE ON {table}
+                BEGIN {capture.format(table=table, key=old_key, op='D', where=old_ok)} END
+                """)
+            
+            if not exists:
+                for table, (key, replicated) in tables.items():
+                    row_key, condition = key.format(row=table), replicated.format(row=table)
+                    cursor.execute(f"""
+                    INSERT OR IGNORE INTO changelog (table_name, row_key, op, seq, updated_at, origin)
+                    SELECT '{table}', {row_key}, 'U',
+                           (SELECT IFNULL(MAX(seq), 0) FROM changelog) + ROW_NUMBER() OVER (),
+                           strftime('%Y-%m-%d %H:%M:%f', 'now'), NULL
+                    FROM {table} WHERE {condition}
+                    """)
+                self.logger.info("Created replication changelog")
+            
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error creating changelog: {e}")
+            return False
+    
+    def _create_asset_index(self):
+        """
+        Prepare the files table for the asset indexer.
+        
+        Adds the modification time (nanoseconds) and content hash columns
+        that rescans compare against, a unique index on the path so
+        batches can upsert, and an index on the hash for finding copies.
+        See App.core.assets.
+        """
+        try:
+            cursor = self.conn.cursor()
+            
+            cursor.execute("PRAGMA table_info(files)")
+            columns = {row['name'] for row in cursor.fetchall()}
+            for column, definition in (('mtime_ns', 'INTEGER'), ('content_hash', 'TEXT')):
+                if column not in columns:
+                    cursor.execute(f"ALTER TABLE files ADD COLUMN {column} {definition}")
+                    self.logger.info(f"Added {column} column to files")
+            
+            cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_files_original_path ON files (original_path)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_files_content_hash ON files (content_hash)")
+            
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error creating asset index: {e}")
+            return False
+    
+    def _create_asset_metadata(self):
+        """
+        Create the tables filled by the asset metadata extractor.
+        
+        asset_metadata holds one row of normalized EXIF/IPTC/XMP fields per
+        file, with its keywords also in asset_keywords for exact keyword
+        lookups. asset_metadata_fts is an external-content FTS5 index over
+        titles, keywords and descriptions, kept in sync by triggers like
+        users_fts. Rows follow their file when the indexer removes it.
+        """
+        try:
+            cursor = self.conn.cursor()
+            
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS asset_metadata (
+                file_id INTEGER PRIMARY KEY,
+                content_hash TEXT,
+                title TEXT,
+                description TEXT,
+                keywords TEXT,
+                creator TEXT,
+                copyright TEXT,
+                width INTEGER,
+                height INTEGER,
+                camera_make TEXT,
+                camera_model TEXT,
+                taken_at TEXT,
+                extracted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (file_id) REFERENCES files (id)
+            )
+            """)
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS asset_keywords (
+                keyword TEXT NOT NULL COLLATE NOCASE,
+                file_id INTEGER NOT NULL,
+                PRIMARY KEY (keyword, file_id)
+            ) WITHOUT ROWID
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_asset_keywords_file ON asset_keywords (file_id)")
+            cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_files_metadata_delete AFTER DELETE ON files
+            BEGIN
+                DELETE FROM asset_keywords WHERE file_id = OLD.id;
+                DELETE FROM asset_metadata WHERE file_id = OLD.id;
+            END
+            """)
+            
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'asset_metadata_fts'")
+            exists = cursor.fetchone() is not None
+            
+            try:
+                cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS asset_metadata_fts USING fts5(
+                    title, keywords, description,
+                    content='asset_metadata', content_rowid='file_id',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                )
+                """)
+            except sqlite3.OperationalError as e:
+                self.logger.warning(f"FTS5 unavailable, asset search will use LIKE search: {e}")
+                self.conn.commit()
+                return True
+            
+            columns = "title, keywords, description"
+            new_values = "NEW.title, NEW.keywords, NEW.description"
+            old_values = "OLD.title, OLD.keywords, OLD.description"
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_asset_metadata_fts_insert AFTER INSERT ON asset_metadata
+            BEGIN
+                INSERT INTO asset_metadata_fts (rowid, {columns}) VALUES (NEW.file_id, {new_values});
+            END
+            """)
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_asset_metadata_fts_delete AFTER DELETE ON asset_metadata
+            BEGIN
+                INSERT INTO asset_metadata_fts (asset_metadata_fts, rowid, {columns})
+                VALUES ('delete', OLD.file_id, {old_values});
+            END
+            """)
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_asset_metadata_fts_update
+            AFTER UPDATE OF {columns} ON asset_metadata
+            BEGIN
+                INSERT INTO asset_metadata_fts (asset_metadata_fts, rowid, {columns})
+                VALUES ('delete', OLD.file_id, {old_values});
+                INSERT INTO asset_metadata_fts (rowid, {columns}) VALUES (NEW.file_id, {new_values});
+            END
+            """)
+            
+            if not exists:
+                cursor.execute("INSERT INTO asset_metadata_fts (asset_metadata_fts) VALUES ('rebuild')")
+            
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error creating asset metadata tables: {e}")
+            return False
+    
+    def _create_asset_hashes(self):
+        """
+        Create the perceptual hash table used for near-duplicate detection.
+        
+        One row per image file with its 64-bit dHash and pHash (stored as
+        signed integers) and the content hash they were computed from, so
+        only new or changed files are hashed again. Rows follow their file
+        when the indexer removes it.
+        """
+        try:
+            cursor = self.conn.cursor()
+            
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS asset_hashes (
+                file_id INTEGER PRIMARY KEY,
+                content_hash TEXT,
+                dhash INTEGER,
+                phash INTEGER,
+                FOREIGN KEY (file_id) REFERENCES files (id)
+            )
+            """)
+            cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_files_hashes_delete AFTER DELETE ON files
+            BEGIN
+                DELETE FROM asset_hashes WHERE file_id = OLD.id;
+            END
+            """)
+            
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error creating asset hashes table: {e}")
+            return False
+    
     def run_migrations(self):
         """Run database migrations to create tables and initialize data if needed."""
         if not self._connect_db():
@@ -336,6 +759,24 @@ class DatabaseMigration:
                     if not self._ensure_default_admin():
                         self.logger.error("Failed to create default admin user")
                 
+                if not self._migrate_attendance_pins():
+                    self.logger.error("Failed to migrate attendance PINs")
+                
+                if not self._create_user_directory():
+                    self.logger.error("Failed to create user directory")
+                
+                if not self._create_changelog():
+                    self.logger.error("Failed to create replication changelog")
+                
+                if not self._create_asset_index():
+                    self.logger.error("Failed to create asset index")
+                
+                if not self._create_asset_metadata():
+                    self.logger.error("Failed to create asset metadata tables")
+                
+                if not self._create_asset_hashes():
+                    self.logger.error("Failed to create asset hashes table")
+                
                 return "updated"  # Indicate that the database was updated
             else:
                 # All tables exist, just ensure they're up to date
@@ -345,6 +786,24 @@ class DatabaseMigration:
                 # Always check if default admin exists, even for existing databases
                 if not self._ensure_default_admin():
                     self.logger.error("Failed to create default admin user")
+                
+                if not self._migrate_attendance_pins():
+                    self.logger.error("Failed to migrate attendance PINs")
+                
+                if not self._create_user_directory():
+                    self.logger.error("Failed to create user directory")
+                
+                if not self._create_changelog():
+                    self.logger.error("Failed to create replication changelog")
+                
+                if not self._create_asset_index():
+                    self.logger.error("Failed to create asset index")
+                
+                if not self._create_asset_metadata():
+                    self.logger.error("Failed to create asset metadata tables")
+                
+                if not self._create_asset_hashes():
+                    self.logger.error("Failed to create asset hashes table")
             
             return "exists" if db_exists else "created"
         
@@ -0,0 +1,577 @@
+"""
+Branch Office Replication
+
+Each office runs its own database. Triggers record every change to users,
+user_attendance, departments and app_settings in the changelog table (see
+DatabaseMigration._create_changelog): one row per changed record holding
+its key, whether it was written or deleted, a millisecond version timestamp
+and a sequence number.
+
+ChangelogExporter writes the entries changed since the previous export,
+together with the current row contents, to a gzip-compressed JSON Lines
+segment file. ChangelogMerger applies segments to another database (usually
+the central one) in a single transaction:
+
+- Rows are matched on natural keys (username, department name, setting
+  key). Attendance ids differ per office, so attendance rows travel with a
+  global "<branch>:<id>" key and the user's username.
+- Conflicts are resolved last-writer-wins on the changelog version
+  timestamp, with the branch id breaking ties. users has no updated_at
+  column, so the version is taken from the changelog rather than the rows.
+- Applying a change stamps the local changelog entry with the incoming
+  version, so merging the same segment again, or an older one, changes
+  nothing.
+
+    python -m App.core.database._db_replication export --out outbox/
+    python -m App.core.database._db_replication merge inbox/*.jsonl.gz
+    python -m App.core.database._db_replication --benchmark 2000
+"""
+import os
+import sys
+import json
+import gzip
+import time
+import sqlite3
+import logging
+import argparse
+import datetime
+from pathlib import Path
+
+if __package__ in (None, ''):
+    sys.path.insert(0, str(Path(__file__).parents[3]))
+
+SEGMENT_FORMAT = 'desainia-changelog'
+SEGMENT_VERSION = 1
+
+# Parents before children: attendance rows need their user
+REPLICATED_TABLES = ('departments', 'users', 'app_settings', 'user_attendance')
+NATURAL_KEYS = {'departments': 'name', 'users': 'username', 'app_settings': 'key'}
+# PIN hashes depend on the office's own attendance_pin_key
+LOCAL_COLUMNS = {'id', 'attendance_pin', 'attendance_pin_hash'}
+
+EXPORT_SEQ_KEY = 'replication_export_seq'
+MERGED_SEQ_KEY = 'replication_merged:{branch}'
+
+
+def _get_db_path():
+    """Get database path from config."""
+    base_dir = str(Path(__file__).parents[3])  # Go up 3 levels from this file
+    with open(os.path.join(base_dir, 'App', 'config', 'config.json'), 'r', encoding='utf-8') as f:
+        db_path = json.load(f)['database']['path']
+    if not os.path.isabs(db_path):
+        db_path = os.path.join(base_dir, db_path)
+    return db_path
+
+
+def _connect(db_path):
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA busy_timeout=10000")
+    return conn
+
+
+def _get_setting(cursor, key, default=None):
+    cursor.execute("SELECT value FROM app_settings WHERE key = ?", (key,))
+    row = cursor.fetchone()
+    return row[0] if row else default
+
+
+def _set_setting(cursor, key, value):
+    cursor.execute("""
+    INSERT INTO app_settings (key, value) VALUES (?, ?)
+    ON CONFLICT (key) DO UPDATE SET value = excluded.value, updated_at = CURRENT_TIMESTAMP
+    """, (key, str(value)))
+
+
+def read_segment(path):
+    """
+    Read a segment file.
+
+    Args:
+        path (str): Segment written by ChangelogExporter
+
+    Returns:
+        tuple: (header dict, list of change dicts)
+
+    Raises:
+        ValueError: If the file is not a changelog segment
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        header = json.loads(f.readline() or 'null')
+        if not isinstance(header, dict) or header.get('format') != SEGMENT_FORMAT:
+            raise ValueError("not a changelog segment")
+        if header.get('version') != SEGMENT_VERSION:
+            raise ValueError(f"unsupported segment version {header.get('version')}")
+        return header, [json.loads(line) for line in f if line.strip()]
+
+
+class ChangelogExporter:
+    """
+    Writes local changes since the last export to segment files.
+    """
+
+    def __init__(self, db_path=None):
+        """
+        Args:
+            db_path (str, optional): Database file; defaults to the configured database
+        """
+        self.logger = logging.getLogger('main.database')
+        self.db_path = db_path or _get_db_path()
+
+    def export(self, out_dir, include_remote=False):
+        """
+        Export the changes made since the previous export.
+
+        Args:
+            out_dir (str): Directory for the segment file
+            include_remote (bool, optional): Also forward changes merged from other
+                offices, e.g. when the central office redistributes. Defaults to False.
+
+        Returns:
+            str: Path of the new segment, or None if there was nothing to export
+                 or a database error occurred
+        """
+        conn = None
+        try:
+            conn = _connect(self.db_path)
+            cursor = conn.cursor()
+            # One read transaction, so the rows match the changelog entries
+            cursor.execute("BEGIN")
+            branch = _get_setting(cursor, 'replication_branch_id')
+            from_seq = int(_get_setting(cursor, EXPORT_SEQ_KEY, 0)) + 1
+
+            origin_filter = "" if include_remote else "AND origin IS NULL"
+            cursor.execute(f"""
+            SELECT table_name, row_key, op, seq, updated_at, origin
+            FROM changelog WHERE seq >= ? {origin_filter}
+            ORDER BY seq
+            """, (from_seq,))
+            entries = cursor.fetchall()
+            if not entries:
+                cursor.execute("ROLLBACK")
+                return None
+            to_seq = entries[-1]['seq']
+
+            os.makedirs(out_dir, exist_ok=True)
+            path = os.path.join(out_dir, f"{branch}-{from_seq:010d}-{to_seq:010d}.jsonl.gz")
+            temp_path = path + '.tmp'
+            with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+                header = {
+                    'format': SEGMENT_FORMAT,
+                    'version': SEGMENT_VERSION,
+                    'branch': branch,
+                    'from_seq': from_seq,
+                    'to_seq': to_seq,
+                    'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+                }
+                f.write(json.dumps(header) + '\n')
+                for entry in entries:
+                    change = self._read_change(cursor, branch, entry)
+                    f.write(json.dumps(change, default=str) + '\n')
+            cursor.execute("ROLLBACK")
+
+            # Only a complete file advances the watermark
+            os.replace(temp_path, path)
+            cursor.execute("BEGIN IMMEDIATE")
+            _set_setting(cursor, EXPORT_SEQ_KEY, to_seq)
+            cursor.execute("COMMIT")
+
+            self.logger.info(f"Exported {len(entries)} changes (seq {from_seq}-{to_seq}) to {path}")
+            return path
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error exporting changelog: {e}")
+            return None
+        finally:
+            if conn:
+                conn.close()
+
+    def _read_change(self, cursor, branch, entry):
+        """Build one segment line: the changelog entry plus the row as it is now."""
+        table = entry['table_name']
+        key = entry['row_key']
+        change = {
+            'table': table,
+            'key': key,
+            'op': entry['op'],
+            'updated_at': entry['updated_at'],
+            'origin': entry['origin'] or branch,
+            'row': None,
+        }
+
+        if table == 'user_attendance':
+            cursor.execute("SELECT global_key FROM replication_attendance_keys WHERE local_id = ?", (int(key),))
+            mapped = cursor.fetchone()
+            change['key'] = mapped[0] if mapped else f"{branch}:{key}"
+            cursor.execute("""
+            SELECT a.*, u.username FROM user_attendance a JOIN users u ON u.id = a.user_id
+            WHERE a.id = ?
+            """, (int(key),))
+        else:
+            cursor.execute(f"SELECT * FROM {table} WHERE {NATURAL_KEYS[table]} = ?", (key,))
+        row = cursor.fetchone()
+
+        if entry['op'] == 'U' and row is not None:
+            change['row'] = {column: row[column] for column in row.keys()
+                             if column not in LOCAL_COLUMNS and column != 'user_id'}
+        elif entry['op'] == 'U':
+            # Written and then removed within the same read; ship it as a delete
+            change['op'] = 'D'
+        return change
+
+
+class ChangelogMerger:
+    """
+    Applies segment files from other offices, last writer wins.
+    """
+
+    def __init__(self, db_path=None):
+        """
+        Args:
+            db_path (str, optional): Database file; defaults to the configured database
+        """
+        self.logger = logging.getLogger('main.database')
+        self.db_path = db_path or _get_db_path()
+        self._columns = {}
+
+    def merge_file(self, path):
+        """
+        Merge one segment file.
+
+        Args:
+            path (str): Segment written by ChangelogExporter
+
+        Returns:
+            dict: 'branch', 'applied', 'skipped' (entries whose local version was as new
+                  or newer), 'conflicts' (list of dicts with 'table', 'key' and 'reason'),
+                  'warnings' (list of str) and 'elapsed' seconds
+
+        Raises:
+            ValueError: If the file is not a changelog segment
+        """
+        header, changes = read_segment(path)
+        return self.merge(header, changes)
+
+    def merge(self, header, changes):
+        """Merge a segment's header and changes; see merge_file()."""
+        start = time.perf_counter()
+        branch = header['branch']
+        report = {'branch': branch, 'applied': 0, 'skipped': 0, 'conflicts': [], 'warnings': [],
+                  'elapsed': 0.0}
+        conn = _connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            self._local_branch = _get_setting(cursor, 'replication_branch_id')
+            if branch == self._local_branch:
+                cursor.execute("ROLLBACK")
+                report['warnings'].append("Segment was exported by this database; ignored")
+                return report
+
+            merged_key = MERGED_SEQ_KEY.format(branch=branch)
+            watermark = _get_setting(cursor, merged_key)
+            merged_seq = int(watermark or 0)
+            if header['to_seq'] <= merged_seq:
+                cursor.execute("ROLLBACK")
+                report['skipped'] = len(changes)
+                report['warnings'].append(f"Segment {header['from_seq']}-{header['to_seq']} already merged")
+                return report
+            # The first segment seen from a branch starts its history here, wherever
+            # its sequence numbers begin (e.g. after a re-seed or a late join)
+            if watermark is not None and header['from_seq'] > merged_seq + 1:
+                # Still safe to apply, but changes in the missing segment stay missing
+                report['warnings'].append(
+                    f"Missing changes {merged_seq + 1}-{header['from_seq'] - 1} from branch {branch}")
+
+            # Within a table, writes before deletes so renames can be matched up
+            order = {table: index for index, table in enumerate(REPLICATED_TABLES)}
+            changes = sorted((c for c in changes if c.get('table') in order),
+                             key=lambda c: (order[c['table']], c['op'] == 'D'))
+            renamed = {c['key'] for c in changes if c['table'] == 'users' and c['op'] == 'D'}
+
+            for change in changes:
+                cursor.execute("SAVEPOINT change")
+                try:
+                    self._apply(cursor, change, renamed, report)
+                    cursor.execute("RELEASE change")
+                except sqlite3.IntegrityError as e:
+                    cursor.execute("ROLLBACK TO change")
+                    cursor.execute("RELEASE change")
+                    report['conflicts'].append(self._conflict(change, f"Constraint failed: {e}"))
+
+            _set_setting(cursor, merged_key, max(merged_seq, header['to_seq']))
+            cursor.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            self.logger.error(f"Database error merging changelog from {branch}: {e}")
+            report['warnings'].append(f"Database error: {e}")
+            report['applied'] = 0
+        finally:
+            conn.close()
+
+        report['elapsed'] = time.perf_counter() - start
+        self.logger.info("Merged %d changes from %s (%d skipped, %d conflicts) in %.2fs",
+                         report['applied'], branch, report['skipped'], len(report['conflicts']),
+                         report['elapsed'])
+        return report
+
+    @staticmethod
+    def _conflict(change, reason):
+        return {'table': change['table'], 'key': change['key'], 'reason': reason}
+
+    def _table_columns(self, cursor, table):
+        if table not in self._columns:
+            cursor.execute(f"PRAGMA table_info({table})")
+            self._columns[table] = {row['name'] for row in cursor.fetchall()} - LOCAL_COLUMNS
+        return self._columns[table]
+
+    def _is_newer(self, cursor, table, local_key, change):
+        """Whether the incoming version beats the local changelog entry for the row."""
+        if local_key is None:
+            return True
+        cursor.execute("SELECT updated_at, origin FROM changelog WHERE table_name = ? AND row_key = ?",
+                       (table, str(local_key)))
+        local = cursor.fetchone()
+        if local is None:
+            return True
+        return (change['updated_at'], change['origin']) > (local['updated_at'],
+                                                           local['origin'] or self._local_branch)
+
+    def _stamp(self, cursor, table, local_key, change):
+        """Give the local changelog entry the incoming version (and keep a tombstone for deletes)."""
+        cursor.execute("""
+        INSERT INTO changelog (table_name, row_key, op, seq, updated_at, origin)
+        VALUES (?, ?, ?, (SELECT IFNULL(MAX(seq), 0) + 1 FROM changelog), ?, ?)
+        ON CONFLICT (table_name, row_key) DO UPDATE SET
+            updated_at = excluded.updated_at, origin = excluded.origin
+        """, (table, str(local_key), change['op'], change['updated_at'], change['origin']))
+
+    def _apply(self, cursor, change, renamed, report):
+        table = change['table']
+        if table == 'user_attendance':
+            return self._apply_attendance(cursor, change, report)
+
+        key_column = NATURAL_KEYS[table]
+        key = change['key']
+        if not self._is_newer(cursor, table, key, change):
+            report['skipped'] += 1
+            return
+
+        if change['op'] == 'D':
+            if table == 'users':
+                # Attendance keeps referring to the user, so deactivate instead
+                cursor.execute("UPDATE users SET is_deleted = 1, is_active = 0 WHERE username = ?", (key,))
+            else:
+                cursor.execute(f"DELETE FROM {table} WHERE {key_column} = ?", (key,))
+            self._stamp(cursor, table, key, change)
+            report['applied'] += 1
+            return
+
+        row = {column: value for column, value in (change['row'] or {}).items()
+               if column in self._table_columns(cursor, table)}
+        row[key_column] = key
+        cursor.execute(f"SELECT id FROM {table} WHERE {key_column} = ?", (key,))
+        existing = cursor.fetchone()
+
+        renamed_from = None
+        if existing is None and table == 'users' and row.get('email'):
+            cursor.execute("SELECT id, username FROM users WHERE email = ?", (row['email'],))
+            owner = cursor.fetchone()
+            if owner is not None and owner['username'] in renamed:
+                # Renamed at the branch: keep the row (and its attendance) under the new name
+                existing = owner
+                renamed_from = owner['username']
+            elif owner is not None:
+                report['conflicts'].append(self._conflict(
+                    change, f"Email {row['email']} already used by {owner['username']}"))
+                return
+
+        columns = list(row)
+        if existing is None:
+            cursor.execute(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                [row[column] for column in columns]
+            )
+            if table == 'users':
+                cursor.execute("INSERT INTO user_preferences (user_id, theme, language) VALUES (?, 'system', 'en')",
+                               (cursor.lastrowid,))
+        else:
+            cursor.execute(
+                f"UPDATE {table} SET {', '.join(f'{column} = ?' for column in columns)} WHERE id = ?",
+                [row[column] for column in columns] + [existing['id']]
+            )
+        self._stamp(cursor, table, key, change)
+        if renamed_from:
+            self._stamp(cursor, table, renamed_from, change)
+        report['applied'] += 1
+
+    def _apply_attendance(self, cursor, change, report):
+        global_key = change['key']
+        branch, _, source_id = global_key.partition(':')
+        if branch == self._local_branch:
+            # One of our own rows coming back through the central office
+            local_id = int(source_id)
+            cursor.execute("SELECT 1 FROM user_attendance WHERE id = ?", (local_id,))
+            if cursor.fetchone() is None:
+                local_id = None
+        else:
+            cursor.execute("SELECT local_id FROM replication_attendance_keys WHERE global_key = ?",
+                           (global_key,))
+            mapped = cursor.fetchone()
+            local_id = mapped[0] if mapped else None
+
+        if not self._is_newer(cursor, 'user_attendance', local_id, change):
+            report['skipped'] += 1
+            return
+
+        if change['op'] == 'D':
+            if local_id is not None:
+                cursor.execute("DELETE FROM user_attendance WHERE id = ?", (local_id,))
+                cursor.execute("DELETE FROM replication_attendance_keys WHERE local_id = ?", (local_id,))
+                self._stamp(cursor, 'user_attendance', local_id, change)
+            report['applied'] += 1
+            return
+
+        row = dict(change['row'] or {})
+        username = row.pop('username', None)
+        cursor.execute("SELECT id FROM users WHERE username = ?", (username,))
+        user = cursor.fetchone()
+        if user is None:
+            report['conflicts'].append(self._conflict(change, f"Unknown user {username}"))
+            return
+        row = {column: value for column, value in row.items()
+               if column in self._table_columns(cursor, 'user_attendance')}
+        row['user_id'] = user['id']
+
+        columns = list(row)
+        if local_id is None:
+            cursor.execute(
+                f"INSERT INTO user_attendance ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                [row[column] for column in columns]
+            )
+            local_id = cursor.lastrowid
+            cursor.execute("INSERT INTO replication_attendance_keys (global_key, local_id) VALUES (?, ?)",
+                           (global_key, local_id))
+        else:
+            cursor.execute(
+                f"UPDATE user_attendance SET {', '.join(f'{column} = ?' for column in columns)} WHERE id = ?",
+                [row[column] for column in columns] + [local_id]
+            )
+        self._stamp(cursor, 'user_attendance', local_id, change)
+        report['applied'] += 1
+
+
+def _benchmark_replication(employees=2000, days=60):
+    """Compare an incremental export and merge against copying the whole database file."""
+    import shutil
+    import tempfile
+    from App.core.database._db_migration import DatabaseMigration
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        databases = {}
+        for name in ('branch', 'central'):
+            migration = DatabaseMigration()
+            migration.db_path = os.path.join(temp_dir, f'{name}.db')
+            migration.run_migrations()
+            databases[name] = migration.db_path
+
+        conn = sqlite3.connect(databases['branch'])
+        conn.executemany(
+            "INSERT INTO users (username, password, fullname, email, role) VALUES (?, 'x', ?, ?, 'user')",
+            [(f"emp{i}", f"Employee {i}", f"emp{i}@example.com") for i in range(employees)])
+        start_day = datetime.date(2024, 1, 1)
+        history = []
+        for offset in range(days):
+            day = start_day + datetime.timedelta(days=offset)
+            history += [(i + 2, day.isoformat(), day.year, day.month, day.day) for i in range(employees)]
+        conn.executemany("""
+        INSERT INTO user_attendance (user_id, full_date, year, month, day, check_in_time, check_out_time,
+                                     working_hours, status, is_present)
+        VALUES (?, ?, ?, ?, ?, '08:00:00', '17:00:00', 9, 'present', 1)
+        """, history)
+        conn.commit()
+
+        # Initial consolidation ships everything once
+        exporter = ChangelogExporter(databases['branch'])
+        merger = ChangelogMerger(databases['central'])
+        start = time.perf_counter()
+        merger.merge_file(exporter.export(os.path.join(temp_dir, 'outbox')))
+        initial = time.perf_counter() - start
+
+        # One more working day at the branch
+        day = start_day + datetime.timedelta(days=days)
+        conn.executemany("""
+        INSERT INTO user_attendance (user_id, full_date, year, month, day, check_in_time, status, is_present)
+        VALUES (?, ?, ?, ?, ?, '08:00:00', 'present', 1)
+        """, [(i + 2, day.isoformat(), day.year, day.month, day.day) for i in range(employees)])
+        conn.commit()
+        conn.close()
+
+        start = time.perf_counter()
+        segment = exporter.export(os.path.join(temp_dir, 'outbox'))
+        report = merger.merge_file(segment)
+        incremental = time.perf_counter() - start
+
+        start = time.perf_counter()
+        shutil.copyfile(databases['branch'], os.path.join(temp_dir, 'copy.db'))
+        copy_time = time.perf_counter() - start
+
+        print(f"Replication of {employees} employees x {days} days")
+        print(f"  initial merge : {initial:.2f}s")
+        print(f"  daily delta   : {incremental:.3f}s, {os.path.getsize(segment) / 1024:,.0f} KiB "
+              f"({report['applied']} changes)")
+        print(f"  file copy     : {copy_time:.3f}s, {os.path.getsize(databases['branch']) / 1024:,.0f} KiB "
+              f"(and the copy still has to be consolidated)")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export and merge branch office changes")
+    parser.add_argument('--db', help="Database file (defaults to the configured database)")
+    parser.add_argument('--benchmark', type=int, metavar='N', help="Benchmark with N generated employees")
+    commands = parser.add_subparsers(dest='command')
+    export_parser = commands.add_parser('export', help="Write changes since the last export to a segment")
+    export_parser.add_argument('--out', default='.', help="Directory for the segment file")
+    export_parser.add_argument('--include-remote', action='store_true',
+                               help="Also forward changes merged from other offices")
+    merge_parser = commands.add_parser('merge', help="Apply segment files, oldest first")
+    merge_parser.add_argument('segments', nargs='+')
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        _benchmark_replication(args.benchmark)
+        return 0
+
+    if args.command == 'export':
+        path = ChangelogExporter(args.db).export(args.out, args.include_remote)
+        print(path or "Nothing to export")
+        return 0
+
+    if args.command == 'merge':
+        merger = ChangelogMerger(args.db)
+        status = 0
+        for segment in args.segments:
+            try:
+                report = merger.merge_file(segment)
+            except (OSError, ValueError) as e:
+                print(f"{segment}: {e}")
+                status = 1
+                continue
+            print(f"{segment}: {report['applied']} applied, {report['skipped']} skipped, "
+                  f"{len(report['conflicts'])} conflicts ({report['elapsed']:.2f}s)")
+            for warning in report['warnings']:
+                print(f"  warning: {warning}")
+            for conflict in report['conflicts']:
+                print(f"  conflict: {conflict['table']} {conflict['key']}: {conflict['reason']}")
+            status = status or (1 if report['conflicts'] else 0)
+        return status
+
+    parser.print_help()
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
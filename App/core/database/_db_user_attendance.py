@@ -9,10 +9,30 @@ import json
 import os
 import logging
 import time
+import hmac
+import hashlib
 from pathlib import Path
 from App.core.user._user_session_handler import session
 
 
+def hash_attendance_pin(pin, key):
+    """
+    Hash an attendance PIN for storage and lookup.
+    
+    PINs are short, so a keyed HMAC (with the per-install key kept in
+    app_settings) is used rather than a bare digest; it stays deterministic
+    so the hash can be indexed for PIN-only kiosk lookups.
+    
+    Args:
+        pin (str): Plain PIN
+        key (str): Value of the 'attendance_pin_key' app setting
+        
+    Returns:
+        str: Hex digest
+    """
+    return hmac.new(key.encode(), str(pin).encode(), hashlib.sha256).hexdigest()
+
+
 class UserAttendanceDB:
     """
     Class to handle all database operations related to user attendance.
@@ -20,10 +40,44 @@ class UserAttendanceDB:
     
     def __init__(self):
         """Initialize the database connection using config."""
-        self.logger = logging.getLogger('main')
+        self.logger = logging.getLogger('main.database')
         self.config = self._load_config()
         self.db_path = self._get_db_path()
         self.conn = None
+        self._listeners = []
+        
+        # Kiosk PIN index: pin hash -> user dict, kept on a long-lived connection
+        # and reloaded only when PRAGMA data_version and the attendance_pin_version
+        # setting (bumped by triggers on users) both say it changed
+        self._pin_key = None
+        self._pin_index = None
+        self._pin_index_version = None
+        self._pin_data_version = None
+        self._index_conn = None
+    
+    def add_listener(self, callback):
+        """
+        Register a callback for successful attendance writes.
+        
+        Args:
+            callback: Callable receiving (user_id, event, record) where event is
+                'check_in' or 'check_out' and record is the written row as a dict
+        """
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+    
+    def remove_listener(self, callback):
+        """Unregister a callback added with add_listener()."""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+    
+    def _notify(self, user_id, event, record):
+        """Pass a committed attendance write to all listeners."""
+        for callback in list(self._listeners):
+            try:
+                callback(user_id, event, record)
+            except Exception as e:
+                self.logger.error(f"Attendance listener failed for {event}: {e}")
     
     def _load_config(self):
         """Load application configuration from config.json."""
@@ -147,7 +201,7 @@ class UserAttendanceDB:
             
             cursor = self.conn.cursor()
             cursor.execute(
-                "SELECT attendance_pin FROM users WHERE id = ?", 
+                "SELECT attendance_pin, attendance_pin_hash FROM users WHERE id = ?", 
                 (user_id,)
             )
             result = cursor.fetchone()
@@ -156,13 +210,18 @@ class UserAttendanceDB:
                 self.logger.warning(f"No user found with ID {user_id}")
                 return False
             
+            stored_hash = result['attendance_pin_hash']
             stored_pin = result['attendance_pin']
             
+            if stored_hash:
+                return hmac.compare_digest(self._hash_pin(pin, cursor), stored_hash)
+            
             # If no PIN is set in the database
             if not stored_pin:
                 self.logger.warning(f"User with ID {user_id} has no attendance PIN set")
                 return False
             
+            # Legacy plaintext PIN that could not be migrated (e.g. duplicate)
             return pin == stored_pin
         
         except sqlite3.Error as e:
@@ -171,22 +230,177 @@ class UserAttendanceDB:
         finally:
             self._close_db()
     
-    def check_in(self):
+    def _insert_check_in(self, cursor, user_id, now):
         """
-        Record a check-in event for the current user.
+        Insert a check-in record without committing.
+        
+        Args:
+            cursor: Cursor on the connection that owns the transaction
+            user_id (int): User to check in
+            now (datetime.datetime): Check-in time
+            
+        Returns:
+            dict: The new record, or None if the user already has an open record
+        """
+        current_date = now.date()
+        check_in_time = now.time().strftime("%H:%M:%S")
+        check_in_datetime = now.strftime("%Y-%m-%d %H:%M:%S")
+        
+        # Always create a new attendance record for each check-in,
+        # but first check there is no unclosed record on this connection
+        cursor.execute(
+            "SELECT id FROM user_attendance "
+            "WHERE user_id = ? AND check_in_time IS NOT NULL AND check_out_time IS NULL "
+            "ORDER BY full_date DESC, check_in_time DESC LIMIT 1",
+            (user_id,)
+        )
+        unclosed_record = cursor.fetchone()
+        
+        if unclosed_record:
+            self.logger.warning(f"User {user_id} attempted to check in but has an unclosed check-in record")
+            return None
+        
+        cursor.execute(
+            "INSERT INTO user_attendance "
+            "(user_id, full_date, year, month, day, check_in_time, check_in_datetime, status, is_present, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)",
+            (
+                user_id,
+                current_date,
+                now.year,
+                now.month,
+                now.day,
+                check_in_time,
+                check_in_datetime,
+                "Present",  # Default status
+                1,  # is_present = True
+            )
+        )
+        
+        return {
+            'id': cursor.lastrowid,
+            'user_id': user_id,
+            'full_date': current_date.isoformat(),
+            'year': now.year,
+            'month': now.month,
+            'day': now.day,
+            'check_in_time': check_in_time,
+            'check_in_datetime': check_in_datetime,
+            'check_out_time': None,
+            'check_out_datetime': None,
+            'working_hours': None,
+            'status': "Present",
+            'is_present': 1,
+        }
+    
+    def _close_check_in(self, cursor, user_id, now):
+        """
+        Close the user's open check-in record without committing.
+        
+        Args:
+            cursor: Cursor on the connection that owns the transaction
+            user_id (int): User to check out
+            now (datetime.datetime): Check-out time
+            
+        Returns:
+            dict: The updated record, or None if the user has no open record
+        """
+        check_out_time = now.time().strftime("%H:%M:%S")
+        check_out_datetime = now.strftime("%Y-%m-%d %H:%M:%S")
+        
+        # Find the most recent check-in record that doesn't have a check-out time
+        # regardless of date (to handle overnight shifts or forgot to check out)
+        cursor.execute(
+            "SELECT id, full_date, check_in_time, check_in_datetime FROM user_attendance "
+            "WHERE user_id = ? AND check_in_time IS NOT NULL AND check_out_time IS NULL "
+            "ORDER BY full_date DESC, check_in_time DESC LIMIT 1",
+            (user_id,)
+        )
+        existing_record_row = cursor.fetchone()
+        
+        if not existing_record_row:
+            # No open check-in record found, can't check out
+            self.logger.warning(f"User {user_id} attempted to check out but has no open check-in record")
+            return None
+        
+        # Convert sqlite3.Row to dict to properly use .get() method
+        existing_record = dict(existing_record_row)
+        
+        # Calculate working hours
+        working_hours = None
+        
+        # If we have the full datetime field, use that for precise calculation
+        if 'check_in_datetime' in existing_record and existing_record['check_in_datetime']:
+            check_in_dt = datetime.datetime.strptime(existing_record['check_in_datetime'], "%Y-%m-%d %H:%M:%S")
+            check_out_dt = now
+        
+            # Calculate hours as decimal, properly handling multi-day spans
+            delta = check_out_dt - check_in_dt
+            working_hours = delta.total_seconds() / 3600  # Convert to hours
+        else:
+            # Fallback to the old method if check_in_datetime is not available
+            # Get the check-in date and time
+            check_in_date = existing_record['full_date']
+            check_in_time = existing_record['check_in_time']
+        
+            # Create datetime objects for check-in and check-out
+            if isinstance(check_in_date, str):
+                check_in_date = datetime.datetime.strptime(check_in_date, "%Y-%m-%d").date()
+        
+            check_in_time = datetime.datetime.strptime(check_in_time, "%H:%M:%S").time()
+            check_in_dt = datetime.datetime.combine(check_in_date, check_in_time)
+        
+            check_out_dt = datetime.datetime.combine(now.date(), datetime.datetime.strptime(check_out_time, "%H:%M:%S").time())
+        
+            # Calculate the difference, handling multi-day spans
+            if check_out_dt < check_in_dt:
+                days_diff = (now.date() - check_in_date).days
+                if days_diff <= 0:
+                    # If same day but checkout time is earlier, assume next day
+                    check_out_dt += datetime.timedelta(days=1)
+                else:
+                    # Otherwise use the actual date
+                    check_out_dt = datetime.datetime.combine(now.date(), datetime.datetime.strptime(check_out_time, "%H:%M:%S").time())
+        
+            # Calculate hours as decimal
+            delta = check_out_dt - check_in_dt
+            working_hours = delta.total_seconds() / 3600  # Convert to hours
+        
+        # Update the existing record with check-out time
+        cursor.execute(
+            "UPDATE user_attendance SET check_out_time = ?, check_out_datetime = ?, working_hours = ?, "
+            "updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+            (check_out_time, check_out_datetime, working_hours, existing_record['id'])
+        )
+        
+        existing_record.update({
+            'user_id': user_id,
+            'check_out_time': check_out_time,
+            'check_out_datetime': check_out_datetime,
+            'working_hours': working_hours,
+        })
+        return existing_record
+    
+    def check_in(self, user_id=None):
+        """
+        Record a check-in event for a user.
         Always creates a new attendance record for each check-in.
         
+        Args:
+            user_id (int, optional): User to check in. Defaults to logged-in user.
+        
         Returns:
             bool: True if check-in was successful, False otherwise
         """
-        if not session.is_logged_in():
-            self.logger.warning("Attempted to check in when not logged in")
-            return False
-        
-        user_id = session.get_user_id()
-        if not user_id:
-            self.logger.warning("No user ID found in session")
-            return False
+        if user_id is None:
+            if not session.is_logged_in():
+                self.logger.warning("Attempted to check in when not logged in")
+                return False
+            
+            user_id = session.get_user_id()
+            if not user_id:
+                self.logger.warning("No user ID found in session")
+                return False
         
         # Use a dedicated connection for this transaction
         conn = None
@@ -196,51 +410,13 @@ class UserAttendanceDB:
             conn = sqlite3.connect(db_path, timeout=60)
             conn.row_factory = sqlite3.Row
             
-            # Get current date and time
-            now = datetime.datetime.now()
-            current_date = now.date()
-            check_in_time = now.time().strftime("%H:%M:%S")
-            check_in_datetime = now.strftime("%Y-%m-%d %H:%M:%S")
-            
-            # Always create a new attendance record for each check-in
-            cursor = conn.cursor()
-            
-            # First, check if there's any unclosed record using this connection
-            cursor.execute(
-                "SELECT id FROM user_attendance "
-                "WHERE user_id = ? AND check_in_time IS NOT NULL AND check_out_time IS NULL "
-                "ORDER BY full_date DESC, check_in_time DESC LIMIT 1",
-                (user_id,)
-            )
-            unclosed_record = cursor.fetchone()
-            
-            if unclosed_record:
-                self.logger.warning(f"User {user_id} attempted to check in but has an unclosed check-in record")
+            record = self._insert_check_in(conn.cursor(), user_id, datetime.datetime.now())
+            if record is None:
                 return False
-                
-            cursor.execute(
-                "INSERT INTO user_attendance "
-                "(user_id, full_date, year, month, day, check_in_time, check_in_datetime, status, is_present, created_at, updated_at) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)",
-                (
-                    user_id,
-                    current_date,
-                    now.year,
-                    now.month,
-                    now.day,
-                    check_in_time,
-                    check_in_datetime,
-                    "Present",  # Default status
-                    1,  # is_present = True
-                )
-            )
-                
             conn.commit()
             
-            # Get the ID of the newly created record
-            attendance_id = cursor.lastrowid
-            
-            self.logger.info(f"User {user_id} checked in at {check_in_time} (Record ID: {attendance_id})")
+            self.logger.info("User %s checked in at %s (Record ID: %s)", user_id, record['check_in_time'], record['id'])
+            self._notify(user_id, 'check_in', record)
             return True
             
         except sqlite3.Error as e:
@@ -265,22 +441,26 @@ class UserAttendanceDB:
             if conn:
                 conn.close()
     
-    def check_out(self):
+    def check_out(self, user_id=None):
         """
-        Record a check-out event for the current user.
+        Record a check-out event for a user.
         Updates the most recent unclosed check-in record for the user, regardless of date.
         
+        Args:
+            user_id (int, optional): User to check out. Defaults to logged-in user.
+        
         Returns:
             bool: True if check-out was successful, False otherwise
         """
-        if not session.is_logged_in():
-            self.logger.warning("Attempted to check out when not logged in")
-            return False
-        
-        user_id = session.get_user_id()
-        if not user_id:
-            self.logger.warning("No user ID found in session")
-            return False
+        if user_id is None:
+            if not session.is_logged_in():
+                self.logger.warning("Attempted to check out when not logged in")
+                return False
+            
+            user_id = session.get_user_id()
+            if not user_id:
+                self.logger.warning("No user ID found in session")
+                return False
         
         # Use a dedicated connection for this transaction
         conn = None
@@ -290,80 +470,13 @@ class UserAttendanceDB:
             conn = sqlite3.connect(db_path, timeout=60)
             conn.row_factory = sqlite3.Row
             
-            # Get current date and time
-            now = datetime.datetime.now()
-            check_out_time = now.time().strftime("%H:%M:%S")
-            check_out_datetime = now.strftime("%Y-%m-%d %H:%M:%S")
-            
-            # Find the most recent check-in record that doesn't have a check-out time
-            # regardless of date (to handle overnight shifts or forgot to check out)
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT id, full_date, check_in_time, check_in_datetime FROM user_attendance "
-                "WHERE user_id = ? AND check_in_time IS NOT NULL AND check_out_time IS NULL "
-                "ORDER BY full_date DESC, check_in_time DESC LIMIT 1",
-                (user_id,)
-            )
-            existing_record_row = cursor.fetchone()
-            
-            if not existing_record_row:
-                # No open check-in record found, can't check out
-                self.logger.warning(f"User {user_id} attempted to check out but has no open check-in record")
+            record = self._close_check_in(conn.cursor(), user_id, datetime.datetime.now())
+            if record is None:
                 return False
-            
-            # Convert sqlite3.Row to dict to properly use .get() method
-            existing_record = dict(existing_record_row)
-            
-            # Calculate working hours
-            working_hours = None
-            
-            # If we have the full datetime field, use that for precise calculation
-            if 'check_in_datetime' in existing_record and existing_record['check_in_datetime']:
-                check_in_dt = datetime.datetime.strptime(existing_record['check_in_datetime'], "%Y-%m-%d %H:%M:%S")
-                check_out_dt = now
-                
-                # Calculate hours as decimal, properly handling multi-day spans
-                delta = check_out_dt - check_in_dt
-                working_hours = delta.total_seconds() / 3600  # Convert to hours
-            else:
-                # Fallback to the old method if check_in_datetime is not available
-                # Get the check-in date and time
-                check_in_date = existing_record['full_date']
-                check_in_time = existing_record['check_in_time']
-                
-                # Create datetime objects for check-in and check-out
-                if isinstance(check_in_date, str):
-                    check_in_date = datetime.datetime.strptime(check_in_date, "%Y-%m-%d").date()
-                
-                check_in_time = datetime.datetime.strptime(check_in_time, "%H:%M:%S").time()
-                check_in_dt = datetime.datetime.combine(check_in_date, check_in_time)
-                
-                check_out_dt = datetime.datetime.combine(now.date(), datetime.datetime.strptime(check_out_time, "%H:%M:%S").time())
-                
-                # Calculate the difference, handling multi-day spans
-                if check_out_dt < check_in_dt:
-                    days_diff = (now.date() - check_in_date).days
-                    if days_diff <= 0:
-                        # If same day but checkout time is earlier, assume next day
-                        check_out_dt += datetime.timedelta(days=1)
-                    else:
-                        # Otherwise use the actual date
-                        check_out_dt = datetime.datetime.combine(now.date(), datetime.datetime.strptime(check_out_time, "%H:%M:%S").time())
-                
-                # Calculate hours as decimal
-                delta = check_out_dt - check_in_dt
-                working_hours = delta.total_seconds() / 3600  # Convert to hours
-            
-            # Update the existing record with check-out time
-            cursor.execute(
-                "UPDATE user_attendance SET check_out_time = ?, check_out_datetime = ?, working_hours = ?, "
-                "updated_at = CURRENT_TIMESTAMP WHERE id = ?",
-                (check_out_time, check_out_datetime, working_hours, existing_record['id'])
-            )
-                
             conn.commit()
             
-            self.logger.info(f"User {user_id} checked out at {check_out_time} (Record ID: {existing_record['id']})")
+            self.logger.info("User %s checked out at %s (Record ID: %s)", user_id, record['check_out_time'], record['id'])
+            self._notify(user_id, 'check_out', record)
             return True
             
         except sqlite3.Error as e:
@@ -527,6 +640,121 @@ class UserAttendanceDB:
         finally:
             self._close_db()
     
+    def get_attendance_page(self, user_id, after=None, limit=100):
+        """
+        Get one page of a user's attendance history, newest first, by keyset.
+        
+        Unlike get_attendance_history's OFFSET, each page seeks straight to
+        its position in idx_user_attendance_user_date, so page 500 costs the
+        same as page 1.
+        
+        Args:
+            user_id (int): User ID
+            after (tuple, optional): (full_date, id) of the last row of the previous page
+            limit (int, optional): Maximum number of rows. Defaults to 100.
+            
+        Returns:
+            list: Tuples (id, full_date, check_in_time, check_out_time, status, notes)
+        """
+        query = (
+            "SELECT id, full_date, check_in_time, check_out_time, status, notes "
+            "FROM user_attendance WHERE user_id = ? "
+        )
+        params = [user_id]
+        if after is not None:
+            query += "AND (full_date, id) < (?, ?) "
+            params.extend(after)
+        query += "ORDER BY full_date DESC, id DESC LIMIT ?"
+        params.append(limit)
+        
+        try:
+            if not self._connect_db():
+                return []
+            
+            cursor = self.conn.cursor()
+            cursor.execute(query, params)
+            return [tuple(row) for row in cursor.fetchall()]
+            
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error getting attendance page: {e}")
+            return []
+        finally:
+            self._close_db()
+    
+    def get_daily_summary(self, user_id, start_date, end_date):
+        """
+        Aggregate a user's attendance per day in one query.
+        
+        Uses its own connection rather than self.conn, so it is safe to call
+        from a worker thread while the GUI thread uses this instance.
+        
+        Args:
+            user_id (int): User ID
+            start_date (str): First day, 'YYYY-MM-DD' (inclusive)
+            end_date (str): Last day, 'YYYY-MM-DD' (inclusive)
+            
+        Returns:
+            dict: full_date -> dict with 'present', 'absent', 'sick', 'permission'
+                  (0/1 flags), 'open' and 'closed' record counts and 'hours',
+                  or None on database error
+        """
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute(
+                "SELECT full_date, "
+                "MAX(is_present) AS present, MAX(is_absent) AS absent, "
+                "MAX(is_sick) AS sick, MAX(is_permission) AS permission, "
+                "SUM(check_in_time IS NOT NULL AND check_out_time IS NULL) AS open, "
+                "SUM(check_out_time IS NOT NULL) AS closed, "
+                "COALESCE(SUM(working_hours), 0) AS hours "
+                "FROM user_attendance "
+                "WHERE user_id = ? AND full_date BETWEEN ? AND ? "
+                "GROUP BY full_date",
+                (user_id, start_date, end_date)
+            )
+            return {row['full_date']: dict(row) for row in cursor.fetchall()}
+            
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error getting daily attendance summary: {e}")
+            return None
+        finally:
+            if conn:
+                conn.close()
+    
+    def get_open_records(self):
+        """
+        Get every open check-in with its user, for the "who's in now" board.
+        
+        Reads only idx_user_attendance_open (open records), never the closed
+        history. Uses its own connection like get_daily_summary().
+        
+        Returns:
+            list: Dicts with 'id', 'user_id', 'username', 'fullname', 'department',
+                  'full_date', 'check_in_time' and 'check_in_datetime',
+                  or None on database error
+        """
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute(
+                "SELECT a.id, a.user_id, u.username, u.fullname, u.department, "
+                "a.full_date, a.check_in_time, a.check_in_datetime "
+                "FROM user_attendance a "
+                "JOIN users u ON u.id = a.user_id "
+                "WHERE a.check_in_time IS NOT NULL AND a.check_out_time IS NULL"
+            )
+            return [dict(row) for row in cursor.fetchall()]
+            
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error getting open attendance records: {e}")
+            return None
+        finally:
+            if conn:
+                conn.close()
+    
     def get_last_check_in_time(self, user_id=None):
         """
         Get the most recent check-in time for a user (from any date).
@@ -664,5 +892,316 @@ class UserAttendanceDB:
         finally:
             self._close_db()
 
+    def get_attendance_state(self, user_id):
+        """
+        Get everything needed to show a user's attendance status in one connection.
+        
+        Args:
+            user_id (int): User ID to load
+            
+        Returns:
+            dict: 'open_record', 'last_check_in' and 'last_check_out' (each a dict or None),
+                  or None on database error
+        """
+        try:
+            if not self._connect_db():
+                return None
+            
+            cursor = self.conn.cursor()
+            state = {}
+            queries = {
+                'open_record': "WHERE user_id = ? AND check_in_time IS NOT NULL AND check_out_time IS NULL "
+                               "ORDER BY full_date DESC, check_in_time DESC LIMIT 1",
+                'last_check_in': "WHERE user_id = ? AND check_in_time IS NOT NULL "
+                                 "ORDER BY full_date DESC, check_in_time DESC LIMIT 1",
+                'last_check_out': "WHERE user_id = ? AND check_out_time IS NOT NULL "
+                                  "ORDER BY full_date DESC, check_out_time DESC LIMIT 1",
+            }
+            for key, where in queries.items():
+                cursor.execute(f"SELECT * FROM user_attendance {where}", (user_id,))
+                row = cursor.fetchone()
+                state[key] = dict(row) if row else None
+            return state
+            
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error getting attendance state: {e}")
+            return None
+        finally:
+            self._close_db()
+
+    def _hash_pin(self, pin, cursor):
+        """Hash a PIN with the install's PIN key, loading the key once."""
+        if self._pin_key is None:
+            cursor.execute("SELECT value FROM app_settings WHERE key = 'attendance_pin_key'")
+            row = cursor.fetchone()
+            if not row or not row[0]:
+                raise sqlite3.OperationalError("attendance_pin_key setting is missing; run migrations")
+            self._pin_key = row[0]
+        return hash_attendance_pin(pin, self._pin_key)
+    
+    def set_attendance_pin(self, user_id, pin):
+        """
+        Set or replace a user's attendance PIN.
+        
+        PINs must be unique across active users because kiosk mode
+        identifies the employee from the PIN alone.
+        
+        Args:
+            user_id (int): User to update
+            pin (str): New PIN, 4-6 digits
+            
+        Returns:
+            tuple: (success, message)
+        """
+        pin = str(pin)
+        if not pin.isdigit() or not 4 <= len(pin) <= 6:
+            return False, "PIN must be 4 to 6 digits"
+        
+        try:
+            if not self._connect_db():
+                return False, "Database connection error"
+            
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "UPDATE users SET attendance_pin_hash = ?, attendance_pin = NULL WHERE id = ?",
+                (self._hash_pin(pin, cursor), user_id)
+            )
+            if cursor.rowcount == 0:
+                return False, "User not found"
+            
+            self.conn.commit()
+            self.logger.info(f"Attendance PIN updated for user {user_id}")
+            return True, "PIN updated successfully"
+            
+        except sqlite3.IntegrityError:
+            return False, "PIN is already used by another employee"
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error setting attendance PIN: {e}")
+            return False, "Failed to update PIN"
+        finally:
+            self._close_db()
+
+    def clear_attendance_pin(self, user_id):
+        """
+        Remove a user's attendance PIN so it can no longer be used at the kiosk.
+
+        Args:
+            user_id (int): User to update
+
+        Returns:
+            tuple: (success, message)
+        """
+        try:
+            if not self._connect_db():
+                return False, "Database connection error"
+
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "UPDATE users SET attendance_pin_hash = NULL, attendance_pin = NULL WHERE id = ?",
+                (user_id,)
+            )
+            if cursor.rowcount == 0:
+                return False, "User not found"
+
+            self.conn.commit()
+            self.logger.info(f"Attendance PIN cleared for user {user_id}")
+            return True, "PIN cleared"
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error clearing attendance PIN: {e}")
+            return False, "Failed to clear PIN"
+        finally:
+            self._close_db()
+
+    def _refresh_pin_index(self):
+        """Reload the in-memory PIN index if the users table changed since last load."""
+        if self._index_conn is None:
+            self._index_conn = sqlite3.connect(self.db_path, timeout=30)
+            self._index_conn.row_factory = sqlite3.Row
+        cursor = self._index_conn.cursor()
+        
+        # data_version is free to read and only moves when another connection commits
+        data_version = cursor.execute("PRAGMA data_version").fetchone()[0]
+        if self._pin_index is not None and data_version == self._pin_data_version:
+            return
+        self._pin_data_version = data_version
+        
+        # Most commits are attendance punches; the trigger-maintained version tells
+        # us whether any PIN or account status actually changed
+        cursor.execute("SELECT value FROM app_settings WHERE key = 'attendance_pin_version'")
+        row = cursor.fetchone()
+        version = row[0] if row else None
+        if self._pin_index is not None and version == self._pin_index_version:
+            return
+        
+        cursor.execute(
+            "SELECT id, username, fullname, department, role, profile_image, attendance_pin_hash "
+            "FROM users WHERE attendance_pin_hash IS NOT NULL AND is_active = 1 AND is_deleted = 0"
+        )
+        self._pin_index = {row['attendance_pin_hash']: dict(row) for row in cursor.fetchall()}
+        self._pin_index_version = version
+        self.logger.debug("Loaded kiosk PIN index (%d users)", len(self._pin_index))
+    
+    def find_user_by_pin(self, pin):
+        """
+        Identify an employee from their attendance PIN alone.
+        
+        Args:
+            pin (str): Entered PIN
+            
+        Returns:
+            dict: User fields (id, username, fullname, department, role, profile_image)
+                  or None if no active user has this PIN
+        """
+        try:
+            self._refresh_pin_index()
+            user = self._pin_index.get(self._hash_pin(pin, self._index_conn.cursor()))
+            if not user:
+                return None
+            return {key: value for key, value in user.items() if key != 'attendance_pin_hash'}
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error during kiosk PIN lookup: {e}")
+            if self._index_conn:
+                self._index_conn.close()
+            self._index_conn = None
+            self._pin_index = None
+            return None
+    
+    def kiosk_punch(self, pin):
+        """
+        Check an employee in or out using only their PIN.
+        
+        Args:
+            pin (str): Entered PIN
+            
+        Returns:
+            tuple: (success, event, user) where event is 'check_in', 'check_out'
+                   or None, and user is the identified user dict or None
+        """
+        user = self.find_user_by_pin(pin)
+        if not user:
+            return False, None, None
+        
+        if self.get_unclosed_attendance_record(user['id']):
+            return self.check_out(user['id']), 'check_out', user
+        return self.check_in(user['id']), 'check_in', user
+    
+    def write_batch(self, conn, operations):
+        """
+        Apply several attendance writes in one transaction on a caller-owned connection.
+        
+        Used by the headless API server, whose single writer connection groups
+        concurrent punches into one commit. Each operation runs in its own
+        savepoint so a failing one does not undo the rest of the batch.
+        Listeners are notified only after the commit.
+        
+        Args:
+            conn: sqlite3 connection opened with isolation_level=None
+            operations: List of (action, value) tuples where action is
+                'check_in' or 'check_out' (value is a user ID) or
+                'punch' (value is a kiosk PIN; toggles check-in/check-out)
+            
+        Returns:
+            list: (success, event, record, user) per operation, in order
+        """
+        results = []
+        cursor = conn.cursor()
+        now = datetime.datetime.now()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            for action, value in operations:
+                user = None
+                if action == 'punch':
+                    user = self.find_user_by_pin(value)
+                    if not user:
+                        results.append((False, None, None, None))
+                        continue
+                    user_id = user['id']
+                    cursor.execute(
+                        "SELECT 1 FROM user_attendance "
+                        "WHERE user_id = ? AND check_in_time IS NOT NULL AND check_out_time IS NULL LIMIT 1",
+                        (user_id,)
+                    )
+                    action = 'check_out' if cursor.fetchone() else 'check_in'
+                else:
+                    user_id = value
+                
+                cursor.execute("SAVEPOINT attendance_op")
+                try:
+                    if action == 'check_in':
+                        record = self._insert_check_in(cursor, user_id, now)
+                    elif action == 'check_out':
+                        record = self._close_check_in(cursor, user_id, now)
+                    else:
+                        raise ValueError(f"Unknown attendance action: {action}")
+                    cursor.execute("RELEASE attendance_op")
+                except (sqlite3.Error, ValueError) as e:
+                    self.logger.error(f"Batched {action} failed for user {user_id}: {e}")
+                    cursor.execute("ROLLBACK TO attendance_op")
+                    cursor.execute("RELEASE attendance_op")
+                    record = None
+                results.append((record is not None, action, record, user))
+            cursor.execute("COMMIT")
+        except sqlite3.Error:
+            if conn.in_transaction:
+                cursor.execute("ROLLBACK")
+            raise
+        
+        for success, event, record, _ in results:
+            if success:
+                self._notify(record['user_id'], event, record)
+        return results
+
 # Create a global instance for easy import
-attendance_db = UserAttendanceDB()
\ No newline at end of file
+attendance_db = UserAttendanceDB()
+
+
+def _benchmark_kiosk(employees=300, punches=1200):
+    """Measure kiosk PIN punches per minute against a throwaway database."""
+    import random
+    import tempfile
+    import shutil
+    from App.core.database._db_migration import DatabaseMigration
+    
+    temp_dir = tempfile.mkdtemp()
+    try:
+        migration = DatabaseMigration()
+        migration.db_path = os.path.join(temp_dir, 'kiosk_benchmark.db')
+        migration.run_migrations()
+        
+        db = UserAttendanceDB()
+        db.db_path = migration.db_path
+        conn = sqlite3.connect(db.db_path)
+        pins = random.sample(range(100000, 1000000), employees)
+        key = conn.execute("SELECT value FROM app_settings WHERE key = 'attendance_pin_key'").fetchone()[0]
+        conn.executemany(
+            "INSERT INTO users (username, password, fullname, email, role, attendance_pin_hash) "
+            "VALUES (?, '', ?, ?, 'user', ?)",
+            [(f"emp{i}", f"Employee {i}", f"emp{i}@example.com", hash_attendance_pin(pin, key))
+             for i, pin in enumerate(pins)]
+        )
+        conn.commit()
+        conn.close()
+        
+        start = time.perf_counter()
+        lookup_time = 0.0
+        failures = 0
+        for _ in range(punches):
+            pin = str(random.choice(pins))
+            lookup_start = time.perf_counter()
+            db.find_user_by_pin(pin)
+            lookup_time += time.perf_counter() - lookup_start
+            success, _, _ = db.kiosk_punch(pin)
+            failures += 0 if success else 1
+        elapsed = time.perf_counter() - start
+        
+        print(f"{punches} kiosk punches across {employees} employees in {elapsed:.2f}s")
+        print(f"  throughput : {punches / elapsed * 60:,.0f} punches/minute")
+        print(f"  PIN lookup : {lookup_time / punches * 1e6:.1f} us average")
+        print(f"  failures   : {failures}")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    _benchmark_kiosk()
\ No newline at end of file
@@ -25,7 +25,7 @@ class UserDashboardDB:
             app_instance: The application instance with BASE_DIR attribute
         """
         self.app = app_instance
-        self.logger = logging.getLogger('main')
+        self.logger = logging.getLogger('main.database')
         self.conn = None
         
         # Get base directory
@@ -69,8 +69,8 @@ class UserDashboardDB:
             def get_path(self, *paths):
                 return os.path.join(self.base_dir, *paths)
         
-        # Get project root directory (3 levels up from this file)
-        base_dir = str(Path(__file__).parents[2])
+        # Get project root directory (App/core/database -> project root)
+        base_dir = str(Path(__file__).parents[3])
         return PathHelper(base_dir)
     
     def _load_config(self):
@@ -86,18 +86,13 @@ class UserDashboardDB:
     def _connect_db(self):
         """Connect to the SQLite database."""
         try:
-            # Print DB path for debugging
-            print(f"UserDashboardDB connecting to database: {self.db_path}")
+            self.logger.debug("UserDashboardDB connecting to database: %s", self.db_path)
             
             self.conn = sqlite3.connect(self.db_path)
             self.conn.row_factory = sqlite3.Row  # Use dictionary-like rows
-            
-            print(f"UserDashboardDB database connection successful: {self.db_path}")
             return True
         except sqlite3.Error as e:
-            self.logger.error(f"Database error: {e}")
-            print(f"UserDashboardDB database connection failed: {self.db_path}")
-            print(f"Error: {e}")
+            self.logger.error("UserDashboardDB connection failed: %s (%s)", self.db_path, e)
             return False
     
     def _close_db(self):
@@ -156,7 +151,7 @@ class UserDashboardDB:
                 # Convert to dict for easier handling
                 user_dict = dict(user_data)
                 # Log all retrieved fields for debugging
-                self.logger.debug(f"Retrieved user data fields: {list(user_dict.keys())}")
+                self.logger.debug("Retrieved user data fields: %s", list(user_dict.keys()))
                 return user_dict
             
             return None
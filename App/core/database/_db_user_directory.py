@@ -0,0 +1,137 @@
+"""
+Searchable user directory for administrators.
+
+Searches go through users_fts, an FTS5 index over fullname, username,
+email, department and phone number that triggers keep in sync with users
+(see DatabaseMigration._create_user_directory). Every word typed is matched
+as a prefix, so results narrow while the admin types, and results are
+ranked with bm25 (name and username matches first). Without FTS5 the
+directory falls back to LIKE matching.
+"""
+import os
+import re
+import json
+import sqlite3
+import logging
+from pathlib import Path
+
+# bm25 column weights: fullname, username, email, department, phone_number
+RANK_WEIGHTS = (10.0, 8.0, 4.0, 2.0, 1.0)
+SEARCH_COLUMNS = ('fullname', 'username', 'email', 'department', 'phone_number')
+RESULT_COLUMNS = ("u.id, u.username, u.fullname, u.email, u.department, u.phone_number, "
+                  "u.role, u.is_active, u.last_login")
+
+
+def build_match_query(text):
+    """
+    Turn free text into an FTS5 query matching every word as a prefix.
+
+    Args:
+        text (str): What the user typed
+
+    Returns:
+        str: e.g. '"jo"* "smi"*', or '' if there is nothing to search for
+    """
+    # Words only, so quotes and FTS operators in the input cannot break the query
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', text))
+
+
+class UserDirectoryDB:
+    """
+    Ranked, paged user search.
+    """
+
+    def __init__(self):
+        """Initialize the database path using config."""
+        self.logger = logging.getLogger('main.database')
+        self.config = self._load_config()
+        self.db_path = self._get_db_path()
+        self._fts_available = None
+
+    def _load_config(self):
+        """Load application configuration from config.json."""
+        try:
+            base_dir = str(Path(__file__).parents[3])  # Go up 3 levels from this file
+            config_path = os.path.join(base_dir, 'App', 'config', 'config.json')
+
+            with open(config_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.error(f"Error loading config in UserDirectoryDB: {e}")
+            raise ValueError(f"Failed to load config file: {e}")
+
+    def _get_db_path(self):
+        """Get database path from config."""
+        db_path = self.config['database']['path']
+
+        # Convert to absolute path if it's relative
+        if not os.path.isabs(db_path):
+            base_dir = str(Path(__file__).parents[3])  # Go up 3 levels from this file
+            db_path = os.path.join(base_dir, db_path)
+
+        return db_path
+
+    def _has_fts(self, cursor):
+        if self._fts_available is None:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users_fts'")
+            self._fts_available = cursor.fetchone() is not None
+        return self._fts_available
+
+    def search(self, text="", offset=0, limit=50, include_deleted=False):
+        """
+        Search users, best matches first.
+
+        Args:
+            text (str, optional): Words to match as prefixes against name, username,
+                email, department and phone. Empty lists everyone by name.
+            offset (int, optional): Number of results to skip. Defaults to 0.
+            limit (int, optional): Page size. Defaults to 50.
+            include_deleted (bool, optional): Include soft-deleted users. Defaults to False.
+
+        Returns:
+            dict: 'users' (list of dicts with id, username, fullname, email, department,
+                  phone_number, role, is_active and last_login) and 'total' (number of
+                  matches across all pages); empty on database error
+        """
+        match = build_match_query(text)
+        deleted_filter = "" if include_deleted else "AND u.is_deleted = 0 "
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+
+            if not match:
+                where, params, order = f"WHERE 1 {deleted_filter}", [], "u.fullname COLLATE NOCASE, u.id"
+                source = "users u"
+            elif self._has_fts(cursor):
+                source = "users_fts f JOIN users u ON u.id = f.rowid"
+                where, params = f"WHERE users_fts MATCH ? {deleted_filter}", [match]
+                weights = ', '.join(str(weight) for weight in RANK_WEIGHTS)
+                order = f"bm25(users_fts, {weights}), u.fullname COLLATE NOCASE"
+            else:
+                source = "users u"
+                words = re.findall(r'\w+', text)
+                any_column = "(" + " OR ".join(f"u.{column} LIKE ?" for column in SEARCH_COLUMNS) + ")"
+                where = f"WHERE {' AND '.join([any_column] * len(words))} {deleted_filter}"
+                params = [f"%{word}%" for word in words for _ in SEARCH_COLUMNS]
+                order = "u.fullname COLLATE NOCASE, u.id"
+
+            cursor.execute(f"SELECT COUNT(*) FROM {source} {where}", params)
+            total = cursor.fetchone()[0]
+            cursor.execute(
+                f"SELECT {RESULT_COLUMNS} FROM {source} {where} ORDER BY {order} LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            )
+            return {'users': [dict(row) for row in cursor.fetchall()], 'total': total}
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error searching users: {e}")
+            return {'users': [], 'total': 0}
+        finally:
+            if conn:
+                conn.close()
+
+
+# Create a global instance for easy import
+user_directory = UserDirectoryDB()
@@ -0,0 +1,375 @@
+"""
+Bulk Employee Import
+
+Creates many user accounts from a CSV or JSON file in one pass instead of
+one UserAuth.register() call (connection + commit) per person.
+
+Rows are read and validated as a stream, then written in chunks: each chunk
+is one transaction with executemany() inserts into users and
+user_preferences. Usernames and emails already taken (in the database or
+earlier in the same file) are checked per chunk with one query and go to
+the conflict report instead of aborting the import. Department names are
+resolved case-insensitively against the departments table.
+
+    python -m App.core.database._db_user_import employees.csv --report conflicts.csv
+    python -m App.core.database._db_user_import --benchmark 3000
+"""
+import os
+import re
+import csv
+import sys
+import json
+import time
+import secrets
+import sqlite3
+import hashlib
+import logging
+import argparse
+from pathlib import Path
+
+if __package__ in (None, ''):
+    sys.path.insert(0, str(Path(__file__).parents[3]))
+
+# Accepted header spellings -> users column
+FIELD_ALIASES = {
+    'username': 'username',
+    'user': 'username',
+    'fullname': 'fullname',
+    'full_name': 'fullname',
+    'name': 'fullname',
+    'email': 'email',
+    'e-mail': 'email',
+    'password': 'password',
+    'department': 'department',
+    'dept': 'department',
+    'phone': 'phone_number',
+    'phone_number': 'phone_number',
+    'role': 'role',
+    'start_date': 'start_date',
+    'gender': 'gender',
+    'address': 'address',
+}
+ROLES = {'user', 'admin'}
+EMAIL_PATTERN = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+USERNAME_PATTERN = re.compile(r'^[\w.\-]{3,50}$')
+DEFAULT_CHUNK_SIZE = 500
+
+
+def read_rows(path):
+    """
+    Stream raw rows from a CSV, JSON array or JSON Lines file.
+
+    Args:
+        path (str): File to read; the format is chosen by extension
+            (.csv, .json, .jsonl/.ndjson)
+
+    Yields:
+        tuple: (line or item number, dict of raw values)
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+    elif extension in ('.jsonl', '.ndjson'):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                if line.strip():
+                    yield line_number, json.loads(line)
+    elif extension == '.json':
+        # A JSON array has to be parsed whole; use JSON Lines for very large files
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get('users', [])
+        for index, row in enumerate(data, 1):
+            yield index, row
+    else:
+        raise ValueError(f"Unsupported import file type: {extension}")
+
+
+def validate_row(raw, departments):
+    """
+    Normalize and validate one raw row.
+
+    Args:
+        raw (dict): Values as read from the file
+        departments (dict): Lowercase department name -> canonical name
+
+    Returns:
+        tuple: (record dict ready for insert, None) or (None, error message)
+    """
+    if not isinstance(raw, dict):
+        return None, "Row is not an object"
+    record = {}
+    for key, value in raw.items():
+        column = FIELD_ALIASES.get(str(key).strip().lower())
+        if column and value is not None and str(value).strip():
+            record[column] = str(value).strip()
+
+    for column in ('username', 'fullname', 'email'):
+        if column not in record:
+            return None, f"Missing {column}"
+    if not USERNAME_PATTERN.match(record['username']):
+        return None, f"Invalid username '{record['username']}'"
+    record['email'] = record['email'].lower()
+    if not EMAIL_PATTERN.match(record['email']):
+        return None, f"Invalid email '{record['email']}'"
+
+    record['role'] = record.get('role', 'user').lower()
+    if record['role'] not in ROLES:
+        return None, f"Invalid role '{record['role']}'"
+
+    if 'department' in record:
+        department = departments.get(record['department'].lower())
+        if department is None:
+            return None, f"Unknown department '{record['department']}'"
+        record['department'] = department
+
+    if 'password' in record:
+        record['password'] = hashlib.sha256(record['password'].encode()).hexdigest()
+    else:
+        # No usable password until an admin or the user resets it
+        record['password'] = '!' + secrets.token_hex(16)
+    return record, None
+
+
+class UserImporter:
+    """
+    Imports employees in chunked transactions and reports conflicts.
+    """
+
+    COLUMNS = ('username', 'password', 'fullname', 'email', 'role',
+               'department', 'phone_number', 'start_date', 'gender', 'address')
+
+    def __init__(self, db_path=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Initialize the importer.
+
+        Args:
+            db_path (str, optional): Database file; defaults to the configured database
+            chunk_size (int, optional): Rows per transaction
+        """
+        self.logger = logging.getLogger('main.database')
+        self.db_path = db_path or self._get_db_path()
+        self.chunk_size = chunk_size
+
+    def _get_db_path(self):
+        """Get database path from config."""
+        base_dir = str(Path(__file__).parents[3])  # Go up 3 levels from this file
+        with open(os.path.join(base_dir, 'App', 'config', 'config.json'), 'r', encoding='utf-8') as f:
+            db_path = json.load(f)['database']['path']
+        if not os.path.isabs(db_path):
+            db_path = os.path.join(base_dir, db_path)
+        return db_path
+
+    def import_file(self, path, dry_run=False):
+        """
+        Import employees from a file.
+
+        Args:
+            path (str): CSV, JSON or JSON Lines file
+            dry_run (bool, optional): Validate and check conflicts without writing
+
+        Returns:
+            dict: 'imported' (count), 'conflicts' and 'errors' (lists of dicts with
+                  'line', 'username', 'email' and 'reason') and 'elapsed' seconds
+        """
+        return self.import_rows(read_rows(path), dry_run)
+
+    def import_rows(self, rows, dry_run=False):
+        """
+        Import employees from (line, raw dict) pairs; see import_file().
+        """
+        start = time.perf_counter()
+        report = {'imported': 0, 'conflicts': [], 'errors': [], 'elapsed': 0.0}
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=10000")
+            departments = {name.lower(): name for (name,) in conn.execute("SELECT name FROM departments")}
+            seen_usernames = set()
+            seen_emails = set()
+
+            chunk = []
+            for line, raw in rows:
+                record, error = validate_row(raw, departments)
+                if error:
+                    report['errors'].append(self._issue(line, raw, error))
+                    continue
+                # Duplicates inside the file never reach the database
+                if record['username'] in seen_usernames:
+                    report['conflicts'].append(self._issue(line, record, "Duplicate username in file"))
+                    continue
+                if record['email'] in seen_emails:
+                    report['conflicts'].append(self._issue(line, record, "Duplicate email in file"))
+                    continue
+                seen_usernames.add(record['username'])
+                seen_emails.add(record['email'])
+
+                chunk.append((line, record))
+                if len(chunk) >= self.chunk_size:
+                    self._write_chunk(conn, chunk, report, dry_run)
+                    chunk = []
+            if chunk:
+                self._write_chunk(conn, chunk, report, dry_run)
+        finally:
+            conn.close()
+
+        report['elapsed'] = time.perf_counter() - start
+        self.logger.info("Imported %d users (%d conflicts, %d errors) in %.2fs",
+                         report['imported'], len(report['conflicts']), len(report['errors']),
+                         report['elapsed'])
+        return report
+
+    @staticmethod
+    def _issue(line, row, reason):
+        values = {}
+        if isinstance(row, dict):
+            for key, value in row.items():
+                column = FIELD_ALIASES.get(str(key).strip().lower())
+                if column in ('username', 'email') and value:
+                    values[column] = str(value).strip()
+        return {'line': line, 'username': values.get('username', ''), 'email': values.get('email', ''),
+                'reason': reason}
+
+    def _write_chunk(self, conn, chunk, report, dry_run):
+        """Check a chunk against existing accounts and insert the rest in one transaction."""
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            usernames = [record['username'] for _, record in chunk]
+            emails = [record['email'] for _, record in chunk]
+            cursor.execute(
+                f"SELECT username, email FROM users "
+                f"WHERE username IN ({','.join('?' * len(usernames))}) "
+                f"OR email COLLATE NOCASE IN ({','.join('?' * len(emails))})",
+                usernames + emails
+            )
+            taken_usernames = set()
+            taken_emails = set()
+            for username, email in cursor.fetchall():
+                taken_usernames.add(username)
+                # Imported emails are lower-cased; older accounts may not be
+                taken_emails.add(email.lower())
+
+            accepted = []
+            for line, record in chunk:
+                if record['username'] in taken_usernames:
+                    report['conflicts'].append(self._issue(line, record, "Username already exists"))
+                elif record['email'] in taken_emails:
+                    report['conflicts'].append(self._issue(line, record, "Email already in use"))
+                else:
+                    accepted.append(record)
+
+            if accepted and not dry_run:
+                placeholders = ', '.join('?' * len(self.COLUMNS))
+                cursor.executemany(
+                    f"INSERT INTO users ({', '.join(self.COLUMNS)}) VALUES ({placeholders})",
+                    [tuple(record.get(column) for column in self.COLUMNS) for record in accepted]
+                )
+                cursor.executemany(
+                    "INSERT INTO user_preferences (user_id, theme, language) "
+                    "SELECT id, 'system', 'en' FROM users WHERE username = ?",
+                    [(record['username'],) for record in accepted]
+                )
+            cursor.execute("ROLLBACK" if dry_run else "COMMIT")
+            report['imported'] += len(accepted)
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                cursor.execute("ROLLBACK")
+            self.logger.error(f"Database error importing users: {e}")
+            for line, record in chunk:
+                report['errors'].append(self._issue(line, record, f"Database error: {e}"))
+
+
+def write_report(report, path):
+    """
+    Write a report's conflicts and errors to a CSV file.
+
+    Args:
+        report (dict): Result of UserImporter.import_file()
+        path (str): CSV file to create
+    """
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['type', 'line', 'username', 'email', 'reason'])
+        writer.writeheader()
+        for kind in ('conflicts', 'errors'):
+            for issue in report[kind]:
+                writer.writerow({'type': kind[:-1], **issue})
+
+
+def _benchmark_import(employees=3000):
+    """Compare bulk import against one register-style transaction per employee."""
+    import shutil
+    import tempfile
+    from App.core.database._db_migration import DatabaseMigration
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        rows = [(i + 2, {'username': f"emp{i}", 'name': f"Employee {i}", 'email': f"emp{i}@example.com",
+                         'department': 'it', 'password': 'secret'})
+                for i in range(employees)]
+        # A few conflicts, as a real branch export would have
+        rows += [(employees + 2, {'username': 'admin', 'name': 'Dup', 'email': 'dup@example.com'}),
+                 (employees + 3, {'username': 'emp0b', 'name': 'Dup', 'email': 'emp0@example.com'})]
+
+        results = {}
+        for mode in ('bulk', 'per_row'):
+            migration = DatabaseMigration()
+            migration.db_path = os.path.join(temp_dir, f'{mode}.db')
+            migration.run_migrations()
+
+            start = time.perf_counter()
+            if mode == 'bulk':
+                report = UserImporter(migration.db_path).import_rows(iter(rows))
+            else:
+                # What per-user register() calls cost: a connection and a commit each
+                for _, row in rows[:employees]:
+                    conn = sqlite3.connect(migration.db_path)
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    cursor = conn.execute(
+                        "INSERT INTO users (username, password, fullname, email, role) VALUES (?, ?, ?, ?, 'user')",
+                        (row['username'], row['password'], row['name'], row['email']))
+                    conn.execute("INSERT INTO user_preferences (user_id, theme, language) VALUES (?, 'system', 'en')",
+                                 (cursor.lastrowid,))
+                    conn.commit()
+                    conn.close()
+            results[mode] = time.perf_counter() - start
+
+        print(f"Import of {employees} employees")
+        print(f"  bulk       : {results['bulk']:.2f}s ({employees / results['bulk']:,.0f} rows/s)")
+        print(f"  per-row    : {results['per_row']:.2f}s ({employees / results['per_row']:,.0f} rows/s)")
+        print(f"  conflicts  : {len(report['conflicts'])}, errors: {len(report['errors'])}")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import employees from CSV or JSON")
+    parser.add_argument('path', nargs='?', help="CSV, JSON or JSON Lines file")
+    parser.add_argument('--report', help="Write conflicts and errors to this CSV file")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--dry-run', action='store_true', help="Validate only; do not write")
+    parser.add_argument('--benchmark', type=int, metavar='N', help="Benchmark with N generated employees")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        _benchmark_import(args.benchmark)
+        return 0
+    if not args.path:
+        parser.error("a file to import is required")
+
+    report = UserImporter(chunk_size=args.chunk_size).import_file(args.path, args.dry_run)
+    print(f"{'Validated' if args.dry_run else 'Imported'} {report['imported']} users in {report['elapsed']:.2f}s")
+    print(f"  conflicts  : {len(report['conflicts'])}")
+    print(f"  errors     : {len(report['errors'])}")
+    if args.report:
+        write_report(report, args.report)
+        print(f"  report     : {args.report}")
+    return 1 if report['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
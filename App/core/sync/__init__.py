@@ -0,0 +1,4 @@
+"""
+Synchronization of local data to external services.
+"""
+from ._sheet_sync import AttendanceSheetSync, GspreadClient, MemorySheetClient, SheetClient, start_from_config
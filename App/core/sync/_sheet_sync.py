@@ -0,0 +1,398 @@
+"""
+Incremental attendance sync to a spreadsheet (Google Sheets).
+
+Each run pushes only user_attendance rows created or changed since the last
+run, found through an (updated_at, id) watermark over
+idx_user_attendance_updated and stored in app_settings per sheet. The sheet
+keeps one row per attendance record, keyed by the record id in column A:
+
+- The id column is read once per session to learn where every record lives.
+- Changed records are rewritten in place and new records appended, with
+  adjacent rows merged into ranges, so a run costs a single batch write
+  however many rows changed.
+- Failed calls are retried with exponential backoff; the watermark only
+  advances after the write succeeded, so nothing is skipped.
+
+The engine talks to a SheetClient. GspreadClient is the real one;
+MemorySheetClient keeps the sheet in memory for tests and benchmarks.
+AttendanceSheetSync.start() runs the engine on a background thread, every
+interval and shortly after each attendance write.
+"""
+import os
+import json
+import random
+import sqlite3
+import logging
+import threading
+from abc import ABC, abstractmethod
+
+# updated_at has one-second resolution; rows from the last few seconds wait for
+# the next run so a later write in the same second cannot slip behind the watermark
+SETTLE_SECONDS = 2
+HEADER = ['id', 'username', 'fullname', 'date', 'check_in', 'check_out', 'hours', 'status', 'notes',
+          'updated_at']
+DEFAULT_BATCH_ROWS = 1000
+
+
+def _column_letter(number):
+    letters = ''
+    while number:
+        number, remainder = divmod(number - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def merge_row_updates(updates):
+    """
+    Merge row writes into contiguous ranges.
+
+    Args:
+        updates (dict): Sheet row number (1-based) -> list of cell values
+
+    Returns:
+        list: (first row, list of rows) per run of adjacent rows, in row order
+    """
+    ranges = []
+    for row_number in sorted(updates):
+        if ranges and ranges[-1][0] + len(ranges[-1][1]) == row_number:
+            ranges[-1][1].append(updates[row_number])
+        else:
+            ranges.append((row_number, [updates[row_number]]))
+    return ranges
+
+
+class SheetClient(ABC):
+    """
+    Minimal sheet interface used by the sync engine.
+    """
+
+    @abstractmethod
+    def read_ids(self):
+        """Return the values of column A, header included."""
+
+    @abstractmethod
+    def write_ranges(self, ranges):
+        """
+        Write several blocks of rows in one request, growing the sheet if needed.
+
+        Args:
+            ranges: List of (first row number, list of rows) from merge_row_updates()
+        """
+
+    def is_retryable(self, error):
+        """Whether a failed call is worth retrying (network trouble, rate limits)."""
+        return isinstance(error, (OSError, TimeoutError, ConnectionError))
+
+
+class GspreadClient(SheetClient):
+    """
+    Google Sheets through gspread with a service account.
+    """
+
+    SCOPES = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
+
+    def __init__(self, credentials_path, spreadsheet, worksheet='Attendance'):
+        """
+        Open the worksheet, creating it if missing.
+
+        Args:
+            credentials_path (str): Service account JSON key file
+            spreadsheet (str): Spreadsheet key or full URL
+            worksheet (str): Worksheet title
+        """
+        import gspread
+        from oauth2client.service_account import ServiceAccountCredentials
+
+        credentials = ServiceAccountCredentials.from_json_keyfile_name(credentials_path, self.SCOPES)
+        client = gspread.authorize(credentials)
+        if spreadsheet.startswith('http'):
+            book = client.open_by_url(spreadsheet)
+        else:
+            book = client.open_by_key(spreadsheet)
+        try:
+            self.sheet = book.worksheet(worksheet)
+        except gspread.exceptions.WorksheetNotFound:
+            self.sheet = book.add_worksheet(title=worksheet, rows=1000, cols=len(HEADER))
+        self._api_error = gspread.exceptions.APIError
+
+    def read_ids(self):
+        return self.sheet.col_values(1)
+
+    def write_ranges(self, ranges):
+        last_row = max(first + len(rows) - 1 for first, rows in ranges)
+        if last_row > self.sheet.row_count:
+            self.sheet.add_rows(last_row - self.sheet.row_count + 500)
+        self.sheet.batch_update([
+            {
+                'range': f"A{first}:{_column_letter(len(rows[0]))}{first + len(rows) - 1}",
+                'values': rows,
+            }
+            for first, rows in ranges
+        ], value_input_option='RAW')
+
+    def is_retryable(self, error):
+        if isinstance(error, self._api_error):
+            status = getattr(getattr(error, 'response', None), 'status_code', None)
+            return status in (429, 500, 502, 503, 504)
+        return super().is_retryable(error)
+
+
+class MemorySheetClient(SheetClient):
+    """
+    In-memory sheet for tests; counts requests and can fail on purpose.
+    """
+
+    def __init__(self, fail_next=0):
+        self.rows = []
+        self.requests = 0
+        self.fail_next = fail_next
+
+    def _request(self):
+        self.requests += 1
+        if self.fail_next:
+            self.fail_next -= 1
+            raise ConnectionError("simulated network failure")
+
+    def read_ids(self):
+        self._request()
+        return [row[0] if row else '' for row in self.rows]
+
+    def write_ranges(self, ranges):
+        self._request()
+        for first, rows in ranges:
+            while len(self.rows) < first + len(rows) - 1:
+                self.rows.append([])
+            for offset, row in enumerate(rows):
+                self.rows[first - 1 + offset] = list(row)
+
+
+class AttendanceSheetSync:
+    """
+    Pushes new and changed attendance rows to a sheet.
+    """
+
+    def __init__(self, client, db_path, sheet_id='default', batch_rows=DEFAULT_BATCH_ROWS,
+                 max_attempts=5, backoff_seconds=1.0):
+        """
+        Initialize the sync engine.
+
+        Args:
+            client: Destination SheetClient, or a callable returning one; the
+                callable runs on the first sync (on the background thread when
+                started), so opening the sheet never blocks the caller
+            db_path (str): Database file
+            sheet_id (str): Identifies the destination; each gets its own watermark
+            batch_rows (int): Maximum rows per batch write
+            max_attempts (int): Tries per sheet call before giving up until the next run
+            backoff_seconds (float): First retry delay; doubled on each retry
+        """
+        self.logger = logging.getLogger('main.sync')
+        self.client = client
+        self.db_path = db_path
+        self.setting_key = f"sheet_sync_watermark:{sheet_id}"
+        self.batch_rows = batch_rows
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self._row_by_id = None
+        self._next_row = None
+        self._thread = None
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+
+    def _call(self, fn, *args):
+        """Run a sheet call, retrying transient failures with exponential backoff."""
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return fn(*args)
+            except Exception as e:
+                if attempt == self.max_attempts or not self.client.is_retryable(e):
+                    raise
+                delay = self.backoff_seconds * 2 ** (attempt - 1) * random.uniform(0.8, 1.2)
+                self.logger.warning("Sheet call failed (%s), retry %d/%d in %.1fs",
+                                    e, attempt, self.max_attempts - 1, delay)
+                if self._stopping.wait(delay):
+                    raise
+
+    def _load_row_map(self):
+        """Learn which sheet row holds each record from the id column."""
+        ids = self._call(self.client.read_ids)
+        self._row_by_id = {}
+        for row_number, value in enumerate(ids, 1):
+            if row_number > 1 and str(value).isdigit():
+                self._row_by_id[int(value)] = row_number
+        self._next_row = max(len(ids), 1) + 1
+        return not ids
+
+    def _read_watermark(self, conn):
+        row = conn.execute("SELECT value FROM app_settings WHERE key = ?", (self.setting_key,)).fetchone()
+        if not row:
+            return None
+        try:
+            value = json.loads(row[0])
+            return value['updated_at'], value['id']
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def _write_watermark(self, conn, watermark):
+        conn.execute(
+            "INSERT INTO app_settings (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = CURRENT_TIMESTAMP",
+            (self.setting_key, json.dumps({'updated_at': watermark[0], 'id': watermark[1]}))
+        )
+        conn.commit()
+
+    def _fetch_changes(self, conn, watermark):
+        query = (
+            "SELECT a.id, u.username, u.fullname, a.full_date, a.check_in_time, a.check_out_time, "
+            "a.working_hours, a.status, a.notes, a.updated_at "
+            "FROM user_attendance a LEFT JOIN users u ON u.id = a.user_id "
+        )
+        query += f"WHERE a.updated_at < datetime('now', '-{SETTLE_SECONDS} seconds') "
+        params = []
+        if watermark:
+            query += "AND (a.updated_at, a.id) > (?, ?) "
+            params.extend(watermark)
+        query += "ORDER BY a.updated_at, a.id LIMIT ?"
+        params.append(self.batch_rows)
+        return conn.execute(query, params).fetchall()
+
+    @staticmethod
+    def _to_cells(row):
+        cells = ['' if value is None else value for value in row]
+        if isinstance(cells[6], float):
+            cells[6] = round(cells[6], 2)
+        return cells
+
+    def sync_once(self):
+        """
+        Push everything changed since the last run.
+
+        Returns:
+            int: Number of rows written
+
+        Raises:
+            Exception: The sheet error when retries are exhausted (the watermark
+                is left where it was, so the next run starts from the same place)
+        """
+        if not isinstance(self.client, SheetClient):
+            self.client = self.client()
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            watermark = self._read_watermark(conn)
+            if self._row_by_id is None:
+                sheet_empty = self._load_row_map()
+                if sheet_empty:
+                    # New or cleared sheet: write the header and send everything again
+                    self._call(self.client.write_ranges, [(1, [HEADER])])
+                    watermark = None
+
+            written = 0
+            while not self._stopping.is_set():
+                rows = self._fetch_changes(conn, watermark)
+                if not rows:
+                    break
+                updates = {}
+                for row in rows:
+                    row_number = self._row_by_id.get(row[0])
+                    if row_number is None:
+                        row_number = self._next_row
+                        self._next_row += 1
+                        self._row_by_id[row[0]] = row_number
+                    updates[row_number] = self._to_cells(row)
+                try:
+                    self._call(self.client.write_ranges, merge_row_updates(updates))
+                except Exception:
+                    # Positions handed out for unwritten rows are unknown to the sheet
+                    self._row_by_id = None
+                    raise
+                watermark = (rows[-1][-1], rows[-1][0])
+                self._write_watermark(conn, watermark)
+                written += len(rows)
+                if len(rows) < self.batch_rows:
+                    break
+            if written:
+                self.logger.info("Synced %d attendance rows to the sheet", written)
+            return written
+        finally:
+            conn.close()
+
+    def start(self, interval_seconds=300, debounce_seconds=5):
+        """
+        Sync on a background thread every interval, and soon after attendance writes.
+
+        Args:
+            interval_seconds (float): Time between scheduled runs
+            debounce_seconds (float): Delay after a write, to group nearby punches
+        """
+        if self._thread is not None:
+            return
+        from App.core.database._db_user_attendance import attendance_db
+        attendance_db.add_listener(self._on_attendance_written)
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval_seconds, debounce_seconds),
+                                        name='sheet-sync', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        """Stop the background thread."""
+        if self._thread is None:
+            return
+        from App.core.database._db_user_attendance import attendance_db
+        attendance_db.remove_listener(self._on_attendance_written)
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _on_attendance_written(self, user_id, event, record):
+        self._wake.set()
+
+    def _run(self, interval_seconds, debounce_seconds):
+        while not self._stopping.is_set():
+            try:
+                self.sync_once()
+            except Exception as e:
+                self.logger.error("Attendance sheet sync failed: %s", e)
+            woken = self._wake.wait(interval_seconds)
+            self._wake.clear()
+            if woken and not self._stopping.is_set():
+                # Let a burst of punches settle into one run
+                self._stopping.wait(debounce_seconds)
+
+
+def start_from_config(base_dir, config):
+    """
+    Start the background sync if the "sheet_sync" config section enables it.
+
+    Args:
+        base_dir (str): Project root directory
+        config (dict): Application configuration
+
+    Returns:
+        AttendanceSheetSync, or None if disabled or not configured
+    """
+    logger = logging.getLogger('main.sync')
+    settings = config.get('sheet_sync', {})
+    if not settings.get('enabled') or not settings.get('spreadsheet'):
+        return None
+
+    db_path = config['database']['path']
+    if not os.path.isabs(db_path):
+        db_path = os.path.join(base_dir, db_path)
+    credentials = settings.get('credentials', 'UserData/google_credentials.json')
+    if not os.path.isabs(credentials):
+        credentials = os.path.join(base_dir, credentials)
+
+    spreadsheet = settings['spreadsheet']
+    worksheet = settings.get('worksheet', 'Attendance')
+    sheet_id = f"{spreadsheet}/{worksheet}"
+
+    def open_client():
+        # Runs on the sync thread; failures are logged and retried on the next run
+        return GspreadClient(credentials, spreadsheet, worksheet)
+
+    sync = AttendanceSheetSync(open_client, db_path, sheet_id,
+                               batch_rows=settings.get('batch_rows', DEFAULT_BATCH_ROWS))
+    sync.start(settings.get('interval_seconds', 300), settings.get('debounce_seconds', 5))
+    logger.info("Attendance sheet sync started (every %ss)", settings.get('interval_seconds', 300))
+    return sync
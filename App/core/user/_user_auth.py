@@ -20,7 +20,7 @@ class UserAuth:
         self.app = app_instance
         self.current_user = None
         self.conn = None
-        self.logger = logging.getLogger('main')
+        self.logger = logging.getLogger('main.auth')
         
         # Initialize settings with defaults
         self.settings = {
@@ -125,18 +125,13 @@ class UserAuth:
         """Connect to the SQLite database."""
         try:
             if not self.conn:
-                # Print database path for debugging
-                print(f"UserAuth connecting to database: {self.db_path}")
+                self.logger.debug("UserAuth connecting to database: %s", self.db_path)
                 
                 self.conn = sqlite3.connect(self.db_path)
                 self.conn.row_factory = sqlite3.Row  # Use dictionary-like rows
-                
-                print(f"UserAuth database connection successful: {self.db_path}")
             return True
         except sqlite3.Error as e:
-            self.logger.error(f"Database connection error: {e}")
-            print(f"UserAuth database connection failed: {self.db_path}")
-            print(f"Error: {e}")
+            self.logger.error("UserAuth connection failed: %s (%s)", self.db_path, e)
             return False
     
     def _close_db(self):
@@ -24,7 +24,7 @@ class SessionHandler:
         """
         try:
             self.user_data = dict(user_data) if user_data else None
-            self.logger.debug(f"Session: User data set for {self.get_username()}")
+            self.logger.debug("Session: User data set for %s", self.get_username())
         except Exception as e:
             self.logger.error(f"Error setting user data: {e}")
             self.user_data = None
@@ -40,7 +40,7 @@ class SessionHandler:
     
     def clear_session(self):
         """Clear the current session."""
-        self.logger.debug(f"Session: Cleared for user {self.get_username()}")
+        self.logger.debug("Session: Cleared for user %s", self.get_username())
         self.user_data = None
         
     def is_logged_in(self):
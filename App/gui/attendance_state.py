@@ -0,0 +1,143 @@
+"""
+Shared in-memory attendance state.
+
+Widgets that show whether a user is checked in subscribe to
+attendance_state.state_changed instead of querying the database on every
+show. The store is updated directly by the attendance write paths
+(check_in/check_out listeners) and only goes back to the database on
+login, on first use for a user, or when PRAGMA data_version reports that
+another connection (e.g. a second app instance) committed changes.
+"""
+import sqlite3
+import logging
+from PyQt6.QtCore import QObject, QTimer, Qt, pyqtSignal
+from App.core.database._db_user_attendance import attendance_db
+from App.core.user._user_session_handler import session
+
+
+class AttendanceStateStore(QObject):
+    """Caches per-user attendance status and broadcasts changes."""
+
+    # user_id, state dict (see _make_state)
+    state_changed = pyqtSignal(int, object)
+
+    POLL_INTERVAL_MS = 5000
+
+    def __init__(self):
+        super().__init__()
+        self.logger = logging.getLogger('main')
+        self._states = {}
+        self._conn = None
+        self._data_version = None
+        self._poll_timer = None
+        attendance_db.add_listener(self._on_attendance_written)
+
+    @staticmethod
+    def _make_state(open_record=None, last_check_in=None, last_check_out=None):
+        return {
+            'checked_in': open_record is not None,
+            'open_record': open_record,
+            'last_check_in': last_check_in,
+            'last_check_out': last_check_out,
+        }
+
+    def get(self, user_id=None):
+        """
+        Get the cached attendance state, loading it on first use.
+
+        Args:
+            user_id: User to look up; defaults to the logged-in user
+
+        Returns:
+            State dict with 'checked_in', 'open_record', 'last_check_in' and
+            'last_check_out', or None if no user is available
+        """
+        if user_id is None:
+            user_id = session.get_user_id()
+            if not user_id:
+                return None
+        if user_id not in self._states:
+            self.reconcile(user_id)
+        return self._states.get(user_id)
+
+    def is_checked_in(self, user_id=None):
+        """Return True if the user has an open check-in record."""
+        state = self.get(user_id)
+        return bool(state and state['checked_in'])
+
+    def reconcile(self, user_id=None):
+        """
+        Reload a user's state from the database and emit if it changed.
+
+        Args:
+            user_id: User to reload; defaults to the logged-in user
+
+        Returns:
+            True if the state was loaded, False otherwise
+        """
+        if user_id is None:
+            user_id = session.get_user_id()
+            if not user_id:
+                return False
+        loaded = attendance_db.get_attendance_state(user_id)
+        if loaded is None:
+            return False
+        self._set_state(user_id, self._make_state(**loaded))
+        self._data_version = self._read_data_version()
+        self._start_polling()
+        return True
+
+    def _set_state(self, user_id, state):
+        if self._states.get(user_id) == state:
+            return
+        self._states[user_id] = state
+        self.state_changed.emit(user_id, state)
+
+    def _on_attendance_written(self, user_id, event, record):
+        """Apply a committed check-in/check-out without re-querying."""
+        current = self._states.get(user_id)
+        if current is None:
+            # Nothing cached yet; load the full picture once
+            self.reconcile(user_id)
+            return
+        if event == 'check_in':
+            state = self._make_state(record, record, current['last_check_out'])
+        else:
+            state = self._make_state(None, current['last_check_in'], record)
+        self._set_state(user_id, state)
+        # Our own commit bumps data_version; take it as the new baseline
+        self._data_version = self._read_data_version()
+
+    def _read_data_version(self):
+        """Read PRAGMA data_version on the store's long-lived connection."""
+        try:
+            if self._conn is None:
+                self._conn = sqlite3.connect(attendance_db.db_path, timeout=5)
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error as e:
+            self.logger.error(f"Error reading attendance data_version: {e}")
+            if self._conn:
+                self._conn.close()
+            self._conn = None
+            return None
+
+    def _start_polling(self):
+        if self._poll_timer is None:
+            self._poll_timer = QTimer(self)
+            self._poll_timer.setTimerType(Qt.TimerType.VeryCoarseTimer)
+            self._poll_timer.timeout.connect(self._check_external_changes)
+        if not self._poll_timer.isActive():
+            self._poll_timer.start(self.POLL_INTERVAL_MS)
+
+    def _check_external_changes(self):
+        """Reconcile cached users when another connection has committed."""
+        version = self._read_data_version()
+        if version is None or version == self._data_version:
+            return
+        self.logger.debug("Attendance data changed externally, reconciling")
+        for user_id in list(self._states):
+            self.reconcile(user_id)
+
+
+# Create a global instance for easy import
+attendance_state = AttendanceStateStore()
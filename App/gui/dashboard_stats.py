@@ -0,0 +1,165 @@
+"""
+Attendance statistics for the user dashboard.
+
+Every card on the dashboard is derived from one per-day aggregate query over
+the current month of user_attendance (see
+UserAttendanceDB.get_daily_summary), run on a worker thread. The per-day
+rows are cached per user:
+
+- Opening the dashboard again shows the cached values immediately and does
+  not query at all unless the month changed or the cache was invalidated.
+- A check-in or check-out (local, or picked up from another instance by
+  attendance_state) only re-aggregates the day it touched and folds it into
+  the cached month.
+
+Widgets call get() for the last known values, refresh() to bring them up to
+date and listen to stats_changed.
+"""
+import datetime
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, pyqtSignal
+from App.core.database._db_user_attendance import attendance_db
+from App.gui.attendance_state import attendance_state
+
+
+def month_bounds(day):
+    """Return the first and last date of day's month."""
+    first = day.replace(day=1)
+    next_month = (first + datetime.timedelta(days=32)).replace(day=1)
+    return first, next_month - datetime.timedelta(days=1)
+
+
+def summarize_days(days, today):
+    """
+    Fold per-day aggregates into the dashboard card values.
+
+    Args:
+        days: full_date -> day aggregate, as returned by get_daily_summary()
+        today: datetime.date used for the remaining-workdays count
+
+    Returns:
+        dict with 'ongoing', 'finished' and 'remaining' day counts, the
+        'present', 'absent', 'sick' and 'permission' day counts,
+        'workdays', 'total_hours' and 'avg_hours'
+    """
+    hours = sum(day['hours'] for day in days.values())
+    worked_days = sum(1 for day in days.values() if day['closed'])
+
+    # Weekdays from today to the end of the month without any record yet
+    _, last = month_bounds(today)
+    remaining = 0
+    day = today
+    while day <= last:
+        if day.weekday() < 5 and day.isoformat() not in days:
+            remaining += 1
+        day += datetime.timedelta(days=1)
+
+    return {
+        'ongoing': sum(1 for day in days.values() if day['open']),
+        'finished': worked_days,
+        'remaining': remaining,
+        'present': sum(day['present'] or 0 for day in days.values()),
+        'absent': sum(day['absent'] or 0 for day in days.values()),
+        'sick': sum(day['sick'] or 0 for day in days.values()),
+        'permission': sum(day['permission'] or 0 for day in days.values()),
+        'workdays': len(days),
+        'total_hours': round(hours, 1),
+        'avg_hours': round(hours / worked_days, 1) if worked_days else 0,
+    }
+
+
+class DashboardStatsProvider(QObject):
+    """Loads dashboard statistics off the GUI thread and keeps them current."""
+
+    # user_id, stats dict (see summarize_days)
+    stats_changed = pyqtSignal(int, object)
+
+    # Worker -> GUI thread: user_id, month, day (None for the whole month), summary
+    _loaded = pyqtSignal(int, str, object, object)
+
+    def __init__(self):
+        super().__init__()
+        self.logger = logging.getLogger('main')
+        self._cache = {}  # user_id -> {'month', 'days', 'stats'}
+        self._stale = set()
+        self._executor = None
+        self._loaded.connect(self._on_loaded)
+        attendance_state.state_changed.connect(self._on_state_changed)
+
+    def get(self, user_id):
+        """Return the last computed stats for a user, or None if never loaded."""
+        entry = self._cache.get(user_id)
+        return entry['stats'] if entry else None
+
+    def refresh(self, user_id):
+        """
+        Bring a user's stats up to date.
+
+        Reloads the month in the background if nothing is cached, the month
+        rolled over or the user was invalidated; otherwise only recomputes
+        the values that depend on today's date.
+        """
+        if not user_id:
+            return
+        today = datetime.date.today()
+        entry = self._cache.get(user_id)
+        if entry is None or entry['month'] != today.strftime('%Y-%m') or user_id in self._stale:
+            self._stale.discard(user_id)
+            self._submit(user_id, today)
+        else:
+            self._publish(user_id, entry, today)
+
+    def invalidate(self, user_id=None):
+        """Force the next refresh() to reload from the database (all users if None)."""
+        self._stale.update(self._cache if user_id is None else (user_id,))
+
+    def _submit(self, user_id, today, day=None):
+        if self._executor is None:
+            # One worker keeps results in submission order
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='dashboard-stats')
+        self._executor.submit(self._load, user_id, today, day)
+
+    def _load(self, user_id, today, day):
+        """Worker thread: run the aggregate for the month or a single day."""
+        first, last = month_bounds(today)
+        start, end = (day, day) if day else (first.isoformat(), last.isoformat())
+        summary = attendance_db.get_daily_summary(user_id, start, end)
+        self._loaded.emit(user_id, today.strftime('%Y-%m'), day, summary)
+
+    def _on_loaded(self, user_id, month, day, summary):
+        if summary is None:
+            return
+        entry = self._cache.get(user_id)
+        if day is None:
+            entry = {'month': month, 'days': summary, 'stats': None}
+            self._cache[user_id] = entry
+        elif entry is None or entry['month'] != month:
+            # A full reload is pending or the month moved on; it includes this day
+            return
+        else:
+            entry['days'].pop(day, None)
+            entry['days'].update(summary)
+        self._publish(user_id, entry, datetime.date.today())
+
+    def _publish(self, user_id, entry, today):
+        stats = summarize_days(entry['days'], today)
+        if stats != entry['stats']:
+            entry['stats'] = stats
+            self.stats_changed.emit(user_id, stats)
+
+    def _on_state_changed(self, user_id, state):
+        """Re-aggregate only the days touched by a check-in or check-out."""
+        entry = self._cache.get(user_id)
+        if entry is None:
+            return
+        days = {record['full_date'] for record in (state['open_record'], state['last_check_in'],
+                                                   state['last_check_out'])
+                if record and str(record['full_date']).startswith(entry['month'])}
+        today = datetime.date.today()
+        for day in days:
+            self._submit(user_id, today, str(day))
+
+
+# Create a global instance for easy import
+dashboard_stats = DashboardStatsProvider()
@@ -0,0 +1,117 @@
+"""
+Single-instance guard for the GUI.
+
+The first instance holds a lock file for the install and listens on a local
+socket. Later launches forward their arguments there (see
+App.utils.single_instance) and exit; the running instance raises its window
+and acts on them through command_received. The guard is released as soon as
+the application starts quitting, so a relaunch (e.g. after an update) is not
+forwarded to the instance that is going away.
+"""
+import json
+import time
+import logging
+from PyQt6.QtCore import QObject, QLockFile, pyqtSignal
+from PyQt6.QtNetwork import QLocalServer
+from ..utils.single_instance import ACK, server_name, lock_path, forward_arguments
+
+MAX_MESSAGE_BYTES = 64 * 1024
+
+
+class InstanceGuard(QObject):
+    """Owns the instance lock and the local server receiving forwarded arguments."""
+
+    command_received = pyqtSignal(list)
+
+    def __init__(self):
+        super().__init__()
+        self.logger = logging.getLogger('main')
+        self._lock = None
+        self._server = None
+        self._base_dir = None
+
+    def acquire(self, base_dir, args, wait_ms=5000):
+        """
+        Become the primary instance, or forward args to the one already running.
+
+        Waits up to wait_ms when another instance holds the lock but is not
+        accepting connections yet (still starting up, or shutting down).
+
+        Args:
+            base_dir: Project root directory
+            args: This launch's command line arguments
+            wait_ms: How long to wait for the lock
+
+        Returns:
+            True if this process is the primary instance and should continue
+        """
+        self._base_dir = base_dir
+        self._lock = QLockFile(lock_path(base_dir))
+        # Only a dead owner makes the lock stale, however long it has been held
+        self._lock.setStaleLockTime(0)
+
+        deadline = time.monotonic() + wait_ms / 1000
+        while True:
+            if self._lock.tryLock(100):
+                return True
+            if forward_arguments(base_dir, args):
+                self.logger.info("Forwarded %s to the running instance", args)
+                return False
+            if time.monotonic() >= deadline:
+                self.logger.error("Another instance holds %s but is not responding", lock_path(base_dir))
+                return False
+
+    def listen(self):
+        """Start accepting forwarded arguments (needs a QApplication)."""
+        if self._lock is None or not self._lock.isLocked():
+            return False
+        name = server_name(self._base_dir)
+        # Holding the lock means any existing socket is left over from a crash
+        QLocalServer.removeServer(name)
+        self._server = QLocalServer(self)
+        self._server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self._server.newConnection.connect(self._on_new_connection)
+        if not self._server.listen(name):
+            self.logger.error("Single-instance server failed to listen on %s: %s",
+                              name, self._server.errorString())
+            return False
+        return True
+
+    def release(self):
+        """Stop accepting arguments and drop the lock."""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        if self._lock is not None and self._lock.isLocked():
+            self._lock.unlock()
+
+    def _on_new_connection(self):
+        while self._server is not None and self._server.hasPendingConnections():
+            connection = self._server.nextPendingConnection()
+            buffer = bytearray()
+            connection.readyRead.connect(lambda c=connection, b=buffer: self._on_ready_read(c, b))
+            connection.disconnected.connect(connection.deleteLater)
+
+    def _on_ready_read(self, connection, buffer):
+        buffer.extend(bytes(connection.readAll()))
+        if b'\n' not in buffer:
+            if len(buffer) > MAX_MESSAGE_BYTES:
+                connection.abort()
+            return
+        line = bytes(buffer).split(b'\n', 1)[0]
+        try:
+            args = json.loads(line)
+            if not isinstance(args, list):
+                raise ValueError("expected a list")
+        except ValueError as e:
+            self.logger.warning("Ignoring malformed instance message: %s", e)
+            connection.abort()
+            return
+        connection.write(ACK + b'\n')
+        connection.flush()
+        connection.disconnectFromServer()
+        self.command_received.emit([str(arg) for arg in args])
+
+
+# Create a global instance for easy import
+instance_guard = InstanceGuard()
@@ -0,0 +1,75 @@
+"""
+Live language switching for the GUI.
+
+Widgets register their translatable text with the global notifier via
+bind(). Switching language re-applies every binding in place and emits
+language_changed for widgets that format text themselves (dates etc.),
+so no application restart is needed.
+"""
+import weakref
+import logging
+from PyQt6 import sip
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtWidgets import QApplication
+
+
+class LanguageNotifier(QObject):
+    """Broadcasts language changes and retranslates bound widgets."""
+
+    language_changed = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.logger = logging.getLogger('main')
+        self._bindings = []
+
+    def _translate(self, keys, template, default):
+        catalog = QApplication.instance().BASE_DIR.translations
+        text = catalog.get('.'.join(keys), default if default is not None else keys[-1])
+        return template.format(text)
+
+    def bind(self, target, setter, *keys, template="{}", default=None):
+        """
+        Set translated text on a widget now and keep it updated on language switch.
+
+        Args:
+            target: Widget, action or menu receiving the text
+            setter: Name of the setter method (e.g. 'setText', 'setToolTip')
+            *keys: Translation key path
+            template: Format string wrapping the translated text
+            default: Text used when the key is missing in every language
+        """
+        getattr(target, setter)(self._translate(keys, template, default))
+        self._bindings.append((weakref.ref(target), setter, keys, template, default))
+        return target
+
+    def switch_language(self, language):
+        """
+        Activate a language and retranslate all live bindings.
+
+        Args:
+            language: Language code to activate
+
+        Returns:
+            True if the language changed, False otherwise
+        """
+        if not QApplication.instance().BASE_DIR.set_language(language):
+            return False
+
+        alive = []
+        for binding in self._bindings:
+            ref, setter, keys, template, default = binding
+            target = ref()
+            if target is None or sip.isdeleted(target):
+                continue
+            getattr(target, setter)(self._translate(keys, template, default))
+            alive.append(binding)
+        self._bindings = alive
+
+        self.logger.info(f"Language switched to '{language}' ({len(alive)} bindings updated)")
+        self.language_changed.emit(language)
+        return True
+
+
+# Create a global instance for easy import
+language_notifier = LanguageNotifier()
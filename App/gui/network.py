@@ -0,0 +1,88 @@
+"""
+Shared network access with a persistent disk cache.
+
+All Qt network requests go through one QNetworkAccessManager backed by a
+QNetworkDiskCache in UserData/cache/network, capped by the
+network.cache_size_mb config setting. Requests prefer the cache; when the
+network is unreachable, a stale cached copy is served instead so remote
+images (e.g. README badges) still show offline.
+"""
+import logging
+from PyQt6.QtCore import QObject, QUrl, QStandardPaths
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtNetwork import QNetworkAccessManager, QNetworkDiskCache, QNetworkRequest, QNetworkReply
+
+DEFAULT_CACHE_SIZE_MB = 50
+
+
+class NetworkCache(QObject):
+    """Owns the application-wide network manager and its disk cache."""
+
+    def __init__(self):
+        super().__init__()
+        self.logger = logging.getLogger('main.network')
+        self._manager = None
+
+    @property
+    def manager(self):
+        """The shared QNetworkAccessManager, created on first use."""
+        if self._manager is None:
+            # Created lazily so the global instance can be imported before QApplication exists
+            self._manager = QNetworkAccessManager(self)
+            disk_cache = QNetworkDiskCache(self)
+            disk_cache.setCacheDirectory(self._cache_directory())
+            disk_cache.setMaximumCacheSize(self._cache_size_mb() * 1024 * 1024)
+            self._manager.setCache(disk_cache)
+        return self._manager
+
+    def _cache_directory(self):
+        app = QApplication.instance()
+        if app is not None and hasattr(app, 'BASE_DIR'):
+            return app.BASE_DIR.get_path('UserData', 'cache', 'network')
+        return QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+
+    def _cache_size_mb(self):
+        app = QApplication.instance()
+        if app is not None and hasattr(app, 'BASE_DIR'):
+            return app.BASE_DIR.config.get('network', {}).get('cache_size_mb', DEFAULT_CACHE_SIZE_MB)
+        return DEFAULT_CACHE_SIZE_MB
+
+    def get(self, url, callback):
+        """
+        Fetch a URL, preferring the cache and falling back to stale copies offline.
+
+        Args:
+            url: URL string or QUrl
+            callback: Called with (QUrl, bytes) once data is available; not
+                called if neither the network nor the cache has the resource
+        """
+        url = QUrl(url)
+        request = QNetworkRequest(url)
+        request.setAttribute(QNetworkRequest.Attribute.CacheLoadControlAttribute,
+                             QNetworkRequest.CacheLoadControl.PreferCache)
+        request.setAttribute(QNetworkRequest.Attribute.RedirectPolicyAttribute,
+                             QNetworkRequest.RedirectPolicy.NoLessSafeRedirectPolicy)
+        reply = self.manager.get(request)
+        reply.finished.connect(lambda: self._on_finished(reply, url, callback))
+
+    def _on_finished(self, reply, url, callback):
+        try:
+            if reply.error() == QNetworkReply.NetworkError.NoError:
+                callback(url, bytes(reply.readAll()))
+                return
+            # Offline or server error: serve whatever we cached last time. Read the
+            # entry directly; Qt refuses AlwaysCache for responses marked no-cache.
+            cached = self.manager.cache().data(url)
+            if cached is None:
+                self.logger.debug("Could not load %s: %s", url.toString(), reply.errorString())
+                return
+            self.logger.debug("Serving cached copy of %s (%s)", url.toString(), reply.errorString())
+            data = bytes(cached.readAll())
+            cached.close()
+            callback(url, data)
+        finally:
+            reply.deleteLater()
+
+
+# Create a global instance for easy import
+network_cache = NetworkCache()
@@ -0,0 +1,248 @@
+"""
+Page lifecycle management for the content stack.
+
+Pages shown in the ContentWidget stay alive while hidden so switching back
+is instant, but a hidden page should cost as little as possible:
+
+- Its active QTimer children are stopped when it is hidden and restarted
+  when it is shown again.
+- Pages may define release_resources() to drop caches (pixmaps, query
+  results) they can rebuild, and page_shown()/page_hidden() hooks.
+- Every hidden page gets an approximate memory and timer cost. When the
+  evictable hidden pages (not pinned, with a factory) together exceed the
+  configured budget, the least recently used of them are destroyed.
+  Showing one of them again recreates it through its factory. A page is
+  only evicted once it has been hidden for a grace period, so work it
+  queued just before being hidden (deferred signals, redirects) has run.
+
+Measured hidden costs are small: about 12-150 KB per tool page once
+release_resources() has dropped its images. The default budget therefore
+only evicts pages that hold real data (item models, cached images); it is a
+ceiling for those, not a target for the small pages.
+
+Pages can refine the estimate by defining memory_cost() (extra bytes held
+outside of widgets, e.g. cached images).
+"""
+import time
+import logging
+from collections import OrderedDict
+from PyQt6 import sip
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QWidget, QLabel, QAbstractItemView
+
+# Rough per-object costs; only used to rank and budget pages
+WIDGET_BYTES = 4 * 1024
+ITEM_BYTES = 256
+DEFAULT_BUDGET_MB = 4
+DEFAULT_GRACE_SECONDS = 30
+
+
+def estimate_page_cost(page):
+    """
+    Estimate what a page keeps alive.
+
+    Args:
+        page: Page widget
+
+    Returns:
+        Tuple (approximate bytes, timer wake-ups per second)
+    """
+    total = WIDGET_BYTES * (1 + len(page.findChildren(QWidget)))
+    for label in page.findChildren(QLabel):
+        pixmap = label.pixmap()
+        if pixmap is not None and not pixmap.isNull():
+            total += pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+    for view in page.findChildren(QAbstractItemView):
+        model = view.model()
+        if model is not None:
+            total += model.rowCount() * max(model.columnCount(), 1) * ITEM_BYTES
+    if hasattr(page, 'memory_cost'):
+        try:
+            total += int(page.memory_cost())
+        except Exception:
+            pass
+
+    wakeups = 0.0
+    for timer in page.findChildren(QTimer):
+        if timer.isActive() and not timer.isSingleShot():
+            wakeups += 1000 / max(timer.interval(), 1)
+    return total, wakeups
+
+
+class _PageEntry:
+    def __init__(self, page, factory, pinned):
+        self.page = page
+        self.factory = factory
+        self.pinned = pinned
+        self.cost = 0
+        self.wakeups = 0.0
+        self.paused_timers = []
+        self.last_shown = time.monotonic()
+        self.hidden_since = None
+
+    @property
+    def evictable(self):
+        return not self.pinned and self.factory is not None and self.page is not None
+
+
+class PageManager:
+    """Tracks page usage and cost, pauses hidden pages and evicts over budget."""
+
+    def __init__(self, evict_callback, budget_mb=DEFAULT_BUDGET_MB, pinned=(),
+                 grace_seconds=DEFAULT_GRACE_SECONDS):
+        """
+        Initialize the manager.
+
+        Args:
+            evict_callback: Called with (name, page) to remove a page from the UI
+            budget_mb: Memory budget for evictable hidden pages
+            pinned: Page names that are never evicted
+            grace_seconds: Minimum time a page stays hidden before it may be evicted
+        """
+        self.logger = logging.getLogger('main')
+        self._evict_callback = evict_callback
+        self.budget = int(budget_mb * 1024 * 1024)
+        self.pinned = set(pinned)
+        self.grace_seconds = grace_seconds
+        self._entries = OrderedDict()  # Least recently shown first
+        self.current = None
+
+    def register(self, name, page, factory=None, pinned=False):
+        """
+        Start managing a page.
+
+        Args:
+            name: Page name
+            page: Page widget
+            factory: Callable returning a new page; required for eviction
+            pinned: Never evict this page (also true for configured pinned names)
+        """
+        entry = self._entries.get(name)
+        if entry is None:
+            entry = _PageEntry(page, factory, pinned or name in self.pinned)
+            self._entries[name] = entry
+        else:
+            entry.page = page
+            entry.factory = factory or entry.factory
+        self._entries.move_to_end(name)
+
+    def unregister(self, name):
+        self._entries.pop(name, None)
+        if self.current == name:
+            self.current = None
+
+    def can_restore(self, name):
+        """True if the page was evicted and can be recreated."""
+        entry = self._entries.get(name)
+        return entry is not None and entry.page is None and entry.factory is not None
+
+    def restore(self, name):
+        """
+        Recreate an evicted page.
+
+        Returns:
+            The new page widget, or None if it cannot be restored
+        """
+        entry = self._entries.get(name)
+        if entry is None or entry.factory is None:
+            return None
+        page = entry.factory()
+        if page is not None:
+            entry.page = page
+            self.logger.debug("Restored page '%s'", name)
+        return page
+
+    def activate(self, name):
+        """
+        Record that a page is now shown: hide the previous one and enforce the budget.
+
+        Args:
+            name: Name of the page being shown
+        """
+        if name == self.current:
+            return
+        previous = self._entries.get(self.current)
+        if previous is not None and previous.page is not None:
+            self._deactivate(previous)
+
+        self.current = name
+        entry = self._entries.get(name)
+        if entry is None or entry.page is None:
+            return
+        self._entries.move_to_end(name)
+        entry.last_shown = time.monotonic()
+        entry.hidden_since = None
+        self._resume_timers(entry)
+        if hasattr(entry.page, 'page_shown'):
+            entry.page.page_shown()
+        self.evict_over_budget()
+
+    def _deactivate(self, entry):
+        page = entry.page
+        if sip.isdeleted(page):
+            entry.page = None
+            return
+        entry.hidden_since = time.monotonic()
+        if hasattr(page, 'page_hidden'):
+            page.page_hidden()
+        entry.cost, entry.wakeups = estimate_page_cost(page)
+        # Single-shot timers resume with what was left, repeating ones restart
+        entry.paused_timers = [(timer, timer.remainingTime())
+                               for timer in page.findChildren(QTimer) if timer.isActive()]
+        for timer, _ in entry.paused_timers:
+            timer.stop()
+        if hasattr(page, 'release_resources'):
+            page.release_resources()
+            entry.cost = estimate_page_cost(page)[0]
+
+    def _resume_timers(self, entry):
+        for timer, remaining in entry.paused_timers:
+            if sip.isdeleted(timer):
+                continue
+            if timer.isSingleShot():
+                timer.start(max(remaining, 0))
+            else:
+                timer.start()
+        entry.paused_timers = []
+
+    def hidden_cost(self):
+        """Total estimated bytes held by hidden, live, evictable pages."""
+        # Pinned pages cannot be evicted, so they do not count against the budget
+        return sum(entry.cost for name, entry in self._entries.items()
+                   if name != self.current and entry.evictable)
+
+    def evict_over_budget(self):
+        """Destroy least recently used evictable hidden pages until under budget."""
+        total = self.hidden_cost()
+        if total <= self.budget:
+            return
+        now = time.monotonic()
+        for name, entry in list(self._entries.items()):
+            if total <= self.budget:
+                break
+            if name == self.current or not entry.evictable:
+                continue
+            if entry.hidden_since is None or now - entry.hidden_since < self.grace_seconds:
+                continue
+            page = entry.page
+            entry.page = None
+            entry.paused_timers = []
+            total -= entry.cost
+            self.logger.info("Evicted page '%s' (~%.1f MB, %.1f timer wake-ups/s); %.1f MB hidden",
+                             name, entry.cost / 1048576, entry.wakeups, total / 1048576)
+            self._evict_callback(name, page)
+
+    def stats(self):
+        """
+        Describe managed pages, least recently shown first.
+
+        Returns:
+            List of dicts with name, loaded, pinned, cost_bytes and timer_wakeups
+        """
+        return [{
+            'name': name,
+            'loaded': entry.page is not None,
+            'pinned': entry.pinned,
+            'cost_bytes': entry.cost,
+            'timer_wakeups': entry.wakeups,
+        } for name, entry in self._entries.items()]
@@ -0,0 +1,121 @@
+"""
+Live set of open check-ins for the admin "who's in now" board.
+
+The store holds every open attendance record in memory. It is seeded with
+one query over the partial index of open records and only goes back to the
+database when PRAGMA data_version says another connection committed
+(another admin PC, a kiosk, the API server) or when this process wrote an
+attendance record itself. Each sync is diffed against the current set, so
+views only insert and remove the rows that changed.
+
+Polling runs only while at least one board is watching (start()/stop()).
+Durations are not stored: views compute them from 'since' on their own
+tick, so a full office costs no database work per second.
+"""
+import sqlite3
+import logging
+import datetime
+from PyQt6.QtCore import QObject, QTimer, Qt, pyqtSignal
+from App.core.database._db_user_attendance import attendance_db
+
+
+class PresenceStore(QObject):
+    """Open attendance records kept in sync through change detection."""
+
+    # Record dict (see get_open_records) plus 'since' as a datetime
+    record_added = pyqtSignal(object)
+    # Attendance record id
+    record_removed = pyqtSignal(int)
+
+    POLL_INTERVAL_MS = 2000
+
+    def __init__(self):
+        super().__init__()
+        self.logger = logging.getLogger('main')
+        self._records = {}  # attendance id -> record
+        self._watchers = 0
+        self._conn = None
+        self._data_version = None
+        self._poll_timer = None
+        attendance_db.add_listener(self._on_attendance_written)
+
+    def records(self):
+        """Return the open records, oldest check-in first."""
+        return sorted(self._records.values(), key=lambda record: record['since'])
+
+    def start(self):
+        """Begin watching: sync now and poll for changes until stop()."""
+        self._watchers += 1
+        if self._watchers > 1:
+            return
+        self.sync()
+        if self._poll_timer is None:
+            self._poll_timer = QTimer(self)
+            self._poll_timer.setTimerType(Qt.TimerType.CoarseTimer)
+            self._poll_timer.timeout.connect(self._check_changes)
+        self._poll_timer.start(self.POLL_INTERVAL_MS)
+
+    def stop(self):
+        """Stop watching; polling ends when the last watcher stops."""
+        self._watchers = max(self._watchers - 1, 0)
+        if self._watchers == 0 and self._poll_timer is not None:
+            self._poll_timer.stop()
+
+    def sync(self):
+        """Reload open records and emit only the differences."""
+        # Read the version first: a commit racing the query shows up on the next poll
+        self._data_version = self._read_data_version()
+        rows = attendance_db.get_open_records()
+        if rows is None:
+            return False
+        current = {row['id']: self._prepare(row) for row in rows}
+
+        for record_id in self._records.keys() - current.keys():
+            del self._records[record_id]
+            self.record_removed.emit(record_id)
+        for record_id in current.keys() - self._records.keys():
+            self._records[record_id] = current[record_id]
+            self.record_added.emit(current[record_id])
+        return True
+
+    @staticmethod
+    def _prepare(row):
+        """Parse the check-in time once so views only subtract datetimes."""
+        since = None
+        try:
+            if row['check_in_datetime']:
+                since = datetime.datetime.strptime(row['check_in_datetime'], "%Y-%m-%d %H:%M:%S")
+            else:
+                since = datetime.datetime.strptime(f"{row['full_date']} {row['check_in_time']}",
+                                                   "%Y-%m-%d %H:%M:%S")
+        except (TypeError, ValueError):
+            since = datetime.datetime.now()
+        row['since'] = since
+        return row
+
+    def _read_data_version(self):
+        """Read PRAGMA data_version on the store's long-lived connection."""
+        try:
+            if self._conn is None:
+                self._conn = sqlite3.connect(attendance_db.db_path, timeout=5)
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error as e:
+            self.logger.error(f"Error reading presence data_version: {e}")
+            if self._conn:
+                self._conn.close()
+            self._conn = None
+            return None
+
+    def _check_changes(self):
+        version = self._read_data_version()
+        if version is not None and version != self._data_version:
+            self.sync()
+
+    def _on_attendance_written(self, user_id, event, record):
+        # Show this process's own check-ins/outs now rather than on the next poll
+        if self._watchers:
+            self.sync()
+
+
+# Create a global instance for easy import
+presence_store = PresenceStore()
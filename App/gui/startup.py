@@ -0,0 +1,166 @@
+"""
+Application startup: splash screen, parallel startup tasks and profiling.
+
+main.py shows the splash as soon as QApplication exists, then submits the
+independent startup work (migrations, translation loading, preference
+files, theme compilation, header image decoding, session restore) to a
+thread pool. While the main thread waits for a result it keeps processing
+events, so the splash stays responsive. Widgets pick up precomputed results
+with startup.take() and fall back to doing the work themselves if a task
+was never submitted (e.g. a window created outside main.py).
+"""
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from PyQt6.QtCore import Qt, QRect
+from PyQt6.QtGui import QPixmap, QPainter, QColor, QFont, QIcon
+from PyQt6.QtWidgets import QApplication, QSplashScreen
+
+SPLASH_SIZE = (420, 200)
+
+
+class StartupTasks:
+    """Runs startup work on a thread pool and records how long every step took."""
+
+    def __init__(self, max_workers=4):
+        self.logger = logging.getLogger('main')
+        self.max_workers = max_workers
+        self._executor = None
+        self._futures = {}
+        self._timings = []  # (name, thread, start offset, duration) in seconds
+        self._lock = threading.Lock()
+        self._t0 = time.perf_counter()
+
+    def submit(self, name, fn, *args, after=()):
+        """
+        Run fn(*args) on the pool.
+
+        Args:
+            name: Task name, used by result()/take() and in the profile
+            fn: Callable to run
+            *args: Arguments for fn
+            after: Names of tasks that must finish first (submit those earlier)
+
+        Returns:
+            concurrent.futures.Future
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='startup')
+        dependencies = [self._futures[dep] for dep in after]
+
+        def run():
+            # Dependencies were submitted first, so they already hold a worker
+            for dependency in dependencies:
+                dependency.result()
+            start = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                self._record(name, 'pool', start)
+
+        self._futures[name] = self._executor.submit(run)
+        return self._futures[name]
+
+    def step(self, name, fn, *args):
+        """Run fn(*args) on the calling thread and record it in the profile."""
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self._record(name, 'main', start)
+
+    def _record(self, name, thread, start):
+        with self._lock:
+            self._timings.append((name, thread, start - self._t0, time.perf_counter() - start))
+
+    def wait(self, *names):
+        """Wait for tasks to finish (successfully or not) while keeping the GUI responsive."""
+        futures = [self._futures[name] for name in names if name in self._futures]
+        app = QApplication.instance()
+        while not all(future.done() for future in futures):
+            if app is not None:
+                app.processEvents()
+            wait(futures, timeout=0.01)
+
+    def result(self, name):
+        """
+        Wait for a task and return its result.
+
+        Raises:
+            Whatever the task raised
+        """
+        self.wait(name)
+        return self._futures[name].result()
+
+    def take(self, name, default=None):
+        """
+        Hand a task's result to its consumer once; later calls get default.
+
+        Returns default if the task was never submitted or failed.
+        """
+        if name not in self._futures:
+            return default
+        try:
+            return self.result(name)
+        except Exception as e:
+            self.logger.error("Startup task '%s' failed: %s", name, e)
+            return default
+        finally:
+            self._futures.pop(name, None)
+
+    def finish(self):
+        """Log the startup profile and release the thread pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        total = time.perf_counter() - self._t0
+        with self._lock:
+            timings = sorted(self._timings, key=lambda timing: timing[2])
+        lines = [f"  {name:<16} {thread:<4} +{offset * 1000:7.1f} ms  {duration * 1000:7.1f} ms"
+                 for name, thread, offset, duration in timings]
+        self.logger.info("Startup profile (%.1f ms to window):\n%s", total * 1000, '\n'.join(lines))
+
+
+def create_splash(config, icon_path):
+    """
+    Build the splash screen without touching translations or large images.
+
+    Args:
+        config: Application configuration dictionary
+        icon_path: Path to the application icon
+
+    Returns:
+        QSplashScreen (not yet shown)
+    """
+    width, height = SPLASH_SIZE
+    pixmap = QPixmap(width, height)
+    pixmap.fill(QColor('#1e1e1e'))
+
+    painter = QPainter(pixmap)
+    try:
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        icon = QIcon(icon_path)
+        if not icon.isNull():
+            painter.drawPixmap(30, (height - 96) // 2, icon.pixmap(96, 96))
+
+        painter.setPen(QColor('#f0f0f0'))
+        painter.setFont(QFont(painter.font().family(), 16, QFont.Weight.DemiBold))
+        painter.drawText(QRect(145, 55, width - 160, 40), Qt.AlignmentFlag.AlignVCenter,
+                         config['application']['name'])
+
+        painter.setPen(QColor('#9a9a9a'))
+        painter.setFont(QFont(painter.font().family(), 9))
+        painter.drawText(QRect(145, 95, width - 160, 24), Qt.AlignmentFlag.AlignVCenter,
+                         f"v{config['application']['version']}")
+    finally:
+        painter.end()
+
+    splash = QSplashScreen(pixmap, Qt.WindowType.WindowStaysOnTopHint)
+    splash.showMessage("Starting...", Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignRight,
+                       QColor('#9a9a9a'))
+    return splash
+
+
+# Create a global instance for easy import
+startup = StartupTasks()
@@ -0,0 +1,377 @@
+"""
+Application theme engine.
+
+Every theme is compiled once into a single application-wide stylesheet at
+startup. Widgets never swap stylesheets to show state; they carry dynamic
+properties (checkedIn, error, active, favorite) that the compiled sheet
+matches on, and set_state() only re-polishes the widget whose property
+actually changed. This keeps the expensive stylesheet parse out of the
+check-in/check-out and card rebuild paths.
+
+Run this module directly to compare the old inline stylesheets with the
+compiled theme (status toggles, unchanged refreshes and building a page of
+tool cards):  python -m App.gui.theme [iterations]
+"""
+import logging
+from string import Template
+from PyQt6.QtWidgets import QApplication
+
+
+# Colour tokens per theme; keys are substituted into APP_STYLESHEET
+THEMES = {
+    'light': {
+        'success': '#4CAF50',
+        'success_hover': '#45a049',
+        'danger': '#f44336',
+        'danger_hover': '#d32f2f',
+        'warning': '#ff9800',
+        'accent': '#0366d6',
+        'muted': 'rgba(127, 127, 127, 1)',
+        'outline': 'rgba(127, 127, 127, 0.5)',
+        'key_background': 'rgba(0, 0, 0, 0.05)',
+        'key_border': 'rgba(0, 0, 0, 0.08)',
+        'key_hover': 'rgba(0, 0, 0, 0.1)',
+        'key_pressed': 'rgba(0, 0, 0, 0.15)',
+    },
+    'dark': {
+        'success': '#4CAF50',
+        'success_hover': '#45a049',
+        'danger': '#f44336',
+        'danger_hover': '#d32f2f',
+        'warning': '#ff9800',
+        'accent': '#0366d6',
+        'muted': 'rgba(127, 127, 127, 1)',
+        'outline': 'rgba(127, 127, 127, 0.5)',
+        'key_background': 'rgba(255, 255, 255, 0.05)',
+        'key_border': 'rgba(255, 255, 255, 0.08)',
+        'key_hover': 'rgba(255, 255, 255, 0.1)',
+        'key_pressed': 'rgba(255, 255, 255, 0.15)',
+    },
+}
+
+DEFAULT_THEME = 'dark'
+
+APP_STYLESHEET = Template("""
+/* Home page */
+QLabel#sectionTitle {
+    font-size: 18px;
+    font-weight: 600;
+    color: palette(windowText);
+}
+QWidget#tool_container {
+    background-color: palette(light);
+    border-radius: 10px;
+}
+QWidget#tool_container:hover {
+    border: 1px solid $outline;
+}
+QLabel#toolTitle {
+    font-weight: 600;
+    font-size: 14px;
+    color: palette(text);
+    background: transparent;
+}
+QLabel#toolDescription {
+    font-size: 11px;
+    background: transparent;
+    color: $muted;
+}
+QPushButton#toolLaunchButton {
+    background-color: palette(button);
+    border: none;
+    border-radius: 5px;
+    padding: 5px 15px;
+}
+QPushButton#toolLaunchButton:hover {
+    background-color: $accent;
+    color: #FFFFFF;
+}
+QPushButton#star_button {
+    background: transparent;
+    border: none;
+    padding: 0;
+    margin: 0;
+}
+
+/* Attendance tool */
+QFrame#attendancePanel, QFrame#attendancePinPanel {
+    background-color: palette(base);
+    border-radius: 8px;
+}
+QFrame#attendancePinPanel {
+    padding: 15px;
+}
+QLabel#attendancePinLabel {
+    font-weight: bold;
+    font-size: 16px;
+    padding: 15px;
+}
+QLineEdit#attendancePinField {
+    font-size: 24px;
+    padding: 10px;
+    background-color: palette(base);
+    border: 1px solid palette(mid);
+    border-radius: 5px;
+    margin-bottom: 15px;
+}
+QLineEdit#attendancePinField[error="true"] {
+    border: 2px solid $danger;
+}
+QPushButton#numpadKey, QPushButton#numpadClear, QPushButton#numpadBackspace {
+    font-size: 20px;
+    font-weight: bold;
+    background-color: $key_background;
+    color: $muted;
+    border: 1px solid $key_border;
+    border-radius: 8px;
+    padding: 15px;
+    min-width: 60px;
+}
+QPushButton#numpadClear {
+    font-size: 16px;
+    border: 1px solid $warning;
+}
+QPushButton#numpadBackspace {
+    border: 1px solid $danger;
+}
+QPushButton#numpadKey:hover, QPushButton#numpadClear:hover, QPushButton#numpadBackspace:hover {
+    background-color: $key_hover;
+}
+QPushButton#numpadKey:pressed, QPushButton#numpadClear:pressed, QPushButton#numpadBackspace:pressed {
+    background-color: $key_pressed;
+}
+QPushButton#attendanceCheckButton {
+    font-size: 18px;
+    font-weight: bold;
+    background-color: $success;
+    color: white;
+    border-radius: 8px;
+    padding: 15px;
+    margin-top: 15px;
+}
+QPushButton#attendanceCheckButton:hover {
+    background-color: $success_hover;
+}
+QPushButton#attendanceCheckButton[checkedIn="true"] {
+    background-color: $danger;
+}
+QPushButton#attendanceCheckButton[checkedIn="true"]:hover {
+    background-color: $danger_hover;
+}
+""")
+
+
+class ThemeEngine:
+    """Compiles and applies the application stylesheet for each theme."""
+
+    def __init__(self):
+        self.logger = logging.getLogger('main')
+        self._compiled = {}
+        self.theme = None
+
+    def compile_all(self):
+        """
+        Compile the stylesheet for every known theme.
+
+        Returns:
+            Dictionary mapping theme names to stylesheet strings
+        """
+        for name, tokens in THEMES.items():
+            if name not in self._compiled:
+                self._compiled[name] = APP_STYLESHEET.substitute(tokens)
+        self.logger.debug(f"Compiled {len(self._compiled)} theme stylesheets")
+        return self._compiled
+
+    def stylesheet(self, theme):
+        """
+        Get the compiled stylesheet for a theme.
+
+        Args:
+            theme: Theme name; unknown names fall back to the default theme
+
+        Returns:
+            Compiled stylesheet string
+        """
+        if theme not in THEMES:
+            self.logger.warning(f"Unknown theme '{theme}', using '{DEFAULT_THEME}'")
+            theme = DEFAULT_THEME
+        if theme not in self._compiled:
+            self._compiled[theme] = APP_STYLESHEET.substitute(THEMES[theme])
+        return self._compiled[theme]
+
+    def apply(self, app, theme):
+        """
+        Install a theme's stylesheet on the application.
+
+        Args:
+            app: QApplication instance
+            theme: Theme name
+
+        Returns:
+            True if the stylesheet was (re)applied, False if it was already active
+        """
+        if theme == self.theme:
+            return False
+        app.setStyleSheet(self.stylesheet(theme))
+        self.theme = theme if theme in THEMES else DEFAULT_THEME
+        self.logger.info(f"Applied theme '{self.theme}'")
+        return True
+
+    @staticmethod
+    def set_state(widget, name, value):
+        """
+        Set a dynamic style property and re-polish only when it changes.
+
+        Args:
+            widget: Widget styled by the application stylesheet
+            name: Property name used in the stylesheet selector
+            value: New property value
+
+        Returns:
+            True if the property changed, False otherwise
+        """
+        if widget.property(name) == value:
+            return False
+        widget.setProperty(name, value)
+        # polish() alone re-resolves the widget's stylesheet rules; calling
+        # unpolish() first only adds a palette/attribute reset per toggle
+        widget.style().polish(widget)
+        return True
+
+
+# Create a global instance for easy import
+theme_engine = ThemeEngine()
+
+
+# Per-widget sheets the home page cards carried before the compiled theme
+_INLINE_CARD_STYLES = {
+    'container': """
+        QWidget#tool_container { background-color: palette(light); border-radius: 10px; }
+        QWidget#tool_container:hover {
+            background-color: palette(light); border-radius: 10px;
+            border: 1px solid rgba(127, 127, 127, 0.5);
+        }
+    """,
+    'title': "font-weight: 600; font-size: 14px; color: palette(text); background: transparent;",
+    'description': "font-size: 11px; background: transparent; color: rgba(127, 127, 127, 1);",
+    'star': "QPushButton { background: transparent; border: none; padding: 0; margin: 0; }",
+    'launch': """
+        QPushButton { background-color: palette(button); border: none; border-radius: 5px; padding: 5px 15px; }
+        QPushButton:hover { background-color: #0366d6; color: #FFFFFF; }
+    """,
+}
+
+
+def _build_card_grid(cards, inline):
+    """A home page style grid of tool cards, styled inline or by object name."""
+    from PyQt6.QtWidgets import QWidget, QGridLayout, QVBoxLayout, QLabel, QPushButton
+
+    page = QWidget()
+    grid = QGridLayout(page)
+    for i in range(cards):
+        container = QWidget()
+        container.setObjectName("tool_container")
+        layout = QVBoxLayout(container)
+        widgets = [(QLabel(f"Tool {i}"), 'title', "toolTitle"),
+                   (QLabel("Description of the tool"), 'description', "toolDescription"),
+                   (QPushButton(), 'star', "star_button"),
+                   (QPushButton("Open"), 'launch', "toolLaunchButton")]
+        for widget, style_key, object_name in widgets:
+            if inline:
+                widget.setStyleSheet(_INLINE_CARD_STYLES[style_key])
+            else:
+                widget.setObjectName(object_name)
+            layout.addWidget(widget)
+        if inline:
+            container.setStyleSheet(_INLINE_CARD_STYLES['container'])
+        grid.addWidget(container, i // 4, i % 4)
+    page.ensurePolished()  # Polishes the whole tree
+    return page
+
+
+def _benchmark(iterations=2000, cards=24):
+    """
+    Compare the old inline-stylesheet approach with the compiled theme.
+
+    Measures status toggles on the check button, status refreshes that do
+    not change the state (the common case: check_current_attendance_status
+    restyled the button on every refresh) and building and polishing a page
+    tree of home page tool cards.
+    """
+    import time
+    from PyQt6.QtWidgets import QPushButton
+
+    app = QApplication.instance() or QApplication([])
+    theme_engine.apply(app, DEFAULT_THEME)
+    tokens = THEMES[DEFAULT_THEME]
+
+    def inline_sheet(color, hover):
+        return f"""
+            QPushButton {{
+                font-size: 18px;
+                font-weight: bold;
+                background-color: {color};
+                color: white;
+                border-radius: 8px;
+                margin-top: 15px;
+            }}
+            QPushButton:hover {{
+                background-color: {hover};
+            }}
+        """
+
+    checked_in = inline_sheet(tokens['danger'], tokens['danger_hover'])
+    checked_out = inline_sheet(tokens['success'], tokens['success_hover'])
+
+    def timed(run, count):
+        start = time.perf_counter()
+        run()
+        return (time.perf_counter() - start) / count * 1e6
+
+    def inline_button():
+        button = QPushButton("CHECK IN")
+        button.show()
+        return button
+
+    def themed_button():
+        button = QPushButton("CHECK IN")
+        button.setObjectName("attendanceCheckButton")
+        button.show()
+        return button
+
+    def toggle_inline(button, states):
+        for state in states:
+            button.setStyleSheet(checked_in if state else checked_out)
+            button.ensurePolished()
+
+    def toggle_themed(button, states):
+        for state in states:
+            theme_engine.set_state(button, 'checkedIn', state)
+            button.ensurePolished()
+
+    toggles = [bool(i % 2) for i in range(iterations)]
+    refreshes = [True] * iterations
+    rows = [
+        ("status toggle (us)",
+         timed(lambda: toggle_inline(inline_button(), toggles), iterations),
+         timed(lambda: toggle_themed(themed_button(), toggles), iterations)),
+        ("status refresh, unchanged (us)",
+         timed(lambda: toggle_inline(inline_button(), refreshes), iterations),
+         timed(lambda: toggle_themed(themed_button(), refreshes), iterations)),
+    ]
+    grids = max(iterations // 200, 5)
+    pages = []
+    rows.append((f"build + polish {cards}-card page (ms)",
+                 timed(lambda: pages.extend(_build_card_grid(cards, True) for _ in range(grids)), grids) / 1000,
+                 timed(lambda: pages.extend(_build_card_grid(cards, False) for _ in range(grids)), grids) / 1000))
+    for page in pages:
+        page.deleteLater()
+
+    print(f"{'':34}{'inline sheets':>15}{'compiled theme':>16}")
+    for label, before, after in rows:
+        print(f"{label:34}{before:15.1f}{after:16.1f}")
+
+
+if __name__ == "__main__":
+    import sys
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,113 @@
+"""
+Asynchronous thumbnails for asset views.
+
+Views ask for a thumbnail by content hash and display size. request()
+answers at once from a small in-memory set of decoded images. Otherwise the
+disk cache lookup, decode and, if needed, rendering (see
+App.core.assets._thumbnail_cache) happen off the GUI thread, and
+thumbnail_ready is emitted once the image is available. Views repaint the
+matching item then; the GUI thread never opens an image file.
+
+Images are QImages, which unlike QPixmaps may be created on any thread.
+Import this module where thumbnails are shown, not at startup: the worker
+pools start on the first request and are shut down when the application
+quits.
+"""
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QCoreApplication, QObject, Qt, pyqtSignal
+from PyQt6.QtGui import QImage
+from App.core.assets import ThumbnailCache
+
+
+class ThumbnailService(QObject):
+    """Serves cached thumbnails to views, rendering missing ones in the background."""
+
+    # content_hash, requested size, QImage
+    thumbnail_ready = pyqtSignal(str, int, QImage)
+    # Worker -> GUI thread: content_hash, requested size, QImage or None
+    _loaded = pyqtSignal(str, int, object)
+
+    # Decoded thumbnails kept in memory, e.g. while scrolling back and forth
+    MEMORY_ITEMS = 500
+
+    def __init__(self):
+        super().__init__()
+        self.logger = logging.getLogger('main')
+        self._cache = None
+        self._loader = None
+        self._images = OrderedDict()  # (content_hash, size) -> QImage
+        self._waiting = set()
+        self._loaded.connect(self._on_loaded)
+
+    def request(self, source_path, content_hash, size):
+        """
+        Get a thumbnail for an indexed image.
+
+        Args:
+            source_path (str): The image file (files.original_path), rendered if not cached
+            content_hash (str): files.content_hash
+            size (int): Longest side to display, in pixels
+
+        Returns:
+            QImage if it is already in memory; otherwise None, and
+            thumbnail_ready follows when it has been loaded
+        """
+        key = (content_hash, size)
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            return image
+        if key not in self._waiting:
+            if self._cache is None:
+                self._cache = ThumbnailCache()
+                self._loader = ThreadPoolExecutor(max_workers=2, thread_name_prefix='thumbnails')
+                QCoreApplication.instance().aboutToQuit.connect(self.shutdown)
+            self._waiting.add(key)
+            self._loader.submit(self._load, source_path, content_hash, size)
+        return None
+
+    def _load(self, source_path, content_hash, size):
+        """Loader thread: read a cached thumbnail, or have it rendered first."""
+        if self._cache.get(content_hash, size) is not None:
+            self._read(content_hash, size)
+            return
+        future = self._cache.render(source_path, content_hash)
+        future.add_done_callback(lambda done: self._rendered(content_hash, size, done.result()))
+
+    def _rendered(self, content_hash, size, error):
+        if error or self._loader is None:
+            self._loaded.emit(content_hash, size, None)
+            return
+        self._loader.submit(self._read, content_hash, size)
+
+    def _read(self, content_hash, size):
+        path = self._cache.get(content_hash, size)
+        image = QImage(path) if path else QImage()
+        if not image.isNull() and max(image.width(), image.height()) > size:
+            image = image.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio,
+                                 Qt.TransformationMode.SmoothTransformation)
+        self._loaded.emit(content_hash, size, None if image.isNull() else image)
+
+    def _on_loaded(self, content_hash, size, image):
+        key = (content_hash, size)
+        self._waiting.discard(key)
+        if image is None:
+            return
+        self._images[key] = image
+        while len(self._images) > self.MEMORY_ITEMS:
+            self._images.popitem(last=False)
+        self.thumbnail_ready.emit(content_hash, size, image)
+
+    def shutdown(self):
+        """Stop loading and rendering (connected to application quit on first use)."""
+        loader, self._loader = self._loader, None
+        if loader is not None:
+            loader.shutdown(wait=False, cancel_futures=True)
+        if self._cache is not None:
+            self._cache.close()
+
+
+# Create a global instance for easy import
+thumbnail_service = ThumbnailService()
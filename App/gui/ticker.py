@@ -0,0 +1,126 @@
+"""
+Shared once-per-second tick service.
+
+Instead of every widget owning a 1 s QTimer, widgets subscribe here. A
+single precise timer fires just after each wall-clock second boundary so
+clocks flip in step, and the timer is only re-armed while at least one
+subscriber is actually visible. Hidden subscribers (e.g. pages parked in
+the QStackedWidget) are skipped and get an immediate catch-up call when
+they are shown again, so an idle kiosk does not wake up for nothing.
+"""
+import datetime
+import logging
+import weakref
+from PyQt6 import sip
+from PyQt6.QtCore import QObject, QTimer, QEvent, Qt
+
+
+def set_label_text(label, text):
+    """
+    Set label text only if it differs from what is already shown.
+
+    Args:
+        label: QLabel (or anything with text()/setText())
+        text: New text
+
+    Returns:
+        True if the label was updated, False otherwise
+    """
+    if label.text() == text:
+        return False
+    label.setText(text)
+    return True
+
+
+class TickService(QObject):
+    """Fans out second-aligned ticks to visible subscribers."""
+
+    def __init__(self):
+        super().__init__()
+        self.logger = logging.getLogger('main')
+        self._subscribers = []
+        self._timer = None
+
+    def subscribe(self, widget, callback):
+        """
+        Call callback(now) once per second while widget is visible.
+
+        Args:
+            widget: Widget whose visibility gates the callback
+            callback: Callable receiving the current datetime.datetime
+        """
+        if hasattr(callback, '__self__'):
+            callback_ref = weakref.WeakMethod(callback)
+        else:
+            callback_ref = lambda cb=callback: cb
+        self._subscribers.append((weakref.ref(widget), callback_ref))
+        widget.installEventFilter(self)
+        self._schedule()
+
+    def unsubscribe(self, widget, callback=None):
+        """
+        Stop ticks for a widget.
+
+        Args:
+            widget: Widget passed to subscribe()
+            callback: Specific callback to remove; all of the widget's if None
+        """
+        remaining = []
+        for widget_ref, callback_ref in self._subscribers:
+            if widget_ref() is widget and (callback is None or callback_ref() == callback):
+                continue
+            remaining.append((widget_ref, callback_ref))
+        self._subscribers = remaining
+        if not any(widget_ref() is widget for widget_ref, _ in remaining):
+            widget.removeEventFilter(self)
+
+    def _schedule(self):
+        """Arm the timer for just after the next second boundary."""
+        if self._timer is None:
+            # Created lazily so the global instance can be imported before QApplication exists
+            self._timer = QTimer(self)
+            self._timer.setSingleShot(True)
+            self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+            self._timer.timeout.connect(self._on_tick)
+        if self._timer.isActive():
+            return
+        now = datetime.datetime.now()
+        self._timer.start(1000 - now.microsecond // 1000 + 1)
+
+    def _on_tick(self):
+        now = datetime.datetime.now()
+        dead = []
+        any_active = False
+        for entry in list(self._subscribers):
+            widget = entry[0]()
+            callback = entry[1]()
+            if widget is None or callback is None or sip.isdeleted(widget):
+                dead.append(entry)
+                continue
+            if not widget.isVisible():
+                continue
+            any_active = True
+            try:
+                callback(now)
+            except Exception as e:
+                self.logger.error(f"Tick subscriber {callback!r} failed: {e}")
+        if dead:
+            self._subscribers = [entry for entry in self._subscribers if entry not in dead]
+
+        # Park the timer when nothing is visible; a Show event re-arms it
+        if any_active:
+            self._schedule()
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Show:
+            now = datetime.datetime.now()
+            for widget_ref, callback_ref in list(self._subscribers):
+                callback = callback_ref()
+                if widget_ref() is obj and callback is not None:
+                    callback(now)
+            self._schedule()
+        return False
+
+
+# Create a global instance for easy import
+tick_service = TickService()
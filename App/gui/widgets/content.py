@@ -1,8 +1,9 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QStackedWidget, QLabel
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QStackedWidget, QLabel, QApplication
 from PyQt6.QtCore import Qt, pyqtSignal
 from .pages.settings_page import SettingsPage
 from .pages.home_page import HomePage
 from .header import PageHeaderWidget
+from ..page_manager import PageManager, DEFAULT_BUDGET_MB, DEFAULT_GRACE_SECONDS
 
 class ContentWidget(QWidget):
     # Add a signal to notify when the page changes
@@ -23,6 +24,15 @@ class ContentWidget(QWidget):
         self.stack.setContentsMargins(5, 5, 5, 5)
         self.layout.addWidget(self.stack)
         
+        # Hidden pages are paused and, over the memory budget, evicted (LRU)
+        page_config = QApplication.instance().BASE_DIR.config.get('pages', {})
+        self.page_manager = PageManager(
+            self._evict_page,
+            budget_mb=page_config.get('memory_budget_mb', DEFAULT_BUDGET_MB),
+            pinned=page_config.get('pinned', ('home', 'settings', 'user')),
+            grace_seconds=page_config.get('eviction_grace_seconds', DEFAULT_GRACE_SECONDS)
+        )
+        
         # Initialize pages
         self.pages = {}
         self._init_pages()
@@ -74,19 +84,56 @@ class ContentWidget(QWidget):
         if hasattr(main_window, 'sidebar'):
             main_window.sidebar.update_home_button_state()
 
-    def add_page(self, name, page_widget):
-        """Add a page to the stack"""
+    def add_page(self, name, page_widget, factory=None, pinned=False):
+        """
+        Add a page to the stack
+        
+        Args:
+            name: Page name
+            page_widget: Page widget
+            factory: Callable recreating the page; lets it be evicted while hidden
+            pinned: Never evict this page
+        """
         self.pages[name] = page_widget
         self.stack.addWidget(page_widget)
+        self.page_manager.register(name, page_widget, factory, pinned)
         
     def remove_page(self, name):
         """Remove a page from the stack"""
         if name in self.pages:
             self.stack.removeWidget(self.pages[name])
             del self.pages[name]
+        self.page_manager.unregister(name)
+    
+    def has_page(self, name):
+        """True if the page is loaded or was evicted and can be restored"""
+        return name in self.pages or self.page_manager.can_restore(name)
+    
+    def _evict_page(self, name, page):
+        """Drop a hidden page; the page manager recreates it when shown again"""
+        self.stack.removeWidget(page)
+        self.pages.pop(name, None)
+        page.deleteLater()
     
     def show_page(self, name):
         """Show a specific page by name"""
+        if name not in self.pages and self.page_manager.can_restore(name):
+            page = self.page_manager.restore(name)
+            if page is not None:
+                self.pages[name] = page
+                self.stack.addWidget(page)
         if name in self.pages:
             self.stack.setCurrentWidget(self.pages[name])
+            self.page_manager.activate(name)
             self.page_changed.emit(name)  # Emit signal to update sidebar highlighting
+    
+    def open_page(self, name):
+        """Show a page or launch a tool by name (e.g. 'settings', 'attendance')"""
+        if self.has_page(name):
+            self.show_page(name)
+            return
+        tool_id = name if name.startswith('tool_') else f"tool_{name}"
+        if self.has_page(tool_id):
+            self.show_page(tool_id)
+        elif 'home' in self.pages:
+            self.pages['home']._launch_tool(tool_id)
@@ -1,8 +1,298 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QLabel, QPushButton,
                             QWidget, QHBoxLayout, QTextBrowser, QApplication)
-from PyQt6.QtCore import Qt, QUrl
+from PyQt6.QtCore import Qt, QByteArray
 from PyQt6.QtGui import QDesktopServices, QPalette, QColor
-from PyQt6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+import os
+import re
+import json
+import logging
+from ...network import network_cache
+
+# Bump when render_readme() output changes so cached HTML is regenerated
+README_RENDER_VERSION = 1
+
+# In-memory copy of the rendered README for this session
+_readme_cache = {}
+
+
+def render_readme(content, repo_url):
+    """
+    Convert the README markdown into styled HTML for the text browser.
+    
+    Args:
+        content: README.md text
+        repo_url: Repository URL used to resolve relative links
+        
+    Returns:
+        Tuple (html, list of remote image URLs referenced by the HTML)
+    """
+    image_urls = []
+    
+    # Handle badge markdown with improved SVG handling
+    def badge_replacement(match):
+        alt_text = match.group(1)
+        image_url = match.group(2)
+        link_url = match.group(3)
+    
+        # Convert SVG shields.io URLs to PNG
+        if 'shields.io' in image_url and image_url.endswith('.svg'):
+            image_url = image_url.replace('.svg', '.png')
+    
+        image_urls.append(image_url)
+    
+        return f'''<a href="{link_url}"><img src="{image_url}" 
+            alt="{alt_text}" height="20" style="margin: 4px 2px;"></a>'''
+    
+    # Process badges first
+    content = re.sub(r'\[\!\[(.*?)\]\((.*?)\)\]\((.*?)\)', badge_replacement, content)
+    
+    # Handle other markdown links
+    def link_replacement(match):
+        text = match.group(1)
+        url = match.group(2)
+    
+        # Handle relative paths and avoid processing already processed badges
+        if url.startswith('./'):
+            url = f"{repo_url}/blob/main/{url[2:]}"
+        elif url.endswith('.svg'):
+            return match.group(0)  # Skip SVG links that weren't badges
+    
+        return f'<a href="{url}">{text}</a>'
+    
+    content = re.sub(r'\[(.*?)\]\((.*?)\)', link_replacement, content)
+    
+    # Handle lists
+    lines = content.split('\n')
+    in_list = False
+    processed_lines = []
+    
+    for line in lines:
+        # Skip lines that are already HTML
+        if re.match(r'<[^>]+>', line.strip()):
+            processed_lines.append(line)
+            continue
+    
+        if line.strip().startswith('- '):
+            if not in_list:
+                processed_lines.append('<ul>')
+                in_list = True
+            processed_lines.append(f'<li>{line.strip()[2:]}</li>')
+        else:
+            if in_list:
+                processed_lines.append('</ul>')
+                in_list = False
+            processed_lines.append(line)
+    
+    if in_list:
+        processed_lines.append('</ul>')
+    
+    content = '\n'.join(processed_lines)
+    
+    # Handle code blocks
+    lines = content.split('\n')
+    in_code_block = False
+    processed_lines = []
+    
+    for line in lines:
+        if line.strip().startswith('```'):
+            if in_code_block:
+                processed_lines.append('</pre>')
+                in_code_block = False
+            else:
+                lang = line.strip().replace('```', '')
+                processed_lines.append(f'<pre class="code-block {lang}">')
+                in_code_block = True
+            continue
+    
+        if in_code_block:
+            processed_lines.append(line)
+        else:
+            processed_lines.append(line)
+    
+    if in_code_block:
+        processed_lines.append('</pre>')
+    
+    content = '\n'.join(processed_lines)
+    
+    # Basic Markdown to HTML conversion
+    content = re.sub(r'^# (.+)$', r'<h1>\1</h1>', content, flags=re.MULTILINE)
+    content = re.sub(r'^## (.+)$', r'<h2>\1</h2>', content, flags=re.MULTILINE)
+    content = re.sub(r'^### (.+)$', r'<h3>\1</h3>', content, flags=re.MULTILINE)
+    
+    # Handle emphasis/bold outside lists
+    content = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', content)
+    content = re.sub(r'\*(.*?)\*', r'<em>\1</em>', content)
+    
+    # Handle blockquotes
+    lines = content.split('\n')
+    processed_lines = []
+    for line in lines:
+        if line.startswith('> '):
+            processed_lines.append(f'<blockquote>{line[2:]}</blockquote>')
+        else:
+            processed_lines.append(line)
+    content = '\n'.join(processed_lines)
+    
+    # Handle paragraphs properly - exclude HTML tags
+    paragraphs = content.split('\n\n')
+    content = '\n'.join(
+        p.strip() if any(p.strip().startswith(tag) for tag in 
+            ['<h1>', '<h2>', '<h3>', '<table>', '<blockquote>', '<p>']) 
+        else f'<p>{p.strip()}</p>' 
+        for p in paragraphs if p.strip()
+    )
+    
+    # Enhanced CSS styling using system colors
+    html = f"""
+    <style>
+        body {{ 
+            font-family: -apple-system,BlinkMacSystemFont,Segoe UI,Helvetica,Arial,sans-serif;
+            font-size: 12px;
+            line-height: 1.6;
+            max-width: 850px;
+            margin: 0 auto;
+            color: palette(text);
+        }}
+        h1 {{ 
+            font-size: 24px; 
+            margin: 24px 0 16px 0;
+            padding-bottom: 0.3em; 
+            border-bottom: 1px solid palette(mid);
+            font-weight: 600;
+            line-height: 1.25;
+            color: palette(text);
+        }}
+        h2 {{ 
+            font-size: 20px; 
+            margin: 24px 0 16px 0;
+            padding-bottom: 0.3em; 
+            border-bottom: 1px solid palette(mid);
+            font-weight: 600;
+            line-height: 1.25;
+            color: palette(text);
+        }}
+        h3 {{ 
+            font-size: 16px; 
+            margin: 24px 0 16px 0;
+            font-weight: 600;
+            line-height: 1.25;
+            color: palette(text);
+        }}
+        p {{ 
+            line-height: 1.6; 
+            margin: 1em 0;
+            font-size: 12px;
+            color: palette(text);
+        }}
+        code {{ 
+            padding: 0.2em 0.4em; 
+            border-radius: 3px; 
+            font-family: SFMono-Regular,Consolas,Liberation Mono,Menlo,monospace;
+            font-size: 11px;
+            background-color: palette(alternateBase);
+            color: palette(text);
+        }}
+        table {{ 
+            border-collapse: collapse; 
+            width: 100%;
+            margin: 1em 0; 
+            font-size: 12px;
+            color: palette(text);
+        }}
+        td, th {{ 
+            border: 1px solid palette(mid);
+            padding: 8px 12px;
+        }}
+        blockquote {{ 
+            border-left: 0.25em solid palette(mid);
+            border-radius: 6px;
+            margin: 1.5em 0;
+            padding: 1em 1.2em;
+            font-size: 12px;
+            line-height: 1.6;
+            background-color: palette(alternateBase);
+            color: palette(text);
+        }}
+        ul {{
+            margin: 0.8em 0;
+            padding-left: 2em;
+            color: palette(text);
+        }}
+        li {{
+            margin: 0.3em 0;
+            font-size: 12px;
+            line-height: 1.6;
+        }}
+        a {{ 
+            color: palette(link);
+            text-decoration: none;
+            transition: color 0.2s ease;
+        }}
+        a:hover {{ 
+            text-decoration: underline;
+        }}
+        pre.code-block {{
+            background-color: palette(alternateBase);
+            border: 1px solid palette(mid);
+            border-radius: 6px;
+            padding: 16px;
+            margin: 1em 0;
+            white-space: pre-wrap;       /* preserve line breaks */
+            word-wrap: break-word;       /* break long words */
+            font-family: SFMono-Regular,Consolas,Liberation Mono,Menlo,monospace;
+            font-size: 11px;
+            line-height: 1.45;
+            color: palette(text);
+        }}
+    </style>
+    {content}
+    """
+    return html, image_urls
+
+
+def load_readme_html(readme_path, cache_path, repo_url):
+    """
+    Get the rendered README, re-rendering only when the file changed.
+    
+    The result is kept in memory for the session and in cache_path across
+    launches, keyed by the README's mtime and size.
+    
+    Args:
+        readme_path: Path to README.md
+        cache_path: JSON file used to persist the rendered HTML
+        repo_url: Repository URL used to resolve relative links
+        
+    Returns:
+        Tuple (html, list of remote image URLs)
+    """
+    stat = os.stat(readme_path)
+    key = [readme_path, stat.st_mtime_ns, stat.st_size, repo_url, README_RENDER_VERSION]
+    
+    cached = _readme_cache.get('entry')
+    if cached is None:
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            cached = None
+    if cached and cached.get('key') == key:
+        _readme_cache['entry'] = cached
+        return cached['html'], cached['images']
+    
+    with open(readme_path, 'r', encoding='utf-8') as f:
+        html, image_urls = render_readme(f.read(), repo_url)
+    entry = {'key': key, 'html': html, 'images': image_urls}
+    _readme_cache['entry'] = entry
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        temp_path = f"{cache_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        logging.getLogger('main').warning("Could not write README cache: %s", e)
+    return html, image_urls
+
 
 class AboutDetailsDialog(QDialog):
     def __init__(self, parent=None):
@@ -17,10 +307,6 @@ class AboutDetailsDialog(QDialog):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(10, 10, 10, 10)
         
-        # Add network manager for loading remote images
-        self.network_manager = QNetworkAccessManager()
-        self.network_manager.finished.connect(self._handle_network_response)
-        
         # Create text browser with improved styling
         self.setStyleSheet("""
             QDialog {
@@ -69,236 +355,17 @@ class AboutDetailsDialog(QDialog):
         self.text_browser.setOpenExternalLinks(True)
         self.text_browser.anchorClicked.connect(self.handle_link)
         
-        # Load README content
-        readme_path = self.app.BASE_DIR.get_path('README.md')
+        # Load README content (rendered HTML is cached by file mtime)
         try:
-            with open(readme_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-                # Handle badge markdown with improved SVG handling
-                import re
-                def badge_replacement(match):
-                    alt_text = match.group(1)
-                    image_url = match.group(2)
-                    link_url = match.group(3)
-                    
-                    # Convert SVG shields.io URLs to PNG
-                    if 'shields.io' in image_url and image_url.endswith('.svg'):
-                        image_url = image_url.replace('.svg', '.png')
-                    
-                    request = QNetworkRequest(QUrl(image_url))
-                    request.setAttribute(QNetworkRequest.Attribute.CacheLoadControlAttribute, 
-                                      QNetworkRequest.CacheLoadControl.PreferCache)
-                    self.network_manager.get(request)
-                    
-                    return f'''<a href="{link_url}"><img src="{image_url}" 
-                        alt="{alt_text}" height="20" style="margin: 4px 2px;"></a>'''
-                
-                # Process badges first
-                content = re.sub(r'\[\!\[(.*?)\]\((.*?)\)\]\((.*?)\)', badge_replacement, content)
-                
-                # Handle other markdown links
-                def link_replacement(match):
-                    text = match.group(1)
-                    url = match.group(2)
-                    
-                    # Handle relative paths and avoid processing already processed badges
-                    if url.startswith('./'):
-                        url = f"{self.app.BASE_DIR.config['repository']['url']}/blob/main/{url[2:]}"
-                    elif url.endswith('.svg'):
-                        return match.group(0)  # Skip SVG links that weren't badges
-                    
-                    return f'<a href="{url}">{text}</a>'
-                
-                content = re.sub(r'\[(.*?)\]\((.*?)\)', link_replacement, content)
-                
-                # Handle lists
-                lines = content.split('\n')
-                in_list = False
-                processed_lines = []
-                
-                for line in lines:
-                    # Skip lines that are already HTML
-                    if re.match(r'<[^>]+>', line.strip()):
-                        processed_lines.append(line)
-                        continue
-                        
-                    if line.strip().startswith('- '):
-                        if not in_list:
-                            processed_lines.append('<ul>')
-                            in_list = True
-                        processed_lines.append(f'<li>{line.strip()[2:]}</li>')
-                    else:
-                        if in_list:
-                            processed_lines.append('</ul>')
-                            in_list = False
-                        processed_lines.append(line)
-                
-                if in_list:
-                    processed_lines.append('</ul>')
-                
-                content = '\n'.join(processed_lines)
-                
-                # Handle code blocks
-                lines = content.split('\n')
-                in_code_block = False
-                processed_lines = []
-                
-                for line in lines:
-                    if line.strip().startswith('```'):
-                        if in_code_block:
-                            processed_lines.append('</pre>')
-                            in_code_block = False
-                        else:
-                            lang = line.strip().replace('```', '')
-                            processed_lines.append(f'<pre class="code-block {lang}">')
-                            in_code_block = True
-                        continue
-                    
-                    if in_code_block:
-                        processed_lines.append(line)
-                    else:
-                        processed_lines.append(line)
-                
-                if in_code_block:
-                    processed_lines.append('</pre>')
-                
-                content = '\n'.join(processed_lines)
-                
-                # Basic Markdown to HTML conversion
-                content = re.sub(r'^# (.+)$', r'<h1>\1</h1>', content, flags=re.MULTILINE)
-                content = re.sub(r'^## (.+)$', r'<h2>\1</h2>', content, flags=re.MULTILINE)
-                content = re.sub(r'^### (.+)$', r'<h3>\1</h3>', content, flags=re.MULTILINE)
-                
-                # Handle emphasis/bold outside lists
-                content = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', content)
-                content = re.sub(r'\*(.*?)\*', r'<em>\1</em>', content)
-                
-                # Handle blockquotes
-                lines = content.split('\n')
-                processed_lines = []
-                for line in lines:
-                    if line.startswith('> '):
-                        processed_lines.append(f'<blockquote>{line[2:]}</blockquote>')
-                    else:
-                        processed_lines.append(line)
-                content = '\n'.join(processed_lines)
-                
-                # Handle paragraphs properly - exclude HTML tags
-                paragraphs = content.split('\n\n')
-                content = '\n'.join(
-                    p.strip() if any(p.strip().startswith(tag) for tag in 
-                        ['<h1>', '<h2>', '<h3>', '<table>', '<blockquote>', '<p>']) 
-                    else f'<p>{p.strip()}</p>' 
-                    for p in paragraphs if p.strip()
-                )
-                
-                # Enhanced CSS styling using system colors
-                html = f"""
-                <style>
-                    body {{ 
-                        font-family: -apple-system,BlinkMacSystemFont,Segoe UI,Helvetica,Arial,sans-serif;
-                        font-size: 12px;
-                        line-height: 1.6;
-                        max-width: 850px;
-                        margin: 0 auto;
-                        color: palette(text);
-                    }}
-                    h1 {{ 
-                        font-size: 24px; 
-                        margin: 24px 0 16px 0;
-                        padding-bottom: 0.3em; 
-                        border-bottom: 1px solid palette(mid);
-                        font-weight: 600;
-                        line-height: 1.25;
-                        color: palette(text);
-                    }}
-                    h2 {{ 
-                        font-size: 20px; 
-                        margin: 24px 0 16px 0;
-                        padding-bottom: 0.3em; 
-                        border-bottom: 1px solid palette(mid);
-                        font-weight: 600;
-                        line-height: 1.25;
-                        color: palette(text);
-                    }}
-                    h3 {{ 
-                        font-size: 16px; 
-                        margin: 24px 0 16px 0;
-                        font-weight: 600;
-                        line-height: 1.25;
-                        color: palette(text);
-                    }}
-                    p {{ 
-                        line-height: 1.6; 
-                        margin: 1em 0;
-                        font-size: 12px;
-                        color: palette(text);
-                    }}
-                    code {{ 
-                        padding: 0.2em 0.4em; 
-                        border-radius: 3px; 
-                        font-family: SFMono-Regular,Consolas,Liberation Mono,Menlo,monospace;
-                        font-size: 11px;
-                        background-color: palette(alternateBase);
-                        color: palette(text);
-                    }}
-                    table {{ 
-                        border-collapse: collapse; 
-                        width: 100%;
-                        margin: 1em 0; 
-                        font-size: 12px;
-                        color: palette(text);
-                    }}
-                    td, th {{ 
-                        border: 1px solid palette(mid);
-                        padding: 8px 12px;
-                    }}
-                    blockquote {{ 
-                        border-left: 0.25em solid palette(mid);
-                        border-radius: 6px;
-                        margin: 1.5em 0;
-                        padding: 1em 1.2em;
-                        font-size: 12px;
-                        line-height: 1.6;
-                        background-color: palette(alternateBase);
-                        color: palette(text);
-                    }}
-                    ul {{
-                        margin: 0.8em 0;
-                        padding-left: 2em;
-                        color: palette(text);
-                    }}
-                    li {{
-                        margin: 0.3em 0;
-                        font-size: 12px;
-                        line-height: 1.6;
-                    }}
-                    a {{ 
-                        color: palette(link);
-                        text-decoration: none;
-                        transition: color 0.2s ease;
-                    }}
-                    a:hover {{ 
-                        text-decoration: underline;
-                    }}
-                    pre.code-block {{
-                        background-color: palette(alternateBase);
-                        border: 1px solid palette(mid);
-                        border-radius: 6px;
-                        padding: 16px;
-                        margin: 1em 0;
-                        white-space: pre-wrap;       /* preserve line breaks */
-                        word-wrap: break-word;       /* break long words */
-                        font-family: SFMono-Regular,Consolas,Liberation Mono,Menlo,monospace;
-                        font-size: 11px;
-                        line-height: 1.45;
-                        color: palette(text);
-                    }}
-                </style>
-                {content}
-                """
-                self.text_browser.setHtml(html)
+            html, image_urls = load_readme_html(
+                self.app.BASE_DIR.get_path('README.md'),
+                self.app.BASE_DIR.get_path('UserData', 'cache', 'readme.json'),
+                self.app.BASE_DIR.config['repository']['url']
+            )
+            self.text_browser.setHtml(html)
+            # Remote images come from the shared disk cache, even offline
+            for image_url in image_urls:
+                network_cache.get(image_url, self._add_image)
         except Exception as e:
             self.text_browser.setPlainText(f"Error loading README: {str(e)}")
         
@@ -315,13 +382,11 @@ class AboutDetailsDialog(QDialog):
         QDesktopServices.openUrl(url)
         return True
     
-    def _handle_network_response(self, reply):
-        """Handle network responses for image loading"""
-        if reply.error() == QNetworkReply.NetworkError.NoError:
-            url = reply.url().toString()
-            self.text_browser.document().addResource(
-                4,  # QTextDocument.ImageResource
-                QUrl(url),
-                reply.readAll()
-            )
-            self.text_browser.viewport().update()
+    def _add_image(self, url, data):
+        """Add a downloaded (or cached) image to the README document"""
+        self.text_browser.document().addResource(
+            4,  # QTextDocument.ImageResource
+            url,
+            QByteArray(data)
+        )
+        self.text_browser.viewport().update()
@@ -1,11 +1,14 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QLabel, QPushButton, 
                             QProgressBar, QWidget, QHBoxLayout, QTextEdit, QApplication)
-from PyQt6.QtCore import Qt, QTimer, QRectF, QPoint
+from PyQt6.QtCore import Qt, QRectF, QPoint
 from PyQt6.QtGui import QPixmap, QPainterPath, QRegion
 import qtawesome as qta
 import random
 import json
 import os
+import math
+import time
+from App.gui.ticker import tick_service, set_label_text
 
 class UpdateDialog(QDialog):
     def __init__(self, current_version, new_version, release_notes, parent=None):
@@ -119,12 +122,11 @@ class UpdateDialog(QDialog):
         self.countdown_template = random.choice(self.messages['countdown_messages'])
         self.timer_label.setText(self.countdown_template.format(count=30))
         
-        # Setup countdown timer
+        # Countdown runs against a deadline on the shared tick service,
+        # so late or coalesced ticks never stretch the 30 seconds
         self.countdown = 30
-        self.timer = QTimer()
-        self.timer.setInterval(1000)  # 1 second
-        self.timer.timeout.connect(self._update_countdown)
-        self.timer.start()
+        self._countdown_deadline = time.monotonic() + self.countdown
+        tick_service.subscribe(self, self._update_countdown)
         
         # Status label
         self.status_label = QLabel()
@@ -218,12 +220,12 @@ class UpdateDialog(QDialog):
         self.centerDialog()
         super().showEvent(event)
 
-    def _update_countdown(self):
+    def _update_countdown(self, now=None):
+        self.countdown = max(0, math.ceil(self._countdown_deadline - time.monotonic()))
         if self.countdown > 0:
-            self.timer_label.setText(self.countdown_template.format(count=self.countdown))
-            self.countdown -= 1
+            set_label_text(self.timer_label, self.countdown_template.format(count=self.countdown))
         else:
-            self.timer.stop()
+            tick_service.unsubscribe(self, self._update_countdown)
             self.timer_label.setText(self.tr('dialog', 'update', 'countdown_done'))
             self.timer_label.setStyleSheet(f"color: {self.tr('dialog', 'update', 'countdown_done_color')}; font-weight: 600;")
             self.cancel_btn.setEnabled(True)
@@ -252,5 +254,5 @@ class UpdateDialog(QDialog):
         if self.countdown > 0:
             event.ignore()
         else:
-            self.timer.stop()
+            tick_service.unsubscribe(self)
             super().closeEvent(event)
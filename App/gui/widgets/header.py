@@ -1,13 +1,63 @@
 from PyQt6.QtWidgets import (QFrame, QVBoxLayout, QHBoxLayout, QLabel, 
                             QGraphicsOpacityEffect, QApplication, QPushButton)
 from PyQt6.QtCore import Qt, QByteArray, QSize, QRect
-from PyQt6.QtGui import QPixmap, QPalette, QColor, QPainter, QPainterPath, QIcon
+from PyQt6.QtGui import QPixmap, QImage, QPalette, QColor, QPainter, QPainterPath, QIcon
 import qtawesome as qta
 from PIL import Image
 from io import BytesIO
 import json
 import os
 import webbrowser
+from ..language import language_notifier
+from ..startup import startup
+
+
+def render_header_image(image_path, radius=10):
+    """
+    Decode the header image and round its corners.
+    
+    Only uses QImage, so it can run on a startup worker thread.
+    
+    Args:
+        image_path: Path to the header image
+        radius: Corner radius in pixels
+        
+    Returns:
+        QImage (null if the image could not be decoded)
+    """
+    # Load and process image with PIL first
+    with Image.open(image_path) as img:
+        # Convert to RGB/RGBA and remove ICC profile
+        if img.mode in ('RGBA', 'LA'):
+            img = img.convert('RGBA')
+        else:
+            img = img.convert('RGB')
+        
+        # Save to buffer without ICC profile
+        buffer = BytesIO()
+        img.save(buffer, format='PNG', icc_profile=None)
+    
+    image = QImage.fromData(QByteArray(buffer.getvalue()))
+    if image.isNull():
+        return image
+    
+    # Apply rounded corners
+    target = QImage(image.size(), QImage.Format.Format_ARGB32_Premultiplied)
+    target.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(target)
+    try:
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        
+        path = QPainterPath()
+        path.addRoundedRect(0, 0, image.width(), image.height(), radius, radius)
+        
+        painter.setClipPath(path)
+        painter.drawImage(0, 0, image)
+    finally:
+        painter.end()
+    return target
+
 
 class HeaderFrame(QFrame):
     """Base class for header frames"""
@@ -64,16 +114,17 @@ class WhatsAppFrame(HeaderFrame):
         layout.setSpacing(2)
         
         app = QApplication.instance()
-        tr = app.BASE_DIR.get_translation
         config = app.BASE_DIR.config  # Get config
         
         # Group name with translation
-        group_name = QLabel(tr('header', 'whatsapp', 'title'))
+        group_name = QLabel()
+        language_notifier.bind(group_name, 'setText', 'header', 'whatsapp', 'title')
         group_name.setStyleSheet("font-weight: 600; font-size: 14px; background: transparent; color: rgba(127, 127, 127, 1);")
         group_name.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         # Join button with translation
-        join_button = QPushButton(f" {tr('header', 'whatsapp', 'join')}")
+        join_button = QPushButton()
+        language_notifier.bind(join_button, 'setText', 'header', 'whatsapp', 'join', template=" {}")
         join_button.setIcon(qta.icon('fa6b.whatsapp', color='#FFFFFF'))
         join_button.setStyleSheet("""
             QPushButton {
@@ -123,26 +174,11 @@ class ImageFrame(HeaderFrame):
         image_path = app.BASE_DIR.get_path('App', 'resources', 'public', 'header', 'header.png')
         if os.path.exists(image_path):
             try:
-                # Load and process image with PIL first
-                with Image.open(image_path) as img:
-                    # Convert to RGB/RGBA and remove ICC profile
-                    if img.mode in ('RGBA', 'LA'):
-                        img = img.convert('RGBA')
-                    else:
-                        img = img.convert('RGB')
-                    
-                    # Save to buffer without ICC profile
-                    buffer = BytesIO()
-                    img.save(buffer, format='PNG', icc_profile=None)
-                    image_data = buffer.getvalue()
-                    
-                    # Create QPixmap from processed image data
-                    pixmap = QPixmap()
-                    pixmap.loadFromData(QByteArray(image_data))
-                    
-                    # Apply rounded corners
-                    rounded_pixmap = self.round_corners(pixmap, 10)
-                    self.image_label.setPixmap(rounded_pixmap)
+                # Usually decoded on a startup worker while the splash is shown
+                image = startup.take('header_image')
+                if image is None:
+                    image = render_header_image(image_path)
+                self.image_label.setPixmap(QPixmap.fromImage(image))
             except Exception as e:
                 print(f"Error loading image: {str(e)}")
                 self.image_label.setText("Error loading image")
@@ -151,34 +187,6 @@ class ImageFrame(HeaderFrame):
             self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         layout.addWidget(self.image_label)
-  # Ubah ke 1.0 untuk 100% opacity
-    def round_corners(self, pixmap, radius):
-        """Apply rounded corners to pixmap"""
-        if pixmap.isNull():
-            return pixmap
-
-        target = QPixmap(pixmap.size())
-        target.fill(Qt.GlobalColor.transparent)
-
-        try:
-            painter = QPainter(target)
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
-
-            path = QPainterPath()
-            path.addRoundedRect(
-                0, 0, 
-                pixmap.width(), 
-                pixmap.height(), 
-                radius, radius
-            )
-
-            painter.setClipPath(path)
-            painter.drawPixmap(0, 0, pixmap)
-        finally:
-            painter.end()
-
-        return target
 
 class DonateFrame(HeaderFrame):
     """Frame for donation button"""
@@ -188,16 +196,15 @@ class DonateFrame(HeaderFrame):
         layout.setContentsMargins(10, 5, 10, 5)
         layout.setSpacing(2)
         
-        app = QApplication.instance()
-        tr = app.BASE_DIR.get_translation
-        
         # Title label with translation
-        title = QLabel(tr('header', 'donate', 'title'))
+        title = QLabel()
+        language_notifier.bind(title, 'setText', 'header', 'donate', 'title')
         title.setStyleSheet("font-weight: 600; font-size: 14px; background: transparent; color: rgba(127, 127, 127, 1);")
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         # Donate button with translation 
-        donate_button = QPushButton(f" {tr('header', 'donate', 'button')}")
+        donate_button = QPushButton()
+        language_notifier.bind(donate_button, 'setText', 'header', 'donate', 'button', template=" {}")
         donate_button.setIcon(qta.icon('fa6s.heart', color='#FF335F'))
         donate_button.setStyleSheet("""
             QPushButton {
@@ -6,6 +6,7 @@ from .dialogs.license_dialog import LicenseDialog
 from .dialogs.donate_dialog import DonateDialog
 import qtawesome as qta
 import platform
+from ..language import language_notifier
 
 class MenuBar(QMenuBar):
     def __init__(self, parent=None):
@@ -17,79 +18,102 @@ class MenuBar(QMenuBar):
         self.setup_style()
 
         # File menu with translations
-        file_menu = QMenu(self.tr('menu', 'file', 'title'), self)
-        new_action = file_menu.addAction(qta.icon('fa6s.file'), self.tr('menu', 'file', 'new'))
+        file_menu = QMenu(self)
+        language_notifier.bind(file_menu, 'setTitle', 'menu', 'file', 'title')
+        new_action = file_menu.addAction(qta.icon('fa6s.file'), "")
+        language_notifier.bind(new_action, 'setText', 'menu', 'file', 'new')
         new_action.setShortcut(QKeySequence.StandardKey.New)
         
-        open_action = file_menu.addAction(qta.icon('fa6s.folder-open'), self.tr('menu', 'file', 'open'))
+        open_action = file_menu.addAction(qta.icon('fa6s.folder-open'), "")
+        language_notifier.bind(open_action, 'setText', 'menu', 'file', 'open')
         open_action.setShortcut(QKeySequence.StandardKey.Open)
         
-        save_action = file_menu.addAction(qta.icon('fa6s.floppy-disk'), self.tr('menu', 'file', 'save'))
+        save_action = file_menu.addAction(qta.icon('fa6s.floppy-disk'), "")
+        language_notifier.bind(save_action, 'setText', 'menu', 'file', 'save')
         save_action.setShortcut(QKeySequence.StandardKey.Save)
         
         if not self.is_macos:
             file_menu.addSeparator()
-            exit_action = file_menu.addAction(qta.icon('fa6s.power-off'), self.tr('menu', 'file', 'exit'))
+            exit_action = file_menu.addAction(qta.icon('fa6s.power-off'), "")
+            language_notifier.bind(exit_action, 'setText', 'menu', 'file', 'exit')
             exit_action.setShortcut(QKeySequence.StandardKey.Quit)
 
         # Edit menu with translations
-        edit_menu = QMenu(self.tr('menu', 'edit', 'title'), self)
-        undo_action = edit_menu.addAction(qta.icon('fa6s.rotate-left'), self.tr('menu', 'edit', 'undo'))
+        edit_menu = QMenu(self)
+        language_notifier.bind(edit_menu, 'setTitle', 'menu', 'edit', 'title')
+        undo_action = edit_menu.addAction(qta.icon('fa6s.rotate-left'), "")
+        language_notifier.bind(undo_action, 'setText', 'menu', 'edit', 'undo')
         undo_action.setShortcut(QKeySequence.StandardKey.Undo)
         
-        redo_action = edit_menu.addAction(qta.icon('fa6s.rotate-right'), self.tr('menu', 'edit', 'redo'))
+        redo_action = edit_menu.addAction(qta.icon('fa6s.rotate-right'), "")
+        language_notifier.bind(redo_action, 'setText', 'menu', 'edit', 'redo')
         redo_action.setShortcut(QKeySequence.StandardKey.Redo)
         
         edit_menu.addSeparator()
-        cut_action = edit_menu.addAction(qta.icon('fa6s.scissors'), self.tr('menu', 'edit', 'cut'))
+        cut_action = edit_menu.addAction(qta.icon('fa6s.scissors'), "")
+        language_notifier.bind(cut_action, 'setText', 'menu', 'edit', 'cut')
         cut_action.setShortcut(QKeySequence.StandardKey.Cut)
         
-        copy_action = edit_menu.addAction(qta.icon('fa6s.copy'), self.tr('menu', 'edit', 'copy'))
+        copy_action = edit_menu.addAction(qta.icon('fa6s.copy'), "")
+        language_notifier.bind(copy_action, 'setText', 'menu', 'edit', 'copy')
         copy_action.setShortcut(QKeySequence.StandardKey.Copy)
         
-        paste_action = edit_menu.addAction(qta.icon('fa6s.paste'), self.tr('menu', 'edit', 'paste'))
+        paste_action = edit_menu.addAction(qta.icon('fa6s.paste'), "")
+        language_notifier.bind(paste_action, 'setText', 'menu', 'edit', 'paste')
         paste_action.setShortcut(QKeySequence.StandardKey.Paste)
         
         if not self.is_macos:
             edit_menu.addSeparator()
-            preferences_action = edit_menu.addAction(qta.icon('fa6s.gear'), self.tr('menu', 'edit', 'preferences'))
+            preferences_action = edit_menu.addAction(qta.icon('fa6s.gear'), "")
+            language_notifier.bind(preferences_action, 'setText', 'menu', 'edit', 'preferences')
             preferences_action.setShortcut("Ctrl+,")
 
         # View menu with translations
-        view_menu = QMenu(self.tr('menu', 'view', 'title'), self)
-        zoom_in = view_menu.addAction(qta.icon('fa6s.magnifying-glass-plus'), self.tr('menu', 'view', 'zoom_in'))
+        view_menu = QMenu(self)
+        language_notifier.bind(view_menu, 'setTitle', 'menu', 'view', 'title')
+        zoom_in = view_menu.addAction(qta.icon('fa6s.magnifying-glass-plus'), "")
+        language_notifier.bind(zoom_in, 'setText', 'menu', 'view', 'zoom_in')
         zoom_in.setShortcut(QKeySequence.StandardKey.ZoomIn)
         
-        zoom_out = view_menu.addAction(qta.icon('fa6s.magnifying-glass-minus'), self.tr('menu', 'view', 'zoom_out'))
+        zoom_out = view_menu.addAction(qta.icon('fa6s.magnifying-glass-minus'), "")
+        language_notifier.bind(zoom_out, 'setText', 'menu', 'view', 'zoom_out')
         zoom_out.setShortcut(QKeySequence.StandardKey.ZoomOut)
         
-        reset_zoom = view_menu.addAction(qta.icon('fa6s.compress'), self.tr('menu', 'view', 'reset_zoom'))
+        reset_zoom = view_menu.addAction(qta.icon('fa6s.compress'), "")
+        language_notifier.bind(reset_zoom, 'setText', 'menu', 'view', 'reset_zoom')
         reset_zoom.setShortcut("Ctrl+0")
 
         # Help menu with translations
-        help_menu = QMenu(self.tr('menu', 'help', 'title'), self)
-        doc_action = help_menu.addAction(qta.icon('fa6s.circle-question'), self.tr('menu', 'help', 'documentation'))
+        help_menu = QMenu(self)
+        language_notifier.bind(help_menu, 'setTitle', 'menu', 'help', 'title')
+        doc_action = help_menu.addAction(qta.icon('fa6s.circle-question'), "")
+        language_notifier.bind(doc_action, 'setText', 'menu', 'help', 'documentation')
         doc_action.setShortcut("F1")
         doc_action.triggered.connect(lambda: QDesktopServices.openUrl(
             QUrl(f"{self.config['repository']['url']}/tree/master/Documentation")))
         
         help_menu.addSeparator()
-        join_action = help_menu.addAction(qta.icon('fa6b.whatsapp', color='#25D366'), self.tr('menu', 'help', 'join_group'))
+        join_action = help_menu.addAction(qta.icon('fa6b.whatsapp', color='#25D366'), "")
+        language_notifier.bind(join_action, 'setText', 'menu', 'help', 'join_group')
         join_action.triggered.connect(lambda: QDesktopServices.openUrl(QUrl(self.config['repository']['whatsapp_url'])))
         
-        issue_action = help_menu.addAction(qta.icon('fa6s.bug', color='#F05400'), self.tr('menu', 'help', 'report_bug'))
+        issue_action = help_menu.addAction(qta.icon('fa6s.bug', color='#F05400'), "")
+        language_notifier.bind(issue_action, 'setText', 'menu', 'help', 'report_bug')
         issue_action.triggered.connect(lambda: QDesktopServices.openUrl(QUrl(f"{self.config['repository']['url']}/issues")))
         
         help_menu.addSeparator()
-        donate_action = help_menu.addAction(qta.icon('fa6s.heart', color='#FF335F'), self.tr('menu', 'help', 'donate'))
+        donate_action = help_menu.addAction(qta.icon('fa6s.heart', color='#FF335F'), "")
+        language_notifier.bind(donate_action, 'setText', 'menu', 'help', 'donate')
         donate_action.triggered.connect(self.show_donate)
         
-        license_action = help_menu.addAction(qta.icon('fa6s.file-lines'), self.tr('menu', 'help', 'license'))
+        license_action = help_menu.addAction(qta.icon('fa6s.file-lines'), "")
+        language_notifier.bind(license_action, 'setText', 'menu', 'help', 'license')
         license_action.triggered.connect(self.show_license)
         
         help_menu.addSeparator()
         if not self.is_macos:
-            about_action = help_menu.addAction(qta.icon('fa6s.circle-info', color='#0366d6'), self.tr('menu', 'help', 'about'))
+            about_action = help_menu.addAction(qta.icon('fa6s.circle-info', color='#0366d6'), "")
+            language_notifier.bind(about_action, 'setText', 'menu', 'help', 'about')
             about_action.triggered.connect(self.show_about)
 
         # Add menus to menubar
@@ -7,68 +7,10 @@ import os
 import json
 import importlib.util
 import sys
+from App.gui.language import language_notifier
+from App.gui.theme import theme_engine
 
-# Centralized styles
-STYLES = {
-    'title': """
-        font-size: 18px;
-        font-weight: 600;
-        color: palette(windowText);
-    """,
-    
-    'tool_widget': """
-        QWidget#tool_container { 
-            background-color: palette(light);
-            border-radius: 10px;
-        }
-        QWidget#tool_container:hover {
-            background-color: palette(light);
-            border-radius: 10px;
-            border: 1px solid rgba(127, 127, 127, 0.5);
-        }
-    """,
-    
-    'tool_title': """
-        font-weight: 600;
-        font-size: 14px;
-        color: palette(text);
-        background: transparent;
-    """,
-    
-    'tool_description': """
-        font-size: 11px;
-        background: transparent;
-        color: rgba(127, 127, 127, 1);
-    """,
-    
-    'launch_button': """
-        QPushButton {
-            background-color: palette(button);
-            border: none;
-            border-radius: 5px;
-            padding: 5px 15px;
-        }
-        QPushButton:hover {
-            background-color: #0366d6;
-            color: #FFFFFF;
-        }
-    """,
-    
-    'star_button': """
-        QPushButton {
-            background: transparent;
-            border: none;
-            padding: 0;
-            margin: 0;
-        }
-    """,
-
-    'lorem_text': """
-        color: palette(text);
-        font-size: 13px;
-        padding: 20px 0;
-    """
-}
+# Card and section styles live in the compiled app stylesheet (App/gui/theme.py)
 
 class HomePage(QWidget):
     def __init__(self, parent=None):
@@ -104,8 +46,9 @@ class HomePage(QWidget):
         layout.setSpacing(20)
         
         # Add Favorites section with translation
-        favorites_title = QLabel(self.tr('page', 'home', 'favorites'))
-        favorites_title.setStyleSheet(STYLES['title'])
+        favorites_title = QLabel()
+        language_notifier.bind(favorites_title, 'setText', 'page', 'home', 'favorites')
+        favorites_title.setObjectName("sectionTitle")
         favorites_title.setAlignment(Qt.AlignmentFlag.AlignLeft)
         layout.addWidget(favorites_title)
         
@@ -124,8 +67,9 @@ class HomePage(QWidget):
                 continue
                 
             # Add category title with translation
-            title = QLabel(self.tr('page', 'home', category_key))
-            title.setStyleSheet(STYLES['title'])
+            title = QLabel()
+            language_notifier.bind(title, 'setText', 'page', 'home', category_key)
+            title.setObjectName("sectionTitle")
             title.setAlignment(Qt.AlignmentFlag.AlignLeft)
             layout.addWidget(title)
             
@@ -213,31 +157,20 @@ class HomePage(QWidget):
         title_container = QVBoxLayout()
         title_container.setSpacing(2)
         
-        # Manual lookup from translation file instead of using tr function
-        try:
-            # Access translation based on current language
-            language = self.app.BASE_DIR.config["application"]["language"]
-            
-            tool_name = tool_data['id'].replace('tool_', '')
-            
-            # Load translation.json directly
-            translation_path = self.app.BASE_DIR.get_path('App', 'config', 'translation.json')
-            with open(translation_path, 'r', encoding='utf-8') as f:
-                translations = json.load(f)
-            
-            # Fetch the title and description from the translation file
-            title_text = translations.get(language, {}).get('tools', {}).get(tool_name, {}).get('title', tool_data.get('title', tool_data['id']))
-            desc_text = translations.get(language, {}).get('tools', {}).get(tool_name, {}).get('description', tool_data.get('description', ''))
-        except Exception:
-            title_text = tool_data.get('title', tool_data['id'])
-            desc_text = tool_data.get('description', '')
+        # Tool title and description come from the precompiled translation table,
+        # falling back to the dictionary values when no translation exists
+        tool_name = tool_data['id'].replace('tool_', '')
         
         # Simple title label without header layout
-        title_label = QLabel(title_text)
-        title_label.setStyleSheet(STYLES['tool_title'])
+        title_label = QLabel()
+        language_notifier.bind(title_label, 'setText', 'tools', tool_name, 'title',
+                               default=tool_data.get('title', tool_data['id']))
+        title_label.setObjectName("toolTitle")
         
-        desc_label = QLabel(desc_text)
-        desc_label.setStyleSheet(STYLES['tool_description'])
+        desc_label = QLabel()
+        language_notifier.bind(desc_label, 'setText', 'tools', tool_name, 'description',
+                               default=tool_data.get('description', ''))
+        desc_label.setObjectName("toolDescription")
         desc_label.setWordWrap(True)
         
         title_container.addWidget(title_label)
@@ -249,7 +182,6 @@ class HomePage(QWidget):
         star_btn.setProperty('tool_id', tool_data['id'])
         star_btn.setFixedSize(24, 24)
         star_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-        star_btn.setStyleSheet(STYLES['star_button'])
         is_favorite = tool_data['id'] in self.user_prefs['favorite_tools']
         star_icon = qta.icon('fa6s.star', 
                            color='#f39c12' if is_favorite else '#757575',
@@ -267,7 +199,7 @@ class HomePage(QWidget):
         # Launch button with connection to the tool's function if available
         launch_btn = QPushButton("Open")
         launch_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-        launch_btn.setStyleSheet(STYLES['launch_button'])
+        launch_btn.setObjectName("toolLaunchButton")
         
         # Connect launch button to the generic tool handler
         if 'function' in tool_data:
@@ -276,7 +208,6 @@ class HomePage(QWidget):
         col_layout.addLayout(header_layout)
         col_layout.addWidget(launch_btn)
         
-        col_widget.setStyleSheet(STYLES['tool_widget'])
         return col_widget
 
     def toggle_favorite(self, tool_id):
@@ -306,6 +237,7 @@ class HomePage(QWidget):
                     color='#f39c12' if is_favorite else '#757575',
                     color_disabled='#757575')
                 star_btn.setIcon(star_icon)
+                theme_engine.set_state(star_btn, 'favorite', is_favorite)
 
     def refresh_favorites(self):
         # Clear existing favorites
@@ -344,7 +276,24 @@ class HomePage(QWidget):
             json.dump(self.user_prefs, f, indent=4)
     
     def _launch_tool(self, tool_id):
-        """Launch tool by dynamically importing and showing the tool module"""
+        """Show a tool page, creating it on first launch"""
+        # Get the main window content widget to show the tool
+        main_window = self.window()
+        if not hasattr(main_window, 'content'):
+            return
+        content_widget = main_window.content
+        
+        # Reuse the open (or evicted and restorable) page instead of building another
+        if not content_widget.has_page(tool_id):
+            tool_instance = self._create_tool(tool_id)
+            if tool_instance is None:
+                return
+            content_widget.add_page(tool_id, tool_instance,
+                                    factory=lambda: self._create_tool(tool_id))
+        content_widget.show_page(tool_id)
+    
+    def _create_tool(self, tool_id):
+        """Create a tool by dynamically importing its module"""
         try:
             # Get tool category and name
             for category in self.TOOLS.values():
@@ -357,37 +306,31 @@ class HomePage(QWidget):
                         tool_path = self.app.BASE_DIR.get_path('App', 'gui', 'widgets', 'pages', 'tools', tool_name, f"{tool_name}.py")
                         
                         if os.path.exists(tool_path):
-                            # Import module dynamically
-                            spec = importlib.util.spec_from_file_location(tool_name, tool_path)
-                            module = importlib.util.module_from_spec(spec)
-                            sys.modules[tool_name] = module
-                            spec.loader.exec_module(module)
+                            # Import module dynamically (once; recreating an evicted page reuses it)
+                            module = sys.modules.get(tool_name)
+                            if getattr(module, '__file__', None) != tool_path:
+                                spec = importlib.util.spec_from_file_location(tool_name, tool_path)
+                                module = importlib.util.module_from_spec(spec)
+                                sys.modules[tool_name] = module
+                                spec.loader.exec_module(module)
                             
                             # Get the main tool class (assuming it follows naming convention)
                             tool_class_name = ''.join(word.capitalize() for word in tool_name.split('_')) + 'Tool'
                             if hasattr(module, tool_class_name):
                                 tool_class = getattr(module, tool_class_name)
-                                # Instantiate and show the tool
+                                # Instantiate the tool
                                 tool_instance = tool_class(self)
                                 
                                 # Connect login_required signal if it exists in the tool
                                 if hasattr(tool_instance, 'login_required'):
                                     tool_instance.login_required.connect(self._redirect_to_login)
-                                
-                                # Get the main window content widget to show the tool
-                                main_window = self.window()
-                                if hasattr(main_window, 'content'):
-                                    content_widget = main_window.content
-                                    # Add the page if it doesn't exist
-                                    if tool_id not in content_widget.pages:
-                                        content_widget.add_page(tool_id, tool_instance)
-                                    content_widget.show_page(tool_id)
-                                    return
+                                return tool_instance
                         break
             
             print(f"Could not find tool module for {tool_id}")
         except Exception as e:
             print(f"Error launching tool {tool_id}: {str(e)}")
+        return None
             
     def _redirect_to_login(self):
         """Redirect to the login page when a tool requires authentication."""
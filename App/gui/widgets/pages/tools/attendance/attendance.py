@@ -6,10 +6,15 @@ from PyQt6.QtGui import QFont, QColor, QPixmap, QPainter, QPainterPath, QBrush
 import json
 import os
 import datetime
+import logging
 from PyQt6.QtWidgets import QApplication
 from App.core.user._user_session_handler import session  # Import session handler
 from App.core.database._db_user_attendance import attendance_db  # Import attendance database
 from App.core.database._db_user_dashboard import UserDashboardDB  # Import for user profile data
+from App.gui.language import language_notifier  # Live language switching
+from App.gui.theme import theme_engine  # State styling via dynamic properties
+from App.gui.ticker import tick_service, set_label_text  # Shared second-aligned ticks
+from App.gui.attendance_state import attendance_state  # Shared attendance status
 
 
 class CircularPhotoLabel(QLabel):
@@ -43,6 +48,17 @@ class CircularPhotoLabel(QLabel):
         if self._pixmap:
             super().setPixmap(self._get_circular_pixmap())
     
+    def clear_image(self):
+        """Drop the source and rendered pixmaps"""
+        self._pixmap = None
+        self.clear()
+    
+    def source_bytes(self):
+        """Approximate memory held by the full-size source pixmap"""
+        if self._pixmap is None or self._pixmap.isNull():
+            return 0
+        return self._pixmap.width() * self._pixmap.height() * max(self._pixmap.depth(), 8) // 8
+    
     def _get_circular_pixmap(self):
         if self._pixmap is None:
             return QPixmap()
@@ -132,15 +148,35 @@ class AttendanceTool(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.logger = logging.getLogger('main.attendance')
         self.is_checked_in = False
         self.pin = ""
-        self.work_timer = None
         self.check_in_time = None
+        self._check_in_date_str = ""
+        self._date_key = None  # (date, language) currently shown in date_label
         
         # Get language setting from config
         self.app = QApplication.instance()
         self.config = self.load_config()
         self.language = self.config.get("application", {}).get("language", "en")
+        language_notifier.language_changed.connect(self._on_language_changed)
+        
+        # Kiosk mode: one shared device where the PIN alone identifies the employee
+        attendance_config = self.config.get("attendance", {})
+        self.kiosk_mode = attendance_config.get("kiosk_mode", False)
+        self.kiosk_reset_ms = int(attendance_config.get("kiosk_reset_seconds", 5) * 1000)
+        self._kiosk_reset_timer = None
+        
+        # Page-owned one-shots: unlike QTimer.singleShot they die with the page,
+        # so they cannot fire on it after the page manager has evicted it
+        self._login_prompt_timer = QTimer(self)
+        self._login_prompt_timer.setSingleShot(True)
+        self._login_prompt_timer.setInterval(300)
+        self._login_prompt_timer.timeout.connect(self._prompt_login)
+        self._show_refresh_timer = QTimer(self)
+        self._show_refresh_timer.setSingleShot(True)
+        self._show_refresh_timer.setInterval(100)
+        self._show_refresh_timer.timeout.connect(self._refresh_on_show)
         
         # Initialize the UserDashboardDB for getting user profile photo
         self.db_handler = UserDashboardDB(self.app)
@@ -152,10 +188,7 @@ class AttendanceTool(QWidget):
         # Create left panel (time and user info) - removed padding/margins
         left_panel = QFrame()
         left_panel.setFrameShape(QFrame.Shape.StyledPanel)
-        left_panel.setStyleSheet("""
-            background-color: palette(base);
-            border-radius: 8px;
-        """)
+        left_panel.setObjectName("attendancePanel")
         left_layout = QVBoxLayout(left_panel)
         left_layout.setContentsMargins(8, 8, 8, 8)  # Add minimal padding
         left_layout.setSpacing(2)  # Very compact spacing
@@ -181,10 +214,9 @@ class AttendanceTool(QWidget):
         """)
         self.date_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
-        # Set up timer to update date and time
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_datetime)
-        self.timer.start(1000)  # Update every second
+        # Clock and work duration are driven by the shared tick service,
+        # which skips this page while it is hidden
+        tick_service.subscribe(self, self._on_tick)
         self.update_datetime()  # Initial update
         
         # Create user profile photo with border
@@ -328,8 +360,9 @@ class AttendanceTool(QWidget):
         self.update_user_info()
         
         # Check if the user is logged in, if not emit login_required signal
-        if not session.is_logged_in():
-            QTimer.singleShot(300, self.login_required.emit)  # Emit after a short delay
+        # (kiosk mode identifies employees by PIN and needs no login)
+        if not self.kiosk_mode and not session.is_logged_in():
+            self._login_prompt_timer.start()  # Emit after a short delay
         
         # Add widgets to left panel
         left_layout.addWidget(self.time_label)
@@ -358,30 +391,19 @@ class AttendanceTool(QWidget):
         # Create right panel (PIN input and numpad)
         right_panel = QFrame()
         right_panel.setFrameShape(QFrame.Shape.StyledPanel)
-        right_panel.setStyleSheet("""
-            background-color: palette(base);
-            border-radius: 8px;
-            padding: 15px;
-        """)
+        right_panel.setObjectName("attendancePinPanel")
         right_layout = QVBoxLayout(right_panel)
         right_layout.setSpacing(15)
         
         # PIN display
         pin_label = QLabel("Enter PIN:")
-        pin_label.setStyleSheet("font-weight: bold; font-size: 16px;")
+        pin_label.setObjectName("attendancePinLabel")
         pin_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         # Modified PIN input to allow keyboard input
         self.pin_display = PinInputField(self)
         self.pin_display.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.pin_display.setStyleSheet("""
-            font-size: 24px;
-            padding: 10px;
-            background-color: palette(base);
-            border: 1px solid palette(mid);
-            border-radius: 5px;
-            margin-bottom: 15px;
-        """)
+        self.pin_display.setObjectName("attendancePinField")
         # Connect the PIN input signals to our handler methods
         self.pin_display.digitAdded.connect(self.add_pin_digit)
         self.pin_display.backspacePressed.connect(self.backspace_pin)
@@ -393,97 +415,36 @@ class AttendanceTool(QWidget):
         numpad_layout = QGridLayout()
         numpad_layout.setSpacing(10)
         
-        # Add number buttons
-        button_style = """
-            QPushButton {
-                font-size: 20px;
-                font-weight: bold;
-                background-color: rgba(0, 0, 0, 0.05);
-                color: rgba(127, 127, 127, 1);
-                border: 1px solid rgba(0, 0, 0, 0.08);
-                border-radius: 8px;
-                min-width: 60px;
-            }
-            QPushButton:hover {
-                background-color: rgba(0, 0, 0, 0.1);
-            }
-            QPushButton:pressed {
-                background-color: rgba(0, 0, 0, 0.15);
-            }
-        """
-        
         # Create number buttons 1-9
         for i in range(3):
             for j in range(3):
                 num = i * 3 + j + 1
                 button = QPushButton(str(num))
-                button.setStyleSheet(button_style)
+                button.setObjectName("numpadKey")
                 button.clicked.connect(lambda _, digit=num: self.add_pin_digit(str(digit)))
                 numpad_layout.addWidget(button, i, j)
         
         # Create 0 button and clear button
         zero_button = QPushButton("0")
-        zero_button.setStyleSheet(button_style)
+        zero_button.setObjectName("numpadKey")
         zero_button.clicked.connect(lambda: self.add_pin_digit("0"))
         numpad_layout.addWidget(zero_button, 3, 1)
         
         # Del button now clears the PIN (switched with Clear)
         del_button = QPushButton("Del")
-        del_button.setStyleSheet("""
-            QPushButton {
-                font-size: 16px;
-                font-weight: bold;
-                background-color: rgba(0, 0, 0, 0.05);
-                color: rgba(127, 127, 127, 1);
-                border: 1px solid #ff9800;
-                border-radius: 8px;
-            }
-            QPushButton:hover {
-                background-color: rgba(0, 0, 0, 0.1);
-            }
-            QPushButton:pressed {
-                background-color: rgba(0, 0, 0, 0.15);
-            }
-        """)
+        del_button.setObjectName("numpadClear")
         del_button.clicked.connect(self.clear_pin)  # Del now clears the PIN
         numpad_layout.addWidget(del_button, 3, 0, 1, 1)
         
         # Backspace button removes the last digit (function didn't change)
         backspace_button = QPushButton("←")
-        backspace_button.setStyleSheet("""
-            QPushButton {
-                font-size: 20px;
-                font-weight: bold;
-                background-color: rgba(0, 0, 0, 0.05);
-                color: rgba(127, 127, 127, 1);
-                border: 1px solid #f44336;
-                border-radius: 8px;
-            }
-            QPushButton:hover {
-                background-color: rgba(0, 0, 0, 0.1);
-            }
-            QPushButton:pressed {
-                background-color: rgba(0, 0, 0, 0.15);
-            }
-        """)
+        backspace_button.setObjectName("numpadBackspace")
         backspace_button.clicked.connect(self.backspace_pin)
         numpad_layout.addWidget(backspace_button, 3, 2, 1, 1)
         
         # Check-in/Check-out button
         self.check_button = QPushButton("CHECK IN")
-        self.check_button.setStyleSheet("""
-            QPushButton {
-                font-size: 18px;
-                font-weight: bold;
-                background-color: #4CAF50;
-                color: white;
-                border-radius: 8px;
-                margin-top: 15px;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-        """)
+        self.check_button.setObjectName("attendanceCheckButton")
         self.check_button.clicked.connect(self.toggle_check_status)
         
         # Add widgets to right panel
@@ -500,10 +461,13 @@ class AttendanceTool(QWidget):
         # Force focus to PIN field when shown
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
         
-        # Install event filter at application level to capture ALL keyboard events
-        self.app.installEventFilter(self)
+        # The application-level key filter (see eventFilter) is installed while
+        # the page is visible; remove it before widgets are torn down on quit
+        self.app.aboutToQuit.connect(self._remove_key_filter)
         
-        # Now that all UI elements are created, check attendance status
+        # Now that all UI elements are created, show attendance status and
+        # follow changes pushed by the shared state store
+        attendance_state.state_changed.connect(self._on_attendance_state_changed)
         self.check_current_attendance_status()
 
     def load_config(self):
@@ -513,7 +477,7 @@ class AttendanceTool(QWidget):
             with open(config_path, 'r') as f:
                 return json.load(f)
         except Exception as e:
-            print(f"Error loading config: {e}")
+            self.logger.error("Error loading config: %s", e)
             return {"application": {"language": "en"}}
 
     def get_indonesian_day_name(self, day_number):
@@ -549,18 +513,49 @@ class AttendanceTool(QWidget):
         }
         return indonesian_months.get(month_number, "")
 
+    def _on_language_changed(self, language):
+        """Reformat the date display when the application language changes."""
+        self.language = language
+        self.update_datetime()
+
+    def release_resources(self):
+        """Drop the profile photo while hidden; showEvent reloads it."""
+        self._login_prompt_timer.stop()
+        self.profile_photo.clear_image()
+    
+    def memory_cost(self):
+        """Extra bytes not visible to the page manager's widget estimate."""
+        return self.profile_photo.source_bytes()
+
     def showEvent(self, event):
         """Called when the widget is shown."""        
-        # Force focus to PIN field when shown
-        QTimer.singleShot(100, self.pin_display.setFocus)
-        
-        # Always refresh user info and attendance status when the widget is shown
-        # This ensures the widget shows current user data after login/logout
-        QTimer.singleShot(100, self.update_user_info)
-        QTimer.singleShot(150, self.check_current_attendance_status)
-        
+        # Capture ALL keyboard events at application level while shown
+        self.app.installEventFilter(self)
+        self._show_refresh_timer.start()
         super().showEvent(event)
     
+    def hideEvent(self, event):
+        """Called when the widget is hidden."""
+        self._remove_key_filter()
+        super().hideEvent(event)
+    
+    def _remove_key_filter(self):
+        """Stop filtering application events, so a hidden or evicted page costs nothing per event."""
+        self.app.removeEventFilter(self)
+    
+    def _refresh_on_show(self):
+        """Focus the PIN field and refresh user info shortly after the page is shown."""
+        self.pin_display.setFocus()
+        
+        # Always refresh user info when the widget is shown; this also re-applies
+        # the cached attendance status for whoever is logged in now
+        self.update_user_info()
+    
+    def _prompt_login(self):
+        """Ask for a login unless someone logged in since the prompt was scheduled."""
+        if not self.kiosk_mode and not session.is_logged_in():
+            self.login_required.emit()
+    
     def focusInEvent(self, event):
         """Called when the widget receives focus."""        
         # Always force focus to PIN field
@@ -601,10 +596,21 @@ class AttendanceTool(QWidget):
         # Pass all other events to the parent
         return super().eventFilter(obj, event)
     
+    def _on_tick(self, now):
+        """Per-second update from the shared tick service."""
+        self.update_datetime()
+        self.update_work_duration(now)
+
     def update_datetime(self):
         """Update the date and time display."""        
         now = QDateTime.currentDateTime()
-        self.time_label.setText(now.toString("hh:mm:ss"))
+        set_label_text(self.time_label, now.toString("hh:mm:ss"))
+        
+        # The date only needs reformatting when the day or language changes
+        date_key = (now.date(), self.language)
+        if date_key == self._date_key:
+            return
+        self._date_key = date_key
         
         # Format date based on language setting
         if self.language == "id":
@@ -640,27 +646,34 @@ class AttendanceTool(QWidget):
             self.pin = self.pin[:-1]
             self.pin_display.setText("*" * len(self.pin))
     
+    def _on_attendance_state_changed(self, user_id, state):
+        """Refresh the display when the logged-in user's attendance changes."""
+        if user_id == session.get_user_id():
+            self.check_current_attendance_status()
+
     def check_current_attendance_status(self):
-        """Check the current attendance status from the database."""        
-        if not session.is_logged_in():
+        """Show the current attendance status from the shared state store."""        
+        if self.kiosk_mode or not session.is_logged_in():
             return
             
         try:
             # Get current user ID from session
             user_id = session.get_user_id()
             if not user_id:
-                print("No user ID found in session")
+                self.logger.debug("No user ID found in session")
                 return
                 
-            # Get any unclosed attendance record (from any date)
-            # This ensures we don't prompt for check-in if the user hasn't checked out from a previous day
-            unclosed_record = attendance_db.get_unclosed_attendance_record(user_id)
+            state = attendance_state.get(user_id)
+            if state is None:
+                return
             
-            # Get last check-in time (from any date)
-            last_checkin_record = attendance_db.get_last_check_in_time(user_id)
+            # Any unclosed attendance record (from any date) means the user is still
+            # checked in, even if they forgot to check out on a previous day
+            unclosed_record = state['open_record']
             
-            # Get last check-out time (from any date)
-            last_checkout_record = attendance_db.get_last_check_out_time(user_id)
+            # Last check-in and check-out (from any date)
+            last_checkin_record = state['last_check_in']
+            last_checkout_record = state['last_check_out']
             
             # Update last check-in time display
             if last_checkin_record and last_checkin_record.get('check_in_time'):
@@ -714,19 +727,7 @@ class AttendanceTool(QWidget):
                 
                 # Update button to show CHECK OUT
                 self.check_button.setText("CHECK OUT")
-                self.check_button.setStyleSheet("""
-                    QPushButton {
-                        font-size: 18px;
-                        font-weight: bold;
-                        background-color: #f44336; /* Red color for check-out */
-                        color: white;
-                        border-radius: 8px;
-                        margin-top: 15px;
-                    }
-                    QPushButton:hover {
-                        background-color: #d32f2f;
-                    }
-                """)
+                theme_engine.set_state(self.check_button, 'checkedIn', True)
                 
                 # Start work duration timer
                 check_in_time_str = unclosed_record.get('check_in_time')
@@ -742,14 +743,12 @@ class AttendanceTool(QWidget):
                     # Combine date and time
                     time_obj = datetime.datetime.strptime(check_in_time_str, "%H:%M:%S").time()
                     self.check_in_time = datetime.datetime.combine(date_obj, time_obj)
+                    self._check_in_date_str = self.check_in_time.strftime("%b %d, %Y")
                     
-                    # Start timer to update work duration
-                    if self.work_timer is None:
-                        self.work_timer = QTimer(self)
-                        self.work_timer.timeout.connect(self.update_work_duration)
-                        self.work_timer.start(1000)  # Update every second
+                    # The tick service picks up the running duration from here
+                    self.update_work_duration()
                 except Exception as e:
-                    print(f"Error starting work duration timer: {e}")
+                    self.logger.error("Error starting work duration timer: %s", e)
                         
             else:
                 self.is_checked_in = False
@@ -760,48 +759,26 @@ class AttendanceTool(QWidget):
                 
                 # Update button to show CHECK IN
                 self.check_button.setText("CHECK IN")
-                self.check_button.setStyleSheet("""
-                    QPushButton {
-                        font-size: 18px;
-                        font-weight: bold;
-                        background-color: #4CAF50; /* Green color for check-in */
-                        color: white;
-                        border-radius: 8px;
-                        margin-top: 15px;
-                    }
-                    QPushButton:hover {
-                        background-color: #45a049;
-                    }
-                """)
+                theme_engine.set_state(self.check_button, 'checkedIn', False)
                 
-                # Stop work duration timer if running
-                if self.work_timer and self.work_timer.isActive():
-                    self.work_timer.stop()
-                self.work_timer = None
+                # Stop ticking the work duration
                 self.check_in_time = None
                 
                 # Display the last completed work duration (static)
                 self.update_last_work_duration()
                 
             # Reset PIN input field style to normal
-            self.pin_display.setStyleSheet("""
-                font-size: 24px;
-                padding: 10px;
-                background-color: palette(base);
-                border: 1px solid palette(mid);
-                border-radius: 5px;
-                margin-bottom: 15px;
-            """)
+            theme_engine.set_state(self.pin_display, 'error', False)
             
         except Exception as e:
-            print(f"Failed to check attendance status: {e}")
+            self.logger.error("Failed to check attendance status: %s", e)
     
     def update_last_work_duration(self):
         """Update the work duration display with the last completed work duration"""
         try:
             # Get the last checkout record with working_hours
-            user_id = session.get_user_id()
-            last_checkout_record = attendance_db.get_last_check_out_time(user_id)
+            state = attendance_state.get()
+            last_checkout_record = state['last_check_out'] if state else None
             
             if last_checkout_record and 'working_hours' in last_checkout_record and last_checkout_record['working_hours'] is not None:
                 # Get working hours from the record
@@ -834,17 +811,17 @@ class AttendanceTool(QWidget):
                 self.work_duration_value.setText("Never")
                 
         except Exception as e:
-            print(f"Error updating last work duration: {e}")
+            self.logger.error("Error updating last work duration: %s", e)
             self.work_duration_value.setText("00:00:00")
     
-    def update_work_duration(self):
+    def update_work_duration(self, now=None):
         """Update the work duration timer based on check-in time"""
         if not self.check_in_time:
             return
         
         try:
             # Calculate time difference between check-in time and now
-            now = datetime.datetime.now()
+            now = now or datetime.datetime.now()
             duration = now - self.check_in_time
             
             # Format as HH:MM:SS
@@ -853,48 +830,36 @@ class AttendanceTool(QWidget):
             minutes = (total_seconds % 3600) // 60
             seconds = total_seconds % 60
             
-            # Get check-in date formatted consistently
-            checkin_date = self.check_in_time.strftime("%b %d, %Y")
-            
-            # Update the label with check-in date and current duration
+            # Update the label with the cached check-in date and current duration
             duration_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-            self.work_duration_value.setText(f"{checkin_date}<br><span style='font-size: 11pt;'>{duration_str}</span>")
+            set_label_text(self.work_duration_value,
+                           f"{self._check_in_date_str}<br><span style='font-size: 11pt;'>{duration_str}</span>")
         except Exception as e:
-            print(f"Error updating work duration: {e}")
+            self.logger.error("Error updating work duration: %s", e)
     
     def toggle_check_status(self):
         """Process check-in or check-out based on current status."""        
+        if self.kiosk_mode:
+            self._kiosk_punch()
+            return
+            
         if not session.is_logged_in():
             QMessageBox.warning(self, "Login Required", 
                                 "You must be logged in to use the attendance tool.")
-            QTimer.singleShot(300, self.login_required.emit)
+            self._login_prompt_timer.start()
             return
             
         # Verify PIN before proceeding
         if not self.pin:
             # Show missing PIN with red border instead of message box
-            self.pin_display.setStyleSheet("""
-                font-size: 24px;
-                padding: 10px;
-                background-color: palette(base);
-                border: 2px solid #f44336;
-                border-radius: 5px;
-                margin-bottom: 15px;
-            """)
+            theme_engine.set_state(self.pin_display, 'error', True)
             self.pin_display.setFocus()
             return
             
         # Verify the PIN with the database
         if not attendance_db.verify_attendance_pin(self.pin):
             # Show invalid PIN with red border instead of message box
-            self.pin_display.setStyleSheet("""
-                font-size: 24px;
-                padding: 10px;
-                background-color: palette(base);
-                border: 2px solid #f44336;
-                border-radius: 5px;
-                margin-bottom: 15px;
-            """)
+            theme_engine.set_state(self.pin_display, 'error', True)
             self.clear_pin()
             return
             
@@ -912,19 +877,7 @@ class AttendanceTool(QWidget):
                     
                     self.is_checked_in = False
                     self.check_button.setText("CHECK IN")
-                    self.check_button.setStyleSheet("""
-                        QPushButton {
-                            font-size: 18px;
-                            font-weight: bold;
-                            background-color: #4CAF50; /* Green color for check-in */
-                            color: white;
-                            border-radius: 8px;
-                            margin-top: 15px;
-                        }
-                        QPushButton:hover {
-                            background-color: #45a049;
-                        }
-                    """)
+                    theme_engine.set_state(self.check_button, 'checkedIn', False)
                 else:
                     # Visual feedback for failure can be added here if needed
                     pass
@@ -938,46 +891,76 @@ class AttendanceTool(QWidget):
                     
                     self.is_checked_in = True
                     self.check_button.setText("CHECK OUT")
-                    self.check_button.setStyleSheet("""
-                        QPushButton {
-                            font-size: 18px;
-                            font-weight: bold;
-                            background-color: #f44336; /* Red color for check-out */
-                            color: white;
-                            border-radius: 8px;
-                            margin-top: 15px;
-                        }
-                        QPushButton:hover {
-                            background-color: #d32f2f;
-                        }
-                    """)
+                    theme_engine.set_state(self.check_button, 'checkedIn', True)
                 else:
                     # Visual feedback for failure can be added here if needed
                     pass
                     
-            # Important: Immediately refresh the attendance status to update UI
-            if success:
-                # Update attendance info immediately after successful check-in/out
-                QTimer.singleShot(100, self.check_current_attendance_status)
-                                      
+            # No follow-up query: the attendance state store pushes the new
+            # record back through state_changed
         except Exception as e:
-            print(f"An error occurred during attendance operation: {str(e)}")
+            self.logger.error("An error occurred during attendance operation: %s", e)
             
         # After checking in/out, clear the PIN and focus back on PIN field
         self.clear_pin()
         
         # Reset PIN input style
-        self.pin_display.setStyleSheet("""
-            font-size: 24px;
-            padding: 10px;
-            background-color: palette(base);
-            border: 1px solid palette(mid);
-            border-radius: 5px;
-            margin-bottom: 15px;
-        """)
+        theme_engine.set_state(self.pin_display, 'error', False)
+
+    def _show_kiosk_idle(self):
+        """Reset the kiosk display so it waits for the next employee's PIN."""
+        self.name_value.setText("Enter your PIN")
+        self.dept_value.setText("")
+        self.attendance_info_widget.setVisible(False)
+        self.create_default_profile_photo("?", "?")
+        self.profile_photo.set_border_color("rgba(127, 127, 127, 0.1)")
+        self.profile_photo.set_grayscale(True)
+        self.check_button.setText("CHECK IN / OUT")
+        theme_engine.set_state(self.check_button, 'checkedIn', False)
+        theme_engine.set_state(self.pin_display, 'error', False)
+
+    def _kiosk_punch(self):
+        """Identify the employee from the entered PIN and toggle their attendance."""
+        if not self.pin:
+            theme_engine.set_state(self.pin_display, 'error', True)
+            self.pin_display.setFocus()
+            return
+        
+        success, event, user = attendance_db.kiosk_punch(self.pin)
+        self.clear_pin()
+        
+        if not user:
+            # Unknown PIN: red border only, never reveal whose PIN is close
+            theme_engine.set_state(self.pin_display, 'error', True)
+            return
+        theme_engine.set_state(self.pin_display, 'error', False)
+        
+        checked_in = success and event == 'check_in'
+        self.name_value.setText(user.get('fullname') or user['username'])
+        if success:
+            action = "Checked in" if checked_in else "Checked out"
+            self.dept_value.setText(f"{action} at {datetime.datetime.now().strftime('%H:%M:%S')}")
+        else:
+            self.dept_value.setText("Attendance could not be recorded")
+        
+        self.update_profile_photo(user, user['username'])
+        self.profile_photo.set_border_color("#4CAF50" if checked_in else "rgba(127, 127, 127, 0.1)")
+        self.profile_photo.set_grayscale(not checked_in)
+        theme_engine.set_state(self.check_button, 'checkedIn', checked_in)
+        
+        # Return to the idle screen shortly; each new punch restarts the countdown
+        if self._kiosk_reset_timer is None:
+            self._kiosk_reset_timer = QTimer(self)
+            self._kiosk_reset_timer.setSingleShot(True)
+            self._kiosk_reset_timer.timeout.connect(self._show_kiosk_idle)
+        self._kiosk_reset_timer.start(self.kiosk_reset_ms)
 
     def update_user_info(self):
         """Update user information from session handler."""        
+        if self.kiosk_mode:
+            self._show_kiosk_idle()
+            return
+            
         if session.is_logged_in():
             # Get full name from session handler
             fullname = session.get_fullname() or session.get_username() or "Unknown"
@@ -1025,9 +1008,9 @@ class AttendanceTool(QWidget):
                 role = session.get_role() or ""
                 self.dept_value.setText(role.capitalize())
                 
-            # Always check attendance status when user info is updated
+            # Always show attendance status when user info is updated
             # This is crucial for handling user switching correctly
-            QTimer.singleShot(100, self.check_current_attendance_status)
+            self.check_current_attendance_status()
         else:
             self.name_value.setText("Please login first")
             self.dept_value.setText("Not authenticated")
@@ -1036,7 +1019,7 @@ class AttendanceTool(QWidget):
             self.create_default_profile_photo("?")
             
             # Emit login required signal if not logged in
-            QTimer.singleShot(300, self.login_required.emit)
+            self._login_prompt_timer.start()
             
     def update_profile_photo(self, user_data, username):
         """Update the profile photo based on user data"""
@@ -1052,9 +1035,9 @@ class AttendanceTool(QWidget):
                 return
         
         # If we reach here, no valid profile image was found, create colored circle with initials
-        self.create_default_profile_photo(username)
+        self.create_default_profile_photo(username, user_data.get('fullname') if user_data else None)
         
-    def create_default_profile_photo(self, username):
+    def create_default_profile_photo(self, username, fullname=None):
         """Create a default profile photo with user initials"""
         # Create empty pixmap
         pixmap = QPixmap(120, 120)
@@ -1066,7 +1049,7 @@ class AttendanceTool(QWidget):
         
         # Get user initials
         initials = ""
-        fullname = session.get_fullname() or username
+        fullname = fullname or session.get_fullname() or username
         
         if fullname and fullname != "?":
             for part in fullname.split():
@@ -0,0 +1,150 @@
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTableView, QHeaderView, QFrame
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QFont
+import datetime
+from App.gui.presence import presence_store
+from App.gui.ticker import tick_service, set_label_text
+
+
+def format_duration(seconds):
+    """Format seconds as H:MM:SS."""
+    seconds = max(int(seconds), 0)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+class PresenceBoardModel(QAbstractTableModel):
+    """
+    Rows of presence_store's open records.
+
+    Rows are inserted and removed as the store reports differences; the
+    duration column is computed from each record's check-in time on every
+    tick, and only that column is announced as changed.
+    """
+
+    HEADERS = ("Name", "Department", "Checked In", "Duration")
+    DURATION_COLUMN = 3
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = presence_store.records()
+        self._now = datetime.datetime.now()
+        presence_store.record_added.connect(self._on_record_added)
+        presence_store.record_removed.connect(self._on_record_removed)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        record = self._rows[index.row()]
+        column = index.column()
+        if column == 0:
+            return record['fullname'] or record['username']
+        if column == 1:
+            return record['department'] or ""
+        if column == 2:
+            since = record['since']
+            # Forgotten check-outs from earlier days show their date
+            return since.strftime("%H:%M" if since.date() == self._now.date() else "%d %b %H:%M")
+        return format_duration((self._now - record['since']).total_seconds())
+
+    def tick(self, now):
+        """Advance the clock; only the duration column is repainted."""
+        self._now = now
+        if self._rows:
+            self.dataChanged.emit(self.index(0, self.DURATION_COLUMN),
+                                  self.index(len(self._rows) - 1, self.DURATION_COLUMN),
+                                  [Qt.ItemDataRole.DisplayRole])
+
+    def _on_record_added(self, record):
+        # Keep rows ordered by check-in time
+        row = len(self._rows)
+        while row > 0 and self._rows[row - 1]['since'] > record['since']:
+            row -= 1
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.insert(row, record)
+        self.endInsertRows()
+
+    def _on_record_removed(self, record_id):
+        for row, record in enumerate(self._rows):
+            if record['id'] == record_id:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._rows[row]
+                self.endRemoveRows()
+                return
+
+
+class PresenceBoardWidget(QWidget):
+    """Live "who's in now" board for administrators."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._watching = False
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(8)
+
+        # Title with live head count
+        header_layout = QHBoxLayout()
+        title_label = QLabel("Who's In Now")
+        title_font = QFont()
+        title_font.setPointSize(10)
+        title_font.setWeight(600)
+        title_label.setFont(title_font)
+        header_layout.addWidget(title_label)
+        header_layout.addStretch()
+
+        self.count_label = QLabel()
+        self.count_label.setStyleSheet("color: #4CAF50; font-weight: 600;")
+        header_layout.addWidget(self.count_label)
+        layout.addLayout(header_layout)
+
+        self.model = PresenceBoardModel(self)
+        self.model.rowsInserted.connect(self._update_count)
+        self.model.rowsRemoved.connect(self._update_count)
+
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setShowGrid(False)
+        self.table.setAlternatingRowColors(True)
+        self.table.setSelectionMode(QTableView.SelectionMode.NoSelection)
+        self.table.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.table.setFrameShape(QFrame.Shape.NoFrame)
+        self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(32)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
+        layout.addWidget(self.table, 1)
+
+        # Durations advance on the shared tick, only while the board is visible
+        tick_service.subscribe(self.table, self.model.tick)
+        self._update_count()
+
+    def _update_count(self, *args):
+        set_label_text(self.count_label, f"{self.model.rowCount()} checked in")
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._watching:
+            self._watching = True
+            presence_store.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        if self._watching:
+            self._watching = False
+            presence_store.stop()
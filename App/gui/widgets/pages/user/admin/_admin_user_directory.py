@@ -0,0 +1,235 @@
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QTableView, QHeaderView, QFrame,
+    QPushButton, QFileDialog, QMessageBox, QInputDialog
+)
+from PyQt6.QtCore import Qt, QTimer, QAbstractTableModel, QModelIndex
+import qtawesome as qta
+from App.core.database._db_user_directory import user_directory
+from App.core.database._db_user_import import UserImporter, write_report
+from App.core.database._db_user_attendance import attendance_db
+from App.gui.ticker import set_label_text
+
+
+class UserDirectoryModel(QAbstractTableModel):
+    """Search results from user_directory, fetched a page at a time while scrolling."""
+
+    PAGE_SIZE = 50
+    COLUMNS = (
+        ("Name", 'fullname'),
+        ("Username", 'username'),
+        ("Email", 'email'),
+        ("Department", 'department'),
+        ("Phone", 'phone_number'),
+        ("Role", 'role'),
+    )
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.text = ""
+        self.total = 0
+        self._rows = []
+
+    def set_search(self, text):
+        """Start a new search, loading its first page."""
+        self.beginResetModel()
+        self.text = text
+        result = user_directory.search(text, 0, self.PAGE_SIZE)
+        self._rows = result['users']
+        self.total = result['total']
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.COLUMNS[section][0]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        user = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return user[self.COLUMNS[index.column()][1]] or ""
+        if role == Qt.ItemDataRole.ForegroundRole and not user['is_active']:
+            return Qt.GlobalColor.gray
+        if role == Qt.ItemDataRole.UserRole:
+            return user['id']
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and len(self._rows) < self.total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        users = user_directory.search(self.text, len(self._rows), self.PAGE_SIZE)['users']
+        if not users:
+            # The directory shrank since the count; stop asking
+            self.total = len(self._rows)
+            return
+        self.beginInsertRows(QModelIndex(), len(self._rows), len(self._rows) + len(users) - 1)
+        self._rows.extend(users)
+        self.endInsertRows()
+
+
+class UserDirectoryWidget(QWidget):
+    """Search-as-you-type list of all user accounts."""
+
+    # Wait for a pause in typing before querying
+    SEARCH_DELAY_MS = 200
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._loaded = False
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(8)
+
+        # Search box with result count
+        search_layout = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search name, username, email, department or phone...")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.addAction(qta.icon("fa6s.magnifying-glass", color="gray"),
+                                   QLineEdit.ActionPosition.LeadingPosition)
+        search_layout.addWidget(self.search_edit, 1)
+
+        self.count_label = QLabel()
+        self.count_label.setStyleSheet("color: palette(text);")
+        search_layout.addWidget(self.count_label)
+
+        import_btn = QPushButton("Import...")
+        import_btn.setIcon(qta.icon("fa6s.file-import", color="gray"))
+        import_btn.setToolTip("Create accounts from a CSV or JSON file")
+        import_btn.clicked.connect(self._import_users)
+        search_layout.addWidget(import_btn)
+
+        self.set_pin_btn = QPushButton("Set PIN...")
+        self.set_pin_btn.setIcon(qta.icon("fa6s.key", color="gray"))
+        self.set_pin_btn.setToolTip("Enrol or reset the selected user's attendance PIN")
+        self.set_pin_btn.clicked.connect(self._set_pin)
+        search_layout.addWidget(self.set_pin_btn)
+
+        self.clear_pin_btn = QPushButton("Clear PIN")
+        self.clear_pin_btn.setIcon(qta.icon("fa6s.ban", color="gray"))
+        self.clear_pin_btn.setToolTip("Remove the selected user's attendance PIN")
+        self.clear_pin_btn.clicked.connect(self._clear_pin)
+        search_layout.addWidget(self.clear_pin_btn)
+        layout.addLayout(search_layout)
+
+        self.model = UserDirectoryModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setShowGrid(False)
+        self.table.setAlternatingRowColors(True)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QTableView.SelectionMode.SingleSelection)
+        self.table.setFrameShape(QFrame.Shape.NoFrame)
+        self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(30)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table, 1)
+        self.table.selectionModel().selectionChanged.connect(self._update_pin_buttons)
+        self.model.modelReset.connect(self._update_pin_buttons)
+        self._update_pin_buttons()
+
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(self._run_search)
+        self.search_edit.textChanged.connect(self._search_timer.start)
+
+    def refresh(self):
+        """Re-run the current search (e.g. after accounts changed)."""
+        self._search_timer.stop()
+        self._run_search()
+
+    def _run_search(self):
+        self.model.set_search(self.search_edit.text().strip())
+        self._loaded = True
+        set_label_text(self.count_label, f"{self.model.total} users")
+
+    def _selected_user(self):
+        """Return (id, name) of the selected user, or None."""
+        rows = self.table.selectionModel().selectedRows()
+        if not rows:
+            return None
+        row = rows[0].row()
+        name = self.model.index(row, 0).data() or self.model.index(row, 1).data()
+        return rows[0].data(Qt.ItemDataRole.UserRole), name
+
+    def _update_pin_buttons(self):
+        selected = self.table.selectionModel().hasSelection()
+        self.set_pin_btn.setEnabled(selected)
+        self.clear_pin_btn.setEnabled(selected)
+
+    def _set_pin(self):
+        """Enrol or replace the selected user's kiosk PIN."""
+        user = self._selected_user()
+        if not user:
+            return
+        user_id, name = user
+        pin, ok = QInputDialog.getText(self, "Set Attendance PIN", f"New PIN for {name} (4-6 digits):",
+                                       QLineEdit.EchoMode.Password)
+        if not ok:
+            return
+        success, message = attendance_db.set_attendance_pin(user_id, pin.strip())
+        if success:
+            QMessageBox.information(self, "Attendance PIN", message)
+        else:
+            QMessageBox.warning(self, "Attendance PIN", message)
+
+    def _clear_pin(self):
+        """Remove the selected user's kiosk PIN after confirmation."""
+        user = self._selected_user()
+        if not user:
+            return
+        user_id, name = user
+        answer = QMessageBox.question(self, "Clear Attendance PIN", f"Remove the attendance PIN for {name}?")
+        if answer != QMessageBox.StandardButton.Yes:
+            return
+        success, message = attendance_db.clear_attendance_pin(user_id)
+        if success:
+            QMessageBox.information(self, "Attendance PIN", message)
+        else:
+            QMessageBox.warning(self, "Attendance PIN", message)
+
+    def _import_users(self):
+        """Bulk-create accounts from a file and summarize conflicts."""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Employees", "", "Employee files (*.csv *.json *.jsonl);;All files (*)")
+        if not path:
+            return
+        try:
+            report = UserImporter().import_file(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Import Failed", f"Could not read {path}:\n{e}")
+            return
+        self.refresh()
+
+        message = (f"Imported {report['imported']} users.\n"
+                   f"Conflicts: {len(report['conflicts'])}\nErrors: {len(report['errors'])}")
+        if not (report['conflicts'] or report['errors']):
+            QMessageBox.information(self, "Import Complete", message)
+            return
+        answer = QMessageBox.question(
+            self, "Import Complete", message + "\n\nSave a report of the skipped rows?",
+            QMessageBox.StandardButton.Save | QMessageBox.StandardButton.Close)
+        if answer == QMessageBox.StandardButton.Save:
+            report_path, _ = QFileDialog.getSaveFileName(self, "Save Import Report", "import_report.csv",
+                                                         "CSV files (*.csv)")
+            if report_path:
+                write_report(report, report_path)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Load the first page only when the directory is first opened
+        if not self._loaded:
+            self._run_search()
@@ -1,6 +1,9 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QHBoxLayout, QPushButton, QApplication
+import logging
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QHBoxLayout, QPushButton, QApplication, QTabWidget
 from PyQt6.QtCore import Qt, pyqtSignal
 import qtawesome as qta
+from App.gui.widgets.pages.user.admin._admin_presence_board import PresenceBoardWidget
+from App.gui.widgets.pages.user.admin._admin_user_directory import UserDirectoryWidget
 
 class AdminDashboard(QWidget):
     """Admin dashboard page shown after successful login for administrators."""
@@ -10,6 +13,7 @@ class AdminDashboard(QWidget):
     
     def __init__(self, parent=None, username="Admin"):
         super().__init__(parent)
+        self.logger = logging.getLogger('main.auth')
         self.username = username
         
         # Get app instance 
@@ -84,23 +88,16 @@ class AdminDashboard(QWidget):
         
         header_layout.addWidget(logout_btn)
         
-        # Admin dashboard content placeholder
-        content_label = QLabel("This will be the admin dashboard content with administrative controls.")
-        content_label.setWordWrap(True)
-        content_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        content_label.setStyleSheet("""
-            font-size: 16px;
-            color: palette(text);
-            background-color: rgba(98, 0, 234, 0.05);
-            border-radius: 8px;
-            padding: 30px;
-            margin: 20px 0;
-        """)
+        # Live board of everyone currently checked in, and the user directory
+        self.tab_widget = QTabWidget()
+        self.presence_board = PresenceBoardWidget()
+        self.user_directory = UserDirectoryWidget()
+        self.tab_widget.addTab(self.presence_board, "Who's In")
+        self.tab_widget.addTab(self.user_directory, "Users")
         
         # Add all components to main layout
         main_layout.addLayout(header_layout)
-        main_layout.addWidget(content_label)
-        main_layout.addStretch()
+        main_layout.addWidget(self.tab_widget, 1)
     
     def _on_logout(self):
         """Handle logout button click"""
@@ -111,7 +108,7 @@ class AdminDashboard(QWidget):
         # Get current user before logout
         current_user = auth.get_current_user()
         if current_user:
-            print(f"Logging out admin: {current_user.get('username', 'unknown')}")
+            self.logger.info("Logging out admin: %s", current_user.get('username', 'unknown'))
         
         # Ensure remember_login is disabled
         auth.update_settings(remember_login=False)
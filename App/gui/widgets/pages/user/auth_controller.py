@@ -1,3 +1,4 @@
+import logging
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QStackedWidget, QApplication
 from PyQt6.QtCore import Qt, pyqtSignal
 
@@ -8,16 +9,18 @@ class AuthController(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.logger = logging.getLogger('main.auth')
         
         # Get app instance and auth helper
         self.app = QApplication.instance()
         from App.core.user._user_auth import UserAuth
         from App.core.user._user_session_handler import session
-        self.auth = UserAuth(self.app)
+        from App.gui.startup import startup
+        # The remembered session is normally restored on a startup worker
+        self.auth = startup.take('session') or UserAuth(self.app)
         self.session = session
         
-        # Debug: Tampilkan status remember_login saat inisialisasi
-        print(f"Initial remember_login setting: {self.auth.settings.get('remember_login', False)}")
+        self.logger.debug("Initial remember_login setting: %s", self.auth.settings.get('remember_login', False))
         
         # Main layout
         main_layout = QVBoxLayout(self)
@@ -61,17 +64,12 @@ class AuthController(QWidget):
         from App.core.user._user_session_handler import session
         session.set_user_data(user)
         
-        # Print session data
-        print("\n===== SESSION HANDLER DATA =====")
-        print(f"Username: {session.get_username()}")
-        print(f"User ID: {session.get_user_id()}")
-        print(f"Role: {session.get_role()}")
-        print(f"Full Name: {session.get_fullname()}")
-        print(f"Email: {session.get_email()}")
-        print(f"Is Admin: {session.is_admin()}")
-        print(f"Is Logged In: {session.is_logged_in()}")
-        print(f"Complete User Data: {session.get_user_data()}")
-        print("================================\n")
+        # Load this user's attendance status once; widgets then follow the store
+        from App.gui.attendance_state import attendance_state
+        attendance_state.reconcile(session.get_user_id())
+        
+        self.logger.info("Session started for %s (id %s, role %s)",
+                         session.get_username(), session.get_user_id(), session.get_role())
         
         # Route to proper dashboard based on user role
         if user_role == "admin":
@@ -133,17 +131,22 @@ class AuthController(QWidget):
         if hasattr(main_window, 'content'):
             main_window.content.pages['admin_dashboard'] = self.admin_dashboard
     
+    def _release_dashboards(self):
+        """Destroy the logged-out user's dashboards"""
+        for attr in ('user_dashboard', 'admin_dashboard'):
+            dashboard = getattr(self, attr)
+            if dashboard is not None:
+                self.stacked_widget.removeWidget(dashboard)
+                dashboard.deleteLater()
+                setattr(self, attr, None)
+    
     def _on_logout(self):
         """Handle logout request by switching back to login page"""
         # Clear the session data
         from App.core.user._user_session_handler import session
         session.clear_session()
         
-        # Print session status after logout
-        print("\n===== SESSION HANDLER AFTER LOGOUT =====")
-        print(f"Is Logged In: {session.is_logged_in()}")
-        print(f"User Data: {session.get_user_data()}")
-        print("========================================\n")
+        self.logger.debug("Session cleared, logged in: %s", session.is_logged_in())
         
         # Also logout from auth
         self.auth.logout()
@@ -161,6 +164,9 @@ class AuthController(QWidget):
                 del main_window.content.pages['user_dashboard']
             if 'admin_dashboard' in main_window.content.pages:
                 del main_window.content.pages['admin_dashboard']
+        
+        # Free the dashboards (timers, pixmaps, per-row widgets); the next login rebuilds them
+        self._release_dashboards()
                 
         # Emit signal that login status changed
         self.login_status_changed.emit(False)
@@ -5,6 +5,8 @@ from PyQt6.QtCore import Qt, pyqtSignal
 import qtawesome as qta
 import os
 import re
+import logging
+from App.gui.language import language_notifier
 
 class LoginRegisterWidget(QWidget):
     """Login and registration widget that can be used as a helper component."""
@@ -110,6 +112,7 @@ class LoginRegisterWidget(QWidget):
     
     def __init__(self, parent=None, auth=None):
         super().__init__(parent)
+        self.logger = logging.getLogger('main.auth')
         
         # Get app instance and translation helper
         from PyQt6.QtWidgets import QApplication
@@ -168,7 +171,8 @@ class LoginRegisterWidget(QWidget):
         login_title_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         # Title label
-        login_title = QLabel(self.tr('page', 'user', 'title'))
+        login_title = QLabel()
+        language_notifier.bind(login_title, 'setText', 'page', 'user', 'title')
         login_title.setStyleSheet(self.STYLES["title"])
         login_title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
@@ -187,7 +191,7 @@ class LoginRegisterWidget(QWidget):
         
         # Username field
         self.username_field = QLineEdit()
-        self.username_field.setPlaceholderText(self.tr('page', 'user', 'username'))
+        language_notifier.bind(self.username_field, 'setPlaceholderText', 'page', 'user', 'username')
         self.username_field.setProperty("class", "login-input")
         self.username_field.setMinimumHeight(40)
         self.username_field.setStyleSheet(self.STYLES["input"])
@@ -196,7 +200,7 @@ class LoginRegisterWidget(QWidget):
         
         # Password field
         self.password_field = QLineEdit()
-        self.password_field.setPlaceholderText(self.tr('page', 'user', 'password'))
+        language_notifier.bind(self.password_field, 'setPlaceholderText', 'page', 'user', 'password')
         self.password_field.setEchoMode(QLineEdit.EchoMode.Password)
         self.password_field.setProperty("class", "login-input")
         self.password_field.setMinimumHeight(40)
@@ -207,7 +211,8 @@ class LoginRegisterWidget(QWidget):
         # Remember me and forgot password row
         options_layout = QHBoxLayout()
         
-        self.remember_me = QCheckBox(self.tr('page', 'user', 'remember_me'))
+        self.remember_me = QCheckBox()
+        language_notifier.bind(self.remember_me, 'setText', 'page', 'user', 'remember_me')
         self.remember_me.setStyleSheet(self.STYLES["checkbox"])
         
         # Load remember_me setting
@@ -217,7 +222,8 @@ class LoginRegisterWidget(QWidget):
         except:
             self.remember_me.setChecked(False)
         
-        forgot_password = QPushButton(self.tr('page', 'user', 'forgot_password'))
+        forgot_password = QPushButton()
+        language_notifier.bind(forgot_password, 'setText', 'page', 'user', 'forgot_password')
         forgot_password.setFlat(True)
         forgot_password.setCursor(Qt.CursorShape.PointingHandCursor)
         forgot_password.setStyleSheet(self.STYLES["button_link"])
@@ -227,7 +233,8 @@ class LoginRegisterWidget(QWidget):
         options_layout.addWidget(forgot_password)
         
         # Login button
-        login_btn = QPushButton(self.tr('page', 'user', 'signin_button'))
+        login_btn = QPushButton()
+        language_notifier.bind(login_btn, 'setText', 'page', 'user', 'signin_button')
         login_btn.setMinimumHeight(45)
         login_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         login_btn.setStyleSheet(self.STYLES["button_primary"])
@@ -236,10 +243,12 @@ class LoginRegisterWidget(QWidget):
         login_register_layout = QHBoxLayout()
         login_register_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
-        login_register_text = QLabel(self.tr('page', 'user', 'no_account'))
+        login_register_text = QLabel()
+        language_notifier.bind(login_register_text, 'setText', 'page', 'user', 'no_account')
         login_register_text.setStyleSheet(self.STYLES["text_label"])
         
-        login_register_btn = QPushButton(self.tr('page', 'user', 'register'))
+        login_register_btn = QPushButton()
+        language_notifier.bind(login_register_btn, 'setText', 'page', 'user', 'register')
         login_register_btn.setFlat(True)
         login_register_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         login_register_btn.setStyleSheet(self.STYLES["button_link"])
@@ -265,7 +274,8 @@ class LoginRegisterWidget(QWidget):
         register_title_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         # Register title
-        register_title = QLabel(self.tr('page', 'user', 'register_title'))
+        register_title = QLabel()
+        language_notifier.bind(register_title, 'setText', 'page', 'user', 'register_title')
         register_title.setStyleSheet(self.STYLES["title"])
         register_title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
@@ -284,7 +294,7 @@ class LoginRegisterWidget(QWidget):
 
         # Name field
         self.name_field = QLineEdit()
-        self.name_field.setPlaceholderText(self.tr('page', 'user', 'fullname'))
+        language_notifier.bind(self.name_field, 'setPlaceholderText', 'page', 'user', 'fullname')
         self.name_field.setProperty("class", "register-input")
         self.name_field.setMinimumHeight(40)
         self.name_field.setStyleSheet(self.STYLES["input"])
@@ -292,7 +302,7 @@ class LoginRegisterWidget(QWidget):
         
         # Email field
         self.email_field = QLineEdit()
-        self.email_field.setPlaceholderText(self.tr('page', 'user', 'email'))
+        language_notifier.bind(self.email_field, 'setPlaceholderText', 'page', 'user', 'email')
         self.email_field.setProperty("class", "register-input")
         self.email_field.setMinimumHeight(40)
         self.email_field.setStyleSheet(self.STYLES["input"])
@@ -300,7 +310,7 @@ class LoginRegisterWidget(QWidget):
         
         # Register username field
         self.reg_username_field = QLineEdit()
-        self.reg_username_field.setPlaceholderText(self.tr('page', 'user', 'register_username'))
+        language_notifier.bind(self.reg_username_field, 'setPlaceholderText', 'page', 'user', 'register_username')
         self.reg_username_field.setProperty("class", "register-input")
         self.reg_username_field.setMinimumHeight(40)
         self.reg_username_field.setStyleSheet(self.STYLES["input"])
@@ -308,7 +318,7 @@ class LoginRegisterWidget(QWidget):
         
         # Register password field
         self.reg_password_field = QLineEdit()
-        self.reg_password_field.setPlaceholderText(self.tr('page', 'user', 'register_password'))
+        language_notifier.bind(self.reg_password_field, 'setPlaceholderText', 'page', 'user', 'register_password')
         self.reg_password_field.setEchoMode(QLineEdit.EchoMode.Password)
         self.reg_password_field.setProperty("class", "register-input")
         self.reg_password_field.setMinimumHeight(40)
@@ -316,7 +326,8 @@ class LoginRegisterWidget(QWidget):
         self.reg_password_field.returnPressed.connect(self._on_register)
         
         # Register button
-        register_btn = QPushButton(self.tr('page', 'user', 'create_account_button'))
+        register_btn = QPushButton()
+        language_notifier.bind(register_btn, 'setText', 'page', 'user', 'create_account_button')
         register_btn.setMinimumHeight(45)
         register_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         register_btn.setStyleSheet(self.STYLES["button_primary"])
@@ -325,10 +336,12 @@ class LoginRegisterWidget(QWidget):
         back_login_layout = QHBoxLayout()
         back_login_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
-        back_login_text = QLabel(self.tr('page', 'user', 'have_account'))
+        back_login_text = QLabel()
+        language_notifier.bind(back_login_text, 'setText', 'page', 'user', 'have_account')
         back_login_text.setStyleSheet(self.STYLES["text_label"])
         
-        register_back_login_btn = QPushButton(self.tr('page', 'user', 'login'))
+        register_back_login_btn = QPushButton()
+        language_notifier.bind(register_back_login_btn, 'setText', 'page', 'user', 'login')
         register_back_login_btn.setFlat(True)
         register_back_login_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         register_back_login_btn.setStyleSheet(self.STYLES["button_link"])
@@ -355,7 +368,8 @@ class LoginRegisterWidget(QWidget):
         forgot_title_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         # Forgot password title
-        forgot_title = QLabel(self.tr('page', 'user', 'reset_password_title'))
+        forgot_title = QLabel()
+        language_notifier.bind(forgot_title, 'setText', 'page', 'user', 'reset_password_title')
         forgot_title.setStyleSheet(self.STYLES["title"])
         forgot_title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
@@ -374,14 +388,14 @@ class LoginRegisterWidget(QWidget):
         
         # Email field
         self.reset_email_field = QLineEdit()
-        self.reset_email_field.setPlaceholderText(self.tr('page', 'user', 'email'))
+        language_notifier.bind(self.reset_email_field, 'setPlaceholderText', 'page', 'user', 'email')
         self.reset_email_field.setMinimumHeight(40)
         self.reset_email_field.setStyleSheet(self.STYLES["input"])
         self.reset_email_field.returnPressed.connect(self._on_reset_password)
         
         # New password field
         self.new_password_field = QLineEdit()
-        self.new_password_field.setPlaceholderText(self.tr('page', 'user', 'new_password'))
+        language_notifier.bind(self.new_password_field, 'setPlaceholderText', 'page', 'user', 'new_password')
         self.new_password_field.setEchoMode(QLineEdit.EchoMode.Password)
         self.new_password_field.setMinimumHeight(40)
         self.new_password_field.setStyleSheet(self.STYLES["input"])
@@ -389,14 +403,15 @@ class LoginRegisterWidget(QWidget):
         
         # Confirm password field
         self.confirm_password_field = QLineEdit()
-        self.confirm_password_field.setPlaceholderText(self.tr('page', 'user', 'confirm_password'))
+        language_notifier.bind(self.confirm_password_field, 'setPlaceholderText', 'page', 'user', 'confirm_password')
         self.confirm_password_field.setEchoMode(QLineEdit.EchoMode.Password)
         self.confirm_password_field.setMinimumHeight(40)
         self.confirm_password_field.setStyleSheet(self.STYLES["input"])
         self.confirm_password_field.returnPressed.connect(self._on_reset_password)
         
         # Reset button
-        reset_btn = QPushButton(self.tr('page', 'user', 'reset_password_button'))
+        reset_btn = QPushButton()
+        language_notifier.bind(reset_btn, 'setText', 'page', 'user', 'reset_password_button')
         reset_btn.setMinimumHeight(45)
         reset_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         reset_btn.setStyleSheet(self.STYLES["button_primary"])
@@ -405,7 +420,8 @@ class LoginRegisterWidget(QWidget):
         back_login_layout = QHBoxLayout()
         back_login_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
-        back_login_btn = QPushButton(self.tr('page', 'user', 'back_to_login'))
+        back_login_btn = QPushButton()
+        language_notifier.bind(back_login_btn, 'setText', 'page', 'user', 'back_to_login')
         back_login_btn.setFlat(True)
         back_login_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         back_login_btn.setStyleSheet(self.STYLES["button_link"])
@@ -474,12 +490,12 @@ class LoginRegisterWidget(QWidget):
             try:
                 self.auth.update_settings(remember_login=False)
             except Exception as e:
-                print(f"Error resetting login form: {e}")
+                self.logger.error("Error resetting login form: %s", e)
 
     def _on_login(self):
         """Handle login button click"""
         if not self.auth:
-            print("Error: Auth helper not provided")
+            self.logger.error("Auth helper not provided")
             return
             
         username = self.username_field.text()
@@ -490,16 +506,16 @@ class LoginRegisterWidget(QWidget):
             remember_me_checked = self.remember_me.isChecked()
             self.auth.update_settings(remember_login=remember_me_checked)
         except Exception as e:
-            print(f"Error saving remember me setting: {e}")
+            self.logger.error("Error saving remember me setting: %s", e)
         
         # Authenticate user
         user = self.auth.authenticate(username, password)
         
         if user:
-            print(f"Login successful for user: {username}")
+            self.logger.info("Login successful for user: %s", username)
             self.login_successful.emit(user)
         else:
-            print("Login failed. Invalid username or password.")
+            self.logger.info("Login failed. Invalid username or password.")
             self.login_error_label.setText(self.tr('page', 'user', 'invalid_credentials'))
             self.login_error_label.setVisible(True)
     
@@ -510,7 +526,7 @@ class LoginRegisterWidget(QWidget):
     def _on_register(self):
         """Handle register button click"""
         if not self.auth:
-            print("Error: Auth helper not provided")
+            self.logger.error("Auth helper not provided")
             return
             
         name = self.name_field.text()
@@ -533,7 +549,7 @@ class LoginRegisterWidget(QWidget):
         success, message = self.auth.register(username, password, name, email)
         
         if success:
-            print(f"Registration successful for {name} ({email})")
+            self.logger.info("Registration successful for %s (%s)", name, email)
             
             # Switch to login screen with success message
             self._switch_to_login()
@@ -568,7 +584,7 @@ class LoginRegisterWidget(QWidget):
     def _on_reset_password(self):
         """Handle reset password button click"""
         if not self.auth:
-            print("Error: Auth helper not provided")
+            self.logger.error("Auth helper not provided")
             return
             
         email = self.reset_email_field.text()
@@ -585,7 +601,7 @@ class LoginRegisterWidget(QWidget):
         success, message = self.auth.reset_password(email, new_password, confirm_password)
         
         if success:
-            print(f"Password reset successful for {email}")
+            self.logger.info("Password reset successful for %s", email)
             
             # Get the user by email
             user = self.auth.get_user_by_email(email)
@@ -615,4 +631,4 @@ class LoginRegisterWidget(QWidget):
             # Show error message
             self.reset_status.setText(message)
             self.reset_status.setVisible(True)
-            print(f"Password reset failed: {message}")
\ No newline at end of file
+            self.logger.info("Password reset failed: %s", message)
\ No newline at end of file
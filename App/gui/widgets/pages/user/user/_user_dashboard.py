@@ -1,15 +1,17 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QFrame, QSizePolicy, QSpacerItem, QGridLayout,
-    QScrollArea, QTableWidget, QTableWidgetItem, QHeaderView
+    QScrollArea, QTableView, QHeaderView, QStyledItemDelegate
 )
-from PyQt6.QtCore import Qt, QDateTime, QTimer
-from PyQt6.QtGui import QFont, QColor
+from PyQt6.QtCore import Qt, QDateTime, QTimer, QAbstractTableModel, QModelIndex, QRect, QSize
+from PyQt6.QtGui import QFont, QColor, QPainter
 import qtawesome as qta
 import random  # For generating random percentage changes
 import datetime
 from App.core.user._user_session_handler import session
 from App.core.database._db_user_attendance import attendance_db
+from App.gui.attendance_state import attendance_state
+from App.gui.dashboard_stats import dashboard_stats
 
 
 class StatBox(QFrame):
@@ -55,13 +57,13 @@ class StatBox(QFrame):
         header_layout.addStretch()
         
         # Add value with specific margins
-        value_label = QLabel(str(value))
+        self.value_label = QLabel(str(value))
         value_font = QFont()
         value_font.setPointSize(28)
         value_font.setWeight(600)  # Semi-bold
-        value_label.setFont(value_font)
-        value_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        value_label.setStyleSheet(f"""
+        self.value_label.setFont(value_font)
+        self.value_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.value_label.setStyleSheet(f"""
             color: {color};
             margin-top: 0px;
             margin-bottom: 0px;
@@ -71,10 +73,14 @@ class StatBox(QFrame):
         
         # Add to main layout
         layout.addLayout(header_layout)
-        layout.addWidget(value_label)
+        layout.addWidget(self.value_label)
         
         # Set size policy but no minimum height
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
+    
+    def set_value(self, value):
+        """Update the displayed value."""
+        self.value_label.setText(str(value))
 
 
 class IncomeBox(QFrame):
@@ -194,166 +200,185 @@ class AttendanceStats(QWidget):
         layout.addStretch()
         
         # Add value
-        value_label = QLabel(str(value))
+        self.value_label = QLabel(str(value))
         value_font = QFont()
         value_font.setPointSize(10)
         value_font.setWeight(600)  # Semi-bold
-        value_label.setFont(value_font)
-        value_label.setStyleSheet(f"color: {color};")
-        layout.addWidget(value_label)
+        self.value_label.setFont(value_font)
+        self.value_label.setStyleSheet(f"color: {color};")
+        layout.addWidget(self.value_label)
         
         # Set size policy
         self.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Preferred)
+    
+    def set_value(self, value):
+        """Update the displayed value."""
+        self.value_label.setText(str(value))
+
+
+class AttendanceRecordsModel(QAbstractTableModel):
+    """
+    A user's attendance history, loaded page by page as the view scrolls.
+    
+    Rows are kept as plain tuples and pages are fetched by keyset (last
+    date and id), so scrolling through years of history stays cheap.
+    """
+    
+    PAGE_SIZE = 100
+    COLUMN_COUNT = 3  # Date, status, check-in/out and notes
+    
+    def __init__(self, user_id=None, parent=None):
+        super().__init__(parent)
+        self.user_id = user_id
+        self._rows = []
+        self._exhausted = user_id is None
+        
+        # Reload when this user checks in or out (here or on another device)
+        attendance_state.state_changed.connect(self._on_state_changed)
+    
+    def set_user(self, user_id):
+        """Show another user's history, starting again from the newest record."""
+        self.beginResetModel()
+        self.user_id = user_id
+        self._rows = []
+        self._exhausted = user_id is None
+        self.endResetModel()
+    
+    def refresh(self):
+        """Drop loaded pages; the view fetches the first page again."""
+        self.set_user(self.user_id)
+    
+    def _on_state_changed(self, user_id, state):
+        if user_id == self.user_id:
+            self.refresh()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.COLUMN_COUNT
+    
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+    
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+        after = (self._rows[-1][1], self._rows[-1][0]) if self._rows else None
+        page = attendance_db.get_attendance_page(self.user_id, after, self.PAGE_SIZE)
+        if len(page) < self.PAGE_SIZE:
+            self._exhausted = True
+        if not page:
+            return
+        self.beginInsertRows(QModelIndex(), len(self._rows), len(self._rows) + len(page) - 1)
+        self._rows.extend(page)
+        self.endInsertRows()
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        _, full_date, check_in, check_out, status, notes = self._rows[index.row()]
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return str(full_date)
+            if column == 1:
+                return status
+            times = f"{(check_in or '')[:5]} - {(check_out or '')[:5]}" if check_in else ""
+            return "   ".join(part for part in (times, notes or "") if part)
+        if role == Qt.ItemDataRole.ToolTipRole and column == 2 and notes:
+            return notes
+        return None
+
+
+class AttendanceRowDelegate(QStyledItemDelegate):
+    """Paints each record as one rounded row instead of per-row widgets."""
+    
+    RADIUS = 10
+    STATUS_COLORS = {
+        "Present": "#4CAF50",
+        "Absent": "#F44336",
+        "Sick": "#FF9800",
+        "Permission": "#2196F3",
+        "Late": "#FFC107",
+    }
+    
+    def paint(self, painter, option, index):
+        view = option.widget
+        model = index.model()
+        # The rounded background spans the whole row; each cell paints its slice
+        first = view.visualRect(index.siblingAtColumn(0))
+        last = view.visualRect(index.siblingAtColumn(model.columnCount() - 1))
+        row_rect = QRect(first.left(), option.rect.top(), last.right() - first.left() + 1,
+                         option.rect.height()).adjusted(0, 1, 0, -1)
+        
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setClipRect(option.rect)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(option.palette.dark())
+        painter.drawRoundedRect(row_rect, self.RADIUS, self.RADIUS)
+        
+        text = index.data() or ""
+        text_rect = option.rect.adjusted(10, 0, -10, 0)
+        alignment = Qt.AlignmentFlag.AlignVCenter
+        if index.column() == 1:
+            color = self.STATUS_COLORS.get(text)
+            painter.setPen(QColor(color) if color else option.palette.text().color())
+            font = QFont(option.font)
+            font.setWeight(QFont.Weight.DemiBold)
+            painter.setFont(font)
+            alignment |= Qt.AlignmentFlag.AlignHCenter
+        else:
+            painter.setPen(option.palette.text().color())
+            painter.setFont(option.font)
+        text = option.fontMetrics.elidedText(text, Qt.TextElideMode.ElideRight, text_rect.width())
+        painter.drawText(text_rect, alignment, text)
+        painter.restore()
+    
+    def sizeHint(self, option, index):
+        return QSize(0, 40)
 
 
-class AttendanceRecordsTable(QTableWidget):
-    """Table widget to display user attendance records."""
+class AttendanceRecordsTable(QTableView):
+    """Table view of the logged-in user's attendance records."""
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, user_id=None):
         super().__init__(parent)
         
         # Set table properties
         self.setShowGrid(False)  # No grid lines
-        self.setAlternatingRowColors(False)  # We'll handle this with custom styling
-        self.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
-        self.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.setSelectionMode(QTableView.SelectionMode.NoSelection)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.setWordWrap(False)
         self.verticalHeader().setVisible(False)  # Hide row numbers
-        self.setFrameShape(QFrame.Shape.NoFrame)  # No border around table
-        
-        # Hide the horizontal header
         self.horizontalHeader().setVisible(False)
-        
-        # Set spacing between rows
-        self.verticalHeader().setDefaultSectionSize(40)  # Row height
-        self.verticalHeader().setMinimumSectionSize(40)
-        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
-        
-        # Add spacing between rows
+        self.setFrameShape(QFrame.Shape.NoFrame)  # No border around table
+        self.setVerticalScrollMode(QTableView.ScrollMode.ScrollPerPixel)
         self.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 border: none;
                 background-color: transparent;
-                selection-background-color: transparent;
                 outline: none;
             }
-            QTableWidget::item {
-                border: none;
-                padding: 5px;
-                margin-bottom: 2px;
-            }
-            QHeaderView::section {
-                background-color: transparent;
-                border: none;
-                padding: 5px;
-                font-weight: bold;
-                color: palette(text);
-            }
-            QTableWidget::item:selected {
-                background-color: transparent;
-                color: palette(text);
-            }
         """)
         
-        # Set up columns
-        self.setColumnCount(3)
+        # Fixed row height lets the view skip measuring rows
+        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.verticalHeader().setDefaultSectionSize(40)
+        
+        self.records_model = AttendanceRecordsModel(
+            user_id if user_id is not None else session.get_user_id(), self)
+        self.setModel(self.records_model)
+        self.setItemDelegate(AttendanceRowDelegate(self))
         
         # Set column widths
         header = self.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.ResizeMode.Fixed)    # Date column
         header.setSectionResizeMode(1, QHeaderView.ResizeMode.Fixed)    # Status column
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)  # Notes column
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)  # Times and notes column
         self.setColumnWidth(0, 100)  # Set date column width
-        self.setColumnWidth(1, 80)   # Set status column width
-        
-        # Load dummy data
-        self._load_dummy_data()
-    
-    def _load_dummy_data(self):
-        """Load dummy attendance data for demonstration."""
-        # Status options and colors
-        statuses = [
-            {"text": "Present", "color": "#4CAF50"},
-            {"text": "Absent", "color": "#F44336"},
-            {"text": "Sick", "color": "#FF9800"},
-            {"text": "Permission", "color": "#2196F3"},
-            {"text": "Late", "color": "#FFC107"}
-        ]
-        
-        # Notes options
-        notes = [
-            "",
-            "Work from home",
-            "Doctor's appointment",
-            "Family event",
-            "Traffic jam",
-            "System issue"
-        ]
-        
-        # Get current date
-        current_date = QDateTime.currentDateTime().date()
-        
-        # Generate rows (for past 14 days)
-        self.setRowCount(14)
-        
-        for i in range(14):
-            # Calculate date (going backward from current date)
-            date = current_date.addDays(-i)
-            date_str = date.toString("yyyy-MM-dd")
-            
-            # Skip weekends (just to make it more realistic)
-            day_of_week = date.dayOfWeek()
-            if day_of_week in [6, 7]:  # Saturday or Sunday
-                status_idx = 1 if day_of_week == 6 else 1  # Absent on weekends
-                note = "Weekend"
-            else:
-                # Random status for weekdays (weighted toward "Present")
-                weights = [70, 5, 10, 10, 5]  # Present, Absent, Sick, Permission, Late
-                status_idx = random.choices(range(len(statuses)), weights=weights, k=1)[0]
-                
-                # Random note (more likely to be empty)
-                note = random.choice([notes[0]] * 5 + notes[1:])
-            
-            # Create custom widgets for each cell to make rounded rows
-            # Create row container widget
-            row_widget = QWidget()
-            row_widget.setObjectName(f"row_{i}")
-            row_widget.setStyleSheet(f"""
-                #row_{i} {{
-                    background-color: palette(dark);
-                    border-radius: 10px;
-                }}
-            """)
-            row_layout = QHBoxLayout(row_widget)
-            row_layout.setContentsMargins(10, 5, 10, 5)
-            row_layout.setSpacing(10)
-            
-            # Date label
-            date_label = QLabel(date_str)
-            
-            # Status label with color
-            status = statuses[status_idx]
-            status_label = QLabel(status["text"])
-            status_label.setStyleSheet(f"color: {status['color']}; font-weight: 600;")
-            status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            
-            # Note label
-            note_label = QLabel(note)
-            note_label.setStyleSheet("color: palette(text);")
-            
-            # Add labels to row layout
-            row_layout.addWidget(date_label, 1)
-            row_layout.addWidget(status_label, 1)
-            row_layout.addWidget(note_label, 3)
-            
-            # Add row widget to table
-            self.setCellWidget(i, 0, row_widget)
-            
-            # Hide other cells (we're using a single widget spanning all columns)
-            self.setSpan(i, 0, 1, 3)
-            
-        # Set row heights with spacing
-        for row in range(self.rowCount()):
-            self.setRowHeight(row, 40)
+        self.setColumnWidth(1, 90)   # Set status column width
 
 
 class UserDashboardWidget(QWidget):
@@ -364,8 +389,15 @@ class UserDashboardWidget(QWidget):
         self.username = username
         self.app = app
         
+        # Stat widgets by dashboard_stats key, filled in by _apply_stats
+        self.stat_widgets = {}
+        
         # Initialize UI
         self._init_ui()
+        
+        # Show the last known values right away, then bring them up to date
+        dashboard_stats.stats_changed.connect(self._on_stats_changed)
+        self.refresh_data()
     
     def _init_ui(self):
         """Initialize the user interface for the dashboard."""
@@ -391,10 +423,11 @@ class UserDashboardWidget(QWidget):
         stats_layout = QHBoxLayout()
         stats_layout.setSpacing(15)
         
-        # Create stat boxes with dummy data
-        ongoing_box = StatBox("Ongoing", 12, "fa5s.clock", "#4A86E8")
-        remaining_box = StatBox("Remaining", 48, "fa5s.tasks", "#FF9900")
-        finished_box = StatBox("Finished", 36, "fa5s.check-circle", "#009E60")
+        # Create stat boxes (days this month); values arrive from dashboard_stats
+        ongoing_box = StatBox("Ongoing", "-", "fa5s.clock", "#4A86E8")
+        remaining_box = StatBox("Remaining", "-", "fa5s.tasks", "#FF9900")
+        finished_box = StatBox("Finished", "-", "fa5s.check-circle", "#009E60")
+        self.stat_widgets.update(ongoing=ongoing_box, remaining=remaining_box, finished=finished_box)
         
         # Add stat boxes to layout
         stats_layout.addWidget(ongoing_box)
@@ -462,10 +495,10 @@ class UserDashboardWidget(QWidget):
         left_layout.addLayout(attendance_header_layout)
         
         # Create attendance records table
-        attendance_records_table = AttendanceRecordsTable()
+        self.attendance_records_table = AttendanceRecordsTable()
         
         # Add to left layout
-        left_layout.addWidget(attendance_records_table, 1)  # Give table a stretch factor
+        left_layout.addWidget(self.attendance_records_table, 1)  # Give table a stretch factor
         
         # Right column (attendance - smaller width)
         right_column = QFrame()
@@ -491,17 +524,22 @@ class UserDashboardWidget(QWidget):
         # Add attendance title to right column
         right_layout.addWidget(attendance_title)
         
-        # Create attendance stats with dummy data and icons
-        present_stats = AttendanceStats("Present", 87, "fa5s.user-check", "#4CAF50")
-        absent_stats = AttendanceStats("Absent", 5, "fa5s.user-times", "#F44336")
-        sick_stats = AttendanceStats("Sick", 3, "fa5s.procedures", "#FF9800")
-        permission_stats = AttendanceStats("Permission", 2, "fa5s.clipboard-check", "#2196F3")
+        # Create attendance stats with icons; values arrive from dashboard_stats
+        present_stats = AttendanceStats("Present", "-", "fa5s.user-check", "#4CAF50")
+        absent_stats = AttendanceStats("Absent", "-", "fa5s.user-times", "#F44336")
+        sick_stats = AttendanceStats("Sick", "-", "fa5s.procedures", "#FF9800")
+        permission_stats = AttendanceStats("Permission", "-", "fa5s.clipboard-check", "#2196F3")
         
         # Use theme-friendly colors for the bottom stats using palette colors
-        total_workdays_stats = AttendanceStats("Total Workdays", 100, "fa5s.calendar-alt", "palette(text)")
+        total_workdays_stats = AttendanceStats("Total Workdays", "-", "fa5s.calendar-alt", "palette(text)")
         total_workdays_stats.setStyleSheet("color: palette(text);")
-        avg_hours_stats = AttendanceStats("Avg Hours/Day", 7.5, "fa5s.clock", "palette(text)")
-        total_hours_stats = AttendanceStats("Total Hours", 750, "fa5s.hourglass-half", "palette(text)")
+        avg_hours_stats = AttendanceStats("Avg Hours/Day", "-", "fa5s.clock", "palette(text)")
+        total_hours_stats = AttendanceStats("Total Hours", "-", "fa5s.hourglass-half", "palette(text)")
+        self.stat_widgets.update(
+            present=present_stats, absent=absent_stats, sick=sick_stats,
+            permission=permission_stats, workdays=total_workdays_stats,
+            avg_hours=avg_hours_stats, total_hours=total_hours_stats,
+        )
         
         # Add attendance stats directly to right layout
         right_layout.addWidget(present_stats)
@@ -534,10 +572,27 @@ class UserDashboardWidget(QWidget):
         main_layout.addWidget(scroll_area)
     
     def refresh_data(self):
-        """Refresh the dashboard data."""
-        # In a real implementation, this would update the numbers from a database
-        pass
+        """Refresh the dashboard data (incremental; see App.gui.dashboard_stats)."""
+        user_id = session.get_user_id()
+        stats = dashboard_stats.get(user_id)
+        if stats:
+            self._apply_stats(stats)
+        dashboard_stats.refresh(user_id)
+    
+    def _on_stats_changed(self, user_id, stats):
+        if user_id == session.get_user_id():
+            self._apply_stats(stats)
+    
+    def _apply_stats(self, stats):
+        for key, widget in self.stat_widgets.items():
+            widget.set_value(stats[key])
     
     def update_username(self, username):
         """Update the displayed username.""" 
-        self.username = username
\ No newline at end of file
+        self.username = username
+        self.attendance_records_table.records_model.set_user(session.get_user_id())
+        
+        # Don't leave the previous user's numbers on screen
+        for widget in self.stat_widgets.values():
+            widget.set_value("-")
+        self.refresh_data()
\ No newline at end of file
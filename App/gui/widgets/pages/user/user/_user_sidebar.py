@@ -7,12 +7,13 @@ from PyQt6.QtGui import QPixmap, QColor, QPainter, QPainterPath, QBrush
 import qtawesome as qta
 import datetime
 import os
+import logging
 
 # Import the database module for user data
 from App.core.database import UserDashboardDB
 from App.core.user._user_auth import UserAuth
 from App.core.user._user_session_handler import session
-from App.core.database._db_user_attendance import attendance_db
+from App.gui.attendance_state import attendance_state
 
 class CircularImageLabel(QLabel):
     """A custom QLabel that displays images in a circular shape"""
@@ -164,6 +165,7 @@ class UserSidebar(QFrame):
     
     def __init__(self, parent=None, username="User"):
         super().__init__(parent)
+        self.logger = logging.getLogger('main.auth')
         self.username = username
         self.setObjectName("leftPanel")
         self.setFixedWidth(220)  # Fixed width for left panel
@@ -180,6 +182,9 @@ class UserSidebar(QFrame):
         self.fullname = self.user_data.get('fullname', username) if self.user_data else username
         
         self._setup_ui()
+        
+        # Follow check-in/check-out changes instead of polling the database
+        attendance_state.state_changed.connect(self._on_attendance_state_changed)
     
     def _setup_ui(self):
         """Set up the UI components of the sidebar"""
@@ -418,7 +423,7 @@ class UserSidebar(QFrame):
         # Get current user before logout
         current_user = auth.get_current_user()
         if current_user:
-            print(f"Logging out user: {current_user.get('username', 'unknown')}")
+            self.logger.info("Logging out user: %s", current_user.get('username', 'unknown'))
         
         # Ensure remember_login is disabled
         auth.update_settings(remember_login=False)
@@ -435,6 +440,11 @@ class UserSidebar(QFrame):
         self.check_attendance_status()
         super().showEvent(event)
     
+    def _on_attendance_state_changed(self, user_id, state):
+        """Update the profile border when the logged-in user checks in or out."""
+        if user_id == session.get_user_id():
+            self.check_attendance_status()
+    
     def check_attendance_status(self):
         """Check if the user is currently checked in and update the profile image border."""
         if not session.is_logged_in():
@@ -446,12 +456,9 @@ class UserSidebar(QFrame):
             if not user_id:
                 return
                 
-            # Get any unclosed attendance record regardless of date
-            # This ensures consistency with the attendance page
-            unclosed_record = attendance_db.get_unclosed_attendance_record(user_id)
-            
-            # If any unclosed record exists, user is considered checked in
-            if unclosed_record and unclosed_record.get('check_in_time') and not unclosed_record.get('check_out_time'):
+            # Cached state is shared with the attendance page, so both stay consistent
+            # If any unclosed record exists (any date), user is considered checked in
+            if attendance_state.is_checked_in(user_id):
                 # Update profile photo border to green to indicate checked in
                 self.profile_image.set_border_color("#4CAF50")  # Green border for checked in
             else:
@@ -459,7 +466,7 @@ class UserSidebar(QFrame):
                 self.profile_image.set_border_color("transparent")
                 
         except Exception as e:
-            print(f"Failed to check attendance status in sidebar: {e}")
+            self.logger.error("Failed to check attendance status in sidebar: %s", e)
             
     def update_username(self, username):
         """Update the displayed username with fresh data from database"""
@@ -93,8 +93,11 @@ class UserDashboard(QWidget):
     
     def _handle_tab_changed(self, index):
         """Handle tab change events"""
+        # Dashboard tab (index 0) only reloads what changed since it was last shown
+        if index == 0:  # Dashboard tab
+            self.dashboard_widget.refresh_data()
         # If changing to profile tab (index 1), refresh profile data
-        if index == 1:  # Profile tab
+        elif index == 1:  # Profile tab
             self.profile_widget.refresh_data()
         # If changing to preferences tab (index 2), refresh user data
         elif index == 2:  # Preferences tab
@@ -119,6 +122,9 @@ class UserDashboard(QWidget):
         # Update sidebar
         self.sidebar.update_username(username)
         
+        # Update dashboard widget
+        self.dashboard_widget.update_username(username)
+        
         # Update profile widget
         self.profile_widget.update_username(username)
         
@@ -9,6 +9,8 @@ import platform
 import subprocess
 import json
 from .dialogs.about_dialog import AboutDialog  # Add this import
+from ..language import language_notifier
+from ..theme import theme_engine
 
 class SideBar(QFrame):
     # Update signals - remove analytics_clicked
@@ -89,27 +91,34 @@ class SideBar(QFrame):
         self.content_layout.addWidget(self.bottom_section)
         
         # Add top icons
-        self.home_btn = self.addItem("fa6s.house", self.tr('sidebar', 'home'), top_layout)
+        self.home_btn = self.addItem("fa6s.house", parent_layout=top_layout)
+        language_notifier.bind(self.home_btn, 'setToolTip', 'sidebar', 'home')
         # IMPORTANT: Don't use setEnabled to make home_btn still clickable
         self.home_btn.clicked.connect(self._on_home_clicked)
         
-        self.github_btn = self.addItem("fa6b.github", self.tr('sidebar', 'github'), top_layout)
+        self.github_btn = self.addItem("fa6b.github", parent_layout=top_layout)
+        language_notifier.bind(self.github_btn, 'setToolTip', 'sidebar', 'github')
         self.github_btn.clicked.connect(self._on_github_clicked)
         
-        self.bug_btn = self.addItem("fa6s.bug", self.tr('sidebar', 'report_bug'), top_layout)
+        self.bug_btn = self.addItem("fa6s.bug", parent_layout=top_layout)
+        language_notifier.bind(self.bug_btn, 'setToolTip', 'sidebar', 'report_bug')
         self.bug_btn.clicked.connect(self._on_bug_clicked)
         
-        self.files_btn = self.addItem("fa6s.folder", self.tr('sidebar', 'open_folder'), top_layout)
+        self.files_btn = self.addItem("fa6s.folder", parent_layout=top_layout)
+        language_notifier.bind(self.files_btn, 'setToolTip', 'sidebar', 'open_folder')
         self.files_btn.clicked.connect(self._on_files_clicked)
         
         # Add settings and about to bottom
-        self.about_btn = self.addItem("fa6s.circle-info", self.tr('sidebar', 'about'), bottom_layout)
+        self.about_btn = self.addItem("fa6s.circle-info", parent_layout=bottom_layout)
+        language_notifier.bind(self.about_btn, 'setToolTip', 'sidebar', 'about')
         self.about_btn.clicked.connect(self._on_about_clicked)
         
-        self.account_btn = self.addItem("fa6s.user", self.tr('sidebar', 'account'), bottom_layout)
+        self.account_btn = self.addItem("fa6s.user", parent_layout=bottom_layout)
+        language_notifier.bind(self.account_btn, 'setToolTip', 'sidebar', 'account')
         self.account_btn.clicked.connect(self._on_account_clicked)
         
-        self.settings_btn = self.addItem("fa6s.gear", self.tr('sidebar', 'settings'), bottom_layout)
+        self.settings_btn = self.addItem("fa6s.gear", parent_layout=bottom_layout)
+        language_notifier.bind(self.settings_btn, 'setToolTip', 'sidebar', 'settings')
         self.settings_btn.clicked.connect(self._on_settings_clicked)
         
         # Check login status and update home button
@@ -126,21 +135,15 @@ class SideBar(QFrame):
         else:
             # For tools or other pages, clear active state
             if self.active_button:
-                self.active_button.setProperty("active", False)
-                self.active_button.style().unpolish(self.active_button)
-                self.active_button.style().polish(self.active_button)
+                theme_engine.set_state(self.active_button, "active", False)
                 self.active_button = None
 
     def _set_active(self, button):
         """Set active state for button"""
-        if self.active_button:
-            self.active_button.setProperty("active", False)
-            self.active_button.style().unpolish(self.active_button)
-            self.active_button.style().polish(self.active_button)
+        if self.active_button and self.active_button is not button:
+            theme_engine.set_state(self.active_button, "active", False)
         self.active_button = button
-        button.setProperty("active", True)
-        button.style().unpolish(button)
-        button.style().polish(button)
+        theme_engine.set_state(button, "active", True)
     
     def update_home_button_state(self):
         """Update home button visual state based on login status"""
@@ -1,16 +1,17 @@
-from PyQt6.QtWidgets import (QStatusBar, QLabel, QHBoxLayout, QWidget, 
-                            QMessageBox, QApplication)
+from PyQt6.QtWidgets import QStatusBar, QLabel, QHBoxLayout, QWidget, QApplication
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QDesktopServices, QColor
 from PyQt6.QtCore import QUrl
-import json
+import logging
 from ...utils.updater import UpdateChecker
 import qtawesome as qta
 from .dialogs.donate_dialog import DonateDialog
+from ..language import language_notifier
 
 class StatusBar(QStatusBar):
     def __init__(self, config, parent=None):
         super().__init__(parent)
+        self.logger = logging.getLogger('main.update')
         self.config = config
         self.tr = QApplication.instance().BASE_DIR.get_translation
         
@@ -135,6 +136,9 @@ class StatusBar(QStatusBar):
         
         lang_layout.addWidget(self.lang_label)
         
+        # Keep language dependent text in sync with live language switches
+        language_notifier.language_changed.connect(self._on_language_changed)
+        
         # Add permanent widgets to right side
         self.addPermanentWidget(python_version)
         self.addPermanentWidget(self.update_container)
@@ -147,25 +151,21 @@ class StatusBar(QStatusBar):
         self.addPermanentWidget(self.lang_container)
         
         # Initialize update checker
-        print("\nStatusBar Update Check:")
-        print(f"Current app version: v{config['application']['version']}")
-        print(f"GitHub Token: {config['repository']['github']['token'][:10]}...")
-        print(f"API URL: {config['repository']['github']['releases']}/latest")
+        self.logger.debug("Update check for v%s against %s/latest",
+                          config['application']['version'], config['repository']['github']['releases'])
         
         try:
             self.update_container.setVisible(False)
             self.checker = UpdateChecker(config['application']['version'])
             self.checker.update_available.connect(self.show_update)
-            print("Update checker initialized successfully")
             self.checker.start()
         except Exception as e:
-            print(f"Error initializing update checker: {str(e)}")
+            self.logger.error("Error initializing update checker: %s", e)
     
     def show_update(self, new_version, release_notes):
         try:
-            print("\nUpdate notification received:")
-            print(f"New version available: v{new_version}")
-            print(f"Current version: v{self.config['application']['version']}")
+            self.logger.info("New version available: v%s (current v%s)",
+                             new_version, self.config['application']['version'])
             
             self.new_version = new_version
             self.release_notes = release_notes
@@ -176,13 +176,12 @@ class StatusBar(QStatusBar):
             self.update_container.setVisible(True)
             self.update_container.repaint()
             
-            print("Update notification shown successfully")
             QApplication.instance().processEvents()
         except Exception as e:
-            print(f"Error showing update notification: {str(e)}")
+            self.logger.error("Error showing update notification: %s", e)
         
     def open_release_page(self, event):
-        print(f"\nStarting update process to v{self.new_version}")
+        self.logger.info("Starting update process to v%s", self.new_version)
         self.checker.download_and_install(self.new_version)
     
     def open_github_repo(self, event):
@@ -204,34 +203,15 @@ class StatusBar(QStatusBar):
         dialog.exec()
     
     def toggle_language(self, event):
-        current_lang = self.config['application']['language']
+        current_lang = QApplication.instance().BASE_DIR.config['application']['language']
         new_lang = 'id' if current_lang == 'en' else 'en'
         
-        # Show restart dialog
-        msg = QMessageBox()
-        msg.setIcon(QMessageBox.Icon.Question)
-        msg.setWindowTitle("Restart Required")
-        msg.setText("The application needs to restart to apply language changes.")
-        msg.setStandardButtons(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
-        
-        if msg.exec() == QMessageBox.StandardButton.Yes:
-            # Save new language setting
-            self.config['application']['language'] = new_lang
-            with open('App/config/config.json', 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=4)
-            
-            # Get current program path and arguments
-            import sys
-            import subprocess
-            import platform
-            
-            if platform.system() == "Windows":
-                subprocess.Popen(["Launcher.bat"])
-            else:
-                subprocess.Popen(["./Launcher.sh"])
-            
-            # Exit current instance
-            QApplication.instance().quit()
-        
-        # Update display even if restart was cancelled
-        self.lang_label.setText("🇺🇸" if new_lang == 'en' else "🇮🇩")
+        # Switch in place - bound widgets retranslate without a restart
+        language_notifier.switch_language(new_lang)
+    
+    def _on_language_changed(self, language):
+        """Refresh language dependent statusbar text"""
+        self.config['application']['language'] = language
+        self.lang_label.setText("🇺🇸" if language == 'en' else "🇮🇩")
+        if getattr(self, 'new_version', None):
+            self.update_text.setText(self.tr('statusbar', 'update').format(version=self.new_version))
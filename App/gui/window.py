@@ -92,4 +92,21 @@ class MainWindow(QMainWindow):
             y = (screen_geometry.height() - self.height()) // 2
             self.move(x, y)
         else:
-            self.showMaximized()
\ No newline at end of file
+            self.showMaximized()
+    
+    def handle_command(self, args):
+        """
+        Act on command line arguments, from this launch or forwarded by a later one.
+        
+        Args:
+            args: Argument list, e.g. ['open', 'attendance'] or ['--open', 'settings']
+        """
+        # Bring the existing window to the front
+        if self.isMinimized():
+            self.showNormal()
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        
+        if len(args) >= 2 and args[0] in ('open', '--open'):
+            self.content.open_page(args[1])
\ No newline at end of file
@@ -0,0 +1,4 @@
+"""
+Headless attendance API server package (no PyQt6)
+"""
+from ._api_server import run_server, AttendanceAPIServer
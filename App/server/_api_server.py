@@ -0,0 +1,512 @@
+"""
+Headless attendance API server.
+
+Exposes attendance punches, login and profile lookups as a small local
+HTTP/JSON API so several kiosks can share one database without each of
+them opening the SQLite file (often on a network share) directly.
+
+Request handler threads never touch SQLite. They hand each request to a
+single DatabaseWorker thread: attendance writes queued together are
+committed as one batch on the worker's single writer connection (so
+concurrent punches share one fsync), and lookups run on the same thread
+using the regular core database classes. Nothing here imports PyQt6.
+
+Endpoints (all JSON):
+    GET  /api/health
+    POST /api/auth/login                    {"username", "password"}
+    GET  /api/users/<username>
+    GET  /api/attendance/<user_id>/state
+    GET  /api/attendance/<user_id>/history  ?limit=30&offset=0
+    POST /api/attendance/<user_id>/check-in
+    POST /api/attendance/<user_id>/check-out
+    POST /api/attendance/punch              {"pin"}
+
+If server.token is set in config.json, every request must send
+"Authorization: Bearer <token>". The server refuses to bind to anything but
+a loopback address without a token, since the API then identifies users by
+id or PIN alone. Punches and credential guesses (failed logins, unknown
+PINs) are rate-limited per client address; over the limit the server
+answers 429 with Retry-After.
+"""
+import re
+import json
+import math
+import time
+import queue
+import hmac
+import sqlite3
+import logging
+import ipaddress
+import threading
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from App.core.database._db_user_attendance import UserAttendanceDB
+
+MAX_BODY_BYTES = 64 * 1024
+
+# Never sent to clients
+PRIVATE_USER_FIELDS = ('password', 'attendance_pin', 'attendance_pin_hash')
+
+# Endpoints that write attendance, and those whose failures are credential guesses
+PUNCH_ROUTES = ('check_in', 'check_out', 'punch')
+GUESS_ROUTES = {'login': 401, 'punch': 404}
+
+
+def public_user(user):
+    """Strip secrets from a user dict before it is returned over the API."""
+    if user is None:
+        return None
+    return {key: value for key, value in user.items() if key not in PRIVATE_USER_FIELDS}
+
+
+def is_loopback(host):
+    """True if host only accepts connections from this machine."""
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class RateLimiter:
+    """
+    Per-client token buckets holding up to per_minute tokens, refilled
+    continuously. A per_minute of 0 disables the limiter.
+    """
+
+    MAX_CLIENTS = 10000
+
+    def __init__(self, per_minute):
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self._buckets = {}  # client -> (tokens, monotonic time)
+        self._lock = threading.Lock()
+
+    def _tokens(self, client, now):
+        tokens, updated = self._buckets.get(client, (self.capacity, now))
+        return min(self.capacity, tokens + (now - updated) * self.rate)
+
+    def check(self, client):
+        """
+        Seconds until the client has a token again (0 if it has one now).
+        """
+        if not self.capacity:
+            return 0
+        with self._lock:
+            tokens = self._tokens(client, time.monotonic())
+        return 0 if tokens >= 1 else (1 - tokens) / self.rate
+
+    def charge(self, client):
+        """Take a token from the client (the bucket may go empty, never negative)."""
+        if not self.capacity:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._buckets[client] = (max(0.0, self._tokens(client, now) - 1), now)
+            if len(self._buckets) > self.MAX_CLIENTS:
+                # Forget clients whose buckets have refilled
+                self._buckets = {key: value for key, value in self._buckets.items()
+                                 if self._tokens(key, now) < self.capacity}
+
+    def acquire(self, client):
+        """
+        Take a token if one is available.
+
+        Returns:
+            0 on success, otherwise seconds until the client may retry
+        """
+        wait = self.check(client)
+        if not wait:
+            self.charge(client)
+        return wait
+
+
+class DatabaseWorker(threading.Thread):
+    """
+    Single thread that owns all database access for the server.
+
+    Writes are grouped: everything already queued when the worker wakes up
+    (up to max_batch) is committed in one transaction, so throughput grows
+    with load instead of each punch paying for its own commit.
+    """
+
+    def __init__(self, db_path=None, max_batch=64, batch_window_ms=0):
+        """
+        Initialize the worker.
+
+        Args:
+            db_path: Database to use; defaults to the path in config.json
+            max_batch: Maximum operations per transaction
+            batch_window_ms: Extra time to wait for more writes before committing
+        """
+        super().__init__(name='DatabaseWorker', daemon=True)
+        self.logger = logging.getLogger('main.server')
+        self.db_path = db_path
+        self.max_batch = max_batch
+        self.batch_window = batch_window_ms / 1000
+        self._queue = queue.Queue()
+        self._services = {}
+        self._writer = None
+        self.batches = 0
+        self.batched_writes = 0
+
+    def write(self, action, value):
+        """Queue an attendance write; returns a Future of (success, event, record, user)."""
+        future = Future()
+        self._queue.put(('write', (action, value), future))
+        return future
+
+    def call(self, service, method, *args, **kwargs):
+        """Queue a lookup on a core database class; returns a Future of its result."""
+        future = Future()
+        self._queue.put(('call', (service, method, args, kwargs), future))
+        return future
+
+    def stop(self):
+        self._queue.put(None)
+
+    def _service(self, name):
+        """Create core database objects on the worker thread, on first use."""
+        if name not in self._services:
+            if name == 'attendance':
+                service = UserAttendanceDB()
+            elif name == 'auth':
+                from App.core.user._user_auth import UserAuth
+                service = UserAuth()
+            elif name == 'dashboard':
+                from App.core.database._db_user_dashboard import UserDashboardDB
+                service = UserDashboardDB()
+            else:
+                raise ValueError(f"Unknown service: {name}")
+            if self.db_path:
+                service.db_path = self.db_path
+                if name == 'auth':
+                    # Settings were read from the configured database in __init__
+                    service._connect_db()
+                    service._load_settings()
+                    service._close_db()
+            self._services[name] = service
+        return self._services[name]
+
+    def _writer_connection(self):
+        if self._writer is None:
+            db_path = self.db_path or self._service('attendance').db_path
+            self._writer = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+            self._writer.row_factory = sqlite3.Row
+            self._writer.execute("PRAGMA journal_mode=WAL")
+            self._writer.execute("PRAGMA synchronous=NORMAL")
+        return self._writer
+
+    def run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = self.batch_window
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=deadline) if deadline else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+            self._process(batch)
+        if self._writer is not None:
+            self._writer.close()
+
+    def _process(self, batch):
+        writes = [(payload, future) for kind, payload, future in batch if kind == 'write']
+        if writes:
+            try:
+                results = self._service('attendance').write_batch(
+                    self._writer_connection(), [payload for payload, _ in writes])
+                for (_, future), result in zip(writes, results):
+                    future.set_result(result)
+                self.batches += 1
+                self.batched_writes += len(writes)
+            except Exception as e:
+                self.logger.error("Attendance batch of %d failed: %s", len(writes), e)
+                for _, future in writes:
+                    future.set_exception(e)
+
+        for kind, payload, future in batch:
+            if kind != 'call':
+                continue
+            service, method, args, kwargs = payload
+            try:
+                future.set_result(getattr(self._service(service), method)(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Routes API requests to the database worker."""
+
+    protocol_version = 'HTTP/1.1'  # Keep-alive for kiosks that poll
+    disable_nagle_algorithm = True  # Headers and body are separate writes
+    server_version = 'DesainiaAttendanceAPI/1.0'
+
+    ROUTES = [
+        ('GET', re.compile(r'^/api/health$'), 'health'),
+        ('POST', re.compile(r'^/api/auth/login$'), 'login'),
+        ('GET', re.compile(r'^/api/users/(?P<username>[^/]+)$'), 'user'),
+        ('GET', re.compile(r'^/api/attendance/(?P<user_id>\d+)/state$'), 'attendance_state'),
+        ('GET', re.compile(r'^/api/attendance/(?P<user_id>\d+)/history$'), 'attendance_history'),
+        ('POST', re.compile(r'^/api/attendance/(?P<user_id>\d+)/check-in$'), 'check_in'),
+        ('POST', re.compile(r'^/api/attendance/(?P<user_id>\d+)/check-out$'), 'check_out'),
+        ('POST', re.compile(r'^/api/attendance/punch$'), 'punch'),
+    ]
+
+    def log_message(self, format, *args):
+        self.server.logger.debug("%s %s", self.address_string(), format % args)
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def _dispatch(self, method):
+        url = urlparse(self.path)
+        token = self.server.token
+        if token and not hmac.compare_digest(self.headers.get('Authorization', ''), f"Bearer {token}"):
+            self._read_body()
+            return self._send(401, {'error': 'Unauthorized'})
+
+        for route_method, pattern, name in self.ROUTES:
+            match = pattern.match(url.path)
+            if match:
+                break
+        else:
+            self._read_body()
+            return self._send(404, {'error': 'Not found'})
+        if route_method != method:
+            self._read_body()
+            return self._send(405, {'error': 'Method not allowed'})
+
+        try:
+            body = self._read_body()
+        except ValueError as e:
+            return self._send(400, {'error': str(e)})
+
+        client = self.client_address[0]
+        wait = self.server.throttle(name, client)
+        if wait:
+            self.server.logger.warning("Rate limited %s on %s", client, name)
+            return self._send(429, {'error': 'Too many requests'}, {'Retry-After': str(math.ceil(wait))})
+
+        try:
+            status, payload = getattr(self, f"_api_{name}")(
+                body=body, query=parse_qs(url.query), **match.groupdict())
+        except Exception as e:
+            self.server.logger.error("API %s failed: %s", name, e)
+            status, payload = 500, {'error': 'Internal server error'}
+        if GUESS_ROUTES.get(name) == status:
+            self.server.guess_limiter.charge(client)
+        self._send(status, payload)
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_BYTES:
+            raise ValueError('Request body too large')
+        if not length:
+            return {}
+        try:
+            body = json.loads(self.rfile.read(length))
+        except ValueError:
+            raise ValueError('Request body must be JSON')
+        if not isinstance(body, dict):
+            raise ValueError('Request body must be a JSON object')
+        return body
+
+    def _send(self, status, payload, headers=None):
+        data = json.dumps(payload, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    # -- endpoints -------------------------------------------------------------
+
+    def _wait(self, future):
+        return future.result(timeout=self.server.request_timeout)
+
+    def _api_health(self, **_):
+        return 200, {'status': 'ok'}
+
+    def _api_login(self, body, **_):
+        if not body.get('username') or not body.get('password'):
+            return 400, {'error': 'username and password are required'}
+        user = self._wait(self.server.worker.call('auth', 'authenticate', body['username'], body['password']))
+        if not user:
+            return 401, {'error': 'Invalid username or password'}
+        return 200, {'user': public_user(user)}
+
+    def _api_user(self, username, **_):
+        user = self._wait(self.server.worker.call('dashboard', 'get_user_data', username, include_profile=False))
+        if not user:
+            return 404, {'error': 'User not found'}
+        return 200, {'user': public_user(user)}
+
+    def _api_attendance_state(self, user_id, **_):
+        state = self._wait(self.server.worker.call('attendance', 'get_attendance_state', int(user_id)))
+        if state is None:
+            return 500, {'error': 'Could not load attendance state'}
+        return 200, state
+
+    def _api_attendance_history(self, user_id, query, **_):
+        try:
+            limit = min(int(query.get('limit', ['30'])[0]), 500)
+            offset = max(int(query.get('offset', ['0'])[0]), 0)
+        except ValueError:
+            return 400, {'error': 'limit and offset must be integers'}
+        records = self._wait(self.server.worker.call(
+            'attendance', 'get_attendance_history', int(user_id), limit, offset))
+        return 200, {'records': records}
+
+    def _punch_response(self, result, failure_status):
+        success, event, record, user = result
+        if not success:
+            return failure_status, {'success': False, 'event': event, 'user': public_user(user)}
+        return 200, {'success': True, 'event': event, 'record': record, 'user': public_user(user)}
+
+    def _api_check_in(self, user_id, **_):
+        return self._punch_response(self._wait(self.server.worker.write('check_in', int(user_id))), 409)
+
+    def _api_check_out(self, user_id, **_):
+        return self._punch_response(self._wait(self.server.worker.write('check_out', int(user_id))), 409)
+
+    def _api_punch(self, body, **_):
+        pin = str(body.get('pin', ''))
+        if not pin.isdigit():
+            return 400, {'error': 'pin is required'}
+        result = self._wait(self.server.worker.write('punch', pin))
+        return self._punch_response(result, 404 if result[3] is None else 409)
+
+
+class AttendanceAPIServer(ThreadingHTTPServer):
+    """Threaded HTTP server bound to a DatabaseWorker."""
+
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=8765, token='', db_path=None,
+                 max_batch=64, batch_window_ms=0, request_timeout=30,
+                 guesses_per_minute=10, punches_per_minute=120):
+        """
+        Initialize the server and start its database worker.
+
+        Args:
+            host: Interface to bind; keep 127.0.0.1 unless kiosks are remote
+            port: TCP port (0 picks a free one)
+            token: Shared bearer token; empty disables the check (loopback hosts only)
+            db_path: Database to serve; defaults to the path in config.json
+            max_batch: Maximum writes committed per transaction
+            batch_window_ms: Extra time to gather writes before committing
+            request_timeout: Seconds a request waits for the database worker
+            guesses_per_minute: Failed logins and unknown PINs allowed per client (0: no limit)
+            punches_per_minute: Punch requests allowed per client (0: no limit)
+
+        Raises:
+            ValueError: If host is not a loopback address and no token is set
+        """
+        if not token and not is_loopback(host):
+            raise ValueError(f"Refusing to serve on {host} without server.token; "
+                             "set a token or bind to 127.0.0.1")
+        super().__init__((host, port), _RequestHandler)
+        self.logger = logging.getLogger('main.server')
+        self.token = token
+        self.request_timeout = request_timeout
+        self.guess_limiter = RateLimiter(guesses_per_minute)
+        self.punch_limiter = RateLimiter(punches_per_minute)
+        self.worker = DatabaseWorker(db_path, max_batch=max_batch, batch_window_ms=batch_window_ms)
+        self.worker.start()
+
+    def throttle(self, route, client):
+        """
+        Apply the rate limits for a request.
+
+        Returns:
+            0 if the request may proceed, otherwise seconds until it may be retried
+        """
+        if route in PUNCH_ROUTES:
+            wait = self.punch_limiter.acquire(client)
+            if wait:
+                return wait
+        if route in GUESS_ROUTES:
+            return self.guess_limiter.check(client)
+        return 0
+
+    def server_close(self):
+        super().server_close()
+        self.worker.stop()
+        self.worker.join(timeout=5)
+
+
+def run_server(base_dir, argv=None):
+    """
+    Entry point for `main.py --server`.
+
+    Args:
+        base_dir: Project root directory
+        argv: Command line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Process exit code
+    """
+    import os
+    import argparse
+    from App.utils.logging_setup import setup_logging
+    from App.core.database import run_migrations
+    from App.core.sync import start_from_config as start_sheet_sync
+
+    with open(os.path.join(base_dir, 'App', 'config', 'config.json'), 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    server_config = config.get('server', {})
+
+    parser = argparse.ArgumentParser(description="Desainia attendance API server")
+    parser.add_argument('--server', action='store_true')
+    parser.add_argument('--host', default=server_config.get('host', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=server_config.get('port', 8765))
+    args = parser.parse_args(argv)
+
+    logger = setup_logging(base_dir, config)
+    if not run_migrations():
+        logger.error("Database initialization failed; not starting the API server")
+        return 1
+
+    sheet_sync = start_sheet_sync(base_dir, config)
+
+    try:
+        server = AttendanceAPIServer(
+            args.host,
+            args.port,
+            token=server_config.get('token', ''),
+            max_batch=server_config.get('max_batch', 64),
+            batch_window_ms=server_config.get('batch_window_ms', 0),
+            guesses_per_minute=server_config.get('guesses_per_minute', 10),
+            punches_per_minute=server_config.get('punches_per_minute', 120)
+        )
+    except (ValueError, OSError) as e:
+        logger.error("Could not start the attendance API: %s", e)
+        if sheet_sync:
+            sheet_sync.stop()
+        return 1
+    logger.info("Attendance API listening on http://%s:%d", *server.server_address[:2])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Attendance API shutting down")
+    finally:
+        server.server_close()
+        if sheet_sync:
+            sheet_sync.stop()
+    return 0
@@ -0,0 +1,166 @@
+"""
+Load test for the headless attendance API server.
+
+By default starts a throwaway server on a temporary database seeded with
+employees and kiosk PINs, then hammers it from several client threads over
+persistent HTTP connections (like kiosks would) and reports throughput,
+latency percentiles and errors. Point it at a running server with --url
+(and --pins) to test a real deployment.
+
+    python -m App.server.load_test --clients 16 --requests 200
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import sqlite3
+import argparse
+import tempfile
+import threading
+import http.client
+from urllib.parse import urlparse
+
+if __package__ in (None, ''):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def _seed_database(db_path, employees):
+    """Create a migrated database with employees and return their PINs."""
+    from App.core.database._db_migration import DatabaseMigration
+    from App.core.database._db_user_attendance import hash_attendance_pin
+
+    migration = DatabaseMigration()
+    migration.db_path = db_path
+    migration.run_migrations()
+
+    conn = sqlite3.connect(db_path)
+    pins = random.sample(range(100000, 1000000), employees)
+    key = conn.execute("SELECT value FROM app_settings WHERE key = 'attendance_pin_key'").fetchone()[0]
+    conn.executemany(
+        "INSERT INTO users (username, password, fullname, email, role, attendance_pin_hash) "
+        "VALUES (?, '', ?, ?, 'user', ?)",
+        [(f"emp{i}", f"Employee {i}", f"emp{i}@example.com", hash_attendance_pin(pin, key))
+         for i, pin in enumerate(pins)]
+    )
+    conn.commit()
+    conn.close()
+    return [str(pin) for pin in pins]
+
+
+def _client(host, port, token, pins, count, latencies, errors, lock):
+    """One kiosk: punch random PINs over a single keep-alive connection."""
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    headers = {'Content-Type': 'application/json'}
+    if token:
+        headers['Authorization'] = f"Bearer {token}"
+    local_latencies = []
+    local_errors = 0
+    for _ in range(count):
+        body = json.dumps({'pin': random.choice(pins)}).encode('utf-8')
+        start = time.perf_counter()
+        try:
+            conn.request('POST', '/api/attendance/punch', body, headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                local_errors += 1
+        except (OSError, http.client.HTTPException):
+            local_errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+        local_latencies.append(time.perf_counter() - start)
+    conn.close()
+    with lock:
+        latencies.extend(local_latencies)
+        errors[0] += local_errors
+
+
+def _percentile(values, fraction):
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def run_load_test(host, port, pins, clients=8, requests_per_client=200, token=''):
+    """
+    Run concurrent kiosk clients against a server.
+
+    Returns:
+        Dictionary with request count, errors, elapsed seconds and sorted latencies
+    """
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    threads = [
+        threading.Thread(target=_client,
+                         args=(host, port, token, pins, requests_per_client, latencies, errors, lock))
+        for _ in range(clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'elapsed': elapsed,
+        'latencies': sorted(latencies),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the attendance API server")
+    parser.add_argument('--url', help="Existing server, e.g. http://127.0.0.1:8765 (default: throwaway server)")
+    parser.add_argument('--pins', help="Comma-separated PINs to punch when using --url")
+    parser.add_argument('--token', default='')
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200, help="Requests per client")
+    parser.add_argument('--employees', type=int, default=300)
+    parser.add_argument('--max-batch', type=int, default=64)
+    parser.add_argument('--batch-window-ms', type=float, default=0)
+    args = parser.parse_args(argv)
+
+    temp_dir = None
+    server = None
+    try:
+        if args.url:
+            if not args.pins:
+                parser.error("--pins is required with --url")
+            url = urlparse(args.url)
+            host, port = url.hostname, url.port or 80
+            pins = args.pins.split(',')
+        else:
+            from App.server._api_server import AttendanceAPIServer
+            temp_dir = tempfile.mkdtemp()
+            db_path = os.path.join(temp_dir, 'load_test.db')
+            pins = _seed_database(db_path, args.employees)
+            # Every client shares one address here, so the per-client rate limits are off
+            server = AttendanceAPIServer('127.0.0.1', 0, token=args.token, db_path=db_path,
+                                         max_batch=args.max_batch, batch_window_ms=args.batch_window_ms,
+                                         guesses_per_minute=0, punches_per_minute=0)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            host, port = server.server_address[:2]
+
+        result = run_load_test(host, port, pins, args.clients, args.requests, args.token)
+        latencies = result['latencies']
+        print(f"{result['requests']} punches from {args.clients} clients in {result['elapsed']:.2f}s")
+        print(f"  throughput : {result['requests'] / result['elapsed']:,.0f} requests/s")
+        print(f"  latency    : p50 {_percentile(latencies, 0.50) * 1000:.1f} ms, "
+              f"p95 {_percentile(latencies, 0.95) * 1000:.1f} ms, "
+              f"p99 {_percentile(latencies, 0.99) * 1000:.1f} ms")
+        print(f"  errors     : {result['errors']}")
+        if server is not None and server.worker.batches:
+            print(f"  batching   : {server.worker.batched_writes / server.worker.batches:.1f} writes per commit")
+        return 1 if result['errors'] else 0
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Application logging setup.
+
+Callers only ever touch a QueueHandler: a record is put on a bounded queue
+and a QueueListener thread does the formatting and the console/file I/O, so
+a busy kiosk never waits on stdout or the disk inside a query. The log file
+rotates when it reaches a size limit or at local midnight, whichever comes
+first. Levels are set per logger from the "logging" section of config.json,
+e.g. {"levels": {"main.database": "DEBUG"}}; modules log to children of the
+'main' logger, and disabled levels cost only an isEnabledFor() check as long
+as messages use %-style arguments instead of f-strings.
+"""
+import os
+import sys
+import time
+import queue
+import atexit
+import logging
+import logging.handlers
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+DEFAULTS = {
+    'level': 'INFO',
+    'console_level': 'INFO',
+    'file': 'debug.log',
+    'max_bytes': 5 * 1024 * 1024,
+    'backup_count': 5,
+    'rotate_daily': True,
+    'queue_size': 10000,
+    'levels': {},
+}
+
+# Argument types that cannot change between the call and the listener formatting them
+_IMMUTABLE_ARGS = (str, int, float, bool, bytes, type(None))
+
+
+class SizedTimedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Size rotation that also rolls over at local midnight.
+
+    Backups keep RotatingFileHandler's numbered names (debug.log.1, .2, ...)
+    so backup_count bounds disk use no matter which trigger fired.
+    """
+
+    def __init__(self, filename, max_bytes=0, backup_count=0, daily=True, **kwargs):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, **kwargs)
+        self.daily = daily
+        self.rollover_at = self._next_midnight()
+
+    @staticmethod
+    def _next_midnight(now=None):
+        now = time.localtime(now)
+        return time.mktime((now.tm_year, now.tm_mon, now.tm_mday + 1, 0, 0, 0, 0, 0, -1))
+
+    def shouldRollover(self, record):
+        if self.daily and record.created >= self.rollover_at:
+            if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+                return True
+            self.rollover_at = self._next_midnight()
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self.rollover_at = self._next_midnight()
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread.
+
+    The stock prepare() formats every record in the calling thread. Records
+    whose arguments are immutable are queued as-is; others have their message
+    rendered first so later mutation cannot change what gets logged. Records
+    are dropped (and counted) rather than blocking when the queue is full.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        args = record.args
+        if args and not (isinstance(args, tuple) and all(isinstance(a, _IMMUTABLE_ARGS) for a in args)):
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info and not record.exc_text:
+            # Tracebacks hold frames; render them while they are still valid
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener = None
+
+
+def _level(name, fallback):
+    return logging.getLevelName(str(name).upper()) if name else fallback
+
+
+def setup_logging(base_dir, config=None):
+    """
+    Route all logging through a background queue listener.
+
+    Args:
+        base_dir: Project root; relative log file paths are resolved against it
+        config: Application config dict; its "logging" section overrides DEFAULTS
+
+    Returns:
+        The 'main' logger
+    """
+    global _listener
+    settings = dict(DEFAULTS)
+    settings.update((config or {}).get('logging', {}))
+
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    console = logging.StreamHandler(sys.stderr)
+    console.setLevel(_level(settings['console_level'], logging.INFO))
+    console.setFormatter(formatter)
+
+    log_path = settings['file']
+    if not os.path.isabs(log_path):
+        log_path = os.path.join(base_dir, log_path)
+    file_handler = SizedTimedRotatingFileHandler(
+        log_path,
+        max_bytes=settings['max_bytes'],
+        backup_count=settings['backup_count'],
+        daily=settings['rotate_daily'],
+        encoding='utf-8',
+        delay=True
+    )
+    file_handler.setFormatter(formatter)
+
+    if _listener is not None:
+        _listener.stop()
+    log_queue = queue.Queue(maxsize=settings['queue_size'])
+    _listener = logging.handlers.QueueListener(log_queue, console, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(DeferredQueueHandler(log_queue))
+    root.setLevel(_level(settings['level'], logging.INFO))
+
+    for name, level in settings['levels'].items():
+        logging.getLogger(name).setLevel(_level(level, logging.NOTSET))
+
+    return logging.getLogger('main')
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
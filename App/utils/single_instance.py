@@ -0,0 +1,88 @@
+"""
+Single-instance addressing and argument forwarding (no PyQt6).
+
+The running instance listens on a local socket (a Unix domain socket, or a
+named pipe on Windows) through App.gui.instance_guard. A second launch calls
+forward_arguments() before importing Qt or touching the database: if the
+running instance acknowledges the arguments, the new process can exit
+immediately.
+
+Names are derived from the user and the install directory, so separate
+installs (and separate users) never talk to each other.
+"""
+import os
+import json
+import socket
+import getpass
+import hashlib
+import tempfile
+import threading
+
+ACK = b'ok'
+
+
+def _instance_id(base_dir):
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = 'user'
+    digest = hashlib.sha1(os.path.normcase(os.path.abspath(base_dir)).encode('utf-8')).hexdigest()[:12]
+    return f"desainia-{''.join(c for c in user if c.isalnum()) or 'user'}-{digest}"
+
+
+def server_name(base_dir):
+    """
+    Name passed to QLocalServer.listen() for this install.
+
+    Returns:
+        Full socket path on Unix, pipe name on Windows
+    """
+    if os.name == 'nt':
+        return _instance_id(base_dir)
+    return os.path.join(tempfile.gettempdir(), f"{_instance_id(base_dir)}.sock")
+
+
+def lock_path(base_dir):
+    """Path of the lock file held by the running instance."""
+    return os.path.join(tempfile.gettempdir(), f"{_instance_id(base_dir)}.lock")
+
+
+def encode_arguments(args):
+    return json.dumps(list(args)).encode('utf-8') + b'\n'
+
+
+def forward_arguments(base_dir, args, timeout=1.0):
+    """
+    Hand command line arguments to the running instance.
+
+    Args:
+        base_dir: Project root directory
+        args: Arguments to forward (e.g. ['open', 'attendance'])
+        timeout: Seconds to wait for the running instance to acknowledge
+
+    Returns:
+        True if a running instance accepted the arguments
+    """
+    message = encode_arguments(args)
+    try:
+        if os.name == 'nt':
+            return _forward_pipe(server_name(base_dir), message, timeout)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(server_name(base_dir))
+            sock.sendall(message)
+            return sock.makefile('rb').readline().strip() == ACK
+    except OSError:
+        # No listener (first launch, stale socket or an instance that is shutting down)
+        return False
+
+
+def _forward_pipe(name, message, timeout):
+    # Reads on a pipe cannot time out, so wait for the reply on a helper thread
+    reply = []
+    with open(rf'\\.\pipe\{name}', 'r+b', buffering=0) as pipe:
+        pipe.write(message)
+        reader = threading.Thread(target=lambda: reply.append(pipe.readline()), daemon=True)
+        reader.start()
+        reader.join(timeout)
+    return bool(reply) and reply[0].strip() == ACK
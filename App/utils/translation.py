@@ -0,0 +1,111 @@
+"""
+Translation catalog module.
+
+Loads translation.json once and flattens each language tree into a
+dotted-key table (e.g. "menu.file.title") so label lookups are a single
+dictionary access instead of a nested walk. Only the active language is
+flattened at startup; the fallback language is flattened on first miss.
+"""
+import json
+import logging
+
+
+def flatten_translations(tree, prefix=""):
+    """
+    Flatten a nested translation tree into a dotted-key dictionary.
+
+    Args:
+        tree: Nested dictionary of translation strings
+        prefix: Key prefix used while recursing
+
+    Returns:
+        Dictionary mapping dotted keys to translated strings
+    """
+    table = {}
+    for key, value in tree.items():
+        dotted_key = f"{prefix}{key}"
+        if isinstance(value, dict):
+            table.update(flatten_translations(value, f"{dotted_key}."))
+        else:
+            table[dotted_key] = value
+    return table
+
+
+class TranslationCatalog:
+    """
+    Holds precompiled per-language lookup tables for translation.json.
+    """
+
+    def __init__(self, translation_path, language="en", fallback_language="en"):
+        """
+        Initialize the catalog and compile the active language.
+
+        Args:
+            translation_path: Path to translation.json
+            language: Active language code
+            fallback_language: Language used when a key is missing
+        """
+        self.logger = logging.getLogger('main')
+        self.translation_path = translation_path
+        self.fallback_language = fallback_language
+        self._tables = {}
+
+        with open(translation_path, 'r', encoding='utf-8') as f:
+            self._raw = json.load(f)
+
+        self.language = None
+        self.set_language(language)
+
+    def available_languages(self):
+        """Return the language codes present in translation.json."""
+        return list(self._raw.keys())
+
+    def _table(self, language):
+        """Return the flattened table for a language, compiling it on first use."""
+        table = self._tables.get(language)
+        if table is None:
+            table = flatten_translations(self._raw.get(language, {}))
+            self._tables[language] = table
+            self.logger.debug(f"Compiled translation table '{language}' ({len(table)} keys)")
+        return table
+
+    def set_language(self, language):
+        """
+        Switch the active language.
+
+        Args:
+            language: Language code to activate
+
+        Returns:
+            True if the active language changed, False otherwise
+        """
+        if language == self.language:
+            return False
+        self.language = language
+        self._active = self._table(language)
+        return True
+
+    def get(self, dotted_key, default=None):
+        """
+        Look up a dotted key in the active language, then the fallback language.
+
+        Args:
+            dotted_key: Key such as "dialog.about.title"
+            default: Value returned when the key is missing in both languages
+
+        Returns:
+            Translated string or default
+        """
+        value = self._active.get(dotted_key)
+        if value is None and self.language != self.fallback_language:
+            value = self._table(self.fallback_language).get(dotted_key)
+        return default if value is None else value
+
+    def text(self, *keys):
+        """
+        Look up a translation by key path.
+
+        Mirrors the old nested lookup: when the key is missing the last key
+        segment is returned so the UI still shows something readable.
+        """
+        return self.get('.'.join(keys), keys[-1] if keys else '')
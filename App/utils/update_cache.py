@@ -0,0 +1,200 @@
+"""
+Update check cache module.
+
+Keeps GitHub API responses for the update checker in UserData so that
+launches within the minimum check interval make no requests at all, and
+later checks are conditional (If-None-Match). GitHub does not count 304
+responses against the rate limit. A 403/429 puts the checker into
+exponential backoff, honouring Retry-After / X-RateLimit-Reset when present.
+"""
+import json
+import os
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+
+
+class RateLimited(Exception):
+    """Raised when the API answers 403/429 for rate limiting."""
+
+    def __init__(self, url, status_code, retry_after=None):
+        super().__init__(f"Rate limited ({status_code}) on {url}")
+        self.url = url
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def retry_after_seconds(value, now=None):
+    """
+    Parse a Retry-After header, which is either delay-seconds or an HTTP-date.
+
+    Returns:
+        Seconds to wait (never negative), or None if the value is not understood
+    """
+    try:
+        return max(0, int(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    now = time.time() if now is None else now
+    return max(0, int(retry_at - now))
+
+
+class UpdateCheckCache:
+    """
+    Persists ETags, response bodies and backoff state for update checks.
+    """
+
+    def __init__(self, cache_path, min_interval_seconds=6 * 3600,
+                 base_backoff_seconds=300, max_backoff_seconds=24 * 3600):
+        """
+        Initialize the cache and load any saved state.
+
+        Args:
+            cache_path: JSON file used to persist the cache
+            min_interval_seconds: Minimum time between network checks
+            base_backoff_seconds: First backoff delay after a rate-limit response
+            max_backoff_seconds: Upper bound for the backoff delay
+        """
+        self.logger = logging.getLogger('main.update')
+        self.cache_path = cache_path
+        self.min_interval_seconds = min_interval_seconds
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.state = self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        state.setdefault('responses', {})
+        state.setdefault('last_check', 0)
+        state.setdefault('backoff_until', 0)
+        state.setdefault('backoff_seconds', 0)
+        return state
+
+    def save(self):
+        """Write the cache atomically so a crash never leaves half a file."""
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            temp_path = f"{self.cache_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, indent=4)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            self.logger.error(f"Error saving update check cache: {e}")
+
+    def is_due(self, now=None):
+        """
+        Check whether a network check is allowed right now.
+
+        Returns:
+            True if the minimum interval has passed and no backoff is active
+        """
+        now = time.time() if now is None else now
+        if self.is_backing_off(now):
+            return False
+        return now - self.state['last_check'] >= self.min_interval_seconds
+
+    def is_backing_off(self, now=None):
+        """Check whether a rate-limit backoff is in effect."""
+        now = time.time() if now is None else now
+        return now < self.state['backoff_until']
+
+    def cached(self, url):
+        """Return the last successful JSON body for a URL, or None."""
+        entry = self.state['responses'].get(url)
+        return entry['body'] if entry else None
+
+    def fetch(self, http, url, headers, timeout=5):
+        """
+        Conditionally GET a JSON URL, falling back to the cached body on 304.
+
+        Args:
+            http: requests.Session (or compatible) used for the request
+            url: URL to fetch
+            headers: Base request headers
+            timeout: Request timeout in seconds
+
+        Returns:
+            Tuple (status_code, body); body is None when nothing is available
+
+        Raises:
+            RateLimited: On 429, or 403 with the rate limit exhausted
+        """
+        entry = self.state['responses'].get(url)
+        request_headers = dict(headers)
+        if entry and entry.get('etag'):
+            request_headers['If-None-Match'] = entry['etag']
+
+        response = http.get(url, headers=request_headers, timeout=timeout)
+
+        if response.status_code == 304 and entry:
+            return 304, entry['body']
+
+        # A 403 is only a rate limit when GitHub says so; otherwise it is an auth problem
+        if response.status_code == 429 or (
+                response.status_code == 403 and (response.headers.get('X-RateLimit-Remaining') == '0'
+                                                 or 'Retry-After' in response.headers)):
+            retry_after = None
+            if response.headers.get('Retry-After'):
+                retry_after = retry_after_seconds(response.headers['Retry-After'])
+            if retry_after is None and response.headers.get('X-RateLimit-Reset', '').isdigit():
+                retry_after = max(0, int(response.headers['X-RateLimit-Reset']) - int(time.time()))
+            raise RateLimited(url, response.status_code, retry_after)
+
+        if response.status_code == 200:
+            body = response.json()
+            self.state['responses'][url] = {
+                'etag': response.headers.get('ETag'),
+                'body': body,
+                'fetched_at': time.time(),
+            }
+            return 200, body
+
+        return response.status_code, None
+
+    def fetch_all(self, http, urls, headers, timeout=5):
+        """
+        Fetch several URLs concurrently and record the check.
+
+        Args:
+            http: requests.Session (or compatible) used for the requests
+            urls: URLs to fetch
+            headers: Base request headers
+            timeout: Request timeout in seconds
+
+        Returns:
+            Dictionary mapping each URL to (status_code, body). On rate limiting
+            every URL maps to (status_code, cached body) and backoff is applied.
+        """
+        now = time.time()
+        try:
+            with ThreadPoolExecutor(max_workers=len(urls)) as pool:
+                futures = {url: pool.submit(self.fetch, http, url, headers, timeout) for url in urls}
+                results = {url: future.result() for url, future in futures.items()}
+        except RateLimited as e:
+            self._apply_backoff(e, now)
+            results = {url: (e.status_code, self.cached(url)) for url in urls}
+        else:
+            self.state['backoff_seconds'] = 0
+            self.state['backoff_until'] = 0
+        self.state['last_check'] = now
+        self.save()
+        return results
+
+    def _apply_backoff(self, error, now):
+        """Double the backoff delay (bounded), preferring the server's hint."""
+        delay = min(self.max_backoff_seconds,
+                    max(self.base_backoff_seconds, self.state['backoff_seconds'] * 2))
+        self.state['backoff_seconds'] = delay
+        if error.retry_after is not None:
+            delay = min(self.max_backoff_seconds, max(delay, error.retry_after))
+        self.state['backoff_until'] = now + delay
+        self.logger.warning(f"{error}; backing off for {delay} seconds")
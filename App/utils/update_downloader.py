@@ -0,0 +1,368 @@
+"""
+Background update downloader.
+
+DeltaUpdater fetches the release's update_manifest.json and downloads only
+the files whose hash differs from the local install. UpdateDownloader is
+the fallback for releases without a manifest: it downloads the release
+archive into UserData/updates, resuming a partial download with an HTTP
+Range request (after a dropped connection or on the next attempt), hashing
+the file as it streams, and extracting it entry by entry so memory use
+stays bounded regardless of archive size.
+
+Both install through update_manifest.apply_update, which swaps the staged
+files in atomically and rolls back on failure. Progress is reported
+through Qt signals so the update dialog stays responsive.
+"""
+import os
+import json
+import shutil
+import hashlib
+import zipfile
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+import requests
+from PyQt6.QtCore import QThread, pyqtSignal
+from .update_manifest import (MANIFEST_NAME, CONFIG_PATH, build_manifest,
+                              load_manifest, diff_manifest, merge_config, apply_update, local_path)
+
+CHUNK_SIZE = 1024 * 1024  # 1 MiB network/file chunks
+MAX_ATTEMPTS = 4
+FILE_WORKERS = 8
+
+
+class UpdateDownloadError(Exception):
+    """Raised when the update archive cannot be downloaded or verified."""
+
+
+class UpdateDownloader(QThread):
+    """Worker thread that downloads, verifies, extracts and installs an update archive."""
+
+    progress = pyqtSignal(int)          # 0-100 for the current phase
+    status = pyqtSignal(str)            # Human readable phase description
+    applied = pyqtSignal(str)           # New commit hash ('' if unknown)
+    failed = pyqtSignal(str)            # Error message
+
+    def __init__(self, download_url, work_dir, install_dir, version, headers=None,
+                 expected_sha256=None, tag_ref_url=None, parent=None):
+        """
+        Initialize the downloader.
+
+        Args:
+            download_url: URL of the release zip archive
+            work_dir: Directory for the partial download and extracted files
+            install_dir: Application root directory to update
+            version: Version being installed
+            headers: Extra request headers (e.g. User-Agent)
+            expected_sha256: Archive SHA-256 to verify against, if published
+            tag_ref_url: GitHub git/refs/tags URL used to look up the commit hash
+            parent: Optional QObject parent
+        """
+        super().__init__(parent)
+        self.logger = logging.getLogger('main.update')
+        self.download_url = download_url
+        self.work_dir = work_dir
+        self.install_dir = install_dir
+        self.version = version
+        self.headers = dict(headers or {})
+        self.expected_sha256 = expected_sha256.lower() if expected_sha256 else None
+        self.tag_ref_url = tag_ref_url
+        self.archive_path = os.path.join(work_dir, 'update.zip')
+        self.partial_path = f"{self.archive_path}.part"
+        self.extract_dir = os.path.join(work_dir, 'extract')
+
+    def run(self):
+        try:
+            os.makedirs(self.work_dir, exist_ok=True)
+            self.status.emit("Downloading update...")
+            digest = self._download()
+            if self.isInterruptionRequested():
+                return
+
+            if self.expected_sha256 and digest != self.expected_sha256:
+                os.remove(self.archive_path)
+                raise UpdateDownloadError("Downloaded update failed checksum verification")
+            self.logger.info(f"Update archive downloaded (sha256 {digest})")
+
+            self.status.emit("Extracting update...")
+            source_dir = self._extract()
+            if self.isInterruptionRequested():
+                return
+
+            manifest = load_manifest(os.path.join(source_dir, MANIFEST_NAME)) \
+                or build_manifest(source_dir, self.version)
+            self.status.emit("Checking installed files...")
+            changed, removed = self._diff(manifest)
+            self._install(source_dir, manifest, changed, removed)
+        except Exception as e:
+            self.logger.error(f"Update download failed: {e}")
+            self.failed.emit(str(e))
+
+    def _hash_existing(self, path):
+        """Hash what is already on disk so a resumed download still gets a full digest."""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest
+
+    def _download(self):
+        """
+        Download the archive, resuming from the partial file when possible.
+
+        Returns:
+            Hex SHA-256 digest of the complete archive
+        """
+        if os.path.exists(self.archive_path):
+            os.remove(self.archive_path)
+
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            offset = os.path.getsize(self.partial_path) if os.path.exists(self.partial_path) else 0
+            headers = dict(self.headers)
+            if offset:
+                headers['Range'] = f"bytes={offset}-"
+
+            try:
+                with requests.get(self.download_url, headers=headers, stream=True, timeout=(5, 30)) as response:
+                    if response.status_code == 416:
+                        # Our partial file is not a prefix of this archive; start over
+                        os.remove(self.partial_path)
+                        continue
+                    if response.status_code not in (200, 206):
+                        raise UpdateDownloadError(f"Failed to download update package (HTTP {response.status_code})")
+
+                    if response.status_code == 206:
+                        digest = self._hash_existing(self.partial_path)
+                        mode = 'ab'
+                    else:
+                        # Server ignored the Range header; rewrite from the start
+                        offset = 0
+                        digest = hashlib.sha256()
+                        mode = 'wb'
+
+                    length = int(response.headers.get('content-length', 0))
+                    total = offset + length if length else 0
+                    received = offset
+
+                    with open(self.partial_path, mode, buffering=CHUNK_SIZE) as f:
+                        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                            if self.isInterruptionRequested():
+                                return None
+                            f.write(chunk)
+                            digest.update(chunk)
+                            received += len(chunk)
+                            if total:
+                                self.progress.emit(int(received * 100 / total))
+
+                    if total and received < total:
+                        raise requests.ConnectionError(f"Connection closed at {received}/{total} bytes")
+
+                os.replace(self.partial_path, self.archive_path)
+                self.progress.emit(100)
+                return digest.hexdigest()
+
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self.logger.warning(f"Update download interrupted (attempt {attempt}/{MAX_ATTEMPTS}): {e}")
+                self.status.emit("Connection lost, resuming download...")
+                self.msleep(1000 * attempt)
+
+        raise UpdateDownloadError("Failed to download update package after several attempts")
+
+    def _extract(self):
+        """
+        Extract the archive entry by entry with bounded memory.
+
+        Returns:
+            Path of the directory holding the release files
+        """
+        if os.path.exists(self.extract_dir):
+            shutil.rmtree(self.extract_dir)
+        os.makedirs(self.extract_dir)
+        root = os.path.realpath(self.extract_dir)
+
+        with zipfile.ZipFile(self.archive_path) as archive:
+            members = archive.infolist()
+            total = sum(member.file_size for member in members) or 1
+            done = 0
+            for member in members:
+                if self.isInterruptionRequested():
+                    return None
+                target = os.path.realpath(os.path.join(root, member.filename))
+                if not target.startswith(root + os.sep) and target != root:
+                    raise UpdateDownloadError(f"Unsafe path in update archive: {member.filename}")
+                if member.is_dir():
+                    os.makedirs(target, exist_ok=True)
+                    continue
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                # ZipExtFile checks each entry's CRC as it streams
+                with archive.open(member) as src, open(target, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, CHUNK_SIZE)
+                done += member.file_size
+                self.progress.emit(int(done * 100 / total))
+
+        # GitHub tag archives wrap everything in a single "<repo>-<version>" folder
+        entries = os.listdir(self.extract_dir)
+        if len(entries) == 1 and os.path.isdir(os.path.join(self.extract_dir, entries[0])):
+            return os.path.join(self.extract_dir, entries[0])
+        return self.extract_dir
+
+    def _diff(self, manifest):
+        installed = load_manifest(os.path.join(self.install_dir, MANIFEST_NAME))
+        return diff_manifest(self.install_dir, manifest, installed,
+                             progress=lambda done, total: self.progress.emit(int(done * 100 / total)))
+
+    def _install(self, stage_dir, manifest, changed, removed):
+        """
+        Stage config.json and the manifest, then apply everything atomically.
+
+        Args:
+            stage_dir: Directory holding the new files at their manifest paths
+            manifest: Manifest of the release being installed
+            changed: Manifest paths to replace or add
+            removed: Manifest paths to delete
+        """
+        commit_hash = self._commit_hash()
+        self.status.emit("Installing update...")
+
+        # Keep the user's settings, pick up new keys, and record the new version
+        local_config_path = local_path(self.install_dir, CONFIG_PATH)
+        with open(local_config_path, 'r', encoding='utf-8') as f:
+            local_config = json.load(f)
+        release_config = local_config
+        if CONFIG_PATH in changed:
+            with open(local_path(stage_dir, CONFIG_PATH), 'r', encoding='utf-8') as f:
+                release_config = json.load(f)
+        config = merge_config(release_config, local_config)
+        config.setdefault('application', {})['version'] = self.version
+        config.setdefault('git', {}).update({'commit_hash': commit_hash, 'tag': f"v{self.version}"})
+
+        staged_config_path = local_path(stage_dir, CONFIG_PATH)
+        os.makedirs(os.path.dirname(staged_config_path), exist_ok=True)
+        with open(staged_config_path, 'w', encoding='utf-8') as f:
+            json.dump(config, f, indent=4)
+        with open(os.path.join(stage_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=4, sort_keys=True)
+        changed = [path for path in changed if path != CONFIG_PATH] + [CONFIG_PATH, MANIFEST_NAME]
+
+        backup_dir = os.path.join(self.work_dir, 'backup')
+        shutil.rmtree(backup_dir, ignore_errors=True)
+        apply_update(self.install_dir, stage_dir, changed, removed, backup_dir)
+        self.progress.emit(100)
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+        self.applied.emit(commit_hash)
+
+    def _commit_hash(self):
+        """Look up the short commit hash of the new tag, or '' if unavailable."""
+        if not self.tag_ref_url:
+            return ""
+        try:
+            response = requests.get(self.tag_ref_url, headers=self.headers, timeout=5)
+            if response.status_code == 200:
+                return response.json()['object']['sha'][:7]
+        except (requests.RequestException, KeyError, ValueError) as e:
+            self.logger.warning(f"Could not fetch commit hash for update: {e}")
+        return ""
+
+
+class DeltaUpdater(UpdateDownloader):
+    """Worker thread that updates only the files changed since the installed release."""
+
+    unavailable = pyqtSignal()          # Release has no manifest; use UpdateDownloader
+
+    def __init__(self, manifest_url, files_base_url, work_dir, install_dir, version,
+                 headers=None, tag_ref_url=None, parent=None):
+        """
+        Initialize the delta updater.
+
+        Args:
+            manifest_url: URL of the release's update_manifest.json
+            files_base_url: URL prefix that manifest paths are appended to
+            work_dir: Directory for staged files and backups
+            install_dir: Application root directory to update
+            version: Version being installed
+            headers: Extra request headers (e.g. User-Agent)
+            tag_ref_url: GitHub git/refs/tags URL used to look up the commit hash
+            parent: Optional QObject parent
+        """
+        super().__init__(manifest_url, work_dir, install_dir, version, headers=headers,
+                         tag_ref_url=tag_ref_url, parent=parent)
+        self.manifest_url = manifest_url
+        self.files_base_url = files_base_url.rstrip('/')
+        self.stage_dir = os.path.join(work_dir, 'stage')
+
+    def run(self):
+        try:
+            self.status.emit("Checking for changed files...")
+            manifest = self._fetch_manifest()
+            if manifest is None:
+                self.unavailable.emit()
+                return
+
+            changed, removed = self._diff(manifest)
+            if self.isInterruptionRequested():
+                return
+
+            shutil.rmtree(self.stage_dir, ignore_errors=True)
+            os.makedirs(self.stage_dir)
+            self.status.emit(f"Downloading {len(changed)} changed files...")
+            self._fetch_files(manifest, changed)
+            if self.isInterruptionRequested():
+                return
+
+            self._install(self.stage_dir, manifest, changed, removed)
+        except Exception as e:
+            self.logger.error(f"Delta update failed: {e}")
+            self.failed.emit(str(e))
+
+    def _fetch_manifest(self):
+        """Return the release manifest, or None if the release does not publish one."""
+        try:
+            response = requests.get(self.manifest_url, headers=self.headers, timeout=(5, 30))
+        except requests.RequestException as e:
+            self.logger.warning(f"Could not fetch update manifest: {e}")
+            return None
+        if response.status_code != 200:
+            self.logger.info(f"No update manifest for v{self.version} (HTTP {response.status_code})")
+            return None
+        try:
+            manifest = response.json()
+        except ValueError:
+            return None
+        return manifest if isinstance(manifest.get('files'), dict) else None
+
+    def _fetch_files(self, manifest, paths):
+        """Download and verify the given manifest paths into the stage directory."""
+        total = sum(manifest['files'][path]['size'] for path in paths) or 1
+        done = [0]
+
+        def fetch(path):
+            if self.isInterruptionRequested():
+                return
+            entry = manifest['files'][path]
+            target = local_path(self.stage_dir, path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            digest = hashlib.sha256()
+            url = f"{self.files_base_url}/{quote(path)}"
+            for attempt in range(1, MAX_ATTEMPTS + 1):
+                try:
+                    with requests.get(url, headers=self.headers, stream=True, timeout=(5, 30)) as response:
+                        if response.status_code != 200:
+                            raise UpdateDownloadError(f"Failed to download {path} (HTTP {response.status_code})")
+                        digest = hashlib.sha256()
+                        with open(target, 'wb', buffering=CHUNK_SIZE) as f:
+                            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                                f.write(chunk)
+                                digest.update(chunk)
+                    break
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    if attempt == MAX_ATTEMPTS:
+                        raise UpdateDownloadError(f"Failed to download {path}: {e}")
+                    self.msleep(1000 * attempt)
+            if digest.hexdigest() != entry['sha256']:
+                raise UpdateDownloadError(f"Checksum mismatch for {path}")
+            done[0] += entry['size']
+            self.progress.emit(int(done[0] * 100 / total))
+
+        with ThreadPoolExecutor(max_workers=FILE_WORKERS) as pool:
+            # list() re-raises the first download error
+            list(pool.map(fetch, paths))
@@ -0,0 +1,260 @@
+"""
+Release manifest and atomic file-level update application.
+
+A release ships an update_manifest.json at the repository root listing the
+SHA-256 and size of every tracked file (git ls-files for a checkout, so logs
+and other local files never enter a manifest). The updater compares it with the
+local install (size first, then hash), fetches only the files that differ,
+and applies them with apply_update(): every changed file is staged first,
+then swapped into place with os.replace while the originals are moved to a
+backup directory, so any failure rolls the install back to where it was.
+
+Generate the manifest for a release checkout with:
+    python -m App.utils.update_manifest <version> [root]
+"""
+import os
+import json
+import shutil
+import hashlib
+import logging
+import subprocess
+
+MANIFEST_NAME = 'update_manifest.json'
+CONFIG_PATH = 'App/config/config.json'
+
+# Never shipped in (or touched by) an update
+EXCLUDED_DIRS = {'.git', '__pycache__', 'UserData', 'Python'}
+EXCLUDED_FILES = {MANIFEST_NAME, 'debug.log'}
+EXCLUDED_SUFFIXES = ('.pyc', '.pyo')
+
+CHUNK_SIZE = 1024 * 1024
+
+logger = logging.getLogger('main.update')
+
+
+class UpdateManifestError(Exception):
+    """Raised when a manifest is invalid or an update cannot be applied."""
+
+
+def file_digest(path):
+    """
+    Hash a file in chunks.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Tuple (sha256 hex digest, size in bytes)
+    """
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def local_path(root, rel_path):
+    """
+    Resolve a manifest path ('/'-separated, relative) under root.
+
+    Raises:
+        UpdateManifestError: If the path would escape root
+    """
+    parts = rel_path.split('/')
+    if not rel_path or rel_path.startswith('/') or '..' in parts or ':' in parts[0]:
+        raise UpdateManifestError(f"Unsafe path in update manifest: {rel_path}")
+    return os.path.join(root, *parts)
+
+
+def _shippable(rel_path):
+    parts = rel_path.split('/')
+    return not EXCLUDED_DIRS.intersection(parts[:-1]) and parts[-1] not in EXCLUDED_FILES \
+        and not parts[-1].endswith(EXCLUDED_SUFFIXES)
+
+
+def release_files(root):
+    """
+    List the files a release ships.
+
+    For a git checkout these are the tracked files, so untracked files in the
+    tree (rotated logs, local databases) are left out. A directory without
+    .git is taken to be an extracted release archive, which only holds
+    tracked files, and is walked.
+
+    Args:
+        root: Release checkout or extracted archive directory
+
+    Returns:
+        Sorted list of '/'-separated paths relative to root
+
+    Raises:
+        UpdateManifestError: If git cannot list the files of a checkout
+    """
+    if os.path.exists(os.path.join(root, '.git')):
+        try:
+            output = subprocess.run(['git', '-C', root, 'ls-files', '-z'],
+                                    capture_output=True, check=True).stdout
+        except (OSError, subprocess.CalledProcessError) as e:
+            raise UpdateManifestError(f"Could not list tracked files in {root}: {e}") from e
+        paths = [path for path in output.decode('utf-8').split('\0') if path]
+        # Tracked files deleted in the working tree are not part of the release
+        return sorted(path for path in paths
+                      if _shippable(path) and os.path.isfile(local_path(root, path)))
+
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in EXCLUDED_DIRS]
+        for filename in filenames:
+            rel_path = os.path.relpath(os.path.join(dirpath, filename), root).replace(os.sep, '/')
+            if _shippable(rel_path):
+                paths.append(rel_path)
+    return sorted(paths)
+
+
+def build_manifest(root, version):
+    """
+    Build a manifest for the release files under root (see release_files).
+
+    Args:
+        root: Release checkout or extracted archive directory
+        version: Release version string
+
+    Returns:
+        Manifest dictionary {'version': ..., 'files': {path: {'sha256', 'size'}}}
+    """
+    files = {}
+    for rel_path in release_files(root):
+        sha256, size = file_digest(local_path(root, rel_path))
+        files[rel_path] = {'sha256': sha256, 'size': size}
+    return {'version': version, 'files': files}
+
+
+def load_manifest(path):
+    """
+    Load a manifest file.
+
+    Returns:
+        Manifest dictionary, or None if the file is missing or invalid
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if isinstance(manifest.get('files'), dict) else None
+
+
+def diff_manifest(install_dir, manifest, installed_manifest=None, progress=None):
+    """
+    Compare a release manifest with the local install.
+
+    Args:
+        install_dir: Application root directory
+        manifest: Manifest of the new release
+        installed_manifest: Manifest of the currently installed release, used to
+            find files the new release removed; without it nothing is removed
+        progress: Optional callable(done, total) for hashing progress
+
+    Returns:
+        Tuple (changed paths, removed paths)
+    """
+    changed = []
+    files = manifest['files']
+    total = len(files)
+    for done, (rel_path, entry) in enumerate(sorted(files.items()), 1):
+        path = local_path(install_dir, rel_path)
+        # Size mismatch is conclusive and avoids hashing most changed files
+        if not os.path.isfile(path) or os.path.getsize(path) != entry['size'] \
+                or file_digest(path)[0] != entry['sha256']:
+            changed.append(rel_path)
+        if progress:
+            progress(done, total)
+
+    removed = []
+    if installed_manifest:
+        for rel_path in sorted(set(installed_manifest['files']) - set(files)):
+            if os.path.isfile(local_path(install_dir, rel_path)):
+                removed.append(rel_path)
+    return changed, removed
+
+
+def merge_config(release_config, local_config):
+    """
+    Merge a release config.json into the local one.
+
+    Keys new in the release are added; values the user already has win.
+
+    Returns:
+        Merged configuration dictionary
+    """
+    merged = dict(release_config)
+    for key, value in local_config.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_config(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def apply_update(install_dir, stage_dir, changed, removed, backup_dir):
+    """
+    Swap staged files into the install, rolling back on any failure.
+
+    Args:
+        install_dir: Application root directory
+        stage_dir: Directory holding the verified new files at their manifest paths
+        changed: Manifest paths to replace or add
+        removed: Manifest paths to delete
+        backup_dir: Empty directory on the same filesystem for the originals
+
+    Raises:
+        UpdateManifestError: If applying failed (the install has been restored)
+    """
+    applied = []  # (path, had_original) in the order they were touched
+    try:
+        for rel_path, remove in [(p, False) for p in changed] + [(p, True) for p in removed]:
+            target = local_path(install_dir, rel_path)
+            had_original = os.path.exists(target)
+            applied.append((rel_path, had_original))
+            if had_original:
+                backup = local_path(backup_dir, rel_path)
+                os.makedirs(os.path.dirname(backup), exist_ok=True)
+                os.replace(target, backup)
+            if not remove:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(local_path(stage_dir, rel_path), target)
+    except OSError as e:
+        logger.error(f"Applying update failed at {applied[-1][0] if applied else '?'}: {e}; rolling back")
+        _rollback(install_dir, backup_dir, applied)
+        raise UpdateManifestError(f"Failed to apply update: {e}") from e
+
+    shutil.rmtree(backup_dir, ignore_errors=True)
+    logger.info(f"Applied update: {len(changed)} files replaced, {len(removed)} removed")
+
+
+def _rollback(install_dir, backup_dir, applied):
+    for rel_path, had_original in reversed(applied):
+        target = local_path(install_dir, rel_path)
+        try:
+            if had_original:
+                backup = local_path(backup_dir, rel_path)
+                if os.path.exists(backup):
+                    os.replace(backup, target)
+            elif os.path.exists(target):
+                os.remove(target)
+        except OSError as e:
+            logger.error(f"Rollback failed for {rel_path}: {e}")
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 2:
+        print("Usage: python -m App.utils.update_manifest <version> [root]")
+        sys.exit(1)
+    release_root = sys.argv[2] if len(sys.argv) > 2 else os.getcwd()
+    release_manifest = build_manifest(release_root, sys.argv[1])
+    with open(os.path.join(release_root, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(release_manifest, f, indent=4, sort_keys=True)
+    print(f"Wrote {MANIFEST_NAME} with {len(release_manifest['files'])} files")
@@ -1,14 +1,18 @@
 import requests
 import semver
-import tempfile
 import os
-import shutil
+import re
 import subprocess
 import json
 import platform
-from PyQt6.QtCore import QThread, pyqtSignal
+import logging
+from PyQt6.QtCore import QThread, QTimer, pyqtSignal
 from PyQt6.QtWidgets import QApplication, QMessageBox
 from ..gui.widgets.dialogs.update_dialog import UpdateDialog
+from .update_cache import UpdateCheckCache
+from .update_downloader import UpdateDownloader, DeltaUpdater
+from .update_manifest import MANIFEST_NAME
+from ..gui.instance_guard import instance_guard
 
 class UpdateChecker(QThread):
     update_available = pyqtSignal(str, str)
@@ -17,6 +21,7 @@ class UpdateChecker(QThread):
     def __init__(self, current_version):
         try:
             super().__init__()
+            self.logger = logging.getLogger('main.update')
             self.current_version = current_version.strip()
             self.app = QApplication.instance()
             
@@ -38,6 +43,14 @@ class UpdateChecker(QThread):
             if self.github_token:
                 self.headers['Authorization'] = f'Bearer {self.github_token}'
             
+            # Cached responses/ETags shared across launches; see update_cache.py
+            update_config = self.config.get('update', {})
+            self.cache = UpdateCheckCache(
+                self.app.BASE_DIR.get_path('UserData', 'update_cache.json'),
+                min_interval_seconds=update_config.get('min_check_interval_minutes', 360) * 60,
+                max_backoff_seconds=update_config.get('max_backoff_minutes', 1440) * 60
+            )
+            
             self.latest_version = None
             self.release_notes = None
             self.commit_hash = None
@@ -45,7 +58,7 @@ class UpdateChecker(QThread):
             self.show_update_dialog.connect(self._show_dialog)
             
         except Exception as e:
-            print(f"Error in UpdateChecker initialization: {str(e)}")
+            logging.getLogger('main.update').error("Error in UpdateChecker initialization: %s", e)
             raise
 
     def _show_dialog(self, current_version, new_version, release_notes):
@@ -56,78 +69,76 @@ class UpdateChecker(QThread):
         dialog.update_btn.clicked.connect(lambda: self._perform_update(dialog, new_version))
         dialog.show()
 
+    def _fetch(self, urls):
+        """Fetch the GitHub endpoints concurrently, retrying without a rejected token."""
+        results = self.cache.fetch_all(requests, urls, self.headers)
+        # A rate-limited 403 starts a backoff; only a real auth failure drops the token
+        if 'Authorization' in self.headers and not self.cache.is_backing_off() and \
+                any(status in (401, 403) for status, _ in results.values()):
+            # Try without token if auth fails
+            self.headers.pop('Authorization', None)
+            results = self.cache.fetch_all(requests, urls, self.headers)
+        return results
+
     def run(self):
         try:
-            # Get commit hash for current version first
             tag_commit_url = f"{self.config['repository']['github']['api_base']}/git/refs/tags/v{self.current_version}"
-            commit_response = requests.get(tag_commit_url, headers=self.headers, timeout=5)
-            if commit_response.status_code == 401:
-                self.headers.pop('Authorization', None)
-                commit_response = requests.get(tag_commit_url, headers=self.headers, timeout=5)
-                
-            if commit_response.status_code == 200:
-                commit_data = commit_response.json()
-                current_commit_hash = commit_data['object']['sha'][:7]
-                
-                # Update config with current version's commit hash
-                if 'git' not in self.config:
-                    self.config['git'] = {}
+            urls = [tag_commit_url, self.api_url]
+            
+            # Within the minimum interval (or while backing off) use cached responses only
+            if self.cache.is_due():
+                results = self._fetch(urls)
+            else:
+                results = {url: (304, self.cache.cached(url)) for url in urls}
+            
+            if 'git' not in self.config:
+                self.config['git'] = {}
+            git_before = dict(self.config['git'])
+            
+            # Commit hash for current version
+            _, commit_data = results[tag_commit_url]
+            if commit_data:
                 self.config['git'].update({
-                    'commit_hash': current_commit_hash,
+                    'commit_hash': commit_data['object']['sha'][:7],
                     'tag': f"v{self.current_version}"
                 })
-                with open(self.config_path, 'w') as f:
-                    json.dump(self.config, f, indent=4)
-
-            # Then check for updates
-            response = requests.get(self.api_url, headers=self.headers, timeout=5)
-            
-            if response.status_code != 200:
-                if response.status_code in [401, 403]:
-                    # Try without token if auth fails
-                    self.headers.pop('Authorization', None)
-                    response = requests.get(self.api_url, headers=self.headers, timeout=5)
-                
-                if response.status_code != 200:  # Still failed
-                    print(f"Update check failed with status {response.status_code}")
-                    return
-            
-            if response.status_code == 200:
-                latest = response.json()
-                if not latest:
-                    return
-                    
+            
+            status, latest = results[self.api_url]
+            if latest:
                 self.latest_version = latest['tag_name'].replace('v', '').strip()
-                
-                # Check if this version should be skipped - from user preferences
-                prefs_path = self.app.BASE_DIR.get_path('UserData', 'user_preferences.json')
-                with open(prefs_path, 'r') as f:
-                    user_prefs = json.load(f)
-                
-                skip_update = user_prefs.get('update', {}).get('skip_update', False)
-                skip_version = user_prefs.get('update', {}).get('skip_version')
-                
-                if skip_update and skip_version == self.latest_version:
-                    return
-                    
-                self.release_notes = latest.get('body', 'No release notes available.')
-                
-                # Update config
-                if 'git' not in self.config:
-                    self.config['git'] = {}
                 self.config['git']['last_github_version'] = self.latest_version
+            
+            # Only rewrite config.json when something actually changed
+            if self.config['git'] != git_before:
                 with open(self.config_path, 'w') as f:
                     json.dump(self.config, f, indent=4)
+            
+            if not latest:
+                self.logger.warning("Update check failed with status %s", status)
+                return
+            
+            # Check if this version should be skipped - from user preferences
+            prefs_path = self.app.BASE_DIR.get_path('UserData', 'user_preferences.json')
+            with open(prefs_path, 'r') as f:
+                user_prefs = json.load(f)
+            
+            skip_update = user_prefs.get('update', {}).get('skip_update', False)
+            skip_version = user_prefs.get('update', {}).get('skip_version')
+            
+            if skip_update and skip_version == self.latest_version:
+                return
                 
-                try:
-                    if semver.compare(self.latest_version, self.current_version) > 0:
-                        self.update_available.emit(self.latest_version, self.release_notes)
-                        self.show_update_dialog.emit(self.current_version, self.latest_version, self.release_notes)
-                except Exception as ve:
-                    print(f"Version comparison error: {str(ve)}")
+            self.release_notes = latest.get('body', 'No release notes available.')
+            
+            try:
+                if semver.compare(self.latest_version, self.current_version) > 0:
+                    self.update_available.emit(self.latest_version, self.release_notes)
+                    self.show_update_dialog.emit(self.current_version, self.latest_version, self.release_notes)
+            except Exception as ve:
+                self.logger.error("Version comparison error: %s", ve)
                     
         except Exception as e:
-            print(f"Update check error: {str(e)}")
+            self.logger.error("Update check error: %s", e)
 
     def download_and_install(self, new_version):
         if not self.release_notes:  # Fallback if release notes not available
@@ -137,115 +148,79 @@ class UpdateChecker(QThread):
         return dialog.exec()
     
     def _perform_update(self, dialog, new_version):
-        try:
-            dialog.progress.show()
-            dialog.update_btn.setEnabled(False)
-            dialog.status_label.setText("Downloading update...")
-            
-            # Download new version
-            temp_dir = tempfile.mkdtemp()
-            temp_file = os.path.join(temp_dir, "update.zip")
-            repo_url = self.config['repository']['github']['api_base'].replace('api.github.com/repos', 'github.com')
-            download_url = f"{repo_url}/archive/refs/tags/v{new_version}.zip"
-            
-            response = requests.get(download_url, stream=True)
-            if response.status_code != 200:
-                raise Exception("Failed to download update package")
-            
-            # Download with progress
-            total_size = int(response.headers.get('content-length', 0))
-            with open(temp_file, 'wb') as f:
-                if total_size == 0:
-                    f.write(response.content)
-                else:
-                    downloaded = 0
-                    for data in response.iter_content(chunk_size=4096):
-                        downloaded += len(data)
-                        f.write(data)
-                        progress = int((downloaded / total_size) * 100)
-                        dialog.progress.setValue(progress)
-            
-            # Extract update
-            dialog.status_label.setText("Extracting update...")
-            dialog.progress.setValue(0)
-            import zipfile
-            with zipfile.ZipFile(temp_file, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
-            dialog.progress.setValue(50)
-            
-            # Prepare update
-            dialog.status_label.setText("Preparing to install...")
-            extracted_dir = os.path.join(temp_dir, f"Desainia-Rak-Arsip-{new_version}")
-            config_path = os.path.join(os.getcwd(), "App", "config", "config.json")
-            
-            # Get new commit hash
-            tag_commit_url = f"{self.config['repository']['github']['api_base']}/git/refs/tags/v{new_version}"
-            commit_response = requests.get(tag_commit_url, headers=self.headers, timeout=5)
-            new_commit_hash = ""
-            if commit_response.status_code == 200:
-                commit_data = commit_response.json()
-                new_commit_hash = commit_data['object']['sha'][:7]
-            
-            # Create platform-specific update script
-            if platform.system() == "Windows":
-                update_script = f"""
-@echo off
-timeout /t 1 /nobreak >nul
-robocopy "{extracted_dir}" "{os.getcwd()}" /E /IS /IT /IM
-if exist "{config_path.replace('/', '\\')}" (
-    python -c "import json;fp='{config_path.replace('\\', '\\\\')}';f=open(fp,'r');d=json.load(f);f.close();d['application']['version']='{new_version}';d['git']={{'commit_hash':'{new_commit_hash}','tag':'v{new_version}'}};f=open(fp,'w');json.dump(d,f,indent=4);f.close()"
-    if errorlevel 1 (
-        exit /b 1
-    )
-)
-start "" "{os.getcwd().replace('/', '\\\\')}\\\\Launcher.bat"
-rmdir /S /Q "{temp_dir.replace('/', '\\')}"
-del "%~f0"
-exit
-"""
-                script_path = os.path.join(temp_dir, "update.bat")
-            else:  # Linux and MacOS
-                update_script = f"""#!/bin/bash
-cp -R "{extracted_dir}/"* "{os.getcwd()}/"
+        """Start the background update; the app restarts from _finish_update."""
+        dialog.progress.setValue(0)
+        dialog.progress.show()
+        dialog.update_btn.setEnabled(False)
+        
+        api_base = self.config['repository']['github']['api_base']
+        raw_base = api_base.replace('api.github.com/repos', 'raw.githubusercontent.com')
+        tag_commit_url = f"{api_base}/git/refs/tags/v{new_version}"
+        install_dir = self.app.BASE_DIR.base_dir
+        # Persistent work dir so an interrupted download resumes on the next attempt
+        work_dir = self.app.BASE_DIR.get_path('UserData', 'updates', f"v{new_version}")
+        
+        # Fetch only the files that changed; releases without a manifest get the full archive
+        self.downloader = DeltaUpdater(
+            f"{raw_base}/v{new_version}/{MANIFEST_NAME}",
+            f"{raw_base}/v{new_version}",
+            work_dir,
+            install_dir,
+            new_version,
+            headers=self.headers,
+            tag_ref_url=tag_commit_url
+        )
+        self.downloader.unavailable.connect(
+            lambda: self._start_downloader(dialog, UpdateDownloader(
+                f"{api_base.replace('api.github.com/repos', 'github.com')}/archive/refs/tags/v{new_version}.zip",
+                work_dir,
+                install_dir,
+                new_version,
+                headers=self.headers,
+                expected_sha256=self._release_checksum(),
+                tag_ref_url=tag_commit_url
+            )))
+        self._start_downloader(dialog, self.downloader)
 
-if [ -f "{config_path}" ]; then
-    python3 -c 'import json;fp="{config_path}";f=open(fp,"r");d=json.load(f);f.close();d["application"]["version"]="{new_version}";d["git"]={{"commit_hash":"{new_commit_hash}","tag":"v{new_version}"}};f=open(fp,"w");json.dump(d,f,indent=4);f.close()'
-fi
+    def _start_downloader(self, dialog, downloader):
+        self.downloader = downloader
+        downloader.progress.connect(dialog.progress.setValue)
+        downloader.status.connect(dialog.status_label.setText)
+        downloader.status.connect(lambda _: dialog.progress.setValue(0))
+        downloader.applied.connect(lambda _: self._finish_update(dialog))
+        downloader.failed.connect(lambda message: self._on_update_failed(dialog, message))
+        dialog.finished.connect(downloader.requestInterruption)
+        downloader.start()
 
-if [ -f "{os.getcwd()}/Launcher.sh" ]; then
-    chmod +x "{os.getcwd()}/Launcher.sh"
-    nohup bash "{os.getcwd()}/Launcher.sh" > /dev/null 2>&1 &
-fi
+    def _release_checksum(self):
+        """Return a SHA-256 published in the release notes (e.g. "SHA256: <hex>"), if any."""
+        match = re.search(r'sha-?256\W+([0-9a-f]{64})', self.release_notes or '', re.IGNORECASE)
+        return match.group(1) if match else None
 
-rm -rf "{temp_dir}"
-rm -- "$0"
-"""
-                script_path = os.path.join(temp_dir, "update.sh")
-            
-            # Write and execute update script
-            with open(script_path, 'w', newline='\n') as f:
-                f.write(update_script)
-            
-            if platform.system() != "Windows":
-                os.chmod(script_path, 0o755)  # Make script executable on Unix
-            
-            dialog.progress.setValue(75)
-            dialog.status_label.setText("Installing update...")
-            
-            # Run update script
-            if platform.system() == "Windows":
-                subprocess.Popen([script_path], shell=True)
-            else:
-                subprocess.Popen([script_path], shell=True)
-            
-            dialog.progress.setValue(100)
-            dialog.status_label.setText("Update complete! Restarting...")
-            
-            # Wait briefly before closing
-            QThread.msleep(1500)
-            QApplication.instance().quit()
-            
-        except Exception as e:
-            QMessageBox.critical(dialog, "Update Error", f"Failed to update: {str(e)}")
-            dialog.update_btn.setEnabled(True)
-            dialog.progress.hide()
+    def _on_update_failed(self, dialog, message):
+        QMessageBox.critical(dialog, "Update Error", f"Failed to update: {message}")
+        dialog.update_btn.setEnabled(True)
+        dialog.progress.hide()
+
+    def _finish_update(self, dialog):
+        """Relaunch through the platform launcher once this instance has exited."""
+        dialog.progress.setValue(100)
+        dialog.status_label.setText("Update complete! Restarting...")
+        
+        base_dir = self.app.BASE_DIR.base_dir
+        # Let the relaunched instance start instead of forwarding to this one
+        instance_guard.release()
+        if platform.system() == "Windows":
+            launcher = os.path.join(base_dir, "Launcher.bat")
+            subprocess.Popen(f'cmd /c "ping -n 3 127.0.0.1 >nul & start "" "{launcher}""',
+                             creationflags=subprocess.CREATE_NO_WINDOW)
+        else:  # Linux and MacOS
+            launcher = os.path.join(base_dir, "Launcher.sh")
+            if os.path.exists(launcher):
+                os.chmod(launcher, 0o755)
+                subprocess.Popen(['bash', '-c', f'sleep 2; exec bash "{launcher}"'],
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                 start_new_session=True)
+        
+        # Quit shortly after without blocking the event loop
+        QTimer.singleShot(1500, QApplication.instance().quit)
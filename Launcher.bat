@@ -33,4 +33,4 @@ set QT_PLUGIN_PATH=Python\Windows\Lib\site-packages\PyQt6\Qt6\plugins
 set QT_QPA_PLATFORM_PLUGIN_PATH=Python\Windows\Lib\site-packages\PyQt6\Qt6\plugins\platforms
 
 :: Run the launcher
-Python\Windows\python.exe main.py
+Python\Windows\python.exe main.py %*
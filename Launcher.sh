@@ -66,4 +66,4 @@ export QT_PLUGIN_PATH="${PYTHON_ROOT}/lib/python3.12/site-packages/PyQt6/Qt6/plu
 export QT_QPA_PLATFORM_PLUGIN_PATH="${QT_PLUGIN_PATH}/platforms"
 
 # Run application
-exec "${PYTHON_ROOT}/bin/python3.12" main.py 2>/dev/null
+exec "${PYTHON_ROOT}/bin/python3.12" main.py "$@" 2>/dev/null
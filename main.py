@@ -47,23 +47,45 @@
 import sys
 import os
 import json
-import logging
+import multiprocessing
 
 # Use os.path.join for cross-platform path handling
 project_root = os.path.dirname(os.path.abspath(__file__))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+# Worker processes (asset indexing, thumbnails) re-launch frozen builds with
+# special arguments; let them run their task instead of the application
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+
+# Headless attendance API server for kiosks; must not import PyQt6
+if __name__ == '__main__' and '--server' in sys.argv:
+    from App.server import run_server
+    sys.exit(run_server(project_root, sys.argv[1:]))
+
+# A second launch hands its arguments to the running instance and exits
+# before loading Qt or touching the database
+if __name__ == '__main__':
+    from App.utils.single_instance import forward_arguments
+    if forward_arguments(project_root, sys.argv[1:]):
+        sys.exit(0)
+
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import Qt
-from App.gui.window import MainWindow
+from App.utils.translation import TranslationCatalog
+from App.gui.theme import theme_engine
+from App.gui.instance_guard import instance_guard
+from App.gui.startup import startup, create_splash
+from App.utils.logging_setup import setup_logging
+from App.core.sync import start_from_config as start_sheet_sync
 
 # Base directory helper
 class PathHelper:
     def __init__(self, base_dir):
         self.base_dir = base_dir
+        self.translations = None
         self._load_config()
-        self._load_translations()
     
     def get_path(self, *paths):
         """Get absolute path relative to project root"""
@@ -75,40 +97,36 @@ class PathHelper:
         with open(config_path, 'r', encoding='utf-8') as f:
             self.config = json.load(f)
             
-    def _load_translations(self):
-        """Load language translations"""
+    def load_translations(self):
+        """Load language translations as precompiled dotted-key tables"""
         translation_path = self.get_path('App', 'config', 'translation.json')
-        with open(translation_path, 'r', encoding='utf-8') as f:
-            self.translations = json.load(f)
+        self.translations = TranslationCatalog(translation_path, self.config['application']['language'])
+        return self.translations
             
     def get_translation(self, *keys):
         """Get translated text for current language"""
-        current = self.translations.get(self.config['application']['language'], {})
-        for key in keys:
-            current = current.get(key, key)
-        return current
+        return self.translations.text(*keys)
+    
+    def set_language(self, language):
+        """Switch the active language in memory and persist it to config.json"""
+        if not self.translations.set_language(language):
+            return False
+        self.config['application']['language'] = language
+        config_path = self.get_path('App', 'config', 'config.json')
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump(self.config, f, indent=4)
+        return True
 
 # Initialize path helper
 BASE_DIR = PathHelper(project_root)
 
-if __name__ == '__main__':
-    # Configure logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(),
-            logging.FileHandler(BASE_DIR.get_path('debug.log'))
-        ]
-    )
-    logger = logging.getLogger('main')
-    logger.info("Application starting...")
 
-    # Initialize user data
+def init_user_data():
+    """Create the user data directory and default preferences on first run"""
     user_data_dir = BASE_DIR.get_path('UserData')
     # Create user data directory if it doesn't exist
     if not os.path.exists(user_data_dir):
-        os.makedirs(user_data_dir)
+        os.makedirs(user_data_dir, exist_ok=True)
         logger.info(f"Created user data directory: {user_data_dir}")
     
     preferences_path = os.path.join(user_data_dir, 'user_preferences.json')
@@ -122,19 +140,50 @@ if __name__ == '__main__':
         with open(preferences_path, 'w') as f:
             json.dump(default_preferences, f, indent=4)
         logger.info(f"Created default user preferences")
-    
-    # Run database migrations with minimal logging
+
+
+def init_database():
+    """Run database migrations with minimal logging"""
     try:
         from App.core.database import run_migrations
         db_status = run_migrations()
         if db_status == "created":
             logger.info("Database created successfully")
-        elif db_status == "exists":
+        elif db_status in ("exists", "updated"):
             pass  # Don't log anything for existing database
         else:
             logger.error("Database initialization failed")
     except Exception as e:
         logger.error(f"Database error: {str(e)}")
+
+
+def restore_session(app):
+    """Create the auth helper, which restores a remembered login"""
+    from App.core.user._user_auth import UserAuth
+    return UserAuth(app)
+
+
+def import_main_window():
+    """Import the GUI (qtawesome, PIL and every page module)"""
+    from App.gui.window import MainWindow
+    return MainWindow
+
+
+def decode_header_image():
+    """Decode the page header image off the GUI thread"""
+    from App.gui.widgets.header import render_header_image
+    image_path = BASE_DIR.get_path('App', 'resources', 'public', 'header', 'header.png')
+    return render_header_image(image_path) if os.path.exists(image_path) else None
+
+
+if __name__ == '__main__':
+    # Configure logging (background writer, rotation, per-module levels from config)
+    logger = setup_logging(BASE_DIR.base_dir, BASE_DIR.config)
+    
+    # Only one instance may run migrations, check for updates and write to the database
+    if not instance_guard.acquire(BASE_DIR.base_dir, sys.argv[1:]):
+        sys.exit(0)
+    logger.info("Application starting...")
     
     # Enable High DPI scaling
     if hasattr(Qt, 'AA_EnableHighDpiScaling'):
@@ -148,7 +197,52 @@ if __name__ == '__main__':
     app.setApplicationDisplayName(BASE_DIR.config['application']['name'])
     app.BASE_DIR = BASE_DIR  # Make available to entire application
     
-    window = MainWindow()
+    # Show the splash before any heavy work
+    splash = startup.step('splash', create_splash, BASE_DIR.config,
+                          BASE_DIR.get_path(BASE_DIR.config['window']['icon']))
+    splash.show()
+    app.processEvents()
+    
+    # Independent startup work runs concurrently; the window waits for what it needs
+    startup.submit('migrations', init_database)
+    startup.submit('translations', BASE_DIR.load_translations)
+    startup.submit('user_data', init_user_data)
+    startup.submit('themes', theme_engine.compile_all)
+    startup.submit('session', restore_session, app, after=('migrations',))
+    
+    # Accept arguments from later launches; stop as soon as we start quitting
+    instance_guard.listen()
+    app.aboutToQuit.connect(instance_guard.release)
+    
+    # Import the GUI while the pool works, then decode the header image
+    # (submitted afterwards so widget modules are not imported from two threads)
+    MainWindow = startup.step('import gui', import_main_window)
+    startup.submit('header_image', decode_header_image)
+    
+    # Install the active theme app-wide
+    theme_config = BASE_DIR.config.get('theme', {})
+    theme = theme_config.get('default_theme', 'dark')
+    if theme_config.get('use_system_theme', False):
+        theme = 'dark' if app.palette().window().color().lightness() < 128 else 'light'
+    startup.result('themes')
+    theme_engine.apply(app, theme)
+    
+    # Wait for everything the pages use, so nothing processes events mid-build;
+    # session and header image are optional (their widgets fall back on failure)
+    startup.wait('user_data', 'migrations', 'session', 'header_image')
+    startup.result('translations')
+    window = startup.step('build window', MainWindow)
     window.show()
+    splash.finish(window)
+    startup.finish()
+    
+    # Push attendance to the HR spreadsheet in the background, if configured
+    sheet_sync = start_sheet_sync(project_root, BASE_DIR.config)
+    if sheet_sync:
+        app.aboutToQuit.connect(sheet_sync.stop)
+    
+    instance_guard.command_received.connect(window.handle_command)
+    if sys.argv[1:]:
+        window.handle_command(sys.argv[1:])
     
     sys.exit(app.exec())
@@ -0,0 +1,81 @@
+"""Shared helpers for the test suite."""
+import os
+import json
+import logging
+import threading
+import http.server
+from App.core.database._db_migration import DatabaseMigration
+
+
+class _PathHelper:
+    """Stands in for main.PathHelper, rooted at a scratch directory."""
+
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+        self.config = {'database': {'path': 'test.db'}}
+
+    def get_path(self, *paths):
+        return os.path.join(self.base_dir, *paths)
+
+
+class _App:
+    def __init__(self, base_dir):
+        self.BASE_DIR = _PathHelper(base_dir)
+
+
+def migrated_database(directory):
+    """
+    Create a database with the current schema in directory.
+
+    Returns:
+        str: Path of the database file
+    """
+    logging.getLogger('main.database').setLevel(logging.ERROR)
+    migration = DatabaseMigration(_App(directory))
+    if not migration.run_migrations():
+        raise RuntimeError("Database migration failed")
+    return migration.db_path
+
+
+class StubServer:
+    """
+    Local HTTP server answering from a route table, for network code tests.
+
+    routes maps a path to (status, headers, body) or to a callable taking the
+    request handler and returning that tuple. Requests are recorded as
+    (path, headers) in requests.
+    """
+
+    def __init__(self, routes=None):
+        self.routes = dict(routes or {})
+        self.requests = []
+        stub = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests.append((self.path, dict(self.headers)))
+                route = stub.routes.get(self.path, (404, {}, b''))
+                status, headers, body = route(self) if callable(route) else route
+                if isinstance(body, (dict, list)):
+                    body = json.dumps(body).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
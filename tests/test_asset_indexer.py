@@ -0,0 +1,67 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+from App.core.assets import _asset_indexer
+from App.core.assets._asset_indexer import AssetIndexer
+from tests.support import migrated_database
+
+
+class AssetIndexerRemovalTest(unittest.TestCase):
+    """Rows must only be removed for files that are really gone."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = migrated_database(self.temp_dir)
+        self.root = os.path.join(self.temp_dir, 'assets')
+        self.sub = os.path.join(self.root, 'sub')
+        os.makedirs(self.sub)
+        for folder, name in ((self.root, 'a.png'), (self.root, 'b.png'), (self.sub, 'c.png')):
+            with open(os.path.join(folder, name), 'wb') as f:
+                f.write(b'\x89PNG\r\n\x1a\n' + name.encode())
+        self.indexer = AssetIndexer(self.db_path, workers=1)
+        report = self.indexer.index(self.root, user_id=1)
+        self.assertEqual(report['added'], 3)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _indexed_paths(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return {row[0] for row in conn.execute("SELECT original_path FROM files")}
+        finally:
+            conn.close()
+
+    def test_missing_root_keeps_rows(self):
+        shutil.move(self.root, self.root + '.unplugged')
+
+        report = self.indexer.index(self.root, user_id=1)
+
+        self.assertEqual(report['removed'], 0)
+        self.assertEqual([path for path, _ in report['errors']], [self.root])
+        self.assertEqual(len(self._indexed_paths()), 3)
+
+    def test_unreadable_folder_keeps_its_rows(self):
+        real_scandir = os.scandir
+
+        def scandir(path):
+            if path == self.sub:
+                raise PermissionError(13, "Permission denied", path)
+            return real_scandir(path)
+
+        os.remove(os.path.join(self.root, 'b.png'))
+        with mock.patch.object(_asset_indexer.os, 'scandir', scandir):
+            report = self.indexer.index(self.root, user_id=1)
+
+        # b.png really is gone; c.png only could not be listed
+        self.assertEqual(report['removed'], 1)
+        self.assertEqual([path for path, _ in report['errors']], [self.sub])
+        self.assertEqual(self._indexed_paths(),
+                         {os.path.join(self.root, 'a.png'), os.path.join(self.sub, 'c.png')})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+import unittest
+from PIL import Image
+from App.core.assets._asset_metadata import read_metadata
+
+XMP = """<x:xmpmeta xmlns:x="adobe:ns:meta/">
+ <rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <rdf:Description rdf:about="">
+   <dc:title><rdf:Alt><rdf:li xml:lang="x-default">{title}</rdf:li></rdf:Alt></dc:title>
+   <dc:subject><rdf:Bag>{keywords}</rdf:Bag></dc:subject>
+  </rdf:Description>
+ </rdf:RDF>
+</x:xmpmeta>"""
+
+
+def xmp_packet(title, keywords):
+    return XMP.format(title=title, keywords=''.join(f"<rdf:li>{k}</rdf:li>" for k in keywords))
+
+
+class ReadMetadataTest(unittest.TestCase):
+    """Titles and keywords from the formats microstock contributors upload."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def path(self, name):
+        return os.path.join(self.temp_dir, name)
+
+    def test_eps_xmp_is_found(self):
+        path = self.path('vector.eps')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("%!PS-Adobe-3.0 EPSF-3.0\n%%BoundingBox: 0 0 120 80\n%%EndComments\n")
+            f.write(xmp_packet("Mountain Icon", ["mountain", "outdoor"]) + "\n")
+            f.write("newpath 0 0 moveto 120 80 lineto stroke\n%%EOF\n")
+        # Pillow opens the header, so this exercises the opened-image path
+        with Image.open(path) as img:
+            self.assertEqual(img.format, 'EPS')
+
+        metadata, error = read_metadata(path)
+        self.assertIsNone(error)
+        self.assertEqual((metadata['width'], metadata['height']), (120, 80))
+        self.assertEqual(metadata['title'], "Mountain Icon")
+        self.assertEqual(metadata['keywords'], ["mountain", "outdoor"])
+
+    def test_jpeg_xmp(self):
+        path = self.path('photo.jpg')
+        packet = xmp_packet("Beach Sunset", ["beach", "Sunset", "sunset"])
+        Image.new('RGB', (16, 8)).save(path, xmp=packet.encode())
+
+        metadata, error = read_metadata(path)
+        self.assertIsNone(error)
+        self.assertEqual(metadata['title'], "Beach Sunset")
+        self.assertEqual(metadata['keywords'], ["beach", "Sunset"])
+
+    def test_jpeg_exif_xp_tags(self):
+        path = self.path('explorer.jpg')
+        exif = Image.Exif()
+        exif[0x9C9B] = "City Lights".encode('utf-16-le') + b'\0\0'
+        exif[0x9C9E] = "city; night;lights".encode('utf-16-le') + b'\0\0'
+        exif[0x9C9D] = "Jane".encode('utf-16-le') + b'\0\0'
+        Image.new('RGB', (16, 8)).save(path, exif=exif)
+
+        metadata, error = read_metadata(path)
+        self.assertIsNone(error)
+        self.assertEqual(metadata['title'], "City Lights")
+        self.assertEqual(metadata['creator'], "Jane")
+        self.assertEqual(metadata['keywords'], ["city", "night", "lights"])
+
+
+if __name__ == '__main__':
+    unittest.main()
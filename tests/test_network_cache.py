@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from PyQt6.QtCore import QCoreApplication, QEventLoop, QTimer
+from App.gui.network import NetworkCache
+from tests.support import StubServer
+
+BADGE = b'<svg xmlns="http://www.w3.org/2000/svg"/>'
+
+
+class NetworkCacheTest(unittest.TestCase):
+    """Badge fetches through the disk cache against a local HTTP server."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        patcher = mock.patch.object(NetworkCache, '_cache_directory', return_value=self.temp_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def fetch(self, cache, url, timeout_ms=5000):
+        """Run the event loop until cache.get answers or a timeout passes."""
+        results = []
+        loop = QEventLoop()
+        QTimer.singleShot(timeout_ms, loop.quit)
+
+        def done(_url, data):
+            results.append(data)
+            loop.quit()
+
+        cache.get(url, done)
+        if not results:
+            loop.exec()
+        # Let the finished reply's deleteLater run before the next fetch
+        QCoreApplication.processEvents()
+        return results[0] if results else None
+
+    def test_fresh_response_is_served_from_disk(self):
+        routes = {'/badge.svg': (200, {'Content-Type': 'image/svg+xml', 'Cache-Control': 'max-age=3600'},
+                                 BADGE)}
+        with StubServer(routes) as stub:
+            url = f"{stub.url}/badge.svg"
+            self.assertEqual(self.fetch(NetworkCache(), url), BADGE)
+            # A new manager (as after a restart) reads the same cache directory
+            self.assertEqual(self.fetch(NetworkCache(), url), BADGE)
+            self.assertEqual(len(stub.requests), 1)
+        self.assertTrue(os.listdir(self.temp_dir))
+
+    def test_expired_copy_is_served_offline(self):
+        headers = {'Content-Type': 'image/svg+xml', 'Cache-Control': 'max-age=0'}
+        stub = StubServer({'/badge.svg': (200, headers, BADGE)})
+        with stub:
+            url = f"{stub.url}/badge.svg"
+            self.assertEqual(self.fetch(NetworkCache(), url), BADGE)
+        # The server is gone; the badge still shows after a restart
+        self.assertEqual(self.fetch(NetworkCache(), url), BADGE)
+
+    def test_stale_copy_is_served_when_server_fails(self):
+        headers = {'Content-Type': 'image/svg+xml', 'Cache-Control': 'no-cache'}
+        with StubServer({'/badge.svg': (200, headers, BADGE)}) as stub:
+            url = f"{stub.url}/badge.svg"
+            cache = NetworkCache()
+            self.assertEqual(self.fetch(cache, url), BADGE)
+
+            stub.routes['/badge.svg'] = (503, {}, b'')
+            self.assertEqual(self.fetch(cache, url), BADGE)
+            # The stale copy came from disk after the revalidation failed
+            self.assertEqual(len(stub.requests), 2)
+
+    def test_uncached_failure_does_not_call_back(self):
+        with StubServer() as stub:
+            self.assertIsNone(self.fetch(NetworkCache(), f"{stub.url}/missing.svg", timeout_ms=500))
+
+
+if __name__ == '__main__':
+    unittest.main()
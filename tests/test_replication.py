@@ -0,0 +1,132 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from App.core.database._db_replication import ChangelogExporter, ChangelogMerger, read_segment
+from tests.support import migrated_database
+
+
+class ChangelogMergerTest(unittest.TestCase):
+    """A central database merging segments from a branch office."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.branch_db = migrated_database(os.path.join(self.temp_dir, 'branch'))
+        self.central_db = migrated_database(os.path.join(self.temp_dir, 'central'))
+        self.outbox = os.path.join(self.temp_dir, 'outbox')
+        self.exporter = ChangelogExporter(self.branch_db)
+        self.merger = ChangelogMerger(self.central_db)
+        # Start from an empty changelog so each export holds one change
+        self.exporter.export(self.outbox)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def export_department(self, name):
+        with sqlite3.connect(self.branch_db) as conn:
+            conn.execute("INSERT INTO departments (name) VALUES (?)", (name,))
+        return self.exporter.export(self.outbox)
+
+    def query(self, db_path, sql, params=()):
+        with sqlite3.connect(db_path) as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def set_central_branch(self, branch):
+        with sqlite3.connect(self.central_db) as conn:
+            conn.execute("UPDATE app_settings SET value = ? WHERE key = 'replication_branch_id'", (branch,))
+
+    def merge_department(self, seq, origin, updated_at, description):
+        """Merge a one-change segment writing the Design department."""
+        header = {'branch': origin, 'from_seq': seq, 'to_seq': seq}
+        change = {'table': 'departments', 'key': "Design", 'op': 'U', 'updated_at': updated_at,
+                  'origin': origin, 'row': {'name': "Design", 'description': description}}
+        return self.merger.merge(header, [change])
+
+    def central_description(self):
+        return self.query(self.central_db, "SELECT description FROM departments WHERE name = 'Design'")[0][0]
+
+    def test_first_segment_from_branch_is_not_a_gap(self):
+        self.export_department("Design")
+        report = self.merger.merge_file(self.export_department("Video"))
+
+        self.assertEqual(report['warnings'], [])
+        self.assertEqual(report['applied'], 1)
+
+    def test_skipped_segment_is_reported(self):
+        self.merger.merge_file(self.export_department("Design"))
+        self.export_department("Video")
+        report = self.merger.merge_file(self.export_department("Audio"))
+
+        self.assertEqual(len(report['warnings']), 1)
+        self.assertTrue(report['warnings'][0].startswith("Missing changes"))
+
+
+    def test_reapplied_changes_are_skipped(self):
+        header, changes = read_segment(self.export_department("Design"))
+        self.assertEqual(self.merger.merge(header, changes)['applied'], 1)
+
+        # Bypass the segment watermark; the per-row versions still stop the changes
+        with sqlite3.connect(self.central_db) as conn:
+            conn.execute("DELETE FROM app_settings WHERE key LIKE 'replication_merged:%'")
+        report = self.merger.merge(header, changes)
+        self.assertEqual((report['applied'], report['skipped']), (0, len(changes)))
+        self.assertIsNone(self.central_description())
+        self.assertEqual(self.query(self.central_db, "SELECT COUNT(*) FROM departments"),
+                         self.query(self.branch_db, "SELECT COUNT(*) FROM departments"))
+
+    def test_last_writer_wins(self):
+        self.set_central_branch('m')
+        with sqlite3.connect(self.central_db) as conn:
+            conn.execute("INSERT INTO departments (name, description) VALUES ('Design', 'local')")
+
+        report = self.merge_department(1, 'b', "2000-01-01 00:00:00.000", "older")
+        self.assertEqual((report['applied'], report['skipped']), (0, 1))
+        self.assertEqual(self.central_description(), "local")
+
+        report = self.merge_department(1, 'c', "2999-01-01 00:00:00.000", "newer")
+        self.assertEqual(report['applied'], 1)
+        self.assertEqual(self.central_description(), "newer")
+
+    def test_equal_versions_break_ties_on_branch_id(self):
+        self.set_central_branch('m')
+        with sqlite3.connect(self.central_db) as conn:
+            conn.execute("INSERT INTO departments (name, description) VALUES ('Design', 'local')")
+        local_version = self.query(
+            self.central_db,
+            "SELECT updated_at FROM changelog WHERE table_name = 'departments' AND row_key = 'Design'")[0][0]
+
+        # 'a' sorts before the local branch 'm' and loses; 'z' sorts after and wins
+        self.assertEqual(self.merge_department(1, 'a', local_version, "from a")['skipped'], 1)
+        self.assertEqual(self.central_description(), "local")
+        self.assertEqual(self.merge_department(1, 'z', local_version, "from z")['applied'], 1)
+        self.assertEqual(self.central_description(), "from z")
+
+    def test_attendance_is_matched_by_global_key(self):
+        branch = self.query(self.branch_db,
+                            "SELECT value FROM app_settings WHERE key = 'replication_branch_id'")[0][0]
+        with sqlite3.connect(self.branch_db) as conn:
+            conn.execute("INSERT INTO users (username, password, fullname, email, role) "
+                         "VALUES ('jane', 'x', 'Jane Doe', 'jane@example.com', 'user')")
+            record_id = conn.execute(
+                "INSERT INTO user_attendance (user_id, full_date, year, month, day, status) "
+                "SELECT id, '2024-05-01', 2024, 5, 1, 'present' FROM users WHERE username = 'jane'").lastrowid
+        report = self.merger.merge_file(self.exporter.export(self.outbox))
+        self.assertEqual((report['applied'], report['conflicts']), (2, []))
+
+        keys = self.query(self.central_db, "SELECT global_key, local_id FROM replication_attendance_keys")
+        self.assertEqual([key for key, _ in keys], [f"{branch}:{record_id}"])
+
+        with sqlite3.connect(self.branch_db) as conn:
+            conn.execute("UPDATE user_attendance SET status = 'sick' WHERE id = ?", (record_id,))
+        report = self.merger.merge_file(self.exporter.export(self.outbox))
+        self.assertEqual(report['applied'], 1)
+
+        rows = self.query(self.central_db,
+                          "SELECT a.id, a.status FROM user_attendance a JOIN users u ON u.id = a.user_id "
+                          "WHERE u.username = 'jane'")
+        self.assertEqual(rows, [(keys[0][1], 'sick')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import json
+import shutil
+import sqlite3
+import logging
+import tempfile
+import unittest
+from unittest import mock
+from App.core.sync import AttendanceSheetSync, MemorySheetClient
+from App.core.sync._sheet_sync import HEADER
+from tests.support import migrated_database
+
+# Retry warnings are expected here
+logging.getLogger('main.sync').setLevel(logging.ERROR)
+
+
+class AttendanceSheetSyncTest(unittest.TestCase):
+    """Incremental pushes to an in-memory sheet."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = migrated_database(self.temp_dir)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("INSERT INTO users (username, password, fullname, email, role) "
+                         "VALUES ('jane', 'x', 'Jane Doe', 'jane@example.com', 'user')")
+            self.user_id = conn.execute("SELECT id FROM users WHERE username = 'jane'").fetchone()[0]
+        self.client = MemorySheetClient()
+        self.sync = AttendanceSheetSync(self.client, self.db_path, max_attempts=3, backoff_seconds=1.0)
+        self.writes = mock.patch.object(self.client, 'write_ranges', wraps=self.client.write_ranges).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def add_attendance(self, day, updated_at, status='present'):
+        """Insert a record last changed at updated_at (older than the settle window)."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                "INSERT INTO user_attendance (user_id, full_date, year, month, day, status, updated_at) "
+                "VALUES (?, ?, 2024, 5, ?, ?, ?)",
+                (self.user_id, f"2024-05-{day:02d}", day, status, updated_at))
+            return cursor.lastrowid
+
+    def update_attendance(self, record_id, status, updated_at):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("UPDATE user_attendance SET status = ?, updated_at = ? WHERE id = ?",
+                         (status, updated_at, record_id))
+
+    def watermark(self):
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute("SELECT value FROM app_settings WHERE key = ?",
+                               (self.sync.setting_key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def sheet(self):
+        """Sheet contents as {record id: status}, checking ids are unique."""
+        ids = [row[0] for row in self.client.rows[1:]]
+        self.assertEqual(len(ids), len(set(ids)))
+        return {row[0]: row[HEADER.index('status')] for row in self.client.rows[1:]}
+
+    def test_first_sync_writes_header_and_all_rows(self):
+        ids = [self.add_attendance(day, f"2024-05-{day:02d} 17:00:00") for day in (1, 2, 3)]
+
+        self.assertEqual(self.sync.sync_once(), 3)
+        self.assertEqual(self.client.rows[0], HEADER)
+        self.assertEqual(self.sheet(), dict.fromkeys(ids, 'present'))
+        self.assertEqual(self.client.rows[1][HEADER.index('username')], 'jane')
+        self.assertEqual(self.watermark(), {'updated_at': "2024-05-03 17:00:00", 'id': ids[-1]})
+
+    def test_incremental_run_pushes_only_rows_past_watermark(self):
+        for day in (1, 2):
+            self.add_attendance(day, f"2024-05-{day:02d} 17:00:00")
+        self.sync.sync_once()
+        self.writes.reset_mock()
+
+        new_id = self.add_attendance(3, "2024-05-03 17:00:00")
+        self.assertEqual(self.sync.sync_once(), 1)
+        self.writes.assert_called_once()
+        (ranges,), _ = self.writes.call_args
+        self.assertEqual([(first, [row[0] for row in rows]) for first, rows in ranges], [(4, [new_id])])
+
+        # Nothing changed since: no write at all
+        self.writes.reset_mock()
+        self.assertEqual(self.sync.sync_once(), 0)
+        self.writes.assert_not_called()
+
+    def test_changed_row_is_rewritten_in_place(self):
+        ids = [self.add_attendance(day, f"2024-05-{day:02d} 17:00:00") for day in (1, 2, 3)]
+        self.sync.sync_once()
+
+        self.update_attendance(ids[1], 'sick', "2024-05-04 08:00:00")
+        # A fresh engine (e.g. after a restart) finds the row through the id column
+        sync = AttendanceSheetSync(self.client, self.db_path)
+        self.assertEqual(sync.sync_once(), 1)
+
+        self.assertEqual(len(self.client.rows), 4)
+        self.assertEqual(self.client.rows[2][0], ids[1])
+        self.assertEqual(self.sheet(), {ids[0]: 'present', ids[1]: 'sick', ids[2]: 'present'})
+
+    def test_adjacent_rows_merge_into_one_request(self):
+        ids = [self.add_attendance(day, f"2024-05-{day:02d} 17:00:00") for day in (1, 2, 3)]
+        self.sync.sync_once()
+        self.writes.reset_mock()
+
+        # Rows 2 and 4 change and a new record lands on row 5
+        self.update_attendance(ids[0], 'late', "2024-05-04 08:00:00")
+        self.update_attendance(ids[2], 'sick', "2024-05-04 08:00:01")
+        new_id = self.add_attendance(4, "2024-05-04 08:00:02")
+        self.assertEqual(self.sync.sync_once(), 3)
+
+        self.writes.assert_called_once()
+        (ranges,), _ = self.writes.call_args
+        self.assertEqual([(first, [row[0] for row in rows]) for first, rows in ranges],
+                         [(2, [ids[0]]), (4, [ids[2], new_id])])
+
+    def test_failed_calls_are_retried_with_backoff(self):
+        record_id = self.add_attendance(1, "2024-05-01 17:00:00")
+        self.client.fail_next = 2
+        with mock.patch('App.core.sync._sheet_sync.random.uniform', return_value=1.0), \
+                mock.patch.object(self.sync._stopping, 'wait', return_value=False) as wait:
+            self.assertEqual(self.sync.sync_once(), 1)
+
+        self.assertEqual([call.args[0] for call in wait.call_args_list], [1.0, 2.0])
+        self.assertEqual(self.sheet(), {record_id: 'present'})
+
+    def test_exhausted_retries_keep_the_watermark(self):
+        first_id = self.add_attendance(1, "2024-05-01 17:00:00")
+        self.sync.sync_once()
+        before = self.watermark()
+
+        second_id = self.add_attendance(2, "2024-05-02 17:00:00")
+        self.client.fail_next = 3
+        with mock.patch.object(self.sync._stopping, 'wait', return_value=False):
+            with self.assertRaises(ConnectionError):
+                self.sync.sync_once()
+        self.assertEqual(self.watermark(), before)
+
+        # The next run sends the record again, without duplicating the first
+        self.assertEqual(self.sync.sync_once(), 1)
+        self.assertEqual(self.sheet(), {first_id: 'present', second_id: 'present'})
+
+
+if __name__ == '__main__':
+    unittest.main()
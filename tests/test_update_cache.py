@@ -0,0 +1,108 @@
+import os
+import time
+import types
+import logging
+import shutil
+import tempfile
+import unittest
+from email.utils import formatdate
+import requests
+from App.utils.update_cache import UpdateCheckCache, retry_after_seconds
+from tests.support import StubServer
+
+RELEASE = {'tag_name': 'v2.0.0', 'body': 'Notes'}
+
+# Backoff warnings are expected here
+logging.getLogger('main.update').setLevel(logging.ERROR)
+
+
+class UpdateCheckCacheTest(unittest.TestCase):
+    """Update checks against a local stub of the GitHub API."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.temp_dir, 'update_cache.json')
+        self.cache = UpdateCheckCache(self.cache_path, min_interval_seconds=3600)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_conditional_request_reuses_cached_body(self):
+        def latest(handler):
+            if handler.headers.get('If-None-Match') == '"v2"':
+                return 304, {}, b''
+            return 200, {'ETag': '"v2"'}, RELEASE
+
+        with StubServer({'/latest': latest}) as stub:
+            url = f"{stub.url}/latest"
+            self.assertEqual(self.cache.fetch_all(requests, [url], {}), {url: (200, RELEASE)})
+            # A new cache instance reads the persisted ETag and body
+            cache = UpdateCheckCache(self.cache_path)
+            self.assertEqual(cache.fetch_all(requests, [url], {}), {url: (304, RELEASE)})
+        self.assertEqual(stub.requests[1][1].get('If-None-Match'), '"v2"')
+
+    def test_minimum_interval(self):
+        with StubServer({'/latest': (200, {}, RELEASE)}) as stub:
+            self.assertTrue(self.cache.is_due())
+            self.cache.fetch_all(requests, [f"{stub.url}/latest"], {})
+        self.assertFalse(self.cache.is_due())
+        self.assertTrue(self.cache.is_due(now=time.time() + 3601))
+
+    def test_rate_limit_backs_off_with_cached_body(self):
+        with StubServer({'/latest': (200, {'ETag': '"v2"'}, RELEASE)}) as stub:
+            url = f"{stub.url}/latest"
+            self.cache.fetch_all(requests, [url], {})
+            stub.routes['/latest'] = (403, {'X-RateLimit-Remaining': '0'}, b'{}')
+            self.assertEqual(self.cache.fetch_all(requests, [url], {}), {url: (403, RELEASE)})
+        self.assertTrue(self.cache.is_backing_off())
+        self.assertGreaterEqual(self.cache.state['backoff_until'], time.time() + 299)
+
+    def test_retry_after_http_date(self):
+        retry_at = time.time() + 7200
+        with StubServer({'/latest': (429, {'Retry-After': formatdate(retry_at, usegmt=True)}, b'')}) as stub:
+            self.cache.fetch_all(requests, [f"{stub.url}/latest"], {})
+        self.assertAlmostEqual(self.cache.state['backoff_until'], retry_at, delta=5)
+
+    def test_retry_after_formats(self):
+        now = float(int(time.time()))
+        self.assertEqual(retry_after_seconds('120'), 120)
+        self.assertEqual(retry_after_seconds(formatdate(now + 60, usegmt=True), now=now), 60)
+        self.assertEqual(retry_after_seconds(formatdate(now - 60, usegmt=True), now=now), 0)
+        self.assertIsNone(retry_after_seconds('soon'))
+
+
+class UpdateCheckerTokenTest(unittest.TestCase):
+    """UpdateChecker._fetch only drops its token for real authentication failures."""
+
+    def setUp(self):
+        from App.utils.updater import UpdateChecker
+        self.temp_dir = tempfile.mkdtemp()
+        self.checker = types.SimpleNamespace(
+            headers={'Authorization': 'Bearer secret'},
+            cache=UpdateCheckCache(os.path.join(self.temp_dir, 'update_cache.json')))
+        self.fetch = lambda urls: UpdateChecker._fetch(self.checker, urls)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_rate_limited_403_keeps_token(self):
+        with StubServer({'/latest': (403, {'X-RateLimit-Remaining': '0'}, b'{}')}) as stub:
+            self.fetch([f"{stub.url}/latest"])
+        self.assertEqual(len(stub.requests), 1)
+        self.assertIn('Authorization', self.checker.headers)
+
+    def test_rejected_token_is_dropped(self):
+        def latest(handler):
+            if handler.headers.get('Authorization'):
+                return 401, {}, b'{}'
+            return 200, {}, RELEASE
+
+        with StubServer({'/latest': latest}) as stub:
+            url = f"{stub.url}/latest"
+            self.assertEqual(self.fetch([url]), {url: (200, RELEASE)})
+        self.assertEqual(len(stub.requests), 2)
+        self.assertNotIn('Authorization', self.checker.headers)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import json
+import shutil
+import logging
+import tempfile
+import subprocess
+import unittest
+from App.utils.update_manifest import MANIFEST_NAME, CONFIG_PATH, build_manifest, load_manifest
+from App.utils.update_downloader import DeltaUpdater
+from tests.support import StubServer
+
+logging.getLogger('main.update').setLevel(logging.ERROR)
+
+
+def _write(root, rel_path, content):
+    path = os.path.join(root, *rel_path.split('/'))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def _read(root, rel_path):
+    with open(os.path.join(root, *rel_path.split('/')), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+class UpdateManifestTest(unittest.TestCase):
+    """Delta updates between two synthetic releases served by a local stub."""
+
+    RELEASE_1 = {
+        'main.py': 'print("v1")\n',
+        'App/core/unchanged.py': 'VALUE = 1\n',
+        'App/core/dropped.py': 'OLD = True\n',
+        CONFIG_PATH: json.dumps({'application': {'version': '1.0.0'}, 'theme': 'dark'}),
+    }
+    RELEASE_2 = {
+        'main.py': 'print("v2")\n',
+        'App/core/unchanged.py': 'VALUE = 1\n',
+        'App/core/added.py': 'NEW = True\n',
+        CONFIG_PATH: json.dumps({'application': {'version': '2.0.0'}, 'theme': 'light', 'pages': {}}),
+    }
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _checkout(self, name, files):
+        """A git checkout of a release, with untracked local files next to it."""
+        root = os.path.join(self.temp_dir, name)
+        for rel_path, content in files.items():
+            _write(root, rel_path, content)
+        subprocess.run(['git', 'init', '-q', root], check=True)
+        subprocess.run(['git', '-C', root, 'add', '.'], check=True)
+        _write(root, 'debug.log.1', 'rotated log\n')
+        _write(root, 'UserData/database.db', 'local data\n')
+        return root
+
+    def test_manifest_lists_tracked_files_only(self):
+        root = self._checkout('release', self.RELEASE_1)
+        self.assertEqual(sorted(build_manifest(root, '1.0.0')['files']), sorted(self.RELEASE_1))
+
+    def test_delta_update_between_releases(self):
+        install_dir = self._checkout('install', self.RELEASE_1)
+        with open(os.path.join(install_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+            json.dump(build_manifest(install_dir, '1.0.0'), f)
+        # The user changed a setting after installing
+        _write(install_dir, CONFIG_PATH, json.dumps({'application': {'version': '1.0.0'}, 'theme': 'blue'}))
+
+        release_dir = self._checkout('release', self.RELEASE_2)
+        manifest = build_manifest(release_dir, '2.0.0')
+        routes = {f"/v2/{rel_path}": (200, {}, _read(release_dir, rel_path).encode())
+                  for rel_path in self.RELEASE_2}
+        routes[f"/v2/{MANIFEST_NAME}"] = (200, {}, manifest)
+
+        with StubServer(routes) as stub:
+            updater = DeltaUpdater(f"{stub.url}/v2/{MANIFEST_NAME}", f"{stub.url}/v2",
+                                   os.path.join(self.temp_dir, 'work'), install_dir, '2.0.0')
+            applied, failed = [], []
+            updater.applied.connect(applied.append)
+            updater.failed.connect(failed.append)
+            updater.run()
+
+        self.assertEqual(failed, [])
+        self.assertEqual(applied, [''])
+        # Only the manifest and the files that differ were downloaded
+        self.assertEqual(sorted(path for path, _ in stub.requests),
+                         sorted(f"/v2/{rel_path}" for rel_path in
+                                (MANIFEST_NAME, 'main.py', 'App/core/added.py', CONFIG_PATH)))
+        self.assertEqual(_read(install_dir, 'main.py'), self.RELEASE_2['main.py'])
+        self.assertEqual(_read(install_dir, 'App/core/added.py'), self.RELEASE_2['App/core/added.py'])
+        self.assertFalse(os.path.exists(os.path.join(install_dir, 'App', 'core', 'dropped.py')))
+        # Untracked local files are neither shipped nor removed
+        self.assertEqual(_read(install_dir, 'debug.log.1'), 'rotated log\n')
+        self.assertEqual(_read(install_dir, 'UserData/database.db'), 'local data\n')
+        config = json.loads(_read(install_dir, CONFIG_PATH))
+        self.assertEqual(config['application']['version'], '2.0.0')
+        self.assertEqual(config['theme'], 'blue')
+        self.assertIn('pages', config)
+        self.assertEqual(load_manifest(os.path.join(install_dir, MANIFEST_NAME))['files'], manifest['files'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from App.core.database._db_user_import import UserImporter
+from tests.support import migrated_database
+
+
+class UserImporterTest(unittest.TestCase):
+    """Conflict detection against accounts already in the database."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = migrated_database(self.temp_dir)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("INSERT INTO users (username, password, fullname, email, role) "
+                         "VALUES ('jane', 'x', 'Jane Doe', 'Jane.Doe@Example.com', 'user')")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_email_conflict_ignores_case(self):
+        rows = [(2, {'username': 'jdoe', 'name': 'Jane Doe', 'email': 'jane.doe@example.com'}),
+                (3, {'username': 'john', 'name': 'John Roe', 'email': 'john@example.com'})]
+        report = UserImporter(self.db_path).import_rows(rows)
+
+        self.assertEqual(report['imported'], 1)
+        self.assertEqual([(c['line'], c['reason']) for c in report['conflicts']],
+                         [(2, "Email already in use")])
+
+
+if __name__ == '__main__':
+    unittest.main()